@@ -0,0 +1,87 @@
+"""
+Converts ArducamIR sensor data to OpenCV images in reused buffers, so no full size arrays are
+allocated per frame. Does not depend on the Arducam SDK.
+"""
+
+import cv2
+import numpy as np
+
+
+class ArducamIRProcessor:
+    """
+    Output buffers are reallocated only when the resolution changes. Returned arrays are
+    overwritten by the next call of the same method, copy them to keep them. Pass one to the
+    CameraArducamIR methods to opt in to reusing buffers between frames.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(cls) -> "tuple[True, ArducamIRProcessor] | tuple[False, None]":
+        """
+        Buffers are allocated on first use.
+
+        Return: Success, object.
+        """
+        return True, ArducamIRProcessor(cls.__create_key)
+
+    def __init__(self, class_private_create_key: object) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ArducamIRProcessor.__create_key, "Use create() method."
+
+        self.__buffers: "dict[str, np.ndarray]" = {}
+
+    def format(self, data: bytes, width: int, height: int, bit_depth: int) -> np.ndarray:
+        """
+        Reduces raw sensor data to 8 bits per pixel.
+
+        data: Raw buffer, 16 bits per pixel if the bit depth is more than 8.
+
+        Return: Shape (height, width).
+        """
+        if bit_depth <= 8:
+            # View of the data, nothing to convert
+            return np.frombuffer(data, np.uint8).reshape(height, width)
+
+        raw = np.frombuffer(data, np.uint16).reshape(height, width)
+        output = self.__buffer("format", (height, width))
+        # Shift and narrowing are done together, without a 16 bit temporary
+        np.right_shift(raw, bit_depth - 8, out=output, casting="unsafe")
+        return output
+
+    def bayer_to_bgra(self, bayer: np.ndarray) -> np.ndarray:
+        """
+        Demosaics Bayer (RGGB) data.
+
+        Return: Shape (height, width, 4) in BGRA.
+        """
+        output = self.__buffer("rgb", (*bayer.shape, 4))
+        cv2.cvtColor(bayer, cv2.COLOR_BayerRG2BGRA, dst=output)
+        return output
+
+    def ir_to_bgra(self, ir: np.ndarray, width: int, height: int) -> np.ndarray:
+        """
+        Scales IR data to the given size.
+
+        Return: Shape (height, width, 4) in BGRA, grey.
+        """
+        # Resized before adding channels, so interpolation runs on 1 channel instead of 4
+        resized = self.__buffer("ir_resized", (height, width))
+        cv2.resize(ir, (width, height), dst=resized)
+
+        output = self.__buffer("ir", (height, width, 4))
+        cv2.cvtColor(resized, cv2.COLOR_GRAY2BGRA, dst=output)
+        return output
+
+    def __buffer(self, name: str, shape: "tuple[int, ...]") -> np.ndarray:
+        """
+        Buffer of the given shape, reallocated if the shape changed.
+        """
+        buffer = self.__buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, np.uint8)
+            self.__buffers[name] = buffer
+
+        return buffer
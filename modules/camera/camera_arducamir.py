@@ -4,11 +4,11 @@ ArducamIR implementation of the camera wrapper.
 
 import enum
 import numpy as np
-import cv2
 
 import ArducamEvkSDK
 import arducam_rgbir_remosaic
 
+from . import arducamir_processing
 from . import base_camera
 
 CAMERA_CONFIG_DIR = "./config/camera_config.cfg"
@@ -78,36 +78,74 @@ class CameraArducamIR(base_camera.BaseCameraDevice):
 
         return True, image_data
 
-    def demosaic(self, image: ArducamEvkSDK.Frame, output: ArducamOutput) -> np.ndarray | None:
+    def demosaic(
+        self,
+        image: ArducamEvkSDK.Frame,
+        output: ArducamOutput,
+        processor: "arducamir_processing.ArducamIRProcessor | None" = None,
+    ) -> np.ndarray | None:
         """
-        Converts Bayer Pattern & IR data to OpenCV Matrix
+        Converts Bayer Pattern & IR data to OpenCV Matrix.
+
+        processor: Reuses its buffers, so the array is overwritten by its next call.
+            None returns a new array.
         """
+        processor = self.__get_processor(processor)
         # Convert sensor data to useable format
-        data = self.format(image)
+        data = self.format(image, processor)
         # Splits raw sensor data into bayer data and IR data using GRIG (Green, Red, IR, Green) filter pattern
         bayer, ir = arducam_rgbir_remosaic.rgbir_remosaic(data, arducam_rgbir_remosaic.GRIG)
         if output == ArducamOutput.RGB:
             # Converts Bayer data to BGRA (Blue, Green, Red, Alpha)
-            return cv2.cvtColor(bayer, cv2.COLOR_BayerRG2BGRA)
-        # Converts IR data to BGRA
-        ir_color = cv2.cvtColor(ir, cv2.COLOR_GRAY2BGRA)
-        # Resize the IR image so that they are both the same size
-        return cv2.resize(ir_color, (bayer.shape[1], bayer.shape[0]))
+            return processor.bayer_to_bgra(bayer)
+        # Converts IR data to BGRA, the same size as the Bayer data
+        return processor.ir_to_bgra(ir, bayer.shape[1], bayer.shape[0])
+
+    def demosaic_both(
+        self,
+        image: ArducamEvkSDK.Frame,
+        processor: "arducamir_processing.ArducamIRProcessor | None" = None,
+    ) -> "tuple[np.ndarray, np.ndarray]":
+        """
+        Converts to both RGB and IR with one remosaic, instead of calling demosaic() twice.
+
+        processor: Reuses its buffers, so the arrays are overwritten by its next call.
+            None returns new arrays.
+
+        Return: RGB in BGRA, IR in BGRA.
+        """
+        processor = self.__get_processor(processor)
+        data = self.format(image, processor)
+        bayer, ir = arducam_rgbir_remosaic.rgbir_remosaic(data, arducam_rgbir_remosaic.GRIG)
+        return (
+            processor.bayer_to_bgra(bayer),
+            processor.ir_to_bgra(ir, bayer.shape[1], bayer.shape[0]),
+        )
 
-    def format(self, image: ArducamEvkSDK.Frame) -> np.ndarray:
+    def format(
+        self,
+        image: ArducamEvkSDK.Frame,
+        processor: "arducamir_processing.ArducamIRProcessor | None" = None,
+    ) -> np.ndarray:
         """
-        Formats byte buffer sensor input into 8-bit arrays
+        Formats byte buffer sensor input into 8-bit arrays.
+
+        processor: Reuses its buffers, so the array is overwritten by its next call.
+            None returns a new array (a view of the frame data if it is already 8 bits).
         """
-        width = image.format.width
-        height = image.format.height
-        bit_depth = image.format.bit_depth
-        data = image.data
-
-        if bit_depth > 8:
-            data = np.frombuffer(data, np.uint16).reshape(height, width)
-            # Reduce higher precision inputs to 8-bit arrays
-            data = (data >> (bit_depth - 8)).astype(np.uint8)
-        else:
-            data = np.frombuffer(data, np.uint8).reshape(height, width)
-
-        return data
+        return self.__get_processor(processor).format(
+            image.data, image.format.width, image.format.height, image.format.bit_depth
+        )
+
+    @staticmethod
+    def __get_processor(
+        processor: "arducamir_processing.ArducamIRProcessor | None",
+    ) -> arducamir_processing.ArducamIRProcessor:
+        """
+        The given processor, or a new one whose buffers are not reused.
+        """
+        if processor is not None:
+            return processor
+
+        _, processor = arducamir_processing.ArducamIRProcessor.create()
+        return processor
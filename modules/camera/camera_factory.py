@@ -8,6 +8,7 @@ from . import base_camera
 from . import camera_opencv
 from . import camera_picamera2
 from . import camera_arducamir
+from . import camera_replay
 
 
 class CameraOption(enum.Enum):
@@ -18,13 +19,19 @@ class CameraOption(enum.Enum):
     OPENCV = 0
     PICAM2 = 1
     ARDUCAMIR = 2
+    REPLAY = 3
 
 
 def create_camera(
     camera_option: CameraOption,
     width: int,
     height: int,
-    config: camera_opencv.ConfigOpenCV | camera_picamera2.ConfigPiCamera2 | None,
+    config: (
+        camera_opencv.ConfigOpenCV
+        | camera_picamera2.ConfigPiCamera2
+        | camera_replay.ConfigReplay
+        | None
+    ),
 ) -> tuple[True, base_camera.BaseCameraDevice] | tuple[False, None]:
     """
     Create a camera object based off of given parameters.
@@ -38,5 +45,7 @@ def create_camera(
             return camera_picamera2.CameraPiCamera2.create(width, height, config)
         case CameraOption.ARDUCAMIR:
             return camera_arducamir.CameraArducamIR.create(width, height, config)
+        case CameraOption.REPLAY:
+            return camera_replay.CameraReplay.create(width, height, config)
 
     return False, None
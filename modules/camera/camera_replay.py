@@ -0,0 +1,603 @@
+"""
+Replay implementation of the camera wrapper, plays back recorded images or video without hardware.
+"""
+
+import abc
+import collections
+import concurrent.futures
+import enum
+import pathlib
+import re
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from . import base_camera
+from . import frame_recording
+
+
+IMAGE_EXTENSIONS = (".bmp", ".jpeg", ".jpg", ".npy", ".png", ".tif", ".tiff")
+
+
+class ReplayRate(enum.Enum):
+    """
+    How fast frames are returned by run() .
+    """
+
+    # Frame rate of the configuration
+    REAL_TIME = 0
+    # As fast as frames are decoded
+    MAX_SPEED = 1
+    # Intervals between frame timestamps of the source
+    TIMESTAMP = 2
+
+
+class ConfigReplay:
+    """
+    Configuration for the replay camera.
+    """
+
+    # Playback settings are all independent
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        path: str | pathlib.Path,
+        rate: ReplayRate = ReplayRate.REAL_TIME,
+        frame_rate: float = 30.0,
+        loop: bool = False,
+        prefetch_count: int = 4,
+        cache_size: int = 0,
+        thread_count: int = 2,
+    ) -> None:
+        """
+        path: Directory of images (e.g. saved by the logger), a recording from
+            frame_recording.FrameRecorder (by file extension), or a video file.
+        rate: How fast frames are returned.
+        frame_rate: Frames per second for real time.
+        loop: Restart from the first frame after the last.
+        prefetch_count: Frames decoded ahead of run() .
+        cache_size: Decoded frames kept for reuse, most recently used first. Useful with loop.
+        thread_count: Threads decoding images. Video is always decoded on 1 thread.
+        """
+        self.path = pathlib.Path(path)
+        self.rate = rate
+        self.frame_rate = frame_rate
+        self.loop = loop
+        self.prefetch_count = prefetch_count
+        self.cache_size = cache_size
+        self.thread_count = thread_count
+
+
+class BaseReplaySource(abc.ABC):
+    """
+    Random access to recorded frames.
+    """
+
+    @property
+    @abc.abstractmethod
+    def frame_count(self) -> int:
+        """
+        Number of frames.
+        """
+        raise NotImplementedError
+
+    @property
+    @abc.abstractmethod
+    def is_thread_safe(self) -> bool:
+        """
+        Whether read() can be called from several threads at once.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def read(self, index: int) -> "tuple[True, np.ndarray, float] | tuple[False, None, None]":
+        """
+        Decodes a frame.
+
+        Return: Success, image, timestamp in seconds.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def release(self) -> None:
+        """
+        Closes files.
+        """
+        raise NotImplementedError
+
+
+class ImageDirectorySource(BaseReplaySource):
+    """
+    Image files in name order, timestamps are modification times.
+    Numbers in names are compared by value, so unpadded sequence numbers (e.g. _2, _10) are in order.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, directory: pathlib.Path
+    ) -> "tuple[True, ImageDirectorySource] | tuple[False, None]":
+        """
+        directory: Contains image files, other files are ignored.
+
+        Return: Success, object.
+        """
+        try:
+            paths = sorted(
+                (
+                    path
+                    for path in directory.iterdir()
+                    if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS
+                ),
+                key=ImageDirectorySource.__get_sort_key,
+            )
+            timestamps = [path.stat().st_mtime_ns / 1e9 for path in paths]
+        except OSError as exception:
+            print(f"Could not list images: {exception}")
+            return False, None
+
+        if len(paths) == 0:
+            print(f"No images in: {directory}")
+            return False, None
+
+        return True, ImageDirectorySource(cls.__create_key, paths, timestamps)
+
+    @staticmethod
+    def __get_sort_key(path: pathlib.Path) -> "list[str | int]":
+        """
+        Natural order: text parts compared as text, digit runs compared as integers.
+        """
+        # Splitting on a capturing group puts digit runs at odd indices, so the types line up
+        parts = re.split(r"(\d+)", path.name)
+        return [int(part) if index % 2 == 1 else part for index, part in enumerate(parts)]
+
+    def __init__(
+        self, class_private_create_key: object, paths: "list[pathlib.Path]", timestamps: list
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ImageDirectorySource.__create_key, "Use create() method."
+
+        self.__paths = paths
+        self.__timestamps = timestamps
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.__paths)
+
+    @property
+    def is_thread_safe(self) -> bool:
+        return True
+
+    def read(self, index: int) -> "tuple[True, np.ndarray, float] | tuple[False, None, None]":
+        path = self.__paths[index]
+        try:
+            if path.suffix.lower() == ".npy":
+                image = np.load(path)
+            else:
+                image = cv2.imread(str(path))
+        except (OSError, ValueError) as exception:
+            print(f"Could not read image {path}: {exception}")
+            return False, None, None
+
+        if image is None:
+            print(f"Could not decode image: {path}")
+            return False, None, None
+
+        return True, image, self.__timestamps[index]
+
+    def release(self) -> None:
+        pass
+
+
+class VideoSource(BaseReplaySource):
+    """
+    Video file, timestamps are positions in the video.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(cls, path: pathlib.Path) -> "tuple[True, VideoSource] | tuple[False, None]":
+        """
+        path: Video file readable by OpenCV.
+
+        Return: Success, object.
+        """
+        video = cv2.VideoCapture(str(path))
+        if not video.isOpened():
+            print(f"Could not open video: {path}")
+            return False, None
+
+        frame_count = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        if frame_count <= 0:
+            print(f"No frames in video: {path}")
+            video.release()
+            return False, None
+
+        return True, VideoSource(cls.__create_key, video, frame_count)
+
+    def __init__(
+        self, class_private_create_key: object, video: cv2.VideoCapture, frame_count: int
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is VideoSource.__create_key, "Use create() method."
+
+        self.__video = video
+        self.__frame_count = frame_count
+        # Index of the frame the next read decodes, seeking is only needed out of order
+        self.__position = 0
+
+    @property
+    def frame_count(self) -> int:
+        return self.__frame_count
+
+    @property
+    def is_thread_safe(self) -> bool:
+        return False
+
+    def read(self, index: int) -> "tuple[True, np.ndarray, float] | tuple[False, None, None]":
+        if index != self.__position:
+            self.__video.set(cv2.CAP_PROP_POS_FRAMES, index)
+
+        result, image = self.__video.read()
+        if not result:
+            self.__position = -1
+            return False, None, None
+
+        self.__position = index + 1
+        return True, image, self.__video.get(cv2.CAP_PROP_POS_MSEC) / 1000
+
+    def release(self) -> None:
+        self.__video.release()
+
+
+class ReplayDecoder:
+    """
+    Decodes and resizes frames of a source, and keeps recently used frames.
+    Decoding threads reference this rather than the camera, so the camera can be deleted on the
+    thread that owns it.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, source: BaseReplaySource, width: int, height: int, cache_size: int
+    ) -> "tuple[True, ReplayDecoder] | tuple[False, None]":
+        """
+        source: Frames to decode.
+        width: Width frames are resized to.
+        height: Height frames are resized to.
+        cache_size: Decoded frames kept, least recently used are removed first.
+
+        Return: Success, object.
+        """
+        if cache_size < 0:
+            return False, None
+
+        return True, ReplayDecoder(cls.__create_key, source, width, height, cache_size)
+
+    # Size and cache are required
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        class_private_create_key: object,
+        source: BaseReplaySource,
+        width: int,
+        height: int,
+        cache_size: int,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ReplayDecoder.__create_key, "Use create() method."
+
+        self.source = source
+        self.__width = width
+        self.__height = height
+        self.__cache_size = cache_size
+
+        # Index to frame, least recently used first
+        self.__cache: "collections.OrderedDict[int, tuple[np.ndarray, float]]" = (
+            collections.OrderedDict()
+        )
+        # Guards the cache, decoding threads add to it
+        self.__cache_lock = threading.Lock()
+
+    def is_cached(self, index: int) -> bool:
+        """
+        Whether the frame is in the cache.
+        """
+        with self.__cache_lock:
+            return index in self.__cache
+
+    def get_cached(self, index: int) -> "tuple[True, np.ndarray, float] | tuple[False, None, None]":
+        """
+        Copy of the frame from the cache, so the caller may modify it.
+
+        Return: Success, image, timestamp.
+        """
+        with self.__cache_lock:
+            if index not in self.__cache:
+                return False, None, None
+
+            self.__cache.move_to_end(index)
+            image, timestamp = self.__cache[index]
+            return True, image.copy(), timestamp
+
+    def decode(self, index: int) -> "tuple[True, np.ndarray, float] | tuple[False, None, None]":
+        """
+        Reads and resizes a frame, and caches it.
+
+        Return: Success, image, timestamp.
+        """
+        result, image, timestamp = self.source.read(index)
+        if not result:
+            return False, None, None
+
+        if image.shape[0] != self.__height or image.shape[1] != self.__width:
+            image = cv2.resize(image, (self.__width, self.__height))
+
+        if self.__cache_size > 0:
+            with self.__cache_lock:
+                self.__cache[index] = (image.copy(), timestamp)
+                self.__cache.move_to_end(index)
+                while len(self.__cache) > self.__cache_size:
+                    self.__cache.popitem(last=False)
+
+        return True, image, timestamp
+
+
+class RecordingSource(BaseReplaySource):
+    """
+    Recording from frame_recording.FrameRecorder , timestamps are as recorded.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(cls, path: pathlib.Path) -> "tuple[True, RecordingSource] | tuple[False, None]":
+        """
+        path: Recording file.
+
+        Return: Success, object.
+        """
+        result, reader = frame_recording.FrameRecordingReader.create(path)
+        if not result:
+            return False, None
+
+        if reader.frame_count == 0:
+            print(f"No frames in recording: {path}")
+            reader.close()
+            return False, None
+
+        return True, RecordingSource(cls.__create_key, reader)
+
+    def __init__(
+        self, class_private_create_key: object, reader: frame_recording.FrameRecordingReader
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is RecordingSource.__create_key, "Use create() method."
+
+        self.__reader = reader
+
+    @property
+    def frame_count(self) -> int:
+        return self.__reader.frame_count
+
+    @property
+    def is_thread_safe(self) -> bool:
+        return True
+
+    def read(self, index: int) -> "tuple[True, np.ndarray, float] | tuple[False, None, None]":
+        result, image, timestamp = self.__reader.read(index)
+        if not result:
+            return False, None, None
+
+        # Raw frames are read only views of the file
+        if not image.flags.writeable:
+            image = image.copy()
+
+        return True, image, timestamp
+
+    def release(self) -> None:
+        self.__reader.close()
+
+
+# Playback state is needed for pacing, prefetching and caching
+# pylint: disable-next=too-many-instance-attributes
+class CameraReplay(base_camera.BaseCameraDevice):
+    """
+    Class for the replay implementation of the camera. Frames are decoded ahead on a thread pool.
+
+    skipped_count: Frames that could not be decoded.
+    cache_hit_count: Frames returned from the cache instead of being decoded.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, width: int, height: int, config: ConfigReplay
+    ) -> "tuple[True, CameraReplay] | tuple[False, None]":
+        """
+        Replay camera. Frames of a different size are resized.
+
+        width: Width of the camera.
+        height: Height of the camera.
+        config: Configuration for replay camera.
+
+        Return: Success, camera object.
+        """
+        if width <= 0:
+            return False, None
+
+        if height <= 0:
+            return False, None
+
+        if config.rate == ReplayRate.REAL_TIME and config.frame_rate <= 0.0:
+            return False, None
+
+        if config.prefetch_count < 0 or config.cache_size < 0 or config.thread_count < 1:
+            return False, None
+
+        if config.path.is_dir():
+            result, source = ImageDirectorySource.create(config.path)
+        elif config.path.suffix == frame_recording.FILE_EXTENSION:
+            result, source = RecordingSource.create(config.path)
+        else:
+            result, source = VideoSource.create(config.path)
+        if not result:
+            return False, None
+
+        result, decoder = ReplayDecoder.create(source, width, height, config.cache_size)
+        if not result:
+            source.release()
+            return False, None
+
+        return True, CameraReplay(cls.__create_key, config, decoder)
+
+    def __init__(
+        self, class_private_create_key: object, config: ConfigReplay, decoder: ReplayDecoder
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is CameraReplay.__create_key, "Use create() method."
+
+        self.__config = config
+        self.__decoder = decoder
+        self.__source = decoder.source
+
+        thread_count = config.thread_count if self.__source.is_thread_safe else 1
+        self.__executor = concurrent.futures.ThreadPoolExecutor(thread_count, "camera_replay")
+        # Index to future of frames being decoded
+        self.__prefetched: "dict[int, concurrent.futures.Future]" = {}
+
+        self.__index = 0
+        # Monotonic time and source timestamp that pacing is relative to
+        self.__start_time: "float | None" = None
+        self.__start_timestamp = 0.0
+        self.__paced_count = 0
+
+        self.skipped_count = 0
+        self.cache_hit_count = 0
+
+    def __del__(self) -> None:
+        """
+        Destructor. Stops decoding and closes files.
+        """
+        self.__executor.shutdown(wait=True, cancel_futures=True)
+        self.__source.release()
+
+    @property
+    def frame_count(self) -> int:
+        """
+        Number of frames in the source.
+        """
+        return self.__source.frame_count
+
+    def run(self) -> tuple[True, np.ndarray] | tuple[False, None]:
+        """
+        Returns the next frame, waiting according to the replay rate.
+
+        Return: Success, image with shape (height, width, channels in BGR). Fails at the end.
+        """
+        failure_count = 0
+        while True:
+            if self.__index >= self.__source.frame_count:
+                if not self.__config.loop:
+                    return False, None
+
+                self.__index = 0
+                # Timestamps restart
+                self.__start_time = None
+
+            index = self.__index
+            self.__index += 1
+            self.__prefetch(index)
+
+            result, image, timestamp = self.__get(index)
+            if result:
+                break
+
+            self.skipped_count += 1
+            failure_count += 1
+            if failure_count >= self.__source.frame_count:
+                # Nothing in the source can be decoded
+                return False, None
+
+        self.__wait(timestamp)
+
+        return True, image
+
+    def __get(self, index: int) -> "tuple[True, np.ndarray, float] | tuple[False, None, None]":
+        """
+        Frame from the cache or a prefetch.
+        """
+        future = self.__prefetched.pop(index, None)
+
+        result, image, timestamp = self.__decoder.get_cached(index)
+        if result:
+            self.cache_hit_count += 1
+            if future is not None:
+                future.cancel()
+            return True, image, timestamp
+
+        if future is None:
+            # Evicted from the cache after __prefetch() checked, decoded on the pool so a video
+            # is only read by 1 thread
+            future = self.__executor.submit(self.__decoder.decode, index)
+
+        return future.result()
+
+    def __prefetch(self, current_index: int) -> None:
+        """
+        Starts decoding the current frame and the ones after it.
+        """
+        frame_count = self.__source.frame_count
+        for offset in range(self.__config.prefetch_count + 1):
+            index = current_index + offset
+            if index >= frame_count:
+                if not self.__config.loop:
+                    break
+
+                index %= frame_count
+
+            if index in self.__prefetched:
+                continue
+
+            if self.__decoder.is_cached(index):
+                continue
+
+            self.__prefetched[index] = self.__executor.submit(self.__decoder.decode, index)
+
+    def __wait(self, timestamp: float) -> None:
+        """
+        Sleeps until the frame is due.
+        """
+        if self.__config.rate == ReplayRate.MAX_SPEED:
+            return
+
+        now = time.monotonic()
+        if self.__start_time is None:
+            self.__start_time = now
+            self.__start_timestamp = timestamp
+            self.__paced_count = 0
+
+        if self.__config.rate == ReplayRate.REAL_TIME:
+            due_time = self.__start_time + self.__paced_count / self.__config.frame_rate
+        else:
+            due_time = self.__start_time + (timestamp - self.__start_timestamp)
+
+        self.__paced_count += 1
+        time.sleep(max(0.0, due_time - now))
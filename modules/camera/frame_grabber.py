@@ -0,0 +1,207 @@
+"""
+Captures from a camera continuously on a separate thread, so consumers get recent frames without
+waiting for an exposure.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from . import base_camera
+
+
+# Delay before retrying after run() fails, so a disconnected camera does not spin the thread
+FAILED_CAPTURE_DELAY = 0.01  # s
+
+
+class CameraFrame:
+    """
+    Image with capture time and sequence number.
+    """
+
+    def __init__(self, image: np.ndarray, timestamp: float, sequence_number: int) -> None:
+        """
+        image: Shape (height, width, channels).
+        timestamp: time.monotonic() when run() returned.
+        sequence_number: Count of frames captured before this one.
+        """
+        self.image = image
+        self.timestamp = timestamp
+        self.sequence_number = sequence_number
+
+
+# Counters are exposed as attributes
+# pylint: disable-next=too-many-instance-attributes
+class FrameGrabber:
+    """
+    Calls run() of a camera in a loop and copies each image into a preallocated ring buffer.
+
+    captured_count: Frames written to the ring buffer.
+    failed_count: Calls to run() that failed or returned an image of a different shape or dtype.
+    dropped_count: Frames overwritten before next() returned them.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, camera: base_camera.BaseCameraDevice, buffer_size: int = 4
+    ) -> "tuple[True, FrameGrabber] | tuple[False, None]":
+        """
+        Takes the first picture to size the ring buffer, then starts the thread.
+
+        camera: From camera_factory.create_camera() . run() must return an image array.
+        buffer_size: Frames kept for next() . Must be at least 2.
+
+        Return: Success, object.
+        """
+        if buffer_size < 2:
+            return False, None
+
+        result, image = camera.run()
+        if not result:
+            print("Could not take first picture.")
+            return False, None
+
+        if not isinstance(image, np.ndarray):
+            print("Camera does not return an image array.")
+            return False, None
+
+        instance = FrameGrabber(cls.__create_key, camera, buffer_size, image, time.monotonic())
+        instance.__thread.start()
+
+        return True, instance
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        camera: base_camera.BaseCameraDevice,
+        buffer_size: int,
+        first_image: np.ndarray,
+        first_timestamp: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is FrameGrabber.__create_key, "Use create() method."
+
+        self.__camera = camera
+
+        self.__images = np.empty((buffer_size, *first_image.shape), first_image.dtype)
+        self.__timestamps = np.zeros(buffer_size)
+        self.__images[0] = first_image
+        self.__timestamps[0] = first_timestamp
+
+        # Guards the ring buffer, notified when a frame is added or the thread stops
+        self.__condition = threading.Condition()
+        self.__latest_sequence_number = 0
+        self.__next_sequence_number = 0
+        self.__is_stopped = False
+
+        self.__thread = threading.Thread(target=self.__run, name="frame_grabber", daemon=True)
+
+        self.captured_count = 1
+        self.failed_count = 0
+        self.dropped_count = 0
+
+    @property
+    def shape(self) -> "tuple[int, ...]":
+        """
+        Shape of every image.
+        """
+        return self.__images.shape[1:]
+
+    def latest(self, out: np.ndarray | None = None) -> CameraFrame:
+        """
+        Most recent frame, without waiting. It may be the same frame as the previous call, compare
+        sequence numbers to check.
+
+        out: Array of the same shape and dtype to copy the image into, otherwise one is allocated.
+
+        Return: Frame.
+        """
+        with self.__condition:
+            return self.__copy_frame(self.__latest_sequence_number, out)
+
+    def next(
+        self, timeout: float | None = None, out: np.ndarray | None = None
+    ) -> "tuple[True, CameraFrame] | tuple[False, None]":
+        """
+        Frame after the one previously returned by next() , in order. If frames were overwritten
+        while waiting to be read, they are counted as dropped and the oldest remaining is returned.
+
+        timeout: Seconds. None waits indefinitely.
+        out: Array of the same shape and dtype to copy the image into, otherwise one is allocated.
+
+        Return: Success, frame. Fails on timeout or when stopped.
+        """
+        with self.__condition:
+            if not self.__condition.wait_for(
+                lambda: self.__latest_sequence_number >= self.__next_sequence_number
+                or self.__is_stopped,
+                timeout,
+            ):
+                return False, None
+
+            if self.__latest_sequence_number < self.__next_sequence_number:
+                return False, None
+
+            oldest_sequence_number = self.__latest_sequence_number - len(self.__images) + 1
+            if self.__next_sequence_number < oldest_sequence_number:
+                self.dropped_count += oldest_sequence_number - self.__next_sequence_number
+                self.__next_sequence_number = oldest_sequence_number
+
+            frame = self.__copy_frame(self.__next_sequence_number, out)
+            self.__next_sequence_number += 1
+
+        return True, frame
+
+    def stop(self) -> None:
+        """
+        Stops capturing. Waiting next() calls return.
+        """
+        with self.__condition:
+            self.__is_stopped = True
+            self.__condition.notify_all()
+
+        self.__thread.join()
+
+    def __copy_frame(self, sequence_number: int, out: np.ndarray | None) -> CameraFrame:
+        """
+        Copies a frame out of the ring buffer. Condition must be held.
+        """
+        index = sequence_number % len(self.__images)
+        if out is None:
+            image = self.__images[index].copy()
+        else:
+            np.copyto(out, self.__images[index])
+            image = out
+
+        return CameraFrame(image, float(self.__timestamps[index]), sequence_number)
+
+    def __run(self) -> None:
+        """
+        Capture thread.
+        """
+        while True:
+            with self.__condition:
+                if self.__is_stopped:
+                    return
+
+            result, image = self.__camera.run()
+            timestamp = time.monotonic()
+
+            if not result or image.shape != self.shape or image.dtype != self.__images.dtype:
+                self.failed_count += 1
+                time.sleep(FAILED_CAPTURE_DELAY)
+                continue
+
+            with self.__condition:
+                sequence_number = self.__latest_sequence_number + 1
+                index = sequence_number % len(self.__images)
+                np.copyto(self.__images[index], image)
+                self.__timestamps[index] = timestamp
+                self.__latest_sequence_number = sequence_number
+                self.captured_count += 1
+                self.__condition.notify_all()
@@ -0,0 +1,425 @@
+"""
+Records camera frames into one container file, and reads them back with random access.
+
+Layout (little endian):
+    File header: Magic, version.
+    Frame records: Record header (frame number, timestamp, shape, dtype, encoding, data size),
+        data. Each record starts on an alignment boundary, so raw data can be viewed in place.
+    Index: One entry per frame, written on close.
+    Trailer: Index offset, frame count, magic.
+
+If the recording was not closed (e.g. power loss), the reader rebuilds the index from the records.
+"""
+
+import enum
+import io
+import mmap
+import pathlib
+import struct
+import time
+
+import cv2
+import numpy as np
+
+from . import base_camera
+
+
+FILE_EXTENSION = ".frames"
+
+FILE_MAGIC = b"FRAMEREC"
+VERSION = 1
+FILE_HEADER = struct.Struct("<8sI52x")
+
+RECORD_MAGIC = b"FRM0"
+# Magic, frame number, timestamp, height, width, channels (0 for 2D), dtype, encoding, data size
+RECORD_HEADER = struct.Struct("<4sQdIII4sB3xQ16x")
+
+INDEX_MAGIC = b"FRAMEIDX"
+# Index offset, frame count, magic
+TRAILER = struct.Struct("<QQ8s")
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("frame_number", "<u8"),
+        ("timestamp", "<f8"),
+        # Offset of the data, after the record header
+        ("offset", "<u8"),
+        ("size", "<u8"),
+        ("height", "<u4"),
+        ("width", "<u4"),
+        ("channels", "<u4"),
+        ("dtype", "S4"),
+        ("encoding", "u1"),
+    ]
+)
+
+# Records start on cache line boundaries
+ALIGNMENT = 64  # bytes
+
+
+class FrameEncoding(enum.Enum):
+    """
+    How frame data is stored.
+    """
+
+    # Array bytes, can be viewed without decoding
+    RAW = 0
+    # Smaller, for uint8 images with 1 or 3 channels
+    JPEG = 1
+
+
+class FrameRecorder:
+    """
+    Appends frames to a recording. Call close() to write the index.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        path: pathlib.Path,
+        encoding: FrameEncoding = FrameEncoding.RAW,
+        jpeg_quality: int = 95,
+    ) -> "tuple[True, FrameRecorder] | tuple[False, None]":
+        """
+        path: File to create, FILE_EXTENSION is recommended.
+        encoding: How frames are stored.
+        jpeg_quality: 0 to 100 (best).
+
+        Return: Success, object.
+        """
+        if not 0 <= jpeg_quality <= 100:
+            return False, None
+
+        try:
+            # Closed by close()
+            # pylint: disable-next=consider-using-with
+            file = open(path, "xb")
+            file.write(FILE_HEADER.pack(FILE_MAGIC, VERSION))
+        except OSError as exception:
+            print(f"Could not create recording: {exception}")
+            return False, None
+
+        return True, FrameRecorder(cls.__create_key, file, encoding, jpeg_quality)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        file: io.BufferedWriter,
+        encoding: FrameEncoding,
+        jpeg_quality: int,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is FrameRecorder.__create_key, "Use create() method."
+
+        self.__file = file
+        self.__encoding = encoding
+        self.__parameters = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+
+        self.__offset = FILE_HEADER.size
+        self.__index: "list[tuple]" = []
+
+    @property
+    def frame_count(self) -> int:
+        """
+        Frames written.
+        """
+        return len(self.__index)
+
+    def write(self, image: np.ndarray, timestamp: float) -> "tuple[True, int] | tuple[False, None]":
+        """
+        Appends a frame.
+
+        image: Shape (height, width) or (height, width, channels).
+            For JPEG encoding, uint8 with 1 or 3 channels.
+        timestamp: Capture time in seconds.
+
+        Return: Success, frame number.
+        """
+        if image.ndim not in (2, 3):
+            return False, None
+
+        if self.__encoding == FrameEncoding.JPEG:
+            # Anything else would be read back with a different shape or dtype
+            channels = image.shape[2] if image.ndim == 3 else 1
+            if image.dtype != np.uint8 or channels not in (1, 3):
+                print("JPEG encoding needs a uint8 image with 1 or 3 channels.")
+                return False, None
+
+            try:
+                result, encoded = cv2.imencode(".jpg", image, self.__parameters)
+            except cv2.error as exception:
+                print(f"Could not encode frame: {exception}")
+                return False, None
+
+            if not result:
+                return False, None
+
+            data = encoded.data
+        else:
+            data = np.ascontiguousarray(image).data
+
+        frame_number = len(self.__index)
+        height = image.shape[0]
+        width = image.shape[1]
+        channels = image.shape[2] if image.ndim == 3 else 0
+        dtype = image.dtype.str.encode()
+
+        header = RECORD_HEADER.pack(
+            RECORD_MAGIC,
+            frame_number,
+            timestamp,
+            height,
+            width,
+            channels,
+            dtype,
+            self.__encoding.value,
+            data.nbytes,
+        )
+        padding = -(RECORD_HEADER.size + data.nbytes) % ALIGNMENT
+
+        try:
+            self.__file.write(header)
+            self.__file.write(data)
+            self.__file.write(bytes(padding))
+        except OSError as exception:
+            print(f"Could not write frame: {exception}")
+            return False, None
+
+        self.__index.append(
+            (
+                frame_number,
+                timestamp,
+                self.__offset + RECORD_HEADER.size,
+                data.nbytes,
+                height,
+                width,
+                channels,
+                dtype,
+                self.__encoding.value,
+            )
+        )
+        self.__offset += RECORD_HEADER.size + data.nbytes + padding
+
+        return True, frame_number
+
+    def record(
+        self, camera: base_camera.BaseCameraDevice, frame_count: int
+    ) -> "tuple[True, int] | tuple[False, None]":
+        """
+        Takes pictures and appends them, timestamped when run() returns.
+
+        camera: From camera_factory.create_camera() . run() must return an image array.
+        frame_count: Pictures to take. Failed pictures are not retried.
+
+        Return: Success, frames written.
+        """
+        written_count = 0
+        for _ in range(frame_count):
+            result, image = camera.run()
+            timestamp = time.time()
+            if not result:
+                continue
+
+            if not isinstance(image, np.ndarray):
+                print("Camera does not return an image array.")
+                return False, None
+
+            result, _ = self.write(image, timestamp)
+            if not result:
+                return False, None
+
+            written_count += 1
+
+        return True, written_count
+
+    def flush(self) -> None:
+        """
+        Writes buffered frames to the file.
+        """
+        self.__file.flush()
+
+    def close(self) -> bool:
+        """
+        Writes the index and closes the file.
+
+        Return: Success.
+        """
+        if self.__file.closed:
+            return True
+
+        index = np.array(self.__index, dtype=INDEX_DTYPE)
+        try:
+            self.__file.write(index.tobytes())
+            self.__file.write(TRAILER.pack(self.__offset, len(index), INDEX_MAGIC))
+            self.__file.close()
+        except OSError as exception:
+            print(f"Could not write index: {exception}")
+            return False
+
+        return True
+
+
+class FrameRecordingReader:
+    """
+    Memory maps a recording. Frames are found through the index without reading earlier frames.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(cls, path: pathlib.Path) -> "tuple[True, FrameRecordingReader] | tuple[False, None]":
+        """
+        path: Recording file.
+
+        Return: Success, object.
+        """
+        try:
+            with open(path, "rb") as file:
+                memory_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exception:
+            # Empty files cannot be mapped
+            print(f"Could not open recording: {exception}")
+            return False, None
+
+        if (
+            len(memory_map) < FILE_HEADER.size
+            or FILE_HEADER.unpack_from(memory_map)[0] != FILE_MAGIC
+        ):
+            print(f"Not a recording: {path}")
+            memory_map.close()
+            return False, None
+
+        result, index = FrameRecordingReader.__read_index(memory_map)
+        if not result:
+            print(f"Rebuilding index of recording that was not closed: {path}")
+            index = FrameRecordingReader.__rebuild_index(memory_map)
+
+        return True, FrameRecordingReader(cls.__create_key, memory_map, index)
+
+    def __init__(
+        self, class_private_create_key: object, memory_map: mmap.mmap, index: np.ndarray
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is FrameRecordingReader.__create_key, "Use create() method."
+
+        self.__memory_map = memory_map
+        self.__index = index
+
+    @property
+    def frame_count(self) -> int:
+        """
+        Frames in the recording.
+        """
+        return len(self.__index)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """
+        Timestamp of each frame in seconds.
+        """
+        return self.__index["timestamp"]
+
+    def read(self, index: int) -> "tuple[True, np.ndarray, float] | tuple[False, None, None]":
+        """
+        Raw frames are read only views of the file, valid until close() . JPEG frames are decoded.
+
+        index: Frame number.
+
+        Return: Success, image, timestamp.
+        """
+        if not 0 <= index < len(self.__index):
+            return False, None, None
+
+        entry = self.__index[index]
+        offset = int(entry["offset"])
+        size = int(entry["size"])
+        shape = (int(entry["height"]), int(entry["width"]))
+        if entry["channels"] > 0:
+            shape = (*shape, int(entry["channels"]))
+
+        data = np.frombuffer(self.__memory_map, np.uint8, size, offset)
+        if entry["encoding"] == FrameEncoding.JPEG.value:
+            flags = cv2.IMREAD_COLOR if entry["channels"] == 3 else cv2.IMREAD_GRAYSCALE
+            image = cv2.imdecode(data, flags)
+            if image is None:
+                return False, None, None
+
+            # Grayscale decodes without the channel axis of shape (height, width, 1)
+            image = image.reshape(shape)
+        else:
+            image = data.view(np.dtype(entry["dtype"].decode())).reshape(shape)
+
+        return True, image, float(entry["timestamp"])
+
+    def close(self) -> None:
+        """
+        Unmaps the file. Views returned by read() must be deleted first.
+        """
+        self.__memory_map.close()
+
+    @staticmethod
+    def __read_index(memory_map: mmap.mmap) -> "tuple[True, np.ndarray] | tuple[False, None]":
+        """
+        Index written on close.
+        """
+        if len(memory_map) < FILE_HEADER.size + TRAILER.size:
+            return False, None
+
+        index_offset, frame_count, magic = TRAILER.unpack_from(
+            memory_map, len(memory_map) - TRAILER.size
+        )
+        if magic != INDEX_MAGIC:
+            return False, None
+
+        if index_offset + frame_count * INDEX_DTYPE.itemsize + TRAILER.size != len(memory_map):
+            return False, None
+
+        # Copied, so the map can be closed while the index is in use
+        index = np.frombuffer(memory_map, INDEX_DTYPE, frame_count, index_offset).copy()
+        return True, index
+
+    @staticmethod
+    def __rebuild_index(memory_map: mmap.mmap) -> np.ndarray:
+        """
+        Index from the record headers, up to the first incomplete record.
+        """
+        entries = []
+        offset = FILE_HEADER.size
+        while offset + RECORD_HEADER.size <= len(memory_map):
+            (
+                magic,
+                frame_number,
+                timestamp,
+                height,
+                width,
+                channels,
+                dtype,
+                encoding,
+                size,
+            ) = RECORD_HEADER.unpack_from(memory_map, offset)
+            data_offset = offset + RECORD_HEADER.size
+            if magic != RECORD_MAGIC or data_offset + size > len(memory_map):
+                break
+
+            entries.append(
+                (
+                    frame_number,
+                    timestamp,
+                    data_offset,
+                    size,
+                    height,
+                    width,
+                    channels,
+                    dtype,
+                    encoding,
+                )
+            )
+            offset = data_offset + size + (-(RECORD_HEADER.size + size) % ALIGNMENT)
+
+        return np.array(entries, dtype=INDEX_DTYPE)
@@ -0,0 +1,318 @@
+"""
+Pool of frames in shared memory, so processes pass small descriptors instead of pickling images.
+"""
+
+import ctypes
+import multiprocessing
+import multiprocessing.shared_memory
+
+# Used in type annotation of lock parameters
+# pylint: disable-next=unused-import
+import multiprocessing.synchronize
+
+import numpy as np
+
+
+# Slots start on cache line boundaries
+ALIGNMENT = 64  # bytes
+
+
+class FrameDescriptor:
+    """
+    Refers to a frame in the pool. Small to pickle, pass it between processes instead of the image.
+    """
+
+    def __init__(
+        self, slot_id: int, shape: "tuple[int, ...]", dtype: str, timestamp: float
+    ) -> None:
+        """
+        slot_id: Index of the slot holding the image.
+        shape: Shape of the image.
+        dtype: NumPy dtype string of the image.
+        timestamp: Capture time.
+        """
+        self.slot_id = slot_id
+        self.shape = shape
+        self.dtype = dtype
+        self.timestamp = timestamp
+
+
+class FramePoolHandle:
+    """
+    Everything needed to attach to a pool. Pass to a child process when starting it (the lock can
+    only be pickled then).
+    """
+
+    # Layout of the pool is required
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        name: str,
+        slot_count: int,
+        shape: "tuple[int, ...]",
+        dtype: str,
+        lock: multiprocessing.synchronize.Lock,
+    ) -> None:
+        """
+        name: Name of the shared memory block.
+        slot_count: Number of frames.
+        shape: Shape of every frame.
+        dtype: NumPy dtype string of every frame.
+        lock: Guards reference counts.
+        """
+        self.name = name
+        self.slot_count = slot_count
+        self.shape = shape
+        self.dtype = dtype
+        self.lock = lock
+
+
+# Counters are exposed as attributes
+# pylint: disable-next=too-many-instance-attributes
+class SharedFramePool:
+    """
+    Fixed number of frame slots in one shared memory block, with a reference count per slot.
+    A slot is reused once every holder of its descriptor has released it.
+
+    The producer writes an image with write() and sends the descriptor to each consumer.
+    Consumers call view() for a zero-copy array and release() when done with it.
+    close() fails while arrays from view() are still referenced.
+
+    dropped_count: Images not written because every slot was in use (this process only).
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, slot_count: int, shape: "tuple[int, ...]", dtype: np.dtype | str = np.uint8
+    ) -> "tuple[True, SharedFramePool] | tuple[False, None]":
+        """
+        Allocates the shared memory. The creating process must call unlink() when done.
+
+        slot_count: Number of frames. Must cover frames queued and held by every consumer.
+        shape: Shape of every frame, e.g. (height, width, channels).
+        dtype: Type of every frame.
+
+        Return: Success, object.
+        """
+        if slot_count < 1:
+            return False, None
+
+        if len(shape) == 0 or min(shape) < 1:
+            return False, None
+
+        dtype = np.dtype(dtype).str
+        size = SharedFramePool.__reference_counts_size(slot_count) + slot_count * (
+            SharedFramePool.__slot_size(shape, dtype)
+        )
+
+        try:
+            shared_memory = multiprocessing.shared_memory.SharedMemory(create=True, size=size)
+        except OSError as exception:
+            print(f"Could not allocate shared memory: {exception}")
+            return False, None
+
+        handle = FramePoolHandle(
+            shared_memory.name, slot_count, tuple(shape), dtype, multiprocessing.Lock()
+        )
+        instance = SharedFramePool(cls.__create_key, shared_memory, handle)
+        instance.__reference_counts[:] = 0
+
+        return True, instance
+
+    @classmethod
+    def attach(cls, handle: FramePoolHandle) -> "tuple[True, SharedFramePool] | tuple[False, None]":
+        """
+        Attaches to a pool created by another process.
+
+        handle: From handle of the pool.
+
+        Return: Success, object.
+        """
+        try:
+            shared_memory = multiprocessing.shared_memory.SharedMemory(handle.name)
+        except OSError as exception:
+            print(f"Could not attach to shared memory: {exception}")
+            return False, None
+
+        return True, SharedFramePool(cls.__create_key, shared_memory, handle)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        shared_memory: multiprocessing.shared_memory.SharedMemory,
+        handle: FramePoolHandle,
+    ) -> None:
+        """
+        Private constructor, use create() or attach() method.
+        """
+        assert class_private_create_key is SharedFramePool.__create_key, "Use create() method."
+
+        self.__shared_memory = shared_memory
+        self.__handle = handle
+
+        reference_counts_size = SharedFramePool.__reference_counts_size(handle.slot_count)
+        slot_size = SharedFramePool.__slot_size(handle.shape, handle.dtype)
+
+        self.__reference_counts = np.ndarray((handle.slot_count,), np.int64, shared_memory.buf, 0)
+        self.__slot_offsets = [
+            reference_counts_size + slot_id * slot_size for slot_id in range(handle.slot_count)
+        ]
+        self.__slots = [
+            np.ndarray(handle.shape, handle.dtype, shared_memory.buf, offset)
+            for offset in self.__slot_offsets
+        ]
+        # Bytes of one frame, for views which keep the shared memory open
+        self.__frame_type = ctypes.c_ubyte * self.__slots[0].nbytes
+
+        # Where to start searching for a free slot, so slots are used in turn
+        self.__next_slot_id = 0
+
+        self.dropped_count = 0
+
+    @property
+    def handle(self) -> FramePoolHandle:
+        """
+        For attach() in another process.
+        """
+        return self.__handle
+
+    def write(
+        self, image: np.ndarray, timestamp: float, reference_count: int = 1
+    ) -> "tuple[True, FrameDescriptor] | tuple[False, None]":
+        """
+        Copies the image into a free slot.
+
+        image: Same shape as the pool, converted to its dtype.
+        timestamp: Capture time.
+        reference_count: Number of consumers the descriptor will be sent to.
+
+        Return: Success, descriptor. Fails if every slot is in use.
+        """
+        if image.shape != self.__handle.shape or reference_count < 1:
+            return False, None
+
+        result, slot_id = self.__claim(reference_count)
+        if not result:
+            self.dropped_count += 1
+            return False, None
+
+        # Claimed slot is not visible to anyone else until the descriptor is sent
+        np.copyto(self.__slots[slot_id], image, casting="unsafe")
+
+        return True, FrameDescriptor(slot_id, self.__handle.shape, self.__handle.dtype, timestamp)
+
+    def view(self, descriptor: FrameDescriptor) -> np.ndarray:
+        """
+        Read only array of the frame, without copying. Valid until the descriptor is released.
+        """
+        # NumPy does not hold a buffer export, but ctypes does, so close() fails while this
+        # array or any array derived from it is referenced instead of unmapping the memory
+        frame = self.__frame_type.from_buffer(
+            self.__shared_memory.buf, self.__slot_offsets[descriptor.slot_id]
+        )
+        image = np.frombuffer(frame, self.__handle.dtype).reshape(self.__handle.shape)
+        image.flags.writeable = False
+        return image
+
+    def add_reference(self, descriptor: FrameDescriptor, count: int = 1) -> bool:
+        """
+        For sending the descriptor to more consumers than given to write().
+
+        Return: Success. Fails if the frame was already released by every holder.
+        """
+        if count < 1:
+            return False
+
+        with self.__handle.lock:
+            if self.__reference_counts[descriptor.slot_id] == 0:
+                print(f"Slot {descriptor.slot_id} is free, the frame may have been overwritten.")
+                return False
+
+            self.__reference_counts[descriptor.slot_id] += count
+
+        return True
+
+    def release(self, descriptor: FrameDescriptor) -> bool:
+        """
+        Done with the frame. The slot is reused once all references are released.
+
+        Return: Success. Fails if the descriptor was released more times than it was referenced.
+        """
+        with self.__handle.lock:
+            if self.__reference_counts[descriptor.slot_id] == 0:
+                print(f"Slot {descriptor.slot_id} is already free.")
+                return False
+
+            self.__reference_counts[descriptor.slot_id] -= 1
+
+        return True
+
+    def free_slot_count(self) -> int:
+        """
+        Slots not referenced.
+        """
+        with self.__handle.lock:
+            return int(np.count_nonzero(self.__reference_counts == 0))
+
+    def close(self) -> bool:
+        """
+        Detaches from the shared memory.
+
+        Return: Success. Fails while arrays returned by view() are still referenced.
+        """
+        try:
+            self.__shared_memory.close()
+        except BufferError:
+            print("Frames are still viewed, delete the arrays from view() first.")
+            return False
+
+        self.__reference_counts = None
+        self.__slots = []
+
+        return True
+
+    def unlink(self) -> None:
+        """
+        Frees the shared memory once every process has closed it. Only call in the creating process.
+        """
+        self.__shared_memory.unlink()
+
+    def __claim(self, reference_count: int) -> "tuple[True, int] | tuple[False, None]":
+        """
+        Finds an unreferenced slot and sets its reference count.
+
+        Return: Success, slot id.
+        """
+        slot_count = self.__handle.slot_count
+        with self.__handle.lock:
+            for offset in range(slot_count):
+                slot_id = (self.__next_slot_id + offset) % slot_count
+                if self.__reference_counts[slot_id] == 0:
+                    self.__reference_counts[slot_id] = reference_count
+                    self.__next_slot_id = (slot_id + 1) % slot_count
+                    return True, slot_id
+
+        return False, None
+
+    @staticmethod
+    def __reference_counts_size(slot_count: int) -> int:
+        """
+        Bytes before the first slot.
+        """
+        return SharedFramePool.__align(slot_count * np.dtype(np.int64).itemsize)
+
+    @staticmethod
+    def __slot_size(shape: "tuple[int, ...]", dtype: str) -> int:
+        """
+        Bytes per slot.
+        """
+        return SharedFramePool.__align(int(np.prod(shape)) * np.dtype(dtype).itemsize)
+
+    @staticmethod
+    def __align(size: int) -> int:
+        """
+        Rounds up to the alignment.
+        """
+        return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
@@ -0,0 +1,190 @@
+"""
+Columnar container of many positions or locations, without an object for each.
+"""
+
+import operator
+from typing import Iterator
+
+import numpy as np
+
+
+class ColumnarArray:
+    """
+    Base of containers backed by a NumPy structured array with a float64 field for each attribute.
+    Columns are available as arrays, and slicing returns a view without copying.
+    Indexing and iteration give rows of the structured array, with the fields as attributes
+    (e.g. row.latitude), so no ELEMENT_CLASS object is created per element.
+    Subclasses set FIELDS and ELEMENT_CLASS.
+    """
+
+    FIELDS: "tuple[str, ...]" = ()
+    ELEMENT_CLASS: type = object
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, data: "np.ndarray | ColumnarArray"
+    ) -> "tuple[True, ColumnarArray] | tuple[False, None]":
+        """
+        data: Structured array with the fields, or array of shape (N, number of fields).
+            Structured arrays with the same dtype and containers of this type are not copied.
+
+        Return: Success, object.
+        """
+        if isinstance(data, cls):
+            return True, data
+
+        try:
+            data = np.asarray(data)
+        except (TypeError, ValueError):
+            return False, None
+
+        dtype = cls.get_dtype()
+
+        if data.dtype == dtype:
+            if data.ndim != 1:
+                return False, None
+
+            return True, cls(cls.__create_key, data)
+
+        if data.dtype.names is not None:
+            if set(data.dtype.names) != set(cls.FIELDS):
+                return False, None
+
+            converted = np.empty(len(data), dtype=dtype)
+            for field in cls.FIELDS:
+                converted[field] = data[field]
+
+            return True, cls(cls.__create_key, converted)
+
+        if data.ndim != 2 or data.shape[1] != len(cls.FIELDS):
+            return False, None
+
+        try:
+            converted = np.ascontiguousarray(data, dtype=np.float64).view(dtype).reshape(-1)
+        except (TypeError, ValueError):
+            return False, None
+
+        return True, cls(cls.__create_key, converted)
+
+    @classmethod
+    def create_empty(cls, length: int) -> "tuple[True, ColumnarArray] | tuple[False, None]":
+        """
+        length: Number of elements, initialized to 0.
+
+        Return: Success, object.
+        """
+        if length < 0:
+            return False, None
+
+        return True, cls(cls.__create_key, np.zeros(length, dtype=cls.get_dtype()))
+
+    @classmethod
+    def from_objects(cls, objects: list) -> "tuple[True, ColumnarArray] | tuple[False, None]":
+        """
+        objects: Instances of ELEMENT_CLASS (or anything with the attributes).
+
+        Return: Success, object.
+        """
+        getter = operator.attrgetter(*cls.FIELDS)
+        try:
+            values = list(map(getter, objects))
+            if len(cls.FIELDS) == 1:
+                values = [(value,) for value in values]
+
+            data = np.array(values, dtype=cls.get_dtype())
+        except (AttributeError, TypeError, ValueError):
+            return False, None
+
+        return True, cls(cls.__create_key, data)
+
+    @classmethod
+    def get_dtype(cls) -> np.dtype:
+        """
+        Structured dtype of the container.
+        """
+        return np.dtype([(field, np.float64) for field in cls.FIELDS])
+
+    def __init__(self, class_private_create_key: object, data: np.ndarray) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ColumnarArray.__create_key, "Use create() method."
+
+        self.data = data
+
+    def get(self, index: int) -> "tuple[True, object] | tuple[False, None]":
+        """
+        One element as ELEMENT_CLASS.
+
+        Return: Success, object.
+        """
+        try:
+            values = self.data[index].tolist()
+        except (IndexError, TypeError):
+            return False, None
+
+        return self.ELEMENT_CLASS.create(*values)
+
+    def to_objects(self) -> "tuple[True, list] | tuple[False, None]":
+        """
+        Converts to a list of ELEMENT_CLASS, for code which needs the objects.
+        Creates an object per element, prefer the columns.
+
+        Return: Success, objects.
+        """
+        create = self.ELEMENT_CLASS.create
+        objects = []
+        for values in self.data.tolist():
+            result, element = create(*values)
+            if not result:
+                return False, None
+
+            objects.append(element)
+
+        return True, objects
+
+    def to_array(self) -> np.ndarray:
+        """
+        Array of shape (N, number of fields) as float64. A view when the data is contiguous.
+        """
+        if self.data.flags.c_contiguous:
+            return self.data.view(np.float64).reshape(-1, len(self.FIELDS))
+
+        return np.column_stack([self.data[field] for field in self.FIELDS])
+
+    def __len__(self) -> int:
+        """
+        Number of elements.
+        """
+        return len(self.data)
+
+    def __getitem__(self, key: "int | slice | np.ndarray | list") -> "np.record | ColumnarArray":
+        """
+        Index returns one row, a view with the fields as attributes. Use get() for ELEMENT_CLASS.
+        Otherwise a subset of the same type: slices are views, index arrays and masks are copies.
+        """
+        if isinstance(key, (int, np.integer)):
+            return self.data.view(np.recarray)[key]
+
+        return self.__class__(ColumnarArray.__create_key, self.data[key])
+
+    def __iter__(self) -> Iterator[np.record]:
+        """
+        Rows with the fields as attributes, for code reading elements one at a time.
+        Prefer the columns for bulk processing.
+        """
+        return iter(self.data.view(np.recarray))
+
+    def __str__(self) -> str:
+        """
+        To string.
+        """
+        return f"{self.__class__}: {len(self)} elements"
+
+    def __repr__(self) -> str:
+        """
+        For collections (e.g. list).
+        """
+        return str(self)
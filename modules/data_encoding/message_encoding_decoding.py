@@ -4,13 +4,35 @@ Save first byte as char to represent which worker sent the message
 """
 
 import base64
+import operator
 import struct
 
 from .. import position_global
+from . import message_schema
 from . import worker_enum
 
 
-DATA_FORMAT = "=Bddd"  # 1 unsigned char + 3 doubles = 25 bytes
+def __create_schema() -> message_schema.MessageSchema:
+    """
+    Worker ID followed by the body, also registered for SchemaRegistry.
+    """
+    result, schema = message_schema.MessageSchema.create(
+        message_schema.MessageType.POSITION_GLOBAL,
+        "ddd",
+        operator.attrgetter("latitude", "longitude", "altitude"),
+        position_global.PositionGlobal.create,
+    )
+    if not result:
+        # Constant format, so this is a programming error
+        raise ValueError("Invalid PositionGlobal schema")
+
+    return schema
+
+
+SCHEMA = __create_schema()
+# 1 unsigned char + 3 doubles = 25 bytes, from SCHEMA so the format is defined once
+# Packed directly when encoding, as going through SCHEMA adds calls per message
+DATA_STRUCT = SCHEMA.worker_struct
 
 
 def encode_position_global(
@@ -34,8 +56,7 @@ def encode_position_global(
             return False, None
 
         # Encode message using PositionGlobal's latitude, longitude, altitude, with the worker ID in the front
-        packed_coordinates = struct.pack(
-            DATA_FORMAT,
+        packed_coordinates = DATA_STRUCT.pack(
             worker_id.value,
             global_position.latitude,
             global_position.longitude,
@@ -64,22 +85,4 @@ def decode_bytes_to_position_global(
     Returns:
         Tuple: success, WorkerEnum class corresponding to ID, PositionGlobal: Decoded PositionGlobal object.
     """
-    # Unpack the byte sequence
-    try:
-        # Decode base64
-        encoded_global_position = base64.b64decode(encoded_str)
-
-        # Ensure corect length
-        if len(encoded_global_position) != struct.calcsize(DATA_FORMAT):
-            return False, None, None
-
-        # Decode position global
-        unpacked_data = struct.unpack(DATA_FORMAT, encoded_global_position)
-        worker_id = worker_enum.WorkerEnum(unpacked_data[0])
-        latitude, longitude, altitude = unpacked_data[1], unpacked_data[2], unpacked_data[3]
-    except struct.error:
-        return False, None, None
-
-    # Create and return a PositionGlobal object
-    success, position = position_global.PositionGlobal.create(latitude, longitude, altitude)
-    return success, worker_id, position
+    return SCHEMA.decode_worker_message(encoded_str)
@@ -0,0 +1,491 @@
+"""
+Schema registry for inter-worker messages with precompiled struct codecs.
+Each message is the worker ID and message type followed by a fixed size body,
+so messages can be packed back to back into one buffer and decoded by a single dispatcher.
+"""
+
+import base64
+import binascii
+import enum
+import struct
+from typing import Callable
+
+from . import worker_enum
+
+
+class MessageType(enum.Enum):
+    """
+    Identifies the schema of a message body.
+    """
+
+    METADATA = 0
+    POSITION_GLOBAL = 1
+
+
+HEADER = struct.Struct("=BB")  # Worker ID, message type
+WORKER_HEADER_FORMAT = "=B"  # Worker ID only, used by the original STATUSTEXT formats
+
+# Avoids constructing the enum to look up each header
+WORKERS_BY_VALUE = {worker.value: worker for worker in worker_enum.WorkerEnum}
+
+
+# Bound methods are cached as attributes
+# pylint: disable-next=too-many-instance-attributes
+class MessageSchema:
+    """
+    Precompiled codec for one message type.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        message_type: MessageType,
+        body_format: str,
+        to_values: Callable[[object], tuple],
+        from_values: Callable[..., "tuple[bool, object]"],
+    ) -> "tuple[True, MessageSchema] | tuple[False, None]":
+        """
+        message_type: Identifies the schema in the header.
+        body_format: struct format of the body without byte order (e.g. "ddd"), no padding.
+        to_values: Converts the object to a tuple of values for the body.
+        from_values: Converts the values of the body back to the object, returns success and object.
+
+        Return: Success, object.
+        """
+        if not isinstance(message_type, MessageType):
+            print("Message type must be a MessageType.")
+            return False, None
+
+        try:
+            message_struct = struct.Struct(HEADER.format + body_format)
+            worker_struct = struct.Struct(WORKER_HEADER_FORMAT + body_format)
+        except struct.error as e:
+            print(f"Invalid body format: {e}.")
+            return False, None
+
+        return True, MessageSchema(
+            cls.__create_key, message_type, message_struct, worker_struct, to_values, from_values
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        message_type: MessageType,
+        message_struct: struct.Struct,
+        worker_struct: struct.Struct,
+        to_values: Callable[[object], tuple],
+        from_values: Callable[..., "tuple[bool, object]"],
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is MessageSchema.__create_key, "Use create() method."
+
+        self.message_type = message_type
+        self.size = message_struct.size
+        # STATUSTEXT format, for encoding inline where the call overhead matters
+        self.worker_struct = worker_struct
+
+        self.__struct = message_struct
+        self.__to_values = to_values
+        self.__from_values = from_values
+
+        # Bound methods and the enum value are looked up once instead of per message
+        self.__message_type_value = message_type.value
+        self.__pack_into = message_struct.pack_into
+        self.__unpack_from = message_struct.unpack_from
+        self.__worker_pack = worker_struct.pack
+        self.__worker_unpack = worker_struct.unpack
+        self.__worker_size = worker_struct.size
+
+    def pack_into(
+        self, buffer: bytearray, offset: int, worker_id: worker_enum.WorkerEnum, value: object
+    ) -> bool:
+        """
+        Writes the message into a preallocated buffer without allocating.
+
+        buffer: Writable buffer with at least size bytes after offset.
+        offset: Start of the message in the buffer.
+        worker_id: ID of the worker sending the message.
+        value: Object to encode.
+
+        Return: Success.
+        """
+        try:
+            self.__pack_into(
+                buffer, offset, worker_id.value, self.__message_type_value, *self.__to_values(value)
+            )
+        except (struct.error, AttributeError, TypeError, ValueError):
+            return False
+
+        return True
+
+    def unpack_from(
+        self, buffer: bytes, offset: int = 0
+    ) -> "tuple[True, worker_enum.WorkerEnum, object] | tuple[False, None, None]":
+        """
+        Reads the message at offset. The header is not checked, use SchemaRegistry.decode().
+
+        buffer: Contains the message.
+        offset: Start of the message in the buffer.
+
+        Return: Success, worker ID, object.
+        """
+        try:
+            values = self.__unpack_from(buffer, offset)
+        except struct.error:
+            return False, None, None
+
+        return self.__convert(values[0], values[2:])
+
+    def create_encoder(
+        self, worker_id: worker_enum.WorkerEnum
+    ) -> "tuple[True, MessageEncoder] | tuple[False, None]":
+        """
+        Encoder for messages of this type sent by the worker.
+
+        worker_id: ID of the worker sending the messages.
+
+        Return: Success, encoder.
+        """
+        return MessageEncoder.create(self.__struct, worker_id, self.message_type, self.__to_values)
+
+    def encode_worker_message(
+        self, worker_id: worker_enum.WorkerEnum, value: object
+    ) -> "tuple[True, bytes] | tuple[False, None]":
+        """
+        Encodes into base64 for a STATUSTEXT message, with only the worker ID as the header.
+
+        worker_id: ID of the worker sending the message.
+        value: Object to encode.
+
+        Return: Success, base64 encoded message.
+        """
+        if not isinstance(worker_id, worker_enum.WorkerEnum):
+            return False, None
+
+        try:
+            data = self.__worker_pack(worker_id.value, *self.__to_values(value))
+        except (struct.error, AttributeError, TypeError, ValueError):
+            return False, None
+
+        return True, base64.b64encode(data)
+
+    def decode_worker_message(
+        self, encoded_str: bytes
+    ) -> "tuple[True, worker_enum.WorkerEnum, object] | tuple[False, None, None]":
+        """
+        Decodes the output of encode_worker_message().
+
+        encoded_str: Base64 encoded message. The null terminator is dropped by STATUSTEXT.
+
+        Return: Success, worker ID, object.
+        """
+        try:
+            data = base64.b64decode(encoded_str)
+        except (binascii.Error, TypeError, ValueError):
+            return False, None, None
+
+        if len(data) != self.__worker_size:
+            return False, None, None
+
+        values = self.__worker_unpack(data)
+        return self.__convert(values[0], values[1:])
+
+    def __convert(
+        self, worker_value: int, values: tuple
+    ) -> "tuple[True, worker_enum.WorkerEnum, object] | tuple[False, None, None]":
+        """
+        Converts unpacked values to the worker ID and object.
+        """
+        worker_id = WORKERS_BY_VALUE.get(worker_value)
+        if worker_id is None:
+            return False, None, None
+
+        result, value = self.__from_values(*values)
+        if not result:
+            return False, None, None
+
+        return True, worker_id, value
+
+
+class MessageEncoder:
+    """
+    Schema bound to a worker, with the header resolved once for encoding many messages.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        message_struct: struct.Struct,
+        worker_id: worker_enum.WorkerEnum,
+        message_type: MessageType,
+        to_values: Callable[[object], tuple],
+    ) -> "tuple[True, MessageEncoder] | tuple[False, None]":
+        """
+        Use MessageSchema.create_encoder() or SchemaRegistry.create_encoder().
+
+        Return: Success, object.
+        """
+        if not isinstance(worker_id, worker_enum.WorkerEnum):
+            print("Worker ID must be a WorkerEnum.")
+            return False, None
+
+        return True, MessageEncoder(
+            cls.__create_key, message_struct, worker_id, message_type, to_values
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        message_struct: struct.Struct,
+        worker_id: worker_enum.WorkerEnum,
+        message_type: MessageType,
+        to_values: Callable[[object], tuple],
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is MessageEncoder.__create_key, "Use create() method."
+
+        self.worker_id = worker_id
+        self.message_type = message_type
+        self.size = message_struct.size
+
+        # Enum value is a property, read it once instead of per message
+        self.__header = (worker_id.value, message_type.value)
+        self.__pack_into = message_struct.pack_into
+        self.__to_values = to_values
+
+    def pack_into(
+        self, buffer: bytearray, offset: int, value: object
+    ) -> "tuple[True, int] | tuple[False, None]":
+        """
+        Writes the message into a preallocated buffer without allocating.
+
+        buffer: Writable buffer with at least size bytes after offset.
+        offset: Start of the message in the buffer.
+        value: Object to encode.
+
+        Return: Success, offset after the message.
+        """
+        try:
+            self.__pack_into(buffer, offset, *self.__header, *self.__to_values(value))
+        except (struct.error, AttributeError, TypeError, ValueError):
+            return False, None
+
+        return True, offset + self.size
+
+    def encode(self, value: object) -> "tuple[True, bytes] | tuple[False, None]":
+        """
+        Encodes one message.
+
+        value: Object to encode.
+
+        Return: Success, message.
+        """
+        buffer = bytearray(self.size)
+        result, _ = self.pack_into(buffer, 0, value)
+        if not result:
+            return False, None
+
+        return True, bytes(buffer)
+
+
+class SchemaRegistry:
+    """
+    Schemas keyed by worker ID and message type, with a decoder dispatching on the header.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, schemas: "list[MessageSchema] | None" = None
+    ) -> "tuple[True, SchemaRegistry] | tuple[False, None]":
+        """
+        schemas: Registered for all workers.
+
+        Return: Success, object.
+        """
+        instance = SchemaRegistry(cls.__create_key)
+
+        for schema in schemas or []:
+            if not instance.register(schema):
+                return False, None
+
+        return True, instance
+
+    def __init__(self, class_private_create_key: object) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is SchemaRegistry.__create_key, "Use create() method."
+
+        # Keyed by the raw header values so decoding is a single lookup
+        self.__schemas = {}
+
+    def register(
+        self, schema: MessageSchema, worker_id: worker_enum.WorkerEnum | None = None
+    ) -> bool:
+        """
+        Adds a schema, replacing any schema of the same type for the worker.
+
+        schema: Codec for the message type.
+        worker_id: Worker which sends the message. None registers for all workers.
+
+        Return: Success.
+        """
+        if not isinstance(schema, MessageSchema):
+            print("Schema must be a MessageSchema.")
+            return False
+
+        if worker_id is None:
+            workers = list(worker_enum.WorkerEnum)
+        elif isinstance(worker_id, worker_enum.WorkerEnum):
+            workers = [worker_id]
+        else:
+            print("Worker ID must be a WorkerEnum.")
+            return False
+
+        for worker in workers:
+            self.__schemas[(worker.value, schema.message_type.value)] = schema
+
+        return True
+
+    def get(
+        self, worker_id: worker_enum.WorkerEnum, message_type: MessageType
+    ) -> "tuple[True, MessageSchema] | tuple[False, None]":
+        """
+        Schema of a message type sent by the worker.
+
+        Return: Success, schema.
+        """
+        try:
+            schema = self.__schemas.get((worker_id.value, message_type.value))
+        except AttributeError:
+            return False, None
+
+        if schema is None:
+            return False, None
+
+        return True, schema
+
+    def create_encoder(
+        self, worker_id: worker_enum.WorkerEnum, message_type: MessageType
+    ) -> "tuple[True, MessageEncoder] | tuple[False, None]":
+        """
+        Encoder for repeatedly sending a message type, faster than encode() and encode_into().
+
+        worker_id: ID of the worker sending the messages.
+        message_type: Schema of the messages.
+
+        Return: Success, encoder.
+        """
+        result, schema = self.get(worker_id, message_type)
+        if not result:
+            return False, None
+
+        return schema.create_encoder(worker_id)
+
+    def encode(
+        self, worker_id: worker_enum.WorkerEnum, message_type: MessageType, value: object
+    ) -> "tuple[True, bytes] | tuple[False, None]":
+        """
+        Encodes one message.
+
+        worker_id: ID of the worker sending the message.
+        message_type: Schema of the message.
+        value: Object to encode.
+
+        Return: Success, message.
+        """
+        result, schema = self.get(worker_id, message_type)
+        if not result:
+            return False, None
+
+        buffer = bytearray(schema.size)
+        if not schema.pack_into(buffer, 0, worker_id, value):
+            return False, None
+
+        return True, bytes(buffer)
+
+    def encode_into(
+        self,
+        buffer: bytearray,
+        offset: int,
+        worker_id: worker_enum.WorkerEnum,
+        message_type: MessageType,
+        value: object,
+    ) -> "tuple[True, int] | tuple[False, None]":
+        """
+        Appends a message into a preallocated buffer, so many messages are sent at once.
+
+        buffer: Writable buffer.
+        offset: Start of the message in the buffer.
+        worker_id: ID of the worker sending the message.
+        message_type: Schema of the message.
+        value: Object to encode.
+
+        Return: Success, offset after the message.
+        """
+        result, schema = self.get(worker_id, message_type)
+        if not result:
+            return False, None
+
+        if not schema.pack_into(buffer, offset, worker_id, value):
+            return False, None
+
+        return True, offset + schema.size
+
+    def decode(
+        self, data: bytes, offset: int = 0
+    ) -> "tuple[True, worker_enum.WorkerEnum, MessageType, object, int] | tuple[False, None, None, None, None]":
+        """
+        Decodes the message at offset, with the schema identified by the header.
+
+        data: Contains the message.
+        offset: Start of the message.
+
+        Return: Success, worker ID, message type, object, offset after the message.
+        """
+        try:
+            schema = self.__schemas.get(HEADER.unpack_from(data, offset))
+        except struct.error:
+            return False, None, None, None, None
+
+        if schema is None:
+            return False, None, None, None, None
+
+        result, worker_id, value = schema.unpack_from(data, offset)
+        if not result:
+            return False, None, None, None, None
+
+        return True, worker_id, schema.message_type, value, offset + schema.size
+
+    def decode_all(
+        self, data: bytes
+    ) -> (
+        "tuple[True, list[tuple[worker_enum.WorkerEnum, MessageType, object]]] | tuple[False, None]"
+    ):
+        """
+        Decodes messages packed back to back (e.g. by encode_into()).
+
+        data: Messages.
+
+        Return: Success, worker ID, message type, and object of each message.
+        """
+        messages = []
+        offset = 0
+        while offset < len(data):
+            result, worker_id, message_type, value, offset = self.decode(data, offset)
+            if not result:
+                return False, None
+
+            messages.append((worker_id, message_type, value))
+
+        return True, messages
@@ -6,10 +6,31 @@ Save first byte as char to represent which worker sent the message
 import base64
 import struct
 
+from . import message_schema
 from . import worker_enum
 
 
-DATA_FORMAT = "=Bi"  # 1 unsigned char + 1 int = 5 bytes
+def __create_schema() -> message_schema.MessageSchema:
+    """
+    Worker ID followed by the body, also registered for SchemaRegistry.
+    """
+    result, schema = message_schema.MessageSchema.create(
+        message_schema.MessageType.METADATA,
+        "i",
+        lambda number_of_messages: (number_of_messages,),
+        lambda number_of_messages: (True, number_of_messages),
+    )
+    if not result:
+        # Constant format, so this is a programming error
+        raise ValueError("Invalid metadata schema")
+
+    return schema
+
+
+SCHEMA = __create_schema()
+# 1 unsigned char + 1 int = 5 bytes, from SCHEMA so the format is defined once
+# Packed directly when encoding, as going through SCHEMA adds calls per message
+DATA_STRUCT = SCHEMA.worker_struct
 
 
 def encode_metadata(
@@ -33,8 +54,7 @@ def encode_metadata(
             return False, None
 
         # Encode message using PositionGlobal's latitude, longitude, altitude, with the worker ID in the front
-        packed_metadata = struct.pack(
-            DATA_FORMAT,
+        packed_metadata = DATA_STRUCT.pack(
             worker_id.value,
             number_of_messages,
         )
@@ -59,21 +79,4 @@ def decode_metadata(
     Returns:
         Tuple: success, WorkerEnum member instance corresponding to ID, number of messages received as an integer.
     """
-    # Unpack the byte sequence
-    try:
-        # Decode base64
-        encoded_metadata = base64.b64decode(encoded_str)
-
-        # Ensure correct length (note the null terminator gets automatically dropped by STATUSTEXT)
-        if len(encoded_metadata) != struct.calcsize(DATA_FORMAT):
-            return False, None, None
-
-        # unpack returns tuple (unsigned char,) so [0] is needed
-        unpacked_data = struct.unpack(DATA_FORMAT, encoded_metadata)
-        worker_id = worker_enum.WorkerEnum(unpacked_data[0])
-        number_of_messages = unpacked_data[1]
-    except struct.error:
-        return False, None, None
-
-    # Create and return a PositionGlobal object
-    return True, worker_id, number_of_messages
+    return SCHEMA.decode_worker_message(encoded_str)
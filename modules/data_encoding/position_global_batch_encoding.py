@@ -0,0 +1,259 @@
+"""
+Encoding and Decoding many Global Positions in one payload.
+First byte is the worker which sent the message, second byte is the position format,
+then 2 bytes of chunk index when split into STATUSTEXT messages.
+Positions follow as little-endian records of latitude, longitude, altitude.
+"""
+
+import base64
+import enum
+import struct
+
+import numpy as np
+
+from .. import position_global
+from . import worker_enum
+
+
+class PositionFormat(enum.Enum):
+    """
+    Encoding of each position. Smaller formats fit more positions into each STATUSTEXT.
+    """
+
+    FLOAT64 = 0  # 24 bytes, exact
+    FLOAT32 = 1  # 12 bytes, about 1 m resolution for latitude and longitude
+    SCALED_INT32 = 2  # 12 bytes, 1e-7 degrees (about 1 cm) and millimetres like MAVLink
+
+
+# Worker ID, position format, chunk index (modulo 2^16)
+# 4 bytes keeps records aligned and chunks a multiple of the base85 group size
+HEADER = struct.Struct("<BBH")
+
+RECORD_DTYPES = {
+    PositionFormat.FLOAT64: np.dtype("<f8"),
+    PositionFormat.FLOAT32: np.dtype("<f4"),
+    PositionFormat.SCALED_INT32: np.dtype("<i4"),
+}
+
+# Latitude, longitude, altitude are multiplied by these for SCALED_INT32
+SCALE = np.array([1e7, 1e7, 1e3])
+
+STATUS_TEXT_LENGTH = 50  # Characters in a STATUSTEXT message
+# Base85 encodes 4 bytes as 5 characters, fitting more than base64 (3 bytes as 4 characters)
+STATUS_TEXT_PAYLOAD_SIZE = STATUS_TEXT_LENGTH // 5 * 4
+
+
+def positions_to_array(
+    positions: "list[position_global.PositionGlobal] | position_global.PositionGlobalArray | np.ndarray",
+) -> "tuple[True, np.ndarray] | tuple[False, None]":
+    """
+    Converts positions to an array with a row of latitude, longitude, altitude for each.
+
+    positions: PositionGlobal objects, PositionGlobalArray, or an array of shape (N, 3).
+
+    Return: Success, array of shape (N, 3) as float64.
+    """
+    if isinstance(positions, position_global.PositionGlobalArray):
+        array = positions.to_array()
+    elif isinstance(positions, np.ndarray):
+        array = positions.astype(np.float64, copy=False)
+    else:
+        try:
+            array = np.array(
+                [
+                    (position.latitude, position.longitude, position.altitude)
+                    for position in positions
+                ],
+                dtype=np.float64,
+            )
+        except (AttributeError, TypeError, ValueError):
+            return False, None
+
+        array = array.reshape(-1, 3)
+
+    if array.ndim != 2 or array.shape[1] != 3:
+        return False, None
+
+    return True, array
+
+
+def array_to_positions(
+    array: np.ndarray,
+) -> "tuple[True, list[position_global.PositionGlobal]] | tuple[False, None]":
+    """
+    Converts an array with a row of latitude, longitude, altitude for each position to objects.
+
+    array: Shape (N, 3).
+
+    Return: Success, PositionGlobal objects.
+    """
+    positions = []
+    for latitude, longitude, altitude in array.tolist():
+        result, position = position_global.PositionGlobal.create(latitude, longitude, altitude)
+        if not result:
+            return False, None
+
+        positions.append(position)
+
+    return True, positions
+
+
+def encode_position_global_batch(
+    worker_id: worker_enum.WorkerEnum,
+    positions: "list[position_global.PositionGlobal] | position_global.PositionGlobalArray | np.ndarray",
+    position_format: PositionFormat = PositionFormat.SCALED_INT32,
+) -> "tuple[True, bytes] | tuple[False, None]":
+    """
+    Encode many positions into bytes.
+
+    worker_id: ID of the worker defined by its constant in WorkerEnum.
+    positions: PositionGlobal objects, or an array of shape (N, 3) of latitude, longitude, altitude.
+    position_format: Encoding of each position.
+
+    Return: Success, header followed by the positions.
+    """
+    if not isinstance(worker_id, worker_enum.WorkerEnum):
+        return False, None
+
+    if not isinstance(position_format, PositionFormat):
+        return False, None
+
+    result, array = positions_to_array(positions)
+    if not result:
+        return False, None
+
+    result, records = __encode_records(array, position_format)
+    if not result:
+        return False, None
+
+    return True, HEADER.pack(worker_id.value, position_format.value, 0) + records.tobytes()
+
+
+def decode_position_global_batch(
+    data: bytes,
+) -> "tuple[True, worker_enum.WorkerEnum, np.ndarray] | tuple[False, None, None]":
+    """
+    Decode bytes into positions, without creating an object for each.
+    Use array_to_positions() to get PositionGlobal objects.
+
+    data: Encoded by encode_position_global_batch().
+
+    Return: Success, worker ID, array of shape (N, 3) of latitude, longitude, altitude as float64.
+    """
+    if len(data) < HEADER.size:
+        return False, None, None
+
+    worker_value, format_value, _ = HEADER.unpack_from(data)
+    try:
+        worker_id = worker_enum.WorkerEnum(worker_value)
+        position_format = PositionFormat(format_value)
+    except ValueError:
+        return False, None, None
+
+    dtype = RECORD_DTYPES[position_format]
+    record_size = dtype.itemsize * 3
+    if (len(data) - HEADER.size) % record_size != 0:
+        return False, None, None
+
+    array = np.frombuffer(data, dtype=dtype, offset=HEADER.size).reshape(-1, 3)
+    if position_format == PositionFormat.SCALED_INT32:
+        array = array / SCALE
+    else:
+        array = array.astype(np.float64)
+
+    return True, worker_id, array
+
+
+def encode_position_global_status_texts(
+    worker_id: worker_enum.WorkerEnum,
+    positions: "list[position_global.PositionGlobal] | position_global.PositionGlobalArray | np.ndarray",
+    position_format: PositionFormat = PositionFormat.SCALED_INT32,
+) -> "tuple[True, list[str]] | tuple[False, None]":
+    """
+    Encode positions into as few STATUSTEXT strings as possible.
+    Each string can be decoded on its own, so a lost message only loses its positions.
+
+    worker_id: ID of the worker defined by its constant in WorkerEnum.
+    positions: PositionGlobal objects, or an array of shape (N, 3) of latitude, longitude, altitude.
+    position_format: Encoding of each position.
+
+    Return: Success, strings of at most STATUS_TEXT_LENGTH characters.
+    """
+    if not isinstance(worker_id, worker_enum.WorkerEnum):
+        return False, None
+
+    if not isinstance(position_format, PositionFormat):
+        return False, None
+
+    result, array = positions_to_array(positions)
+    if not result:
+        return False, None
+
+    result, records = __encode_records(array, position_format)
+    if not result:
+        return False, None
+
+    record_size = records.itemsize * 3
+    positions_per_chunk = (STATUS_TEXT_PAYLOAD_SIZE - HEADER.size) // record_size
+    chunk_size = HEADER.size + positions_per_chunk * record_size
+    chunk_count = -(-len(records) // positions_per_chunk)
+
+    # Lay out all chunks in one buffer and encode it at once, which is much faster than
+    # encoding each chunk, and gives the same text as each chunk is a multiple of 4 bytes
+    chunks = np.zeros((chunk_count, chunk_size), dtype=np.uint8)
+    chunks[:, 0] = worker_id.value
+    chunks[:, 1] = position_format.value
+    chunks[:, 2:4] = (np.arange(chunk_count) % 2**16).astype("<u2").view(np.uint8).reshape(-1, 2)
+
+    padded_records = np.zeros((chunk_count * positions_per_chunk, 3), dtype=records.dtype)
+    padded_records[: len(records)] = records
+    chunks[:, HEADER.size :] = padded_records.view(np.uint8).reshape(chunk_count, -1)
+
+    padding_size = (len(padded_records) - len(records)) * record_size
+    data = chunks.tobytes()[: chunks.nbytes - padding_size]
+    encoded = base64.b85encode(data).decode("ascii")
+
+    chunk_length = chunk_size // 4 * 5
+    texts = [
+        encoded[start : start + chunk_length] for start in range(0, len(encoded), chunk_length)
+    ]
+
+    return True, texts
+
+
+def decode_position_global_status_text(
+    text: str,
+) -> "tuple[True, worker_enum.WorkerEnum, np.ndarray] | tuple[False, None, None]":
+    """
+    Decode one STATUSTEXT string from encode_position_global_status_texts().
+
+    text: Content of the STATUSTEXT message.
+
+    Return: Success, worker ID, array of shape (N, 3) of latitude, longitude, altitude as float64.
+    """
+    try:
+        data = base64.b85decode(text)
+    except ValueError:
+        return False, None, None
+
+    return decode_position_global_batch(data)
+
+
+def __encode_records(
+    array: np.ndarray, position_format: PositionFormat
+) -> "tuple[True, np.ndarray] | tuple[False, None]":
+    """
+    Converts positions of shape (N, 3) to the record type of the format.
+    """
+    if not np.all(np.isfinite(array)):
+        return False, None
+
+    if position_format != PositionFormat.SCALED_INT32:
+        return True, array.astype(RECORD_DTYPES[position_format])
+
+    scaled = np.rint(array * SCALE)
+    limits = np.iinfo(np.int32)
+    if np.any(scaled < limits.min) or np.any(scaled > limits.max):
+        return False, None
+
+    return True, scaled.astype(RECORD_DTYPES[position_format])
@@ -2,40 +2,269 @@
 Module to convert ground locations list to kml document.
 """
 
+import itertools
+import operator
 import pathlib
+import shutil
 import time
+from typing import Iterable
 
-import simplekml
-import simplekml.base
+import numpy as np
 
+from . import kml_decimation
+from . import kml_writer
 from .. import location_global
 from .. import position_global_relative_altitude
 
 
-def __save_kml_file(
-    kml: simplekml.Kml, document_name_prefix: str, save_directory: pathlib.Path
-) -> tuple[True, pathlib.Path] | tuple[False, None]:
+# Tile size on screen for its file to be loaded, smaller tiles show the overview instead
+TILE_MIN_LOD_PIXELS = 128
+
+# Placemarks of each tile in the overview, spread evenly through the tile
+OVERVIEW_PLACEMARKS_PER_TILE = 16
+
+
+def __create_kml_file(
+    document_name_prefix: str, save_directory: pathlib.Path, is_tiled: bool
+) -> "tuple[True, pathlib.Path, pathlib.Path | None] | tuple[False, None, None]":
+    """
+    Creates an empty timestamped KML file in the directory, and its tile directory if tiled.
+    A number is added to the name if it is already taken (e.g. by a call in the same second),
+    so earlier files are never overwritten.
+
+    Return: Success, path to the KML file, path to the tile directory or None.
+    """
+    name = f"{document_name_prefix}_{int(time.time())}"
+    for attempt in itertools.count():
+        stem = name if attempt == 0 else f"{name}_{attempt}"
+        kml_file_path = pathlib.Path(save_directory, f"{stem}.kml")
+        try:
+            kml_file_path.touch(exist_ok=False)
+        except FileExistsError:
+            continue
+        except OSError as exception:
+            print(f"Error while creating KML file: {exception}")
+            return False, None, None
+
+        if not is_tiled:
+            return True, kml_file_path, None
+
+        tile_directory = pathlib.Path(save_directory, f"{stem}_tiles")
+        try:
+            tile_directory.mkdir()
+        except FileExistsError:
+            kml_file_path.unlink()
+            continue
+        except OSError as exception:
+            print(f"Error while creating tile directory: {exception}")
+            kml_file_path.unlink()
+            return False, None, None
+
+        return True, kml_file_path, tile_directory
+
+    # Unreachable, the loop only ends by returning
+    return False, None, None
+
+
+def __unzip_placemarks(
+    placemarks: "Iterable[tuple[str, float, float, float]]",
+) -> "tuple[list[tuple[str, float, float, float]], np.ndarray]":
+    """
+    Placemarks as a list, and their latitude, longitude, altitude as an array of shape (N, 3).
+    """
+    placemarks = list(placemarks)
+    coordinates = np.array([placemark[1:] for placemark in placemarks], dtype=np.float64).reshape(
+        -1, 3
+    )
+
+    return placemarks, coordinates
+
+
+def __write_tile_file(
+    path: pathlib.Path, placemarks: "Iterable[tuple[str, float, float, float]]"
+) -> "tuple[True, int] | tuple[False, None]":
+    """
+    Writes the placemarks of one tile to their own file.
+
+    Return: Success, number of placemarks written.
+    """
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        result, writer = kml_writer.KmlWriter.create(file)
+        if not result:
+            return False, None
+
+        result, count = writer.write_placemarks(placemarks)
+        if not result:
+            return False, None
+
+        if not writer.close():
+            return False, None
+
+    return True, count
+
+
+def __write_tiles(
+    writer: kml_writer.KmlWriter,
+    placemarks: "Iterable[tuple[str, float, float, float]]",
+    tile_size: float,
+    tile_directory: pathlib.Path,
+) -> "tuple[True, int] | tuple[False, None]":
+    """
+    Writes the placemarks of each tile of the latitude and longitude grid to a file in the tile
+    directory. The document gets a link to each file with a region, so viewers only load tiles
+    in view, and an overview of each tile shown until it is large enough on screen.
+    Tiles are in order of south to north then west to east.
+
+    Return: Success, number of placemarks written to the tile files.
+    """
+    placemarks, coordinates = __unzip_placemarks(placemarks)
+    if len(placemarks) == 0:
+        return True, 0
+
+    # Points on the north pole or the antimeridian are in the last tile
+    rows = np.minimum(
+        np.floor((coordinates[:, 0] + 90.0) / tile_size), np.ceil(180.0 / tile_size) - 1
+    ).astype(np.int64)
+    columns = np.minimum(
+        np.floor((coordinates[:, 1] + 180.0) / tile_size), np.ceil(360.0 / tile_size) - 1
+    ).astype(np.int64)
+
+    order = np.lexsort((columns, rows))
+    is_new_tile = (np.diff(rows[order]) != 0) | (np.diff(columns[order]) != 0)
+    boundaries = np.flatnonzero(is_new_tile) + 1
+
+    count = 0
+    for tile in np.split(order, boundaries):
+        row = int(rows[tile[0]])
+        column = int(columns[tile[0]])
+        name = f"Tile {row} {column}"
+        south = -90.0 + row * tile_size
+        west = -180.0 + column * tile_size
+        bounds = (min(south + tile_size, 90.0), south, min(west + tile_size, 180.0), west)
+
+        tile_file_name = f"tile_{row}_{column}.kml"
+        result, tile_count = __write_tile_file(
+            pathlib.Path(tile_directory, tile_file_name), (placemarks[i] for i in tile.tolist())
+        )
+        if not result:
+            return False, None
+
+        overview = np.unique(
+            np.linspace(0, len(tile) - 1, min(len(tile), OVERVIEW_PLACEMARKS_PER_TILE)).round()
+        ).astype(np.int64)
+        if not writer.begin_folder(f"{name} overview", *bounds, 0, TILE_MIN_LOD_PIXELS):
+            return False, None
+
+        result, _ = writer.write_placemarks(placemarks[i] for i in tile[overview].tolist())
+        if not result:
+            return False, None
+
+        if not writer.end_folder():
+            return False, None
+
+        if not writer.write_network_link(
+            name, f"{tile_directory.name}/{tile_file_name}", *bounds, TILE_MIN_LOD_PIXELS
+        ):
+            return False, None
+
+        count += tile_count
+
+    return True, count
+
+
+def __grid_bin_placemarks(
+    placemarks: "Iterable[tuple[str, float, float, float]]", grid_cell_size: float
+) -> "tuple[True, list[tuple[str, float, float, float]]] | tuple[False, None]":
+    """
+    First placemark in each grid cell.
+    """
+    placemarks, coordinates = __unzip_placemarks(placemarks)
+
+    result, indices = kml_decimation.grid_bin(coordinates[:, 0], coordinates[:, 1], grid_cell_size)
+    if not result:
+        return False, None
+
+    return True, [placemarks[i] for i in indices.tolist()]
+
+
+def __simplify_track_placemarks(
+    placemarks: "Iterable[tuple[str, float, float, float]]", track_tolerance: float
+) -> "tuple[True, list[tuple[str, float, float, float]]] | tuple[False, None]":
     """
-    Save KML to the directory.
+    Placemarks of the vertices kept by Douglas-Peucker.
     """
-    current_time = time.time()
-    kml_file_path = pathlib.Path(save_directory, f"{document_name_prefix}_{int(current_time)}.kml")
+    placemarks, coordinates = __unzip_placemarks(placemarks)
+
+    result, indices = kml_decimation.douglas_peucker(
+        coordinates[:, 0], coordinates[:, 1], coordinates[:, 2], track_tolerance
+    )
+    if not result:
+        return False, None
+
+    return True, [placemarks[i] for i in indices.tolist()]
+
 
+def placemarks_to_kml(
+    placemarks: "Iterable[tuple[str, float, float, float]]",
+    document_name_prefix: str,
+    save_directory: pathlib.Path,
+    tile_size: "float | None" = None,
+) -> "tuple[True, pathlib.Path] | tuple[False, None]":
+    """
+    Streams placemarks to a KML file, so the document is never held in memory.
+
+    placemarks: Name, latitude, longitude, relative altitude. Any iterable, consumed once.
+    document_name_prefix: Name of the KML file to save (without the timestamp or .kml extension).
+    save_directory: Parent directory to save the KML file to.
+    tile_size: If provided, placemarks are split into a file per tile of this many degrees
+        square, in a directory named after the KML file with a _tiles suffix. The KML file links
+        to each tile with a region, so viewers only load the tiles in view, and holds an overview
+        of a few placemarks per tile for zoomed out views. The placemarks are then held in memory
+        to group them.
+
+    Return: Success, path to the KML file.
+    """
+    if tile_size is not None and tile_size <= 0.0:
+        return False, None
+
+    result, kml_file_path, tile_directory = __create_kml_file(
+        document_name_prefix, save_directory, tile_size is not None
+    )
+    if not result:
+        return False, None
+
+    count = 0
     try:
-        kml.save(str(kml_file_path))
-    # Required for catching library exceptions
-    # pylint: disable-next=broad-exception-caught
-    except Exception as exception:
+        with open(kml_file_path, "w", encoding="utf-8", newline="\n") as file:
+            result, writer = kml_writer.KmlWriter.create(file)
+            if result and tile_directory is not None:
+                result, count = __write_tiles(writer, placemarks, tile_size, tile_directory)
+            elif result:
+                result, count = writer.write_placemarks(placemarks)
+
+            if result:
+                result = writer.close()
+    except OSError as exception:
         print(f"Error while saving KML file: {exception}")
+        result = False
+
+    if not result or count == 0:
+        # Both were created by this call
+        kml_file_path.unlink(missing_ok=True)
+        if tile_directory is not None:
+            shutil.rmtree(tile_directory, ignore_errors=True)
+
         return False, None
 
     return True, kml_file_path
 
 
 def named_positions_to_kml(
-    named_positions: list[position_global_relative_altitude.NamedPositionGlobalRelativeAltitude],
+    named_positions: "Iterable[position_global_relative_altitude.NamedPositionGlobalRelativeAltitude]",
     document_name_prefix: str,
     save_directory: pathlib.Path,
+    grid_cell_size: "float | None" = None,
+    tile_size: "float | None" = None,
 ) -> tuple[True, pathlib.Path] | tuple[False, None]:
     """
     Generates a KML file from a list of ground locations.
@@ -43,69 +272,65 @@ def named_positions_to_kml(
     named_positions: Positions with names.
     document_name_prefix: Name of the KML file to save (without the timestamp or .kml extension).
     save_directory: Parent directory to save the KML file to.
+    grid_cell_size: If provided, only the first position in each grid cell of this many metres
+        square is kept.
+    tile_size: If provided, positions are split into files per tile of this many degrees square
+        (see placemarks_to_kml()).
 
     Return: Success, path to the KML file.
     """
-    if len(named_positions) == 0:
-        return False, None
-
-    # Force KML ID reset for determinism
-    # pylint: disable-next=protected-access
-    simplekml.base.Kmlable._globalid = 0
+    getter = operator.attrgetter("name", "latitude", "longitude", "relative_altitude")
+    placemarks = map(getter, named_positions)
 
-    kml = simplekml.Kml()
-
-    for named_position in named_positions:
-        name = named_position.name
-        latitude = named_position.latitude
-        longitude = named_position.longitude
-        relative_altitude = named_position.relative_altitude
-
-        # Coordinates are in the order: longitude, latitude, optional height
-        kml.newpoint(name=name, coords=[(longitude, latitude, relative_altitude)])
+    if grid_cell_size is not None:
+        result, placemarks = __grid_bin_placemarks(placemarks, grid_cell_size)
+        if not result:
+            return False, None
 
-    return __save_kml_file(kml, document_name_prefix, save_directory)
+    return placemarks_to_kml(placemarks, document_name_prefix, save_directory, tile_size)
 
 
 def positions_to_kml(
-    positions: list[position_global_relative_altitude.PositionGlobalRelativeAltitude],
+    positions: "Iterable[position_global_relative_altitude.PositionGlobalRelativeAltitude]",
     document_name_prefix: str,
     save_directory: pathlib.Path,
+    track_tolerance: "float | None" = None,
+    tile_size: "float | None" = None,
 ) -> "tuple[bool, pathlib.Path | None]":
     """
-    Converts positions to named positions with enumerated name and calls named_positions_to_kml.
+    Generates a KML file with positions named by their index.
 
     positions: Positions without names.
     document_name_prefix: Name of the KML file to save (without the timestamp or .kml extension).
     save_directory: Parent directory to save the KML file to.
+    track_tolerance: If provided, the positions are a track simplified with Douglas-Peucker so
+        that no removed position is more than this many metres from it. Names are still the
+        index in the original positions.
+    tile_size: If provided, positions are split into files per tile of this many degrees square
+        (see placemarks_to_kml()).
 
     Return: Success, path to the KML file.
     """
-    named_positions = []
-    for i, position in enumerate(positions):
-        result, named_position = (
-            position_global_relative_altitude.NamedPositionGlobalRelativeAltitude.create(
-                str(i), position.latitude, position.longitude, position.relative_altitude
-            )
-        )
+    placemarks = (
+        (str(i), position.latitude, position.longitude, position.relative_altitude)
+        for i, position in enumerate(positions)
+    )
+
+    if track_tolerance is not None:
+        result, placemarks = __simplify_track_placemarks(placemarks, track_tolerance)
         if not result:
             return False, None
 
-        # Get Pylance to stop complaining
-        assert named_position is not None
-
-        named_positions.append(named_position)
-
-    return named_positions_to_kml(named_positions, document_name_prefix, save_directory)
+    return placemarks_to_kml(placemarks, document_name_prefix, save_directory, tile_size)
 
 
 def named_locations_to_kml(
-    named_locations: list[location_global.NamedLocationGlobal],
+    named_locations: "Iterable[location_global.NamedLocationGlobal]",
     document_name_prefix: str,
     save_directory: pathlib.Path,
 ) -> tuple[True, pathlib.Path] | tuple[False, None]:
     """
-    Converts named locations to named positions and calls named_positions_to_kml.
+    Generates a KML file from named locations with altitude 0.0.
 
     named_locations: Locations with names.
     document_name_prefix: Name of the KML file to save (without the timestamp or .kml extension).
@@ -113,31 +338,20 @@ def named_locations_to_kml(
 
     Return: Success, path to the KML file.
     """
-    named_positions = []
-    for named_location in named_locations:
-        result, named_position = (
-            position_global_relative_altitude.NamedPositionGlobalRelativeAltitude.create(
-                named_location.name, named_location.latitude, named_location.longitude, 0.0
-            )
-        )
-        if not result:
-            return False, None
-
-        # Get Pylance to stop complaining
-        assert named_position is not None
-
-        named_positions.append(named_position)
-
-    return named_positions_to_kml(named_positions, document_name_prefix, save_directory)
+    placemarks = (
+        (named_location.name, named_location.latitude, named_location.longitude, 0.0)
+        for named_location in named_locations
+    )
+    return placemarks_to_kml(placemarks, document_name_prefix, save_directory)
 
 
 def locations_to_kml(
-    locations: list[location_global.LocationGlobal],
+    locations: "Iterable[location_global.LocationGlobal]",
     document_name_prefix: str,
     save_directory: pathlib.Path,
 ) -> "tuple[bool, pathlib.Path | None]":
     """
-    Converts locations to named positions with enumerated name and altitude 0.0 and calls named_positions_to_kml.
+    Generates a KML file with locations named by their index and altitude 0.0.
 
     locations: Locations without names.
     document_name_prefix: Name of the KML file to save (without the timestamp or .kml extension).
@@ -145,19 +359,7 @@ def locations_to_kml(
 
     Return: Success, path to the KML file.
     """
-    named_positions = []
-    for i, location in enumerate(locations):
-        result, named_position = (
-            position_global_relative_altitude.NamedPositionGlobalRelativeAltitude.create(
-                str(i), location.latitude, location.longitude, 0.0
-            )
-        )
-        if not result:
-            return False, None
-
-        # Get Pylance to stop complaining
-        assert named_position is not None
-
-        named_positions.append(named_position)
-
-    return named_positions_to_kml(named_positions, document_name_prefix, save_directory)
+    placemarks = (
+        (str(i), location.latitude, location.longitude, 0.0) for i, location in enumerate(locations)
+    )
+    return placemarks_to_kml(placemarks, document_name_prefix, save_directory)
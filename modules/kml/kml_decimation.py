@@ -0,0 +1,115 @@
+"""
+Reduces the number of points written to KML while keeping the shape of tracks and point sets.
+Distances are in metres on a local equirectangular projection, accurate over a flight area.
+"""
+
+import numpy as np
+
+
+EARTH_RADIUS = 6371008.8  # m
+
+
+def __project(
+    latitudes: np.ndarray, longitudes: np.ndarray, reference_latitude: float
+) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    North and east in metres, scaled at the reference latitude.
+    """
+    north = np.radians(latitudes) * EARTH_RADIUS
+    east = np.radians(longitudes) * EARTH_RADIUS * np.cos(np.radians(reference_latitude))
+    return north, east
+
+
+def douglas_peucker(
+    latitudes: np.ndarray, longitudes: np.ndarray, altitudes: np.ndarray, tolerance: float
+) -> "tuple[True, np.ndarray] | tuple[False, None]":
+    """
+    Keeps the vertices of a track needed so that no removed vertex is farther than the tolerance
+    from the simplified track. The first and last vertices are always kept.
+
+    latitudes, longitudes: Decimal degrees.
+    altitudes: Metres, included in the distance.
+    tolerance: Metres.
+
+    Return: Success, indices of the kept vertices in increasing order.
+    """
+    if tolerance < 0.0:
+        return False, None
+
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    altitudes = np.asarray(altitudes, dtype=np.float64)
+    if not latitudes.shape == longitudes.shape == altitudes.shape or latitudes.ndim != 1:
+        return False, None
+
+    count = len(latitudes)
+    if count <= 2:
+        return True, np.arange(count)
+
+    north, east = __project(latitudes, longitudes, float(latitudes[0]))
+    points = np.column_stack([north, east, altitudes])
+
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = True
+    keep[-1] = True
+
+    # Explicit stack, tracks are too long for recursion
+    stack = [(0, count - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        segment_start = points[start]
+        segment = points[end] - segment_start
+        offsets = points[start + 1 : end] - segment_start
+
+        # Distance to the segment, not the infinite line
+        length_squared = float(segment @ segment)
+        if length_squared > 0.0:
+            fractions = np.clip(offsets @ segment / length_squared, 0.0, 1.0)
+            offsets = offsets - fractions[:, np.newaxis] * segment
+
+        distances_squared = np.einsum("ij,ij->i", offsets, offsets)
+        farthest = int(np.argmax(distances_squared))
+        if distances_squared[farthest] <= tolerance * tolerance:
+            continue
+
+        index = start + 1 + farthest
+        keep[index] = True
+        stack.append((start, index))
+        stack.append((index, end))
+
+    return True, np.flatnonzero(keep)
+
+
+def grid_bin(
+    latitudes: np.ndarray, longitudes: np.ndarray, cell_size: float
+) -> "tuple[True, np.ndarray] | tuple[False, None]":
+    """
+    Keeps the first point in each square grid cell, for point sets such as detected targets.
+
+    latitudes, longitudes: Decimal degrees.
+    cell_size: Side of a cell in metres.
+
+    Return: Success, indices of the kept points in increasing order.
+    """
+    if cell_size <= 0.0:
+        return False, None
+
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    if latitudes.shape != longitudes.shape or latitudes.ndim != 1:
+        return False, None
+
+    if len(latitudes) == 0:
+        return True, np.arange(0)
+
+    north, east = __project(latitudes, longitudes, float(np.mean(latitudes)))
+    cells = np.column_stack([np.floor(north / cell_size), np.floor(east / cell_size)]).astype(
+        np.int64
+    )
+
+    _, first_indices = np.unique(cells, axis=0, return_index=True)
+
+    return True, np.sort(first_indices)
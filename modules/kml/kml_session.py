@@ -0,0 +1,481 @@
+"""
+Live KML document that grows as positions arrive, for viewing a track while flying.
+Each update writes only the new placemarks and track vertices, so updates do not slow down as the
+document grows.
+"""
+
+import io
+import pathlib
+import struct
+import time
+import zlib
+from typing import Iterable
+
+from . import kml_writer
+from .. import position_global
+from ..mavlink import drone_odometry_global
+
+
+TRACK_ALTITUDE_MODE = "absolute"
+
+# ZIP records for a single deflated entry, see the PKWARE APPNOTE
+LOCAL_FILE_HEADER = struct.Struct("<IHHHHHIIIHH")
+CENTRAL_DIRECTORY_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+END_OF_CENTRAL_DIRECTORY = struct.Struct("<IHHHHIIH")
+LOCAL_FILE_HEADER_SIGNATURE = 0x04034B50
+CENTRAL_DIRECTORY_HEADER_SIGNATURE = 0x02014B50
+END_OF_CENTRAL_DIRECTORY_SIGNATURE = 0x06054B50
+ZIP_VERSION = 20
+ZIP_DEFLATED = 8
+KMZ_ENTRY_NAME = b"doc.kml"
+
+
+class KmlAppendFile:
+    """
+    KML file where content is inserted before a fixed tail (the closing tags).
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(cls, path: pathlib.Path) -> "tuple[True, KmlAppendFile] | tuple[False, None]":
+        """
+        path: File to create or overwrite.
+
+        Return: Success, object.
+        """
+        try:
+            # Closed by close()
+            # pylint: disable-next=consider-using-with
+            file = open(path, "wb")
+        except OSError as exception:
+            print(f"Error while creating KML file: {exception}")
+            return False, None
+
+        return True, KmlAppendFile(cls.__create_key, file)
+
+    def __init__(self, class_private_create_key: object, file: io.BufferedWriter) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is KmlAppendFile.__create_key, "Use create() method."
+
+        self.__file = file
+        self.__content_end = 0
+
+    def write(self, content: bytes, tail: bytes) -> bool:
+        """
+        Appends content and rewrites the tail after it.
+
+        Return: Success.
+        """
+        try:
+            self.__file.seek(self.__content_end)
+            self.__file.write(content)
+            self.__content_end += len(content)
+            self.__file.write(tail)
+            self.__file.truncate()
+            self.__file.flush()
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KML file: {exception}")
+            return False
+
+        return True
+
+    def close(self) -> None:
+        """
+        Closes the file.
+        """
+        self.__file.close()
+
+
+# ZIP entry state is needed to rewrite the headers
+# pylint: disable-next=too-many-instance-attributes
+class KmzAppendFile:
+    """
+    KMZ (ZIP with one deflated doc.kml) where content is inserted before a fixed tail.
+    The deflate stream is flushed to a byte boundary after each write so it can be continued,
+    and only the compressed tail, the ZIP directory, and the fixed size header are rewritten.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(cls, path: pathlib.Path) -> "tuple[True, KmzAppendFile] | tuple[False, None]":
+        """
+        path: File to create or overwrite.
+
+        Return: Success, object.
+        """
+        try:
+            # Closed by close()
+            # pylint: disable-next=consider-using-with
+            file = open(path, "wb")
+        except OSError as exception:
+            print(f"Error while creating KMZ file: {exception}")
+            return False, None
+
+        return True, KmzAppendFile(cls.__create_key, file)
+
+    def __init__(self, class_private_create_key: object, file: io.BufferedWriter) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is KmzAppendFile.__create_key, "Use create() method."
+
+        self.__file = file
+        # Raw deflate, as stored in ZIP
+        self.__compressor = zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS
+        )
+        self.__crc = 0
+        self.__size = 0
+        self.__compressed_size = 0
+        self.__content_end = LOCAL_FILE_HEADER.size + len(KMZ_ENTRY_NAME)
+
+        local_time = time.localtime()
+        self.__dos_time = (
+            (local_time.tm_hour << 11) | (local_time.tm_min << 5) | (local_time.tm_sec // 2)
+        )
+        self.__dos_date = (
+            ((local_time.tm_year - 1980) << 9) | (local_time.tm_mon << 5) | local_time.tm_mday
+        )
+
+    def write(self, content: bytes, tail: bytes) -> bool:
+        """
+        Appends content and rewrites the tail after it.
+
+        Return: Success.
+        """
+        compressed = self.__compressor.compress(content) + self.__compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+        self.__crc = zlib.crc32(content, self.__crc)
+        self.__size += len(content)
+        self.__compressed_size += len(compressed)
+
+        # Finish a copy, the original stream continues on the next write
+        finisher = self.__compressor.copy()
+        compressed_tail = finisher.compress(tail) + finisher.flush(zlib.Z_FINISH)
+        crc = zlib.crc32(tail, self.__crc)
+        size = self.__size + len(tail)
+        compressed_size = self.__compressed_size + len(compressed_tail)
+
+        central_directory_offset = self.__content_end + len(compressed) + len(compressed_tail)
+        central_directory = (
+            CENTRAL_DIRECTORY_HEADER.pack(
+                CENTRAL_DIRECTORY_HEADER_SIGNATURE,
+                ZIP_VERSION,
+                ZIP_VERSION,
+                0,
+                ZIP_DEFLATED,
+                self.__dos_time,
+                self.__dos_date,
+                crc,
+                compressed_size,
+                size,
+                len(KMZ_ENTRY_NAME),
+                0,
+                0,
+                0,
+                0,
+                0,
+                0,
+            )
+            + KMZ_ENTRY_NAME
+        )
+        end_of_central_directory = END_OF_CENTRAL_DIRECTORY.pack(
+            END_OF_CENTRAL_DIRECTORY_SIGNATURE,
+            0,
+            0,
+            1,
+            1,
+            len(central_directory),
+            central_directory_offset,
+            0,
+        )
+        local_file_header = (
+            LOCAL_FILE_HEADER.pack(
+                LOCAL_FILE_HEADER_SIGNATURE,
+                ZIP_VERSION,
+                0,
+                ZIP_DEFLATED,
+                self.__dos_time,
+                self.__dos_date,
+                crc,
+                compressed_size,
+                size,
+                len(KMZ_ENTRY_NAME),
+                0,
+            )
+            + KMZ_ENTRY_NAME
+        )
+
+        try:
+            self.__file.seek(self.__content_end)
+            self.__file.write(compressed)
+            self.__content_end += len(compressed)
+            self.__file.write(compressed_tail + central_directory + end_of_central_directory)
+            self.__file.truncate()
+            self.__file.seek(0)
+            self.__file.write(local_file_header)
+            self.__file.flush()
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KMZ file: {exception}")
+            return False
+
+        return True
+
+    def close(self) -> None:
+        """
+        Closes the file.
+        """
+        self.__file.close()
+
+
+# Files, settings, and pending track state
+# pylint: disable-next=too-many-instance-attributes
+class KmlSession:
+    """
+    Keeps a KML or KMZ document open and appends placemarks and track vertices to it.
+    The document is complete after every update.
+
+    The track is one line string, kept open at the end of the document with its closing tags
+    rewritten after each update. Adding placemarks ends it, and the track continues in a new
+    line string from the last vertex.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        document_name_prefix: str,
+        save_directory: pathlib.Path,
+        use_kmz: bool = False,
+        refresh_interval: "float | None" = None,
+        update_interval: float = 0.0,
+        track_name: str = "Track",
+    ) -> "tuple[True, KmlSession] | tuple[False, None]":
+        """
+        document_name_prefix: Name of the file to save (without the timestamp or extension).
+        save_directory: Parent directory to save the file to.
+        use_kmz: Write a compressed KMZ instead of KML.
+        refresh_interval: Seconds between reloads by the viewer. If provided, a KML file with a
+            NetworkLink to the document is also written, to be opened in the viewer instead.
+        update_interval: Minimum seconds between writes, added items are held until then.
+        track_name: Name of the track line string placemarks.
+
+        Return: Success, object.
+        """
+        if refresh_interval is not None and refresh_interval <= 0.0:
+            return False, None
+
+        if update_interval < 0.0:
+            return False, None
+
+        name = f"{document_name_prefix}_{int(time.time())}"
+        document_path = pathlib.Path(save_directory, f"{name}.kmz" if use_kmz else f"{name}.kml")
+
+        network_link_path = None
+        if refresh_interval is not None:
+            network_link_path = pathlib.Path(save_directory, f"{name}_network_link.kml")
+            # Written by KmlWriter so the name and path are escaped
+            network_link = io.StringIO()
+            result, writer = kml_writer.KmlWriter.create(network_link)
+            if not result:
+                return False, None
+
+            if not writer.write_network_link(
+                name, document_path.name, refresh_interval=refresh_interval
+            ):
+                return False, None
+
+            if not writer.close():
+                return False, None
+
+            try:
+                network_link_path.write_text(
+                    network_link.getvalue(), encoding="utf-8", newline="\n"
+                )
+            except OSError as exception:
+                print(f"Error while saving NetworkLink file: {exception}")
+                return False, None
+
+        if use_kmz:
+            result, file = KmzAppendFile.create(document_path)
+        else:
+            result, file = KmlAppendFile.create(document_path)
+
+        if not result:
+            return False, None
+
+        buffer = io.StringIO()
+        result, writer = kml_writer.KmlWriter.create(buffer)
+        if not result:
+            file.close()
+            return False, None
+
+        session = KmlSession(
+            cls.__create_key,
+            file,
+            buffer,
+            writer,
+            document_path,
+            network_link_path,
+            update_interval,
+            track_name,
+        )
+
+        # Write the empty document so the viewer can open it immediately
+        if not session.update():
+            session.close()
+            return False, None
+
+        return True, session
+
+    # Paths, settings, and the pending state are all required
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        class_private_create_key: object,
+        file: "KmlAppendFile | KmzAppendFile",
+        buffer: io.StringIO,
+        writer: kml_writer.KmlWriter,
+        document_path: pathlib.Path,
+        network_link_path: "pathlib.Path | None",
+        update_interval: float,
+        track_name: str,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is KmlSession.__create_key, "Use create() method."
+
+        self.__file = file
+        self.__buffer = buffer
+        self.__writer = writer
+        self.document_path = document_path
+        self.network_link_path = network_link_path
+        self.__update_interval = update_interval
+        self.__track_name = track_name
+
+        self.__pending_track: "list[tuple[float, float, float]]" = []
+        self.__last_track_point: "tuple[float, float, float] | None" = None
+        self.__is_track_open = False
+        self.__last_update_time = -float("inf")
+        self.__is_closed = False
+
+    def add_placemarks(self, placemarks: "Iterable[tuple[str, float, float, float]]") -> bool:
+        """
+        placemarks: Name, latitude, longitude, relative altitude.
+
+        Return: Success.
+        """
+        if self.__is_closed:
+            return False
+
+        # Placemarks cannot be inside the track
+        if self.__is_track_open:
+            if not self.__writer.end_line_string():
+                return False
+
+            self.__is_track_open = False
+
+        result, _ = self.__writer.write_placemarks(placemarks)
+        if not result:
+            return False
+
+        return self.__update_if_due()
+
+    def add_track_positions(self, positions: "Iterable[position_global.PositionGlobal]") -> bool:
+        """
+        Extends the track, altitude is above mean sea level.
+
+        Return: Success.
+        """
+        if self.__is_closed:
+            return False
+
+        try:
+            self.__pending_track.extend(
+                (position.latitude, position.longitude, position.altitude) for position in positions
+            )
+        except AttributeError:
+            return False
+
+        return self.__update_if_due()
+
+    def add_odometry(self, odometry: drone_odometry_global.DroneOdometryGlobal) -> bool:
+        """
+        Extends the track with the drone position.
+
+        Return: Success.
+        """
+        return self.add_track_positions([odometry.position])
+
+    def __update_if_due(self) -> bool:
+        """
+        Updates if the update interval has passed since the last update.
+
+        Return: Success.
+        """
+        if time.monotonic() - self.__last_update_time < self.__update_interval:
+            return True
+
+        return self.update()
+
+    def update(self) -> bool:
+        """
+        Writes everything added since the last update.
+
+        Return: Success.
+        """
+        if self.__is_closed:
+            return False
+
+        # A new line string continues the track from the end of the previous one,
+        # a first single point is held until there is a second one
+        track = self.__pending_track
+        if not self.__is_track_open and self.__last_track_point is not None:
+            track = [self.__last_track_point] + track
+
+        if len(self.__pending_track) > 0 and (self.__is_track_open or len(track) >= 2):
+            if not self.__is_track_open:
+                if not self.__writer.begin_line_string(self.__track_name, TRACK_ALTITUDE_MODE):
+                    return False
+
+                self.__is_track_open = True
+
+            if not self.__writer.extend_line_string(track):
+                return False
+
+            self.__last_track_point = track[-1]
+            self.__pending_track = []
+
+        self.__last_update_time = time.monotonic()
+
+        content = self.__buffer.getvalue()
+        self.__buffer.seek(0)
+        self.__buffer.truncate()
+
+        tail = kml_writer.FOOTER
+        if self.__is_track_open:
+            tail = self.__writer.line_string_end + tail
+
+        return self.__file.write(content.encode("utf-8"), tail.encode("utf-8"))
+
+    def close(self) -> bool:
+        """
+        Writes pending items and closes the file.
+
+        Return: Success.
+        """
+        if self.__is_closed:
+            return True
+
+        result = self.update()
+        self.__file.close()
+        self.__is_closed = True
+
+        return result
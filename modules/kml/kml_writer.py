@@ -0,0 +1,517 @@
+"""
+Writes a KML document one placemark at a time, without building the document in memory.
+Output is identical to simplekml with the ID counter reset.
+"""
+
+import textwrap
+from typing import Iterable, TextIO
+
+
+HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<kml xmlns="http://www.opengis.net/kml/2.2" xmlns:gx="http://www.google.com/kml/ext/2.2">\n'
+    '    <Document id="1">\n'
+)
+FOOTER = "    </Document>\n</kml>\n"
+
+PLACEMARK_TEMPLATE = (
+    '        <Placemark id="{placemark_id}">\n'
+    "            {name_element}\n"
+    '            <Point id="{point_id}">\n'
+    "                <coordinates>{longitude},{latitude},{altitude}</coordinates>\n"
+    "            </Point>\n"
+    "        </Placemark>\n"
+)
+
+LINE_STRING_BEGIN_TEMPLATE = (
+    '        <Placemark id="{placemark_id}">\n'
+    "            {name_element}\n"
+    '            <LineString id="{line_string_id}">\n'
+    "{altitude_mode_element}"
+    "                <coordinates>"
+)
+# Starts on the line of the coordinates, the rest is indented for the folder depth
+LINE_STRING_END = "</coordinates>\n"
+LINE_STRING_END_LINES = "            </LineString>\n        </Placemark>\n"
+
+REGION_TEMPLATE = (
+    "            <Region>\n"
+    "                <LatLonAltBox>\n"
+    "                    <north>{north}</north>\n"
+    "                    <south>{south}</south>\n"
+    "                    <east>{east}</east>\n"
+    "                    <west>{west}</west>\n"
+    "                </LatLonAltBox>\n"
+    "                <Lod>\n"
+    "                    <minLodPixels>{min_lod_pixels}</minLodPixels>\n"
+    "                    <maxLodPixels>{max_lod_pixels}</maxLodPixels>\n"
+    "                </Lod>\n"
+    "            </Region>\n"
+)
+
+FOLDER_TEMPLATE = '        <Folder id="{folder_id}">\n            {name_element}\n{region}'
+FOLDER_END = "        </Folder>\n"
+
+NETWORK_LINK_TEMPLATE = (
+    '        <NetworkLink id="{network_link_id}">\n'
+    "            {name_element}\n"
+    "{region}"
+    "            <Link>\n"
+    "                <href>{href}</href>\n"
+    "{refresh}"
+    "            </Link>\n"
+    "        </NetworkLink>\n"
+)
+REGION_REFRESH = "                <viewRefreshMode>onRegion</viewRefreshMode>\n"
+INTERVAL_REFRESH_TEMPLATE = (
+    "                <refreshMode>onInterval</refreshMode>\n"
+    "                <refreshInterval>{refresh_interval}</refreshInterval>\n"
+)
+
+INDENT = "    "
+
+# simplekml gives the document ID 1, then each geometry and its placemark the next 2 IDs
+FIRST_GEOMETRY_ID = 2
+
+# Placemarks formatted before each write to the file
+WRITE_BATCH_SIZE = 1000
+
+
+# Templates indented for the folder depth and the open line string state
+# pylint: disable-next=too-many-instance-attributes
+class KmlWriter:
+    """
+    Writes the header on creation, placemarks as they are given, and the footer on close.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(cls, file: TextIO) -> "tuple[True, KmlWriter] | tuple[False, None]":
+        """
+        file: Text file opened for writing. The writer does not close it.
+
+        Return: Success, object.
+        """
+        try:
+            file.write(HEADER)
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KML header: {exception}")
+            return False, None
+
+        return True, KmlWriter(cls.__create_key, file)
+
+    def __init__(self, class_private_create_key: object, file: TextIO) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is KmlWriter.__create_key, "Use create() method."
+
+        self.__file = file
+        self.__placemark_count = 0
+        self.__next_id = FIRST_GEOMETRY_ID
+
+        # Templates indented for the current folder depth
+        self.__depth = 0
+        self.__placemark_template = PLACEMARK_TEMPLATE
+        self.__line_string_begin_template = LINE_STRING_BEGIN_TEMPLATE
+        self.__line_string_end = LINE_STRING_END + LINE_STRING_END_LINES
+        self.__is_line_string_open = False
+        self.__is_line_string_empty = True
+        self.__is_closed = False
+
+    @property
+    def placemark_count(self) -> int:
+        """
+        Number of placemarks written.
+        """
+        return self.__placemark_count
+
+    @staticmethod
+    def __escape(text: str) -> str:
+        """
+        Escapes text the same way as simplekml after pretty printing.
+        """
+        return (
+            text.replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace('"', "&quot;")
+            .replace(">", "&gt;")
+        )
+
+    @staticmethod
+    def __format_name(name: str) -> str:
+        """
+        Name element, which pretty printing collapses when empty.
+        """
+        name = str(name)
+        return f"<name>{KmlWriter.__escape(name)}</name>" if name else "<name/>"
+
+    def __take_ids(self) -> "tuple[int, int]":
+        """
+        Next geometry and placemark IDs.
+        """
+        geometry_id = self.__next_id
+        self.__next_id += 2
+        self.__placemark_count += 1
+
+        return geometry_id, geometry_id + 1
+
+    def __format_placemark(
+        self, name: str, latitude: float, longitude: float, altitude: float
+    ) -> str:
+        """
+        Placemark XML with the next IDs.
+        """
+        point_id, placemark_id = self.__take_ids()
+
+        return self.__placemark_template.format(
+            placemark_id=placemark_id,
+            name_element=self.__format_name(name),
+            point_id=point_id,
+            longitude=longitude,
+            latitude=latitude,
+            altitude=altitude,
+        )
+
+    def write_placemark(
+        self, name: str, latitude: float, longitude: float, altitude: float
+    ) -> bool:
+        """
+        Writes one point placemark.
+
+        Return: Success.
+        """
+        if self.__is_closed or self.__is_line_string_open:
+            return False
+
+        try:
+            self.__file.write(self.__format_placemark(name, latitude, longitude, altitude))
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KML placemark: {exception}")
+            return False
+
+        return True
+
+    def write_placemarks(
+        self, placemarks: "Iterable[tuple[str, float, float, float]]"
+    ) -> "tuple[True, int] | tuple[False, None]":
+        """
+        Writes point placemarks from any iterable, consumed lazily.
+
+        placemarks: Name, latitude, longitude, altitude.
+
+        Return: Success, number of placemarks written by this call.
+        """
+        if self.__is_closed or self.__is_line_string_open:
+            return False, None
+
+        start_count = self.__placemark_count
+        batch = []
+        try:
+            for name, latitude, longitude, altitude in placemarks:
+                batch.append(self.__format_placemark(name, latitude, longitude, altitude))
+                if len(batch) == WRITE_BATCH_SIZE:
+                    self.__file.write("".join(batch))
+                    batch.clear()
+
+            self.__file.write("".join(batch))
+        except (AttributeError, TypeError, ValueError, OSError) as exception:
+            print(f"Error while writing KML placemarks: {exception}")
+            return False, None
+
+        return True, self.__placemark_count - start_count
+
+    @property
+    def line_string_end(self) -> str:
+        """
+        Closing tags written by end_line_string(), for files that keep the line string open.
+        """
+        return self.__line_string_end
+
+    def write_line_string(
+        self,
+        name: str,
+        coordinates: "Iterable[tuple[float, float, float]]",
+        altitude_mode: "str | None" = None,
+    ) -> bool:
+        """
+        Writes one line string placemark.
+
+        coordinates: Latitude, longitude, altitude of each vertex.
+        altitude_mode: KML altitudeMode (e.g. absolute), default clamps to ground.
+
+        Return: Success.
+        """
+        return (
+            self.begin_line_string(name, altitude_mode)
+            and self.extend_line_string(coordinates)
+            and self.end_line_string()
+        )
+
+    def begin_line_string(self, name: str, altitude_mode: "str | None" = None) -> bool:
+        """
+        Starts a line string placemark, extended by extend_line_string() until end_line_string().
+        Nothing else can be written in between.
+
+        altitude_mode: KML altitudeMode (e.g. absolute), default clamps to ground.
+
+        Return: Success.
+        """
+        if self.__is_closed or self.__is_line_string_open:
+            return False
+
+        altitude_mode_element = ""
+        if altitude_mode is not None:
+            altitude_mode_element = (
+                f"{INDENT * self.__depth}"
+                f"                <altitudeMode>{altitude_mode}</altitudeMode>\n"
+            )
+
+        line_string_id, placemark_id = self.__take_ids()
+
+        try:
+            self.__file.write(
+                self.__line_string_begin_template.format(
+                    placemark_id=placemark_id,
+                    name_element=self.__format_name(name),
+                    line_string_id=line_string_id,
+                    altitude_mode_element=altitude_mode_element,
+                )
+            )
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KML line string: {exception}")
+            return False
+
+        self.__is_line_string_open = True
+        self.__is_line_string_empty = True
+
+        return True
+
+    def extend_line_string(self, coordinates: "Iterable[tuple[float, float, float]]") -> bool:
+        """
+        Adds vertices to the open line string.
+
+        coordinates: Latitude, longitude, altitude of each vertex.
+
+        Return: Success.
+        """
+        if self.__is_closed or not self.__is_line_string_open:
+            return False
+
+        try:
+            text = " ".join(
+                f"{longitude},{latitude},{altitude}"
+                for latitude, longitude, altitude in coordinates
+            )
+        except (TypeError, ValueError) as exception:
+            print(f"Error while writing KML line string: {exception}")
+            return False
+
+        if text == "":
+            return True
+
+        if not self.__is_line_string_empty:
+            text = " " + text
+
+        try:
+            self.__file.write(text)
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KML line string: {exception}")
+            return False
+
+        self.__is_line_string_empty = False
+
+        return True
+
+    def end_line_string(self) -> bool:
+        """
+        Ends the open line string.
+
+        Return: Success.
+        """
+        if self.__is_closed or not self.__is_line_string_open:
+            return False
+
+        try:
+            self.__file.write(self.__line_string_end)
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KML line string: {exception}")
+            return False
+
+        self.__is_line_string_open = False
+
+        return True
+
+    def __set_depth(self, depth: int) -> None:
+        """
+        Indents the templates for the folder depth.
+        """
+        self.__depth = depth
+        self.__placemark_template = textwrap.indent(PLACEMARK_TEMPLATE, INDENT * depth)
+        self.__line_string_begin_template = textwrap.indent(
+            LINE_STRING_BEGIN_TEMPLATE, INDENT * depth
+        )
+        self.__line_string_end = LINE_STRING_END + textwrap.indent(
+            LINE_STRING_END_LINES, INDENT * depth
+        )
+
+    # Region bounds and level of detail are all required
+    # pylint: disable-next=too-many-arguments
+    def begin_folder(
+        self,
+        name: str,
+        north: float,
+        south: float,
+        east: float,
+        west: float,
+        min_lod_pixels: int = 128,
+        max_lod_pixels: int = -1,
+    ) -> bool:
+        """
+        Starts a folder with a region, so viewers only draw its contents when the region is in
+        view and its size on screen is within the level of detail. The contents are still loaded
+        with the file. Placemarks written next are in the folder.
+
+        north, south, east, west: Bounds in decimal degrees.
+        min_lod_pixels, max_lod_pixels: Size on screen for the folder to be active, -1 is no limit.
+
+        Return: Success.
+        """
+        if self.__is_closed or self.__is_line_string_open:
+            return False
+
+        folder = FOLDER_TEMPLATE.format(
+            folder_id=self.__next_id,
+            name_element=self.__format_name(name),
+            region=REGION_TEMPLATE.format(
+                north=north,
+                south=south,
+                east=east,
+                west=west,
+                min_lod_pixels=min_lod_pixels,
+                max_lod_pixels=max_lod_pixels,
+            ),
+        )
+
+        try:
+            self.__file.write(textwrap.indent(folder, INDENT * self.__depth))
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KML folder: {exception}")
+            return False
+
+        self.__next_id += 1
+        self.__set_depth(self.__depth + 1)
+
+        return True
+
+    # Region bounds, level of detail, and refresh are all independent
+    # pylint: disable-next=too-many-arguments
+    def write_network_link(
+        self,
+        name: str,
+        href: str,
+        north: "float | None" = None,
+        south: "float | None" = None,
+        east: "float | None" = None,
+        west: "float | None" = None,
+        min_lod_pixels: int = 128,
+        max_lod_pixels: int = -1,
+        refresh_interval: "float | None" = None,
+    ) -> bool:
+        """
+        Writes a link to another KML file. With a region, viewers only download it when the
+        region is in view and covers at least min_lod_pixels.
+
+        href: Path of the linked file, relative to this one.
+        north, south, east, west: Bounds in decimal degrees. All None for no region.
+        min_lod_pixels, max_lod_pixels: Size on screen for the link to be active, -1 is no limit.
+        refresh_interval: If provided, seconds between reloads of the linked file.
+
+        Return: Success.
+        """
+        if self.__is_closed or self.__is_line_string_open:
+            return False
+
+        bounds = (north, south, east, west)
+        if all(bound is None for bound in bounds):
+            region = ""
+            refresh = ""
+        elif any(bound is None for bound in bounds):
+            print("Region needs all of north, south, east, and west.")
+            return False
+        else:
+            region = REGION_TEMPLATE.format(
+                north=north,
+                south=south,
+                east=east,
+                west=west,
+                min_lod_pixels=min_lod_pixels,
+                max_lod_pixels=max_lod_pixels,
+            )
+            refresh = REGION_REFRESH
+
+        if refresh_interval is not None:
+            refresh += INTERVAL_REFRESH_TEMPLATE.format(refresh_interval=refresh_interval)
+
+        network_link = NETWORK_LINK_TEMPLATE.format(
+            network_link_id=self.__next_id,
+            name_element=self.__format_name(name),
+            region=region,
+            href=self.__escape(href),
+            refresh=refresh,
+        )
+
+        try:
+            self.__file.write(textwrap.indent(network_link, INDENT * self.__depth))
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KML network link: {exception}")
+            return False
+
+        self.__next_id += 1
+
+        return True
+
+    def end_folder(self) -> bool:
+        """
+        Ends the innermost folder.
+
+        Return: Success.
+        """
+        if self.__is_closed or self.__is_line_string_open or self.__depth == 0:
+            return False
+
+        self.__set_depth(self.__depth - 1)
+
+        try:
+            self.__file.write(INDENT * self.__depth + FOLDER_END)
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KML folder: {exception}")
+            return False
+
+        return True
+
+    def close(self) -> bool:
+        """
+        Ends any open line string and folders and writes the footer. Further writes fail.
+
+        Return: Success.
+        """
+        if self.__is_closed:
+            return True
+
+        if self.__is_line_string_open and not self.end_line_string():
+            return False
+
+        while self.__depth > 0:
+            if not self.end_folder():
+                return False
+
+        try:
+            self.__file.write(FOOTER)
+        except (OSError, ValueError) as exception:
+            print(f"Error while writing KML footer: {exception}")
+            return False
+
+        self.__is_closed = True
+        return True
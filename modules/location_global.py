@@ -1,15 +1,21 @@
 """
 Location on ground in WGS 84.
 
-Class with name also available.
+Class with name and columnar array also available.
 """
 
+import numpy as np
+
+from . import columnar_array
+
 
 class LocationGlobal:
     """
     WGS 84 following ISO 6709 (latitude before longitude).
     """
 
+    __slots__ = ("latitude", "longitude")
+
     __create_key = object()
 
     @classmethod
@@ -51,6 +57,8 @@ class NamedLocationGlobal(LocationGlobal):
     Named LocationGlobal.
     """
 
+    __slots__ = ("name",)
+
     __create_key = object()
 
     @classmethod
@@ -85,3 +93,26 @@ class NamedLocationGlobal(LocationGlobal):
         To string.
         """
         return f"{self.__class__}: name: {self.name}, latitude: {self.latitude}, longitude: {self.longitude}"
+
+
+class LocationGlobalArray(columnar_array.ColumnarArray):
+    """
+    Many LocationGlobal as columns, see ColumnarArray.
+    """
+
+    FIELDS = ("latitude", "longitude")
+    ELEMENT_CLASS = LocationGlobal
+
+    @property
+    def latitude(self) -> np.ndarray:
+        """
+        Decimal degrees.
+        """
+        return self.data["latitude"]
+
+    @property
+    def longitude(self) -> np.ndarray:
+        """
+        Decimal degrees.
+        """
+        return self.data["longitude"]
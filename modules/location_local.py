@@ -1,15 +1,21 @@
 """
 Location on the ground in local Euclidean space (origin at home position global).
 
-Class with name also available.
+Class with name and columnar array also available.
 """
 
+import numpy as np
+
+from . import columnar_array
+
 
 class LocationLocal:
     """
     Location in NED system relative to home position, with down = 0.0 .
     """
 
+    __slots__ = ("north", "east")
+
     __create_key = object()
 
     @classmethod
@@ -49,6 +55,8 @@ class NamedLocationLocal(LocationLocal):
     Named LocationLocal.
     """
 
+    __slots__ = ("name",)
+
     __create_key = object()
 
     @classmethod
@@ -83,3 +91,26 @@ class NamedLocationLocal(LocationLocal):
         To string.
         """
         return f"{self.__class__}: name: {self.name}, north: {self.north}, east: {self.east}"
+
+
+class LocationLocalArray(columnar_array.ColumnarArray):
+    """
+    Many LocationLocal as columns, see ColumnarArray.
+    """
+
+    FIELDS = ("north", "east")
+    ELEMENT_CLASS = LocationLocal
+
+    @property
+    def north(self) -> np.ndarray:
+        """
+        Metres.
+        """
+        return self.data["north"]
+
+    @property
+    def east(self) -> np.ndarray:
+        """
+        Metres.
+        """
+        return self.data["east"]
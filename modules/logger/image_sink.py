@@ -0,0 +1,267 @@
+"""
+Saves images to a directory, optionally on a separate thread so the caller does not wait for
+encoding and disk I/O.
+"""
+
+import enum
+import pathlib
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class ImageFormat(enum.Enum):
+    """
+    File format, the value is the extension.
+    """
+
+    PNG = "png"
+    JPEG = "jpg"
+    NPY = "npy"
+
+
+# Counters are exposed as attributes
+# pylint: disable-next=too-many-instance-attributes
+class ImageSink:
+    """
+    Saves images with unique filenames. Images can be skipped by sampling and rate limiting,
+    and when saving on a separate thread, dropped if the queue is full.
+
+    saved_count: Images written.
+    skipped_count: Images not saved due to sampling or rate limiting.
+    dropped_count: Images not saved because the queue was full.
+    failed_count: Images that could not be encoded or written.
+    """
+
+    __create_key = object()
+
+    __STOP = object()
+
+    @classmethod
+    def create(
+        cls,
+        directory: pathlib.Path,
+        name_prefix: str,
+        image_format: ImageFormat = ImageFormat.PNG,
+        png_compression: int = 3,
+        jpeg_quality: int = 95,
+        queue_size: int = 0,
+        sample_interval: int = 1,
+        min_interval: float = 0.0,
+    ) -> "tuple[True, ImageSink] | tuple[False, None]":
+        """
+        directory: Where images are saved.
+        name_prefix: Start of each filename.
+        image_format: File format.
+        png_compression: 0 (fastest) to 9 (smallest).
+        jpeg_quality: 0 to 100 (best).
+        queue_size: Images waiting to be saved on a separate thread. 0 saves on the calling thread.
+        sample_interval: Save every nth image.
+        min_interval: Minimum seconds between saved images.
+
+        Return: Success, object.
+        """
+        if not 0 <= png_compression <= 9:
+            return False, None
+
+        if not 0 <= jpeg_quality <= 100:
+            return False, None
+
+        if queue_size < 0 or sample_interval < 1 or min_interval < 0.0:
+            return False, None
+
+        if image_format == ImageFormat.PNG:
+            parameters = [cv2.IMWRITE_PNG_COMPRESSION, png_compression]
+        elif image_format == ImageFormat.JPEG:
+            parameters = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+        else:
+            parameters = []
+
+        return True, ImageSink(
+            cls.__create_key,
+            directory,
+            name_prefix,
+            image_format,
+            parameters,
+            queue_size,
+            sample_interval,
+            min_interval,
+        )
+
+    # Settings are all required
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        class_private_create_key: object,
+        directory: pathlib.Path,
+        name_prefix: str,
+        image_format: ImageFormat,
+        parameters: "list[int]",
+        queue_size: int,
+        sample_interval: int,
+        min_interval: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ImageSink.__create_key, "Use create() method."
+
+        self.__directory = directory
+        self.__name_prefix = name_prefix
+        self.__image_format = image_format
+        self.__parameters = parameters
+        self.__sample_interval = sample_interval
+        self.__min_interval = min_interval
+
+        # Guards the sequence, interval, counters, and closing, as save() is called from any thread
+        self.__lock = threading.Lock()
+        self.__sequence = 0
+        self.__last_save_time = -float("inf")
+        self.__is_closed = False
+
+        self.saved_count = 0
+        self.skipped_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+
+        self.__queue: "queue.Queue | None" = None
+        self.__thread: "threading.Thread | None" = None
+        if queue_size > 0:
+            self.__queue = queue.Queue(queue_size)
+            self.__thread = threading.Thread(target=self.__run, name="image_sink", daemon=True)
+            self.__thread.start()
+
+    @property
+    def is_queued(self) -> bool:
+        """
+        Whether images are saved on a separate thread, after save() returns.
+        """
+        return self.__queue is not None
+
+    def save(
+        self, image: np.ndarray, filename: str = ""
+    ) -> "tuple[True, str] | tuple[False, None]":
+        """
+        Saves the image, or queues it to be saved. Queued images are copied, so the caller can
+        reuse the array.
+
+        filename: Added to the end of the unique name.
+
+        Return: Success, name of the file (which exists once saved). Fails after close().
+        """
+        with self.__lock:
+            if self.__is_closed:
+                return False, None
+
+            sequence = self.__sequence
+            self.__sequence += 1
+
+            if sequence % self.__sample_interval != 0:
+                self.skipped_count += 1
+                return False, None
+
+            current_time = time.time()
+            if current_time - self.__last_save_time < self.__min_interval:
+                self.skipped_count += 1
+                return False, None
+
+            # The sequence number keeps names unique within the same second,
+            # padded so names sort in order as text
+            full_file_name = f"{self.__name_prefix}_{int(current_time)}_{sequence:06}"
+            if filename != "":
+                full_file_name = f"{full_file_name}_{filename}"
+            full_file_name = f"{full_file_name}.{self.__image_format.value}"
+
+            if self.__queue is not None:
+                try:
+                    self.__queue.put_nowait((image.copy(), full_file_name))
+                except queue.Full:
+                    self.dropped_count += 1
+                    return False, None
+
+            # Reserved before writing, so other threads are still rate limited meanwhile
+            previous_save_time = self.__last_save_time
+            self.__last_save_time = current_time
+
+        # Encoded outside the lock, so other threads are not held up
+        if self.__queue is None and not self.__write(image, full_file_name):
+            # Nothing was saved, so the interval does not start
+            with self.__lock:
+                if self.__last_save_time == current_time:
+                    self.__last_save_time = previous_save_time
+
+            return False, None
+
+        return True, full_file_name
+
+    def flush(self) -> None:
+        """
+        Waits until queued images are saved. Does nothing after close().
+        """
+        with self.__lock:
+            if self.__is_closed:
+                return
+
+        if self.__queue is not None:
+            self.__queue.join()
+
+    def close(self) -> None:
+        """
+        Saves queued images and stops the thread. Later images are not saved.
+        """
+        with self.__lock:
+            if self.__is_closed:
+                return
+
+            self.__is_closed = True
+
+        if self.__thread is None:
+            return
+
+        # Blocks if full, the stop must not be dropped
+        self.__queue.put(self.__STOP)
+        self.__thread.join()
+        self.__thread = None
+
+    def __write(self, image: np.ndarray, full_file_name: str) -> bool:
+        """
+        Encodes and writes the image.
+
+        Return: Success.
+        """
+        filepath = pathlib.Path(self.__directory, full_file_name)
+
+        try:
+            if self.__image_format == ImageFormat.NPY:
+                np.save(filepath, image)
+                result = True
+            else:
+                result = cv2.imwrite(str(filepath), image, self.__parameters)
+        except (OSError, ValueError, cv2.error) as exception:
+            print(f"Error while saving image: {exception}")
+            result = False
+
+        with self.__lock:
+            if not result:
+                self.failed_count += 1
+                return False
+
+            self.saved_count += 1
+            return True
+
+    def __run(self) -> None:
+        """
+        Writer thread.
+        """
+        while True:
+            item = self.__queue.get()
+            if item is self.__STOP:
+                self.__queue.task_done()
+                return
+
+            image, full_file_name = item
+            self.__write(image, full_file_name)
+            self.__queue.task_done()
@@ -0,0 +1,189 @@
+"""
+Moves log output off the calling thread: records go into a bounded queue and a writer thread
+writes them in batches.
+"""
+
+import logging
+import logging.handlers
+import queue
+import threading
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Puts records into a bounded queue without blocking. Records that do not fit are dropped and
+    counted, so logging never stalls the caller.
+    """
+
+    def __init__(self, record_queue: queue.Queue) -> None:
+        """
+        record_queue: Bounded queue read by a BatchQueueListener.
+        """
+        super().__init__(record_queue)
+
+        self.__dropped_count = 0
+        self.__dropped_lock = threading.Lock()
+
+    @property
+    def dropped_count(self) -> int:
+        """
+        Number of records dropped because the queue was full.
+        """
+        return self.__dropped_count
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        The queue is in process, so the record is passed as is and formatted by the writer thread.
+        """
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Puts the record into the queue, or drops it if the queue is full.
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.__dropped_lock:
+                self.__dropped_count += 1
+
+
+class BatchQueueListener:
+    """
+    Writer thread taking records from the queue and passing them to the handlers.
+    Stream handlers are written to directly and flushed once per batch instead of once per record.
+    """
+
+    __create_key = object()
+
+    __STOP = object()
+
+    @classmethod
+    def create(
+        cls, record_queue: queue.Queue, handlers: "list[logging.Handler]", batch_size: int
+    ) -> "tuple[True, BatchQueueListener] | tuple[False, None]":
+        """
+        record_queue: Queue filled by a DroppingQueueHandler.
+        handlers: Handlers to write to, only used by the writer thread.
+        batch_size: Maximum number of records written before flushing.
+
+        Return: Success, object.
+        """
+        if batch_size < 1:
+            return False, None
+
+        return True, BatchQueueListener(cls.__create_key, record_queue, handlers, batch_size)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        record_queue: queue.Queue,
+        handlers: "list[logging.Handler]",
+        batch_size: int,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is BatchQueueListener.__create_key, "Use create() method."
+
+        self.__queue = record_queue
+        self.__handlers = handlers
+        self.__batch_size = batch_size
+        # Guards starting, stopping, and flushing the writer thread
+        self.__lock = threading.Lock()
+        self.__thread: "threading.Thread | None" = None
+
+    def start(self) -> None:
+        """
+        Starts the writer thread.
+        """
+        with self.__lock:
+            if self.__thread is not None:
+                return
+
+            self.__thread = threading.Thread(target=self.__run, name="log_writer", daemon=True)
+            self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Writes the records already queued and stops the writer thread.
+        """
+        with self.__lock:
+            if self.__thread is None:
+                return
+
+            # Blocks if full, the stop must not be dropped
+            self.__queue.put(self.__STOP)
+            self.__thread.join()
+            self.__thread = None
+
+    def flush(self) -> None:
+        """
+        Waits until the records queued before this call are written. Returns if not running.
+        """
+        with self.__lock:
+            if self.__thread is None:
+                return
+
+            # Set by the writer thread once the batch containing it is written
+            written = threading.Event()
+            # Blocks if full, the marker must not be dropped
+            self.__queue.put(written)
+            written.wait()
+
+    def __run(self) -> None:
+        """
+        Writer thread.
+        """
+        while True:
+            batch = [self.__queue.get()]
+            while len(batch) < self.__batch_size:
+                try:
+                    batch.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for item in batch if isinstance(item, logging.LogRecord)]
+            for handler in self.__handlers:
+                self.__write(handler, records)
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+            if batch[-1] is self.__STOP:
+                return
+
+    @staticmethod
+    def __write(handler: logging.Handler, batch: "list[logging.LogRecord]") -> None:
+        """
+        Writes the records the handler accepts.
+        """
+        records = [record for record in batch if record.levelno >= handler.level]
+        if len(records) == 0:
+            return
+
+        # Other handlers may be doing their own I/O, so they are used as they are
+        if not isinstance(handler, logging.StreamHandler) or handler.stream is None:
+            for record in records:
+                handler.handle(record)
+            return
+
+        lines = []
+        for record in records:
+            if not handler.filter(record):
+                continue
+
+            try:
+                lines.append(handler.format(record) + handler.terminator)
+            # Same as logging.Handler.emit(), a bad record must not stop the writer thread
+            # pylint: disable-next=broad-exception-caught
+            except Exception:
+                handler.handleError(record)
+
+        with handler.lock:
+            try:
+                handler.stream.write("".join(lines))
+                handler.flush()
+            except (OSError, ValueError):
+                handler.handleError(records[-1])
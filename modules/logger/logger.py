@@ -2,21 +2,23 @@
 Logs debug messages.
 """
 
+import atexit
 import datetime
-import inspect
 import logging
 import os
 import pathlib
+import queue
 import sys
-import time
+from typing import Callable
 
 # Used in type annotation of logger parameters
 # pylint: disable-next=unused-import
 import types
 
-import cv2
 import numpy as np
 
+from . import image_sink
+from . import log_queue
 from ..read_yaml import read_yaml
 
 
@@ -30,10 +32,18 @@ class Logger:
 
     __create_key = object()
 
+    # Start of the frame info for each function, which only needs the line number added
+    __frame_info_prefixes: "dict[types.CodeType, str]" = {}
+
     @classmethod
-    def create(cls, name: str, enable_log_to_file: bool) -> "tuple[bool, Logger | None]":
+    def create(
+        cls, name: str, enable_log_to_file: bool, use_queue: bool = False
+    ) -> "tuple[bool, Logger | None]":
         """
         Create and configure a logger.
+
+        use_queue: Write to the terminal and file from a separate thread, so logging calls do not
+            wait for I/O. Messages are dropped and counted if the queue is full.
         """
         # Configuration settings
         result, config = read_yaml.open_config(CONFIG_FILE_PATH)
@@ -49,13 +59,33 @@ class Logger:
             file_datetime_format = config["logger"]["file_datetime_format"]
             logger_format = config["logger"]["format"]
             logger_datetime_format = config["logger"]["log_datetime_format"]
+            queue_size = config["logger"]["queue_size"]
+            queue_batch_size = config["logger"]["queue_batch_size"]
+            level_name = config["logger"]["level"]
+            image_config = config["logger"]["image"]
+            image_format_name = image_config["format"]
+            image_png_compression = image_config["png_compression"]
+            image_jpeg_quality = image_config["jpeg_quality"]
+            image_queue_size = image_config["queue_size"]
+            image_sample_interval = image_config["sample_interval"]
+            image_min_interval = image_config["min_interval"]
         except KeyError as exception:
             print(f"Config key(s) not found: {exception}")
             return False, None
 
+        # Checked before anything is created, so nothing is left open on failure
+        if image_format_name not in image_sink.ImageFormat.__members__:
+            print(f"ERROR: Unknown image format: {image_format_name}")
+            return False, None
+
+        level = logging.getLevelName(level_name)
+        if not isinstance(level, int):
+            print(f"ERROR: Unknown logger level: {level_name}")
+            return False, None
+
         # Create a unique logger instance
         logger = logging.getLogger(name)
-        logger.setLevel(logging.DEBUG)
+        logger.setLevel(level)
 
         formatter = logging.Formatter(
             fmt=logger_format,
@@ -65,10 +95,15 @@ class Logger:
         # Handles logging to terminal
         stream_handler = logging.StreamHandler(sys.stdout)
         stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
 
         if not enable_log_to_file:
-            return True, Logger(cls.__create_key, logger, None)
+            result, listener, queue_handler = cls.__add_handlers(
+                logger, [stream_handler], use_queue, queue_size, queue_batch_size
+            )
+            if not result:
+                return False, None
+
+            return True, Logger(cls.__create_key, logger, None, listener, queue_handler)
 
         # Handles logging to file
 
@@ -99,17 +134,89 @@ class Logger:
             print("ERROR: Log file already exists.")
             return False, None
 
+        result, sink = image_sink.ImageSink.create(
+            pathlib.Path(log_directory_path, log_path),
+            name,
+            image_sink.ImageFormat[image_format_name],
+            image_png_compression,
+            image_jpeg_quality,
+            image_queue_size,
+            image_sample_interval,
+            image_min_interval,
+        )
+        if not result:
+            print("ERROR: Failed to create image sink")
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert sink is not None
+
         file_handler = logging.FileHandler(filename=filepath, mode="w")
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
 
-        return True, Logger(cls.__create_key, logger, pathlib.Path(log_directory_path, log_path))
+        result, listener, queue_handler = cls.__add_handlers(
+            logger, [stream_handler, file_handler], use_queue, queue_size, queue_batch_size
+        )
+        if not result:
+            file_handler.close()
+            sink.close()
+            return False, None
+
+        # Save what is left in the queue on exit
+        atexit.register(sink.close)
+
+        return True, Logger(cls.__create_key, logger, sink, listener, queue_handler)
+
+    @staticmethod
+    def __add_handlers(
+        logger: logging.Logger,
+        handlers: "list[logging.Handler]",
+        use_queue: bool,
+        queue_size: int,
+        queue_batch_size: int,
+    ) -> "tuple[True, log_queue.BatchQueueListener | None, log_queue.DroppingQueueHandler | None] | tuple[False, None, None]":
+        """
+        Adds the handlers to the logger, or to a writer thread fed by the logger.
+
+        Return: Success, writer thread if used, queue handler if used.
+        """
+        if not use_queue:
+            for handler in handlers:
+                logger.addHandler(handler)
+
+            return True, None, None
+
+        if queue_size < 1:
+            print("ERROR: Logger queue size must be positive")
+            return False, None, None
+
+        record_queue = queue.Queue(queue_size)
+        result, listener = log_queue.BatchQueueListener.create(
+            record_queue, handlers, queue_batch_size
+        )
+        if not result:
+            print("ERROR: Failed to create logger writer thread")
+            return False, None, None
+
+        # Get Pylance to stop complaining
+        assert listener is not None
+
+        queue_handler = log_queue.DroppingQueueHandler(record_queue)
+        logger.addHandler(queue_handler)
+
+        listener.start()
+        # Write what is left in the queue on exit
+        atexit.register(listener.stop)
+
+        return True, listener, queue_handler
 
     def __init__(
         self,
         class_create_private_key: object,
         logger: logging.Logger,
-        maybe_log_directory: pathlib.Path | None,
+        maybe_image_sink: "image_sink.ImageSink | None",
+        maybe_listener: "log_queue.BatchQueueListener | None" = None,
+        maybe_queue_handler: "log_queue.DroppingQueueHandler | None" = None,
     ) -> None:
         """
         Private constructor, use create() method.
@@ -117,7 +224,38 @@ class Logger:
         assert class_create_private_key is Logger.__create_key, "Use create() method."
 
         self.logger = logger
-        self.__maybe_log_directory = maybe_log_directory
+        self.__maybe_image_sink = maybe_image_sink
+        self.__maybe_listener = maybe_listener
+        self.__maybe_queue_handler = maybe_queue_handler
+
+    @property
+    def dropped_message_count(self) -> int:
+        """
+        Number of messages dropped because the queue was full, always 0 without a queue.
+        """
+        if self.__maybe_queue_handler is None:
+            return 0
+
+        return self.__maybe_queue_handler.dropped_count
+
+    @property
+    def image_sink(self) -> "image_sink.ImageSink | None":
+        """
+        Saves images for save_image() and counts them, None without file logging.
+        """
+        return self.__maybe_image_sink
+
+    def flush(self) -> None:
+        """
+        Waits until queued messages are written and queued images are saved.
+        """
+        if self.__maybe_image_sink is not None:
+            self.__maybe_image_sink.flush()
+
+        if self.__maybe_listener is None:
+            return
+
+        self.__maybe_listener.flush()
 
     @staticmethod
     def message_and_metadata(message: str, frame: "types.FrameType | None") -> str:
@@ -130,61 +268,123 @@ class Logger:
         # Get Pylance to stop complaining
         assert frame is not None
 
-        function_name = frame.f_code.co_name
-        filename = frame.f_code.co_filename
-        line_number = inspect.getframeinfo(frame).lineno
+        code = frame.f_code
+        prefix = Logger.__frame_info_prefixes.get(code)
+        if prefix is None:
+            prefix = f"[{code.co_filename} | {code.co_name} | "
+            Logger.__frame_info_prefixes[code] = prefix
 
-        return f"[{filename} | {function_name} | {line_number}] {message}"
+        return f"{prefix}{frame.f_lineno}] {message}"
 
-    def debug(self, message: str, log_with_frame_info: bool = True) -> None:
+    def is_enabled_for(self, level: int) -> bool:
         """
-        Logs a debug level message.
+        Whether messages of the level (e.g. logging.DEBUG) are logged. Use to skip preparing
+        messages that would not be logged.
         """
+        return self.logger.isEnabledFor(level)
+
+    def __log(
+        self,
+        level: int,
+        message: str | Callable[[], str],
+        log_with_frame_info: bool,
+        args: tuple,
+    ) -> None:
+        """
+        Builds and logs the message, only called once the level is known to be enabled.
+        """
+        if callable(message):
+            message = message()
+
+        if args:
+            message = message % args
+
         if log_with_frame_info:
-            logger_frame = inspect.currentframe()
-            caller_frame = logger_frame.f_back
-            message = self.message_and_metadata(message, caller_frame)
-        self.logger.debug(message)
+            # Caller of the level method, without the cost of inspect
+            # pylint: disable-next=protected-access
+            message = self.message_and_metadata(message, sys._getframe(2))
 
-    def info(self, message: str, log_with_frame_info: bool = True) -> None:
+        self.logger.log(level, message)
+
+    def debug(
+        self,
+        message: str | Callable[[], str],
+        log_with_frame_info: bool = True,
+        *,
+        args: tuple = (),
+    ) -> None:
+        """
+        Logs a debug level message.
+
+        message: Text, %-style format with args, or function returning the text. Formatting and
+            the function are skipped if the level is disabled.
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.__log(logging.DEBUG, message, log_with_frame_info, args)
+
+    def info(
+        self,
+        message: str | Callable[[], str],
+        log_with_frame_info: bool = True,
+        *,
+        args: tuple = (),
+    ) -> None:
         """
         Logs an info level message.
+
+        message: Text, %-style format with args, or function returning the text. Formatting and
+            the function are skipped if the level is disabled.
         """
-        if log_with_frame_info:
-            logger_frame = inspect.currentframe()
-            caller_frame = logger_frame.f_back
-            message = self.message_and_metadata(message, caller_frame)
-        self.logger.info(message)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.__log(logging.INFO, message, log_with_frame_info, args)
 
-    def warning(self, message: str, log_with_frame_info: bool = True) -> None:
+    def warning(
+        self,
+        message: str | Callable[[], str],
+        log_with_frame_info: bool = True,
+        *,
+        args: tuple = (),
+    ) -> None:
         """
         Logs a warning level message.
+
+        message: Text, %-style format with args, or function returning the text. Formatting and
+            the function are skipped if the level is disabled.
         """
-        if log_with_frame_info:
-            logger_frame = inspect.currentframe()
-            caller_frame = logger_frame.f_back
-            message = self.message_and_metadata(message, caller_frame)
-        self.logger.warning(message)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.__log(logging.WARNING, message, log_with_frame_info, args)
 
-    def error(self, message: str, log_with_frame_info: bool = True) -> None:
+    def error(
+        self,
+        message: str | Callable[[], str],
+        log_with_frame_info: bool = True,
+        *,
+        args: tuple = (),
+    ) -> None:
         """
         Logs an error level message.
+
+        message: Text, %-style format with args, or function returning the text. Formatting and
+            the function are skipped if the level is disabled.
         """
-        if log_with_frame_info:
-            logger_frame = inspect.currentframe()
-            caller_frame = logger_frame.f_back
-            message = self.message_and_metadata(message, caller_frame)
-        self.logger.error(message)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.__log(logging.ERROR, message, log_with_frame_info, args)
 
-    def critical(self, message: str, log_with_frame_info: bool = True) -> None:
+    def critical(
+        self,
+        message: str | Callable[[], str],
+        log_with_frame_info: bool = True,
+        *,
+        args: tuple = (),
+    ) -> None:
         """
         Logs a critical level message.
+
+        message: Text, %-style format with args, or function returning the text. Formatting and
+            the function are skipped if the level is disabled.
         """
-        if log_with_frame_info:
-            logger_frame = inspect.currentframe()
-            caller_frame = logger_frame.f_back
-            message = self.message_and_metadata(message, caller_frame)
-        self.logger.critical(message)
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.__log(logging.CRITICAL, message, log_with_frame_info, args)
 
     def save_image(
         self,
@@ -193,27 +393,27 @@ class Logger:
         log_with_frame_info: bool = True,
     ) -> None:
         """
-        Logs an image.
+        Logs an image. Format, sampling, and whether it is saved on a separate thread are set in
+        the configuration file. Images skipped or dropped are counted by image_sink.
 
         Args:
             image: The image to log.
             filename: The filename to save the image as.
             log_with_frame_info: Whether to log the frame info.
         """
-        if self.__maybe_log_directory is None:
+        if self.__maybe_image_sink is None:
             self.logger.warning("Image not saved: Logger not set up with file logging")
             return
 
         # Get Pylance to stop complaining
-        assert self.__maybe_log_directory is not None
+        assert self.__maybe_image_sink is not None
 
-        full_file_name = (
-            f"{self.logger.name}_{int(time.time())}_{filename}.png"
-            if filename != ""
-            else f"{self.logger.name}_{int(time.time())}.png"
-        )
-        filepath = pathlib.Path(self.__maybe_log_directory, full_file_name)
+        result, full_file_name = self.__maybe_image_sink.save(image, filename)
+        if not result:
+            return
 
-        cv2.imwrite(str(filepath), image)
+        if self.__maybe_image_sink.is_queued:
+            self.info(f"Image queued to be saved as: {full_file_name}", log_with_frame_info)
+            return
 
         self.info(f"Image saved as: {full_file_name}", log_with_frame_info)
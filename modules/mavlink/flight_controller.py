@@ -10,6 +10,7 @@ from modules.hitl import hitl_base
 
 from . import drone_odometry_global
 from . import dronekit
+from . import local_frame
 from .. import orientation
 from .. import position_global
 
@@ -268,6 +269,9 @@ class FlightController:
         self.hitl = hitl
         self.hitl_instance = hitl_instance
 
+        # Recreated only when the home position changes
+        self.__local_frame = None
+
     def get_odometry(self) -> "tuple[bool, drone_odometry_global.DroneOdometryGlobal | None]":
         """
         Returns odometry data from the drone.
@@ -354,6 +358,32 @@ class FlightController:
 
         return True, position
 
+    def get_local_frame(
+        self, timeout: float, flat_earth: bool = False
+    ) -> "tuple[bool, local_frame.LocalFrame | None]":
+        """
+        Local frame at the home position, for converting between local and global space.
+        The frame is kept between calls and only recreated when the home position changes.
+        timeout: Seconds, see get_home_position().
+        flat_earth: Faster approximation within a few km of home, see LocalFrame.
+        """
+        result, home_position = self.get_home_position(timeout)
+        if not result:
+            return False, None
+
+        if (
+            self.__local_frame is None
+            or self.__local_frame.flat_earth != flat_earth
+            or not self.__local_frame.is_home(home_position)
+        ):
+            result, frame = local_frame.LocalFrame.create(home_position, flat_earth)
+            if not result:
+                return False, None
+
+            self.__local_frame = frame
+
+        return True, self.__local_frame
+
     def upload_commands(self, commands: "list[dronekit.Command]") -> bool:
         """
         Writes a mission to the drone from a list of commands (will overwrite any previous missions).
@@ -2,10 +2,12 @@
 Conversion between local and global space.
 """
 
+import numpy as np
 import pymap3d as pm
 
 from . import drone_odometry_global
 from . import drone_odometry_local
+from . import local_frame
 from .. import location_global
 from .. import location_local
 from .. import position_global
@@ -141,3 +143,104 @@ def drone_odometry_local_from_global(
         drone_position_local,
         odometry_global.orientation,
     )
+
+
+def positions_global_from_positions_local(
+    home_position: position_global.PositionGlobal,
+    local_positions: "position_local.PositionLocalArray | np.ndarray",
+    flat_earth: bool = False,
+) -> "tuple[True, position_global.PositionGlobalArray] | tuple[False, None]":
+    """
+    Local coordinates to global coordinates for many positions in one call.
+    Use LocalFrame to also keep the home position computation between calls.
+
+    home_position: Global.
+    local_positions: Local, or an array of shape (N, 3) of north, east, down.
+    flat_earth: Faster approximation within a few km of home, see LocalFrame.
+
+    Return: Success, global.
+    """
+    # Single positions have their own function, checked before computing the frame
+    if isinstance(local_positions, position_local.PositionLocal):
+        return False, None
+
+    result, frame = local_frame.LocalFrame.create(home_position, flat_earth)
+    if not result:
+        return False, None
+
+    return frame.to_global(local_positions)
+
+
+def positions_global_from_locations_local(
+    home_position: position_global.PositionGlobal,
+    local_locations: "location_local.LocationLocalArray | np.ndarray",
+    flat_earth: bool = False,
+) -> "tuple[True, position_global.PositionGlobalArray] | tuple[False, None]":
+    """
+    Local coordinates to global coordinates for many locations in one call.
+
+    home_position: Global.
+    local_locations: Local, or an array of shape (N, 2) of north, east.
+    flat_earth: Faster approximation within a few km of home, see LocalFrame.
+
+    Return: Success, global.
+    """
+    result, local_locations = location_local.LocationLocalArray.create(local_locations)
+    if not result:
+        return False, None
+
+    local_positions = np.zeros((len(local_locations), 3))
+    local_positions[:, :2] = local_locations.to_array()
+
+    return positions_global_from_positions_local(home_position, local_positions, flat_earth)
+
+
+def positions_local_from_positions_global(
+    home_position: position_global.PositionGlobal,
+    global_positions: "position_global.PositionGlobalArray | np.ndarray",
+    flat_earth: bool = False,
+) -> "tuple[True, position_local.PositionLocalArray] | tuple[False, None]":
+    """
+    Global coordinates to local coordinates for many positions in one call.
+    Use LocalFrame to also keep the home position computation between calls.
+
+    home_position: Global.
+    global_positions: Global, or an array of shape (N, 3) of latitude, longitude, altitude.
+    flat_earth: Faster approximation within a few km of home, see LocalFrame.
+
+    Return: Success, local.
+    """
+    # Single positions have their own function, checked before computing the frame
+    if isinstance(global_positions, position_global.PositionGlobal):
+        return False, None
+
+    result, frame = local_frame.LocalFrame.create(home_position, flat_earth)
+    if not result:
+        return False, None
+
+    return frame.to_local(global_positions)
+
+
+def positions_local_from_locations_global(
+    home_position: position_global.PositionGlobal,
+    global_locations: "location_global.LocationGlobalArray | np.ndarray",
+    flat_earth: bool = False,
+) -> "tuple[True, position_local.PositionLocalArray] | tuple[False, None]":
+    """
+    Global coordinates to local coordinates for many locations in one call.
+    Locations are at the altitude of the home position.
+
+    home_position: Global.
+    global_locations: Global, or an array of shape (N, 2) of latitude, longitude.
+    flat_earth: Faster approximation within a few km of home, see LocalFrame.
+
+    Return: Success, local.
+    """
+    result, global_locations = location_global.LocationGlobalArray.create(global_locations)
+    if not result:
+        return False, None
+
+    global_positions = np.full((len(global_locations), 3), float(home_position.altitude))
+    global_positions[:, :2] = global_locations.to_array()
+
+    return positions_local_from_positions_global(home_position, global_positions, flat_earth)
@@ -0,0 +1,85 @@
+"""
+Wrapper for TCP client socket operations on an asyncio event loop.
+"""
+
+import asyncio
+import socket
+
+from .async_socket_wrapper import AsyncTcpSocket
+
+
+class AsyncTcpClientSocket(AsyncTcpSocket):
+    """
+    Wrapper for TCP client socket operations on an asyncio event loop.
+    """
+
+    __create_key = object()
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        connection_timeout: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+
+        assert class_private_create_key is AsyncTcpClientSocket.__create_key, "Use create() method"
+
+        super().__init__(reader, writer, connection_timeout)
+
+    @classmethod
+    async def create(
+        cls,
+        instance: socket.socket = None,
+        host: str = "localhost",
+        port: int = 5000,
+        connection_timeout: float = 60.0,
+    ) -> "tuple[bool, AsyncTcpClientSocket | None]":
+        """
+        Establishes socket connection through provided host and port.
+
+        Parameters
+        ----------
+        instance: socket.socket (default None)
+            For initializing Socket with an existing connected socket object.
+        host: str (default "localhost")
+        port: int (default 5000)
+            The host combined with the port will form an address (e.g. localhost:5000)
+        connection_timeout: float (default 60.0)
+            Timeout for establishing connection and for operations such as receive, in seconds
+
+        Returns
+        -------
+        tuple[bool, AsyncTcpClientSocket | None]
+            The first parameter represents if the socket creation is successful.
+            - If it is not successful, the second parameter will be None.
+            - If it is successful, the second parameter will be the created
+              AsyncTcpClientSocket object.
+        """
+
+        if connection_timeout <= 0:
+            print("Must be a positive non-zero value")
+            return False, None
+
+        try:
+            if instance is not None:
+                connection = asyncio.open_connection(sock=instance)
+            else:
+                connection = asyncio.open_connection(host, port)
+
+            reader, writer = await asyncio.wait_for(connection, connection_timeout)
+            return True, AsyncTcpClientSocket(cls.__create_key, reader, writer, connection_timeout)
+        except asyncio.TimeoutError:
+            print("Connection timed out.")
+        except socket.gaierror as e:
+            print(
+                f"Could not connect to socket, address related error: {e}. "
+                "Make sure the host and port are correct."
+            )
+        except socket.error as e:
+            print(f"Could not connect to socket, connection error: {e}.")
+
+        return False, None
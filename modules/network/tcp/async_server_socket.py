@@ -0,0 +1,244 @@
+"""
+Wrapper for TCP server socket operations on an asyncio event loop.
+"""
+
+import asyncio
+import socket
+from typing import Awaitable, Callable
+
+from .async_socket_wrapper import AsyncTcpSocket
+
+
+class AsyncTcpServerSocket(AsyncTcpSocket):
+    """
+    Wrapper for TCP server socket operations on an asyncio event loop.
+    """
+
+    __create_key = object()
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        connection_timeout: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+
+        assert class_private_create_key is AsyncTcpServerSocket.__create_key, "Use create() method"
+
+        super().__init__(reader, writer, connection_timeout)
+
+    @classmethod
+    async def create(
+        cls,
+        host: str = "",
+        port: int = 5000,
+        connection_timeout: float = 60.0,
+    ) -> "tuple[bool, AsyncTcpServerSocket | None]":
+        """
+        Waits for a single connection on the provided host and port, like TcpServerSocket.
+        Other tasks on the event loop keep running while waiting.
+        To accept many connections, use AsyncTcpServer instead.
+
+        Parameters
+        ----------
+        host: str (default "")
+            Empty string is interpreted as all addresses (IPv4 and IPv6 where available).
+        port: int (default 5000)
+            The host combined with the port will form an address (e.g. localhost:5000)
+        connection_timeout: float (default 60.0)
+            Timeout for accepting the connection and for operations such as receive, in seconds
+
+        Returns
+        -------
+        tuple[bool, AsyncTcpServerSocket | None]
+            The first parameter represents if the socket creation is successful.
+            - If it is not successful, the second parameter will be None.
+            - If it is successful, the second parameter will be the created
+              AsyncTcpServerSocket object.
+        """
+
+        if connection_timeout <= 0:
+            print("Must be a positive non-zero value")
+            return False, None
+
+        loop = asyncio.get_running_loop()
+        connection = loop.create_future()
+
+        def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            if connection.done():
+                # Only the first connection is accepted
+                writer.close()
+                return
+
+            connection.set_result((reader, writer))
+
+        try:
+            server = await asyncio.start_server(on_connect, host or None, port)
+        except socket.gaierror as e:
+            print(
+                f"Could not connect to socket, address related error: {e}. "
+                "Make sure the host and port are correct."
+            )
+            return False, None
+        except socket.error as e:
+            print(f"Could not connect to socket, connection error: {e}.")
+            return False, None
+
+        if host == "":
+            print(f"Listening for external connections on port {port}")
+        else:
+            print(f"Listening for internal connections on {host}:{port}")
+
+        try:
+            reader, writer = await asyncio.wait_for(connection, connection_timeout)
+        except asyncio.TimeoutError:
+            print("Connection timed out.")
+            return False, None
+        finally:
+            server.close()
+            print("No longer accepting new connections.")
+
+        addr = writer.get_extra_info("peername")
+        print(f"Accepted a connection from {addr[0]}:{addr[1]}")
+
+        return True, AsyncTcpServerSocket(cls.__create_key, reader, writer, connection_timeout)
+
+
+class AsyncTcpServer:
+    """
+    Accepts any number of connections, each handled by its own task on the event loop.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    async def create(
+        cls,
+        handler: Callable[[AsyncTcpSocket], Awaitable[None]],
+        host: str = "",
+        port: int = 5000,
+        connection_timeout: float = 60.0,
+    ) -> "tuple[bool, AsyncTcpServer | None]":
+        """
+        Starts listening on the provided host and port.
+
+        Parameters
+        ----------
+        handler: Callable[[AsyncTcpSocket], Awaitable[None]]
+            Coroutine function called with each new connection.
+            The connection is closed when it returns.
+        host: str (default "")
+            Empty string is interpreted as all addresses (IPv4 and IPv6 where available).
+        port: int (default 5000)
+            0 picks a free port, see address().
+        connection_timeout: float (default 60.0)
+            Timeout for operations such as receive on each connection, in seconds
+
+        Returns
+        -------
+        tuple[bool, AsyncTcpServer | None]
+            The first parameter represents if the server creation is successful.
+            - If it is not successful, the second parameter will be None.
+            - If it is successful, the second parameter will be the created AsyncTcpServer object.
+        """
+
+        if connection_timeout <= 0:
+            print("Must be a positive non-zero value")
+            return False, None
+
+        instance = AsyncTcpServer(cls.__create_key, handler, connection_timeout)
+
+        try:
+            await instance.__start(host, port)
+        except socket.gaierror as e:
+            print(
+                f"Could not connect to socket, address related error: {e}. "
+                "Make sure the host and port are correct."
+            )
+            return False, None
+        except socket.error as e:
+            print(f"Could not connect to socket, connection error: {e}.")
+            return False, None
+
+        return True, instance
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        handler: Callable[[AsyncTcpSocket], Awaitable[None]],
+        connection_timeout: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+
+        assert class_private_create_key is AsyncTcpServer.__create_key, "Use create() method"
+
+        self.__handler = handler
+        self.__connection_timeout = connection_timeout
+        self.__server = None
+        self.__handler_tasks = set()
+
+        self.connection_count = 0
+        self.active_connection_count = 0
+
+    # Called by create(), pylint does not see accesses through the instance
+    # pylint: disable-next=unused-private-member
+    async def __start(self, host: str, port: int) -> None:
+        """
+        Binds and starts accepting connections.
+        """
+
+        self.__server = await asyncio.start_server(self.__on_connect, host or None, port)
+
+    async def __on_connect(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Runs the handler for a new connection and closes it afterwards.
+        """
+
+        task = asyncio.current_task()
+        self.__handler_tasks.add(task)
+        self.connection_count += 1
+        self.active_connection_count += 1
+
+        connection = AsyncTcpSocket(reader, writer, self.__connection_timeout)
+        try:
+            await self.__handler(connection)
+        finally:
+            await connection.close()
+            self.active_connection_count -= 1
+            self.__handler_tasks.discard(task)
+
+    def address(self) -> "tuple[str, int]":
+        """
+        Retrieves the address that the server is listening on.
+
+        Returns
+        -------
+        tuple[str, int]
+            The address in the format (ip address, port).
+        """
+
+        return self.__server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        """
+        Accepts connections until closed or cancelled.
+        """
+
+        await self.__server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Stops accepting new connections and waits for the handlers of existing connections
+        to return.
+        """
+
+        self.__server.close()
+        await asyncio.gather(*self.__handler_tasks, return_exceptions=True)
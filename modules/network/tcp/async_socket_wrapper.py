@@ -0,0 +1,234 @@
+"""
+Wrapper for a TCP connection on an asyncio event loop.
+"""
+
+import asyncio
+
+from .socket_wrapper import (
+    DEFAULT_MAX_RECV_SIZE,
+    DISCARD_CHUNK_SIZE,
+    MAX_MESSAGE_SIZE,
+    MESSAGE_HEADER,
+)
+
+
+class AsyncTcpSocket:
+    """
+    Wrapper for a TCP connection on an asyncio event loop.
+    Same contract as TcpSocket, but the methods are coroutines.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        connection_timeout: float | None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        reader: asyncio.StreamReader
+        writer: asyncio.StreamWriter
+            Both ends of the connection, from asyncio.open_connection() or asyncio.start_server().
+        connection_timeout: float | None
+            Timeout for operations such as receive, in seconds. None is no timeout.
+        """
+
+        self.__reader = reader
+        self.__writer = writer
+        self.__connection_timeout = connection_timeout
+
+    async def send(self, data: bytes) -> bool:
+        """
+        Sends all data at once over the socket.
+        Waits while the send buffer is full, letting other tasks run.
+
+        Parameters
+        ----------
+        data: bytes
+
+        Returns
+        -------
+        bool: If the data was sent successfully.
+        """
+
+        try:
+            self.__writer.write(data)
+            await self.__drain()
+        except (OSError, asyncio.TimeoutError) as e:
+            print(f"Could not send data: {e}.")
+            return False
+
+        return True
+
+    async def recv(self, buf_size: int) -> "tuple[bool, bytes | None]":
+        """
+        Reads buf_size bytes from the socket.
+
+        Parameters
+        ----------
+        buf_size: int
+            The number of bytes to receive.
+
+        Returns
+        -------
+        tuple[bool, bytes | None]
+            The first parameter represents if the read is successful.
+            - If it is not successful, the second parameter will be None.
+            - If it is successful, the second parameter will be the data that is read.
+        """
+
+        try:
+            async with asyncio.timeout(self.__connection_timeout):
+                data = await self.__reader.readexactly(buf_size)
+        except asyncio.IncompleteReadError:
+            print("Socket connection broken")
+            return False, None
+        except (OSError, asyncio.TimeoutError) as e:
+            print(f"Could not receive data: {e}.")
+            return False, None
+
+        return True, data
+
+    async def send_message(self, data: bytes) -> bool:
+        """
+        Sends data prefixed with its length so the receiver can use recv_message().
+        Compatible with TcpSocket.recv_message() on the other end.
+
+        Parameters
+        ----------
+        data: bytes
+            Any object supporting the buffer protocol (e.g. bytes, bytearray, np.ndarray).
+
+        Returns
+        -------
+        bool: If the data was sent successfully.
+        """
+
+        payload = memoryview(data).cast("B")
+        if payload.nbytes > MAX_MESSAGE_SIZE:
+            print(f"Message too large: {payload.nbytes} bytes.")
+            return False
+
+        # Both are queued in the transport before draining, so they are sent together
+        try:
+            self.__writer.writelines([MESSAGE_HEADER.pack(payload.nbytes), payload])
+            await self.__drain()
+        except (OSError, asyncio.TimeoutError) as e:
+            print(f"Could not send data: {e}.")
+            return False
+
+        return True
+
+    async def recv_message(
+        self, max_message_size: int = DEFAULT_MAX_RECV_SIZE
+    ) -> "tuple[bool, bytes | None]":
+        """
+        Reads a message sent with send_message().
+        Compatible with TcpSocket.send_message() on the other end.
+
+        Parameters
+        ----------
+        max_message_size: int (default DEFAULT_MAX_RECV_SIZE)
+            Bytes, larger messages are discarded without allocating a buffer for them.
+
+        Returns
+        -------
+        tuple[bool, bytes | None]
+            The first parameter represents if the read is successful.
+            - If it is not successful, the second parameter will be None.
+            - If it is successful, the second parameter will be the message.
+        """
+
+        # One timeout for the whole message, scheduling a timer per read is expensive
+        try:
+            async with asyncio.timeout(self.__connection_timeout):
+                header = await self.__reader.readexactly(MESSAGE_HEADER.size)
+                (message_size,) = MESSAGE_HEADER.unpack(header)
+                if message_size > max_message_size:
+                    print(
+                        f"Message too large: {message_size} bytes, "
+                        f"limit is {max_message_size} bytes."
+                    )
+                    # Keep the stream framed
+                    await self.__discard(message_size)
+                    return False, None
+
+                data = await self.__reader.readexactly(message_size)
+        except asyncio.IncompleteReadError:
+            print("Socket connection broken")
+            return False, None
+        except (OSError, asyncio.TimeoutError) as e:
+            print(f"Could not receive data: {e}.")
+            return False, None
+
+        return True, data
+
+    async def __discard(self, size: int) -> None:
+        """
+        Reads and drops size bytes from the stream, in chunks of at most DISCARD_CHUNK_SIZE.
+
+        Parameters
+        ----------
+        size: int
+            The number of bytes to drop.
+        """
+
+        while size > 0:
+            chunk = await self.__reader.readexactly(min(size, DISCARD_CHUNK_SIZE))
+            size -= len(chunk)
+
+    async def __drain(self) -> None:
+        """
+        Waits until the send buffer is below its high water mark.
+        """
+
+        # Nothing to wait for, skip scheduling the timeout
+        if self.__writer.transport.get_write_buffer_size() == 0:
+            await self.__writer.drain()
+            return
+
+        async with asyncio.timeout(self.__connection_timeout):
+            await self.__writer.drain()
+
+    async def close(self) -> bool:
+        """
+        Closes the connection. All future operations on the socket object will fail.
+
+        Returns
+        -------
+        bool: If the socket was closed successfully.
+        """
+
+        self.__writer.close()
+        try:
+            await self.__writer.wait_closed()
+        except OSError as e:
+            print(f"Could not close socket: {e}.")
+            return False
+
+        return True
+
+    def address(self) -> "tuple[str, int]":
+        """
+        Retrieves the local address of the socket.
+
+        Returns
+        -------
+        tuple[str, int]
+            The address in the format (ip address, port).
+        """
+
+        return self.__writer.get_extra_info("sockname")
+
+    def peer_address(self) -> "tuple[str, int]":
+        """
+        Retrieves the address of the other end of the connection.
+
+        Returns
+        -------
+        tuple[str, int]
+            The address in the format (ip address, port).
+        """
+
+        return self.__writer.get_extra_info("peername")
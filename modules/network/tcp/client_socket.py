@@ -4,6 +4,7 @@ Wrapper for TCP client socket operations.
 
 import socket
 
+from .connection_profile import ConnectionProfile
 from .socket_wrapper import TcpSocket
 
 
@@ -30,6 +31,7 @@ class TcpClientSocket(TcpSocket):
         host: str = "localhost",
         port: int = 5000,
         connection_timeout: float = 60.0,
+        profile: ConnectionProfile | None = None,
     ) -> "tuple[bool, TcpClientSocket | None]":
         """
         Establishes socket connection through provided host and port.
@@ -43,6 +45,9 @@ class TcpClientSocket(TcpSocket):
             The host combined with the port will form an address (e.g. localhost:5000)
         connection_timeout: float (default 60.0)
             Timeout for establishing connection, in seconds
+        profile: ConnectionProfile | None (default None)
+            Socket options to apply once connected (e.g. TCP_NODELAY, keepalive, buffer sizes).
+            Its timeout replaces connection_timeout for later operations.
 
         Returns
         -------
@@ -64,6 +69,10 @@ class TcpClientSocket(TcpSocket):
 
         try:
             socket_instance = socket.create_connection((host, port), connection_timeout)
+            if profile is not None and not profile.apply(socket_instance):
+                socket_instance.close()
+                return False, None
+
             return True, TcpClientSocket(cls.__create_key, socket_instance)
         except TimeoutError:
             print("Connection timed out.")
@@ -0,0 +1,83 @@
+"""
+TCP socket options for a link.
+"""
+
+import socket
+
+
+# Plain configuration, one attribute per option
+# pylint: disable-next=too-many-instance-attributes
+class ConnectionProfile:
+    """
+    Socket options applied to each connection.
+    The defaults favour low latency and quick detection of a dead link (e.g. radio dropout).
+    """
+
+    def __init__(
+        self,
+        connection_timeout: float = 5.0,
+        no_delay: bool = True,
+        keepalive: bool = True,
+        keepalive_idle: int = 1,
+        keepalive_interval: int = 1,
+        keepalive_count: int = 3,
+        send_buffer_size: int | None = None,
+        recv_buffer_size: int | None = None,
+    ) -> None:
+        """
+        connection_timeout: Seconds for connecting and for operations such as receive.
+        no_delay: Disable Nagle's algorithm (TCP_NODELAY) so small messages are sent immediately.
+        keepalive: Send keepalive probes while idle, so a dead link is detected without sending.
+        keepalive_idle: Seconds idle before the first probe.
+        keepalive_interval: Seconds between probes.
+        keepalive_count: Unanswered probes before the connection is considered dead.
+        send_buffer_size: Bytes (SO_SNDBUF). None keeps the system default.
+        recv_buffer_size: Bytes (SO_RCVBUF). None keeps the system default.
+        """
+        self.connection_timeout = connection_timeout
+        self.no_delay = no_delay
+        self.keepalive = keepalive
+        self.keepalive_idle = keepalive_idle
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count = keepalive_count
+        self.send_buffer_size = send_buffer_size
+        self.recv_buffer_size = recv_buffer_size
+
+    def apply(self, socket_instance: socket.socket) -> bool:
+        """
+        Sets the options on a TCP socket.
+        Keepalive timing is only set where the platform supports it.
+
+        socket_instance: TCP socket.
+
+        Return: Success.
+        """
+        try:
+            socket_instance.settimeout(self.connection_timeout)
+            socket_instance.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(self.no_delay))
+            socket_instance.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, int(self.keepalive))
+
+            if self.keepalive:
+                for option_name, value in [
+                    ("TCP_KEEPIDLE", self.keepalive_idle),
+                    ("TCP_KEEPINTVL", self.keepalive_interval),
+                    ("TCP_KEEPCNT", self.keepalive_count),
+                ]:
+                    option = getattr(socket, option_name, None)
+                    if option is not None:
+                        socket_instance.setsockopt(socket.IPPROTO_TCP, option, value)
+
+            if self.send_buffer_size is not None:
+                socket_instance.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size
+                )
+
+            if self.recv_buffer_size is not None:
+                socket_instance.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_RCVBUF, self.recv_buffer_size
+                )
+        except socket.error as e:
+            print(f"Could not set socket options: {e}.")
+            return False
+
+        return True
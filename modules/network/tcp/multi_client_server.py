@@ -0,0 +1,562 @@
+"""
+TCP server accepting any number of clients, on a single thread with a selector (e.g. epoll).
+"""
+
+import selectors
+import socket
+from typing import Callable
+
+from .socket_wrapper import MAX_MESSAGE_SIZE, MESSAGE_HEADER
+
+
+READ_BUFFER_SIZE = 2**16  # Bytes received per system call, grows for larger messages
+MAX_SEND_BUFFER_SIZE = 2**22  # 4 MB queued per connection, more messages are dropped
+MAX_SEND_BUFFERS = 64  # Buffers per scatter-gather system call
+ACCEPTS_PER_EVENT = 16  # Limits time spent accepting so clients are not starved
+
+
+# Statistics are exposed as attributes
+# pylint: disable-next=too-many-instance-attributes
+class TcpServerConnection:
+    """
+    Non-blocking connection to one client of TcpMultiClientServer.
+    Sends are queued and written when the socket is writable, so they never block.
+    Not thread-safe: only use from the thread calling TcpMultiClientServer.run_once().
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        socket_instance: socket.socket,
+        address: tuple,
+        selector: selectors.BaseSelector,
+        handler: "Callable[[TcpServerConnection, memoryview], None]",
+        close_callback: "Callable[[TcpServerConnection], None]",
+        max_send_buffer_size: int,
+        max_message_size: int,
+    ) -> "tuple[True, TcpServerConnection] | tuple[False, None]":
+        """
+        socket_instance: Accepted socket, is set to non-blocking.
+        address: Address of the client.
+        selector: Selector of the server, the socket is registered with it.
+        handler: Called with this connection and a view of each message.
+        close_callback: Called when the connection closes.
+        max_send_buffer_size: Bytes which can be queued before messages are dropped.
+        max_message_size: Larger incoming messages close the connection.
+
+        Return: Success, object.
+        """
+        connection = TcpServerConnection(
+            cls.__create_key,
+            socket_instance,
+            address,
+            selector,
+            handler,
+            close_callback,
+            max_send_buffer_size,
+            max_message_size,
+        )
+
+        try:
+            socket_instance.setblocking(False)
+            selector.register(socket_instance, selectors.EVENT_READ, connection)
+        except (OSError, ValueError) as e:
+            print(f"Could not register connection: {e}.")
+            return False, None
+
+        return True, connection
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        socket_instance: socket.socket,
+        address: tuple,
+        selector: selectors.BaseSelector,
+        handler: "Callable[[TcpServerConnection, memoryview], None]",
+        close_callback: "Callable[[TcpServerConnection], None]",
+        max_send_buffer_size: int,
+        max_message_size: int,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is TcpServerConnection.__create_key, "Use create() method."
+
+        self.__socket = socket_instance
+        self.__address = address
+        self.__selector = selector
+        self.__handler = handler
+        self.__close_callback = close_callback
+        self.__max_send_buffer_size = max_send_buffer_size
+        self.__max_message_size = max_message_size
+        self.__events = selectors.EVENT_READ
+        self.__is_closed = False
+
+        self.__read_buffer = bytearray(READ_BUFFER_SIZE)
+        self.__read_view = memoryview(self.__read_buffer)
+        self.__read_size = 0
+
+        self.__send_queue = []
+        self.__send_queue_size = 0
+
+        self.messages_received = 0
+        self.messages_sent = 0
+        self.messages_dropped = 0
+
+    def send(self, data: bytes) -> bool:
+        """
+        Queues data to be sent as is.
+
+        data: Any object supporting the buffer protocol (e.g. bytes, bytearray, np.ndarray).
+
+        Return: False if the connection is closed or the send queue is full.
+        """
+        return self.__queue([memoryview(data).cast("B")])
+
+    def send_message(self, data: bytes) -> bool:
+        """
+        Queues data prefixed with its length, for TcpSocket.recv_message() on the client.
+
+        data: Any object supporting the buffer protocol (e.g. bytes, bytearray, np.ndarray).
+
+        Return: False if the connection is closed or the send queue is full.
+        """
+        payload = memoryview(data).cast("B")
+        if payload.nbytes > MAX_MESSAGE_SIZE:
+            print(f"Message too large: {payload.nbytes} bytes.")
+            return False
+
+        return self.__queue([memoryview(MESSAGE_HEADER.pack(payload.nbytes)), payload])
+
+    def get_send_queue_size(self) -> int:
+        """
+        Bytes waiting to be sent.
+        """
+        return self.__send_queue_size
+
+    def is_reading_paused(self) -> bool:
+        """
+        Whether messages from the client are not read because too much is waiting to be sent.
+        """
+        return not self.__events & selectors.EVENT_READ and not self.__is_closed
+
+    def is_closed(self) -> bool:
+        """
+        Whether the connection is closed.
+        """
+        return self.__is_closed
+
+    def close(self) -> bool:
+        """
+        Closes the connection, discarding anything not sent yet.
+
+        Return: If the socket was closed successfully.
+        """
+        if self.__is_closed:
+            return True
+
+        self.__is_closed = True
+        self.__events = 0
+        self.__send_queue.clear()
+        self.__send_queue_size = 0
+
+        try:
+            self.__selector.unregister(self.__socket)
+        except (KeyError, ValueError):
+            pass
+
+        try:
+            self.__socket.close()
+        except socket.error as e:
+            print(f"Could not close socket: {e}.")
+            return False
+        finally:
+            self.__close_callback(self)
+
+        return True
+
+    def address(self) -> "tuple[str, int]":
+        """
+        Retrieves the address of the client.
+
+        Return: The address in the format (ip address, port).
+        """
+        return self.__address[:2]
+
+    def handle_read(self) -> None:
+        """
+        Receives available data and calls the handler for each complete message.
+        Called by the server when the socket is readable.
+        """
+        try:
+            size = self.__socket.recv_into(self.__read_view[self.__read_size :])
+        except (BlockingIOError, InterruptedError):
+            return
+        except socket.error as e:
+            print(f"Could not receive data: {e}.")
+            self.close()
+            return
+
+        if size == 0:
+            # Client disconnected
+            self.close()
+            return
+
+        self.__read_size += size
+        self.__dispatch()
+
+    def handle_write(self) -> None:
+        """
+        Sends queued data. Called by the server when the socket is writable.
+        """
+        self.__flush()
+
+        # Messages left in the read buffer while reading was paused
+        if not self.__is_closed and not self.__is_send_queue_congested():
+            self.__dispatch()
+
+    def __dispatch(self) -> None:
+        """
+        Calls the handler for each complete message in the read buffer,
+        until the send queue is congested.
+        """
+        # Messages are handled in place, without copying them out of the read buffer
+        start = 0
+        while (
+            self.__read_size - start >= MESSAGE_HEADER.size and not self.__is_send_queue_congested()
+        ):
+            (message_size,) = MESSAGE_HEADER.unpack_from(self.__read_buffer, start)
+            if message_size > self.__max_message_size:
+                print(f"Message too large: {message_size} bytes.")
+                self.close()
+                return
+
+            end = start + MESSAGE_HEADER.size + message_size
+            if end > self.__read_size:
+                break
+
+            self.messages_received += 1
+            self.__handler(self, self.__read_view[start + MESSAGE_HEADER.size : end])
+            if self.__is_closed:
+                return
+
+            start = end
+
+        if start > 0:
+            # Move the rest to the front
+            remaining = self.__read_size - start
+            self.__read_buffer[:remaining] = self.__read_buffer[start : self.__read_size]
+            self.__read_size = remaining
+
+        if self.__read_size >= MESSAGE_HEADER.size:
+            (message_size,) = MESSAGE_HEADER.unpack_from(self.__read_buffer)
+            # Checked before growing, the loop above does not run while the send queue is congested
+            if message_size > self.__max_message_size:
+                print(f"Message too large: {message_size} bytes.")
+                self.close()
+                return
+
+            required_size = MESSAGE_HEADER.size + message_size
+            if required_size > len(self.__read_buffer):
+                # Replace instead of resizing, as the handler may still hold a view of the old one
+                buffer = bytearray(required_size)
+                buffer[: self.__read_size] = self.__read_view[: self.__read_size]
+                self.__read_buffer = buffer
+                self.__read_view = memoryview(buffer)
+
+        self.__update_events()
+
+    def __queue(self, buffers: "list[memoryview]") -> bool:
+        """
+        Sends what the socket accepts now and queues a copy of the rest.
+        """
+        if self.__is_closed:
+            return False
+
+        size = sum(buffer.nbytes for buffer in buffers)
+        if self.__send_queue_size + size > self.__max_send_buffer_size:
+            self.messages_dropped += 1
+            return False
+
+        was_empty = len(self.__send_queue) == 0
+        self.__send_queue += buffers
+        self.__send_queue_size += size
+        self.messages_sent += 1
+
+        # Try to send immediately, only data which could not be sent is copied
+        if was_empty:
+            self.__flush()
+        else:
+            self.__update_events()
+
+        if self.__is_closed:
+            return False
+
+        # Unsent parts of the new buffers are at the end of the queue
+        for i in range(max(len(self.__send_queue) - len(buffers), 0), len(self.__send_queue)):
+            if not isinstance(self.__send_queue[i].obj, bytes):
+                # Caller may modify its buffer after returning
+                self.__send_queue[i] = memoryview(bytes(self.__send_queue[i]))
+
+        return True
+
+    def __flush(self) -> None:
+        """
+        Sends queued data until the socket would block, then updates the selector events.
+        """
+        try:
+            while len(self.__send_queue) > 0:
+                if hasattr(self.__socket, "sendmsg"):
+                    bytes_sent = self.__socket.sendmsg(self.__send_queue[:MAX_SEND_BUFFERS])
+                else:
+                    bytes_sent = self.__socket.send(self.__send_queue[0])
+
+                self.__send_queue_size -= bytes_sent
+
+                # Drop the buffers which have been fully sent, and trim a partially sent one
+                sent_count = 0
+                while (
+                    sent_count < len(self.__send_queue)
+                    and bytes_sent >= self.__send_queue[sent_count].nbytes
+                ):
+                    bytes_sent -= self.__send_queue[sent_count].nbytes
+                    sent_count += 1
+
+                del self.__send_queue[:sent_count]
+                if bytes_sent > 0:
+                    self.__send_queue[0] = self.__send_queue[0][bytes_sent:]
+        except (BlockingIOError, InterruptedError):
+            pass
+        except socket.error as e:
+            print(f"Could not send data: {e}.")
+            self.close()
+            return
+
+        self.__update_events()
+
+    def __is_send_queue_congested(self) -> bool:
+        """
+        More than half of the send queue limit is used.
+        """
+        return self.__send_queue_size > self.__max_send_buffer_size // 2
+
+    def __update_events(self) -> None:
+        """
+        Waits for writability while data is queued.
+        Stops reading while more than half of the send queue limit is used, so a client which
+        sends requests without reading the replies is slowed down instead of dropping replies.
+        """
+        # Socket is already unregistered
+        if self.__is_closed:
+            return
+
+        events = 0
+        if not self.__is_send_queue_congested() and self.__read_size < len(self.__read_buffer):
+            events |= selectors.EVENT_READ
+        if len(self.__send_queue) > 0:
+            events |= selectors.EVENT_WRITE
+
+        if events == self.__events:
+            return
+
+        if events == 0:
+            self.__selector.unregister(self.__socket)
+        elif self.__events == 0:
+            self.__selector.register(self.__socket, events, self)
+        else:
+            self.__selector.modify(self.__socket, events, self)
+
+        self.__events = events
+
+
+# Settings are passed on to each new connection
+# pylint: disable-next=too-many-instance-attributes
+class TcpMultiClientServer:
+    """
+    Listens for clients and dispatches each complete framed message (see TcpSocket.send_message())
+    to a handler. All clients are served by the thread calling run_once().
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        handler: "Callable[[TcpServerConnection, memoryview], None]",
+        host: str = "",
+        port: int = 5000,
+        max_send_buffer_size: int = MAX_SEND_BUFFER_SIZE,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        connect_handler: "Callable[[TcpServerConnection], None] | None" = None,
+        disconnect_handler: "Callable[[TcpServerConnection], None] | None" = None,
+    ) -> "tuple[True, TcpMultiClientServer] | tuple[False, None]":
+        """
+        handler: Called with the connection and a view of each message.
+            The view is only valid during the call, copy it (e.g. bytes(message)) to keep it.
+            Replies can be sent with connection.send_message().
+        host: Empty string is interpreted as all addresses (IPv4 and IPv6 where available).
+        port: 0 picks a free port, see address().
+        max_send_buffer_size: Bytes which can be queued per connection before messages are dropped.
+        max_message_size: Larger incoming messages close the connection.
+        connect_handler: Called with each new connection.
+        disconnect_handler: Called with each closed connection.
+
+        Return: Success, object.
+        """
+        if max_send_buffer_size <= 0:
+            print("Maximum send buffer size must be a positive non-zero value.")
+            return False, None
+
+        try:
+            if host == "" and socket.has_dualstack_ipv6():
+                # Accept both IPv6 and IPv4 on all addresses if possible
+                server = socket.create_server(
+                    (host, port), family=socket.AF_INET6, dualstack_ipv6=True
+                )
+            else:
+                server = socket.create_server((host, port))
+            server.setblocking(False)
+        except socket.gaierror as e:
+            print(
+                f"Could not create socket, address related error: {e}. "
+                "Make sure the host and port are correct."
+            )
+            return False, None
+        except socket.error as e:
+            print(f"Could not create socket, error: {e}.")
+            return False, None
+
+        selector = selectors.DefaultSelector()
+        selector.register(server, selectors.EVENT_READ, None)
+
+        if host == "":
+            print(f"Listening for external connections on port {port}")
+        else:
+            print(f"Listening for internal connections on {host}:{port}")
+
+        return True, TcpMultiClientServer(
+            cls.__create_key,
+            server,
+            selector,
+            handler,
+            max_send_buffer_size,
+            max_message_size,
+            connect_handler,
+            disconnect_handler,
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        server: socket.socket,
+        selector: selectors.BaseSelector,
+        handler: "Callable[[TcpServerConnection, memoryview], None]",
+        max_send_buffer_size: int,
+        max_message_size: int,
+        connect_handler: "Callable[[TcpServerConnection], None] | None",
+        disconnect_handler: "Callable[[TcpServerConnection], None] | None",
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is TcpMultiClientServer.__create_key, "Use create() method."
+
+        self.__server = server
+        self.__selector = selector
+        self.__handler = handler
+        self.__max_send_buffer_size = max_send_buffer_size
+        self.__max_message_size = max_message_size
+        self.__connect_handler = connect_handler
+        self.__disconnect_handler = disconnect_handler
+
+        self.__connections = set()
+
+        self.connection_count = 0
+
+    def run_once(self, timeout: float | None = None) -> None:
+        """
+        Waits for socket events and handles them: accepts clients, receives messages and
+        calls the handler, and sends queued data.
+
+        timeout: Seconds to wait for an event. None waits indefinitely, 0 does not wait.
+        """
+        for key, events in self.__selector.select(timeout):
+            connection = key.data
+            if connection is None:
+                self.__accept()
+                continue
+
+            if events & selectors.EVENT_WRITE:
+                connection.handle_write()
+            if events & selectors.EVENT_READ and not connection.is_closed():
+                connection.handle_read()
+
+    def get_connections(self) -> "list[TcpServerConnection]":
+        """
+        Connections which are open.
+        """
+        return list(self.__connections)
+
+    def address(self) -> "tuple[str, int]":
+        """
+        Retrieves the address that the server is listening on.
+
+        Return: The address in the format (ip address, port).
+        """
+        return self.__server.getsockname()[:2]
+
+    def close(self) -> None:
+        """
+        Stops listening and closes all connections.
+        """
+        for connection in list(self.__connections):
+            connection.close()
+
+        self.__selector.unregister(self.__server)
+        self.__server.close()
+        self.__selector.close()
+
+    def __accept(self) -> None:
+        """
+        Accepts pending clients.
+        """
+        for _ in range(ACCEPTS_PER_EVENT):
+            try:
+                socket_instance, addr = self.__server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except socket.error as e:
+                print(f"Could not accept connection: {e}.")
+                return
+
+            result, connection = TcpServerConnection.create(
+                socket_instance,
+                addr,
+                self.__selector,
+                self.__handler,
+                self.__on_close,
+                self.__max_send_buffer_size,
+                self.__max_message_size,
+            )
+            if not result:
+                socket_instance.close()
+                continue
+
+            print(f"Accepted a connection from {addr[0]}:{addr[1]}")
+
+            self.__connections.add(connection)
+            self.connection_count += 1
+
+            if self.__connect_handler is not None:
+                self.__connect_handler(connection)
+
+    def __on_close(self, connection: TcpServerConnection) -> None:
+        """
+        Forgets a closed connection.
+        """
+        self.__connections.discard(connection)
+
+        if self.__disconnect_handler is not None:
+            self.__disconnect_handler(connection)
@@ -0,0 +1,378 @@
+"""
+TCP client which stays connected: reconnects in the background and queues messages during outages.
+"""
+
+import collections
+import select
+import threading
+import time
+
+from .client_socket import TcpClientSocket
+from .connection_profile import ConnectionProfile
+
+
+QUEUE_SIZE = 256  # Messages kept while disconnected, the oldest are dropped
+INITIAL_BACKOFF = 0.1  # Seconds before the first reconnect attempt
+MAX_BACKOFF = 5.0  # Seconds, upper limit between reconnect attempts
+BACKOFF_MULTIPLIER = 2.0  # Delay is multiplied by this after each failed attempt
+LATENCY_HISTORY_SIZE = 100  # Reconnect latencies kept for statistics
+
+
+# Statistics are exposed as attributes
+# pylint: disable-next=too-many-instance-attributes
+class PersistentTcpClientSocket:
+    """
+    Keeps a connection to a server open, reconnecting with exponential backoff when it breaks.
+    Messages are sent by a background thread, so send_message() does not block on the network.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        host: str = "localhost",
+        port: int = 5000,
+        profile: ConnectionProfile | None = None,
+        queue_size: int = QUEUE_SIZE,
+        initial_backoff: float = INITIAL_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+    ) -> "tuple[True, PersistentTcpClientSocket] | tuple[False, None]":
+        """
+        Starts connecting in the background, returns without waiting for the connection.
+
+        host: Server host.
+        port: Server port.
+        profile: Socket options for each connection. None is the default profile.
+        queue_size: Messages kept while disconnected. When full, the oldest message is dropped.
+        initial_backoff: Seconds before the first reconnect attempt.
+        max_backoff: Upper limit of seconds between reconnect attempts.
+
+        Return: Success, object.
+        """
+        if queue_size <= 0:
+            print("Queue size must be a positive non-zero value.")
+            return False, None
+
+        if initial_backoff <= 0.0 or max_backoff < initial_backoff:
+            print("Backoff must be positive and the maximum at least the initial backoff.")
+            return False, None
+
+        if profile is None:
+            profile = ConnectionProfile()
+
+        instance = PersistentTcpClientSocket(
+            cls.__create_key, host, port, profile, queue_size, initial_backoff, max_backoff
+        )
+        instance.__thread.start()
+
+        return True, instance
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        host: str,
+        port: int,
+        profile: ConnectionProfile,
+        queue_size: int,
+        initial_backoff: float,
+        max_backoff: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert (
+            class_private_create_key is PersistentTcpClientSocket.__create_key
+        ), "Use create() method."
+
+        self.__host = host
+        self.__port = port
+        self.__profile = profile
+        self.__initial_backoff = initial_backoff
+        self.__max_backoff = max_backoff
+
+        # Guards the connection and the queue, notified when either changes
+        self.__condition = threading.Condition()
+        self.__connection = None
+        self.__queue = collections.deque(maxlen=queue_size)
+        self.__is_stopped = False
+        self.__disconnect_time = time.monotonic()
+
+        self.__thread = threading.Thread(target=self.__run, name=f"TCP-{host}:{port}", daemon=True)
+
+        self.connect_count = 0
+        self.reconnect_count = 0
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.reconnect_latencies = collections.deque(maxlen=LATENCY_HISTORY_SIZE)
+
+    def send_message(self, data: bytes) -> bool:
+        """
+        Queues a framed message (see TcpSocket.send_message()) to be sent when connected.
+
+        data: Any object supporting the buffer protocol, it is copied.
+
+        Return: False if closed.
+        """
+        message = bytes(data)
+
+        with self.__condition:
+            if self.__is_stopped:
+                return False
+
+            if len(self.__queue) == self.__queue.maxlen:
+                self.messages_dropped += 1
+
+            # Full deque drops the oldest
+            self.__queue.append(message)
+            self.__condition.notify_all()
+
+        return True
+
+    def recv_message(self) -> "tuple[bool, memoryview | None]":
+        """
+        Reads a message from the current connection (see TcpSocket.recv_message()).
+        If nothing arrives within the connection timeout, fails without disconnecting.
+        Other failures start reconnecting in the background.
+
+        Return: Success, view of the message valid until the next call.
+        """
+        with self.__condition:
+            connection = self.__connection
+
+        if connection is None:
+            print("Not connected.")
+            return False, None
+
+        # Waiting here instead of in the read, so an idle link is not mistaken for a broken one
+        # and a timeout never splits a message
+        socket_instance = connection.get_socket()
+        try:
+            readable, _, _ = select.select([socket_instance], [], [], socket_instance.gettimeout())
+        except (OSError, ValueError) as exception:
+            # Closed by another thread
+            print(f"Could not wait for message: {exception}")
+            self.__disconnect(connection)
+            return False, None
+
+        if len(readable) == 0:
+            return False, None
+
+        result, message = connection.recv_message()
+        if not result:
+            self.__disconnect(connection)
+            return False, None
+
+        return True, message
+
+    def is_connected(self) -> bool:
+        """
+        Whether a connection is currently open.
+        """
+        with self.__condition:
+            return self.__connection is not None
+
+    def wait_connected(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until connected.
+
+        timeout: Seconds. None waits indefinitely.
+
+        Return: Whether connected.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: self.__connection is not None or self.__is_stopped, timeout
+            ) and (self.__connection is not None)
+
+    def get_queue_size(self) -> int:
+        """
+        Messages waiting to be sent.
+        """
+        with self.__condition:
+            return len(self.__queue)
+
+    def close(self) -> None:
+        """
+        Stops reconnecting and closes the connection. Queued messages are discarded.
+        """
+        with self.__condition:
+            self.__is_stopped = True
+            connection = self.__connection
+            self.__connection = None
+            self.__condition.notify_all()
+
+        if connection is not None:
+            connection.close()
+
+        self.__thread.join()
+
+    def __run(self) -> None:
+        """
+        Background thread: connects, sends queued messages, and reconnects when the link breaks.
+        """
+        backoff = self.__initial_backoff
+        while True:
+            with self.__condition:
+                if self.__is_stopped:
+                    return
+
+                connection = self.__connection
+
+            if connection is None:
+                if self.__connect():
+                    backoff = self.__initial_backoff
+                    continue
+
+                # Wait before retrying, or stop early if closed
+                with self.__condition:
+                    self.__condition.wait_for(lambda: self.__is_stopped, backoff)
+
+                backoff = min(backoff * BACKOFF_MULTIPLIER, self.__max_backoff)
+                continue
+
+            with self.__condition:
+                self.__condition.wait_for(
+                    lambda: len(self.__queue) > 0
+                    or self.__connection is not connection
+                    or self.__is_stopped
+                )
+                if self.__connection is not connection or self.__is_stopped:
+                    continue
+
+                message = self.__queue.popleft()
+
+            if connection.send_message(message):
+                with self.__condition:
+                    self.messages_sent += 1
+
+                continue
+
+            # Retry the message on the next connection, unless newer messages filled the queue
+            with self.__condition:
+                if len(self.__queue) < self.__queue.maxlen:
+                    self.__queue.appendleft(message)
+                else:
+                    self.messages_dropped += 1
+
+            self.__disconnect(connection)
+
+    def __connect(self) -> bool:
+        """
+        Attempts to connect once.
+        """
+        result, connection = TcpClientSocket.create(
+            host=self.__host,
+            port=self.__port,
+            connection_timeout=self.__profile.connection_timeout,
+            profile=self.__profile,
+        )
+        if not result:
+            return False
+
+        with self.__condition:
+            if self.__is_stopped:
+                connection.close()
+                return False
+
+            self.__connection = connection
+            if self.connect_count > 0:
+                self.reconnect_count += 1
+                self.reconnect_latencies.append(time.monotonic() - self.__disconnect_time)
+
+            self.connect_count += 1
+            self.__condition.notify_all()
+
+        return True
+
+    def __disconnect(self, connection: TcpClientSocket) -> None:
+        """
+        Closes a broken connection so the background thread reconnects.
+        """
+        with self.__condition:
+            if self.__connection is not connection:
+                # Already replaced
+                return
+
+            self.__connection = None
+            self.__disconnect_time = time.monotonic()
+            self.__condition.notify_all()
+
+        connection.close()
+
+
+class TcpClientPool:
+    """
+    Shares one persistent connection per server address, kept open between uses.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, profile: ConnectionProfile | None = None, queue_size: int = QUEUE_SIZE
+    ) -> "tuple[True, TcpClientPool] | tuple[False, None]":
+        """
+        profile: Socket options for each connection. None is the default profile.
+        queue_size: Messages kept per connection while disconnected.
+
+        Return: Success, object.
+        """
+        if queue_size <= 0:
+            print("Queue size must be a positive non-zero value.")
+            return False, None
+
+        return True, TcpClientPool(cls.__create_key, profile, queue_size)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        profile: ConnectionProfile | None,
+        queue_size: int,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is TcpClientPool.__create_key, "Use create() method."
+
+        self.__profile = profile
+        self.__queue_size = queue_size
+        self.__clients = {}
+        self.__lock = threading.Lock()
+
+    def get(
+        self, host: str, port: int
+    ) -> "tuple[True, PersistentTcpClientSocket] | tuple[False, None]":
+        """
+        Connection to the address, created on first use.
+
+        host: Server host.
+        port: Server port.
+
+        Return: Success, client.
+        """
+        with self.__lock:
+            client = self.__clients.get((host, port))
+            if client is not None:
+                return True, client
+
+            result, client = PersistentTcpClientSocket.create(
+                host, port, self.__profile, self.__queue_size
+            )
+            if not result:
+                return False, None
+
+            self.__clients[(host, port)] = client
+
+        return True, client
+
+    def close(self) -> None:
+        """
+        Closes all connections.
+        """
+        with self.__lock:
+            clients = list(self.__clients.values())
+            self.__clients.clear()
+
+        for client in clients:
+            client.close()
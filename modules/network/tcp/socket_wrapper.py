@@ -3,6 +3,16 @@ Wrapper for a TCP socket.
 """
 
 import socket
+import struct
+
+
+# 4 byte message length (unsigned int, network or big-endian format)
+MESSAGE_HEADER = struct.Struct("!I")
+MAX_MESSAGE_SIZE = 2**32 - 1
+# Default receive limit, protects against allocating huge buffers for bad headers
+DEFAULT_MAX_RECV_SIZE = 2**26  # 64 MB
+# Scratch size for dropping a message that does not fit in the given buffer
+DISCARD_CHUNK_SIZE = 2**16  # bytes
 
 
 class TcpSocket:
@@ -19,6 +29,7 @@ class TcpSocket:
         """
 
         self.__socket = socket_instance
+        self.__recv_buffer = bytearray(0)
 
     def send(self, data: bytes) -> bool:
         """
@@ -74,6 +85,160 @@ class TcpSocket:
 
         return True, message
 
+    def send_message(self, data: bytes) -> bool:
+        """
+        Sends data prefixed with its length so the receiver can use recv_message().
+        The header and data are sent together without concatenating them.
+
+        Parameters
+        ----------
+        data: bytes
+            Any object supporting the buffer protocol (e.g. bytes, bytearray, np.ndarray).
+
+        Returns
+        -------
+        bool: If the data was sent successfully.
+        """
+
+        payload = memoryview(data).cast("B")
+        if payload.nbytes > MAX_MESSAGE_SIZE:
+            print(f"Message too large: {payload.nbytes} bytes.")
+            return False
+
+        header = MESSAGE_HEADER.pack(payload.nbytes)
+
+        # Scatter-gather is not available on all platforms (e.g. Windows)
+        if not hasattr(self.__socket, "sendmsg"):
+            return self.send(header) and self.send(payload)
+
+        buffers = [memoryview(header), payload]
+        try:
+            while len(buffers) > 0:
+                bytes_sent = self.__socket.sendmsg(buffers)
+
+                # Drop the buffers which have been fully sent, and trim a partially sent one
+                while len(buffers) > 0 and bytes_sent >= buffers[0].nbytes:
+                    bytes_sent -= buffers[0].nbytes
+                    buffers.pop(0)
+
+                if bytes_sent > 0:
+                    buffers[0] = buffers[0][bytes_sent:]
+        except socket.error as e:
+            print(f"Could not send data: {e}.")
+            return False
+
+        return True
+
+    def recv_message(
+        self, buffer: bytearray | None = None, max_message_size: int = DEFAULT_MAX_RECV_SIZE
+    ) -> "tuple[bool, memoryview | None]":
+        """
+        Reads a message sent with send_message().
+        The data is received directly into a buffer, without intermediate copies.
+
+        Parameters
+        ----------
+        buffer: bytearray | None (default None)
+            Buffer to receive the message into, must be at least as large as the message.
+            If it is too small, the message is discarded so the next call reads the following one.
+            If None, an internal buffer is reused, which only grows when a larger message arrives.
+            Data in the internal buffer is overwritten by the next call,
+            so copy it (e.g. bytes(message)) if it must be kept.
+        max_message_size: int (default DEFAULT_MAX_RECV_SIZE)
+            Bytes, larger messages are discarded without allocating a buffer for them.
+
+        Returns
+        -------
+        tuple[bool, memoryview | None]
+            The first parameter represents if the read is successful.
+            - If it is not successful, the second parameter will be None.
+            - If it is successful, the second parameter will be a view of the message.
+        """
+
+        header = bytearray(MESSAGE_HEADER.size)
+        if not self.__recv_into(memoryview(header)):
+            return False, None
+
+        (message_size,) = MESSAGE_HEADER.unpack(header)
+
+        if message_size > max_message_size:
+            print(f"Message too large: {message_size} bytes, limit is {max_message_size} bytes.")
+            # Keep the stream framed
+            self.__discard(message_size)
+            return False, None
+
+        if buffer is None:
+            if len(self.__recv_buffer) < message_size:
+                # Replace instead of resizing, as the caller may still hold a view of the old one
+                self.__recv_buffer = bytearray(message_size)
+
+            buffer = self.__recv_buffer
+        elif len(buffer) < message_size:
+            print(f"Buffer too small: {len(buffer)} bytes for message of {message_size} bytes.")
+            # Keep the stream framed
+            self.__discard(message_size)
+            return False, None
+
+        message = memoryview(buffer)[:message_size]
+        if not self.__recv_into(message):
+            return False, None
+
+        return True, message
+
+    def __recv_into(self, view: memoryview) -> bool:
+        """
+        Fills the view with data from the socket.
+
+        Parameters
+        ----------
+        view: memoryview
+            Destination of the data, filled completely.
+
+        Returns
+        -------
+        bool: If the read is successful.
+        """
+
+        bytes_recd = 0
+        while bytes_recd < view.nbytes:
+            try:
+                chunk_size = self.__socket.recv_into(view[bytes_recd:])
+            except socket.error as e:
+                print(f"Could not receive data: {e}.")
+                return False
+
+            if chunk_size == 0:
+                print("Socket connection broken")  # When 0 is received, means error
+                return False
+
+            bytes_recd += chunk_size
+
+        return True
+
+    def __discard(self, size: int) -> bool:
+        """
+        Reads and drops size bytes from the socket, in chunks of at most DISCARD_CHUNK_SIZE.
+
+        Parameters
+        ----------
+        size: int
+            The number of bytes to drop.
+
+        Returns
+        -------
+        bool: If the read is successful.
+        """
+
+        chunk = memoryview(bytearray(min(size, DISCARD_CHUNK_SIZE)))
+        while size > 0:
+            chunk_size = min(size, chunk.nbytes)
+            if not self.__recv_into(chunk[:chunk_size]):
+                return False
+
+            size -= chunk_size
+
+        return True
+
     def close(self) -> bool:
         """
         Closes the socket object. All future operations on the socket object will fail.
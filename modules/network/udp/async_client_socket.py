@@ -0,0 +1,111 @@
+"""
+Wrapper for UDP client socket operations on an asyncio event loop.
+"""
+
+import asyncio
+import socket
+
+from .async_socket_wrapper import AsyncUdpSocket, DatagramQueueProtocol
+
+
+class AsyncUdpClientSocket(AsyncUdpSocket):
+    """
+    Wrapper for UDP client socket operations on an asyncio event loop.
+    """
+
+    __create_key = object()
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        transport: asyncio.DatagramTransport,
+        protocol: DatagramQueueProtocol,
+        connection_timeout: float,
+        server_address: tuple,
+    ) -> None:
+        """
+        Private Constructor, use create() method.
+        """
+
+        assert class_private_create_key is AsyncUdpClientSocket.__create_key, "Use create() method"
+
+        super().__init__(transport, protocol, connection_timeout)
+        self.__server_address = server_address
+
+    @classmethod
+    async def create(
+        cls, host: str = "localhost", port: int = 5000, connection_timeout: float = 60.0
+    ) -> "tuple[bool, AsyncUdpClientSocket | None]":
+        """
+        Initializes UDP client socket with the appropriate server address.
+
+        Parameters
+        ----------
+        host: str (default "localhost")
+            The hostname or IP address of the server.
+        port: int (default 5000)
+            The port number of the server.
+        connection_timeout: float (default 60.0)
+            Timeout for sending while the send buffer is full, in seconds
+
+        Returns
+        -------
+        tuple[bool, AsyncUdpClientSocket | None]
+            The boolean value represents whether the initialization was successful or not.
+                - If it is not successful, the second parameter will be None.
+                - If it is successful, the second parameter will be the created
+                    AsyncUdpClientSocket object.
+        """
+
+        if connection_timeout <= 0:
+            print("Must provide positive non-zero value.")
+            return False, None
+
+        try:
+            loop = asyncio.get_running_loop()
+            transport, protocol = await loop.create_datagram_endpoint(
+                DatagramQueueProtocol, family=socket.AF_INET
+            )
+        except socket.error as e:
+            print(f"Could not connect: {e}")
+            return False, None
+
+        return True, AsyncUdpClientSocket(
+            cls.__create_key, transport, protocol, connection_timeout, (host, port)
+        )
+
+    async def send(self, data: bytes) -> bool:
+        """
+        Sends data to the specified server address during this socket's creation.
+
+        Parameters
+        ----------
+        data: bytes
+            Takes in raw data that we wish to send
+
+        Returns
+        -------
+        bool: True if data is sent successfully, and false if it fails to send
+        """
+
+        host, port = self.__server_address
+        return await super().send_to(data, host, port)
+
+    async def recv(self, buf_size: int) -> None:
+        """
+        Receive data method override to prevent client sockets from receiving data.
+
+        Parameters
+        ----------
+        bufsize: int
+            The amount of data to be received.
+
+        Raises
+        ------
+        NotImplementedError
+            Always raised because client sockets should not receive data.
+        """
+
+        raise NotImplementedError(
+            "Client sockets cannot receive data as they are not bound by a port."
+        )
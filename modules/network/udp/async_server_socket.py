@@ -0,0 +1,78 @@
+"""
+Wrapper for UDP server socket operations on an asyncio event loop.
+"""
+
+import asyncio
+import socket
+
+from .async_socket_wrapper import AsyncUdpSocket, DatagramQueueProtocol
+
+
+class AsyncUdpServerSocket(AsyncUdpSocket):
+    """
+    Wrapper for UDP server socket operations on an asyncio event loop.
+    """
+
+    __create_key = object()
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        transport: asyncio.DatagramTransport,
+        protocol: DatagramQueueProtocol,
+        connection_timeout: float,
+    ) -> None:
+        """
+        Private Constructor, use create() method.
+        """
+
+        assert class_private_create_key is AsyncUdpServerSocket.__create_key, "Use create() method"
+
+        super().__init__(transport, protocol, connection_timeout)
+
+    @classmethod
+    async def create(
+        cls, host: str = "", port: int = 5000, connection_timeout: float = 60.0
+    ) -> "tuple[bool, AsyncUdpServerSocket | None]":
+        """
+        Creates a UDP server socket bound to the provided host and port.
+
+        Parameters
+        ----------
+        host: str (default "")
+            The hostname or IP address to bind the socket to.
+        port: int (default 5000)
+            The port number to bind the socket to.
+        connection_timeout: float (default 60.0)
+            Timeout for operations such as receive, in seconds
+
+        Returns
+        -------
+        tuple[bool, AsyncUdpServerSocket | None]
+            The first parameter represents if the socket creation is successful.
+                - If it is not successful, the second parameter will be None.
+                - If it is successful, the second parameter will be the created
+                    AsyncUdpServerSocket object.
+        """
+
+        if connection_timeout <= 0:
+            print("Must provide a positive non-zero value.")
+            return False, None
+
+        try:
+            loop = asyncio.get_running_loop()
+            transport, protocol = await loop.create_datagram_endpoint(
+                DatagramQueueProtocol,
+                local_addr=(host or "0.0.0.0", port),
+                family=socket.AF_INET,
+            )
+        except socket.error as e:
+            print(f"Could not create socket, error: {e}.")
+            return False, None
+
+        if host == "":
+            print(f"Listening for external data on port {port}")
+        else:
+            print(f"Listening for internal data on {host}:{port}")
+
+        return True, AsyncUdpServerSocket(cls.__create_key, transport, protocol, connection_timeout)
@@ -0,0 +1,206 @@
+"""
+Wrapper for a UDP socket on an asyncio event loop.
+"""
+
+import asyncio
+
+from .socket_wrapper import CHUNK_SIZE, SEND_DELAY
+
+
+RECEIVE_QUEUE_SIZE = 1024  # Datagrams waiting for recv(), more are dropped
+
+
+class DatagramQueueProtocol(asyncio.DatagramProtocol):
+    """
+    Queues received datagrams for AsyncUdpSocket.recv().
+    """
+
+    def __init__(self, queue_size: int = RECEIVE_QUEUE_SIZE) -> None:
+        """
+        queue_size: Maximum number of datagrams waiting to be received.
+        """
+
+        self.queue = asyncio.Queue(queue_size)
+        self.writable = asyncio.Event()
+        self.writable.set()
+
+        self.datagrams_dropped = 0
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        """
+        Called by the event loop for each datagram.
+        """
+
+        try:
+            self.queue.put_nowait((data, addr))
+        except asyncio.QueueFull:
+            self.datagrams_dropped += 1
+
+    def error_received(self, exc: Exception) -> None:
+        """
+        Called by the event loop when a send or receive fails (e.g. ICMP port unreachable).
+        """
+
+        print(f"Socket error: {exc}")
+
+    def pause_writing(self) -> None:
+        """
+        Called by the event loop when the send buffer is full.
+        """
+
+        self.writable.clear()
+
+    def resume_writing(self) -> None:
+        """
+        Called by the event loop when the send buffer has space again.
+        """
+
+        self.writable.set()
+
+
+class AsyncUdpSocket:
+    """
+    Wrapper for a UDP socket on an asyncio event loop.
+    Same contract as UdpSocket, but the methods are coroutines.
+    """
+
+    def __init__(
+        self,
+        transport: asyncio.DatagramTransport,
+        protocol: DatagramQueueProtocol,
+        connection_timeout: float | None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        transport: asyncio.DatagramTransport
+        protocol: DatagramQueueProtocol
+            Both from loop.create_datagram_endpoint().
+        connection_timeout: float | None
+            Timeout for operations such as receive, in seconds. None is no timeout.
+        """
+
+        self.__transport = transport
+        self.__protocol = protocol
+        self.__connection_timeout = connection_timeout
+
+    async def send_to(
+        self,
+        data: bytes,
+        host: str = "",
+        port: int = 5000,
+        chunk_size: int = CHUNK_SIZE,
+        send_delay: float = SEND_DELAY,
+    ) -> bool:
+        """
+        Sends data to specified address.
+        Other tasks run during the delay between datagrams and while the send buffer is full.
+
+        Parameters
+        ----------
+        data: bytes
+        host: str (default "")
+            Empty string is interpreted as '0.0.0.0' (IPv4) or '::' (IPv6), which is an open address
+        port: int (default 5000)
+            The host, combined with the port, will form the address as a tuple
+        chunk_size: int (default CHUNK_SIZE)
+            Maximum bytes in each datagram.
+        send_delay: float (default SEND_DELAY)
+            Seconds to wait after each datagram.
+
+        Returns
+        -------
+        bool: if data was transferred successfully
+        """
+
+        address = (host, port)
+        payload = memoryview(data).cast("B")
+
+        for start in range(0, payload.nbytes, chunk_size):
+            try:
+                if not self.__protocol.writable.is_set():
+                    async with asyncio.timeout(self.__connection_timeout):
+                        await self.__protocol.writable.wait()
+
+                self.__transport.sendto(payload[start : start + chunk_size], address)
+            except (OSError, asyncio.TimeoutError) as e:
+                print(f"Could not send data: {e}")
+                return False
+
+            await asyncio.sleep(send_delay)
+
+        return True
+
+    async def recv(self, buf_size: int) -> "tuple[bool, bytes | None]":
+        """
+        Parameters
+        ----------
+        buf_size: int
+            The number of bytes to receive
+
+        Returns
+        -------
+        tuple:
+            bool - True if data was received and unpacked successfully, False otherwise
+            bytes | None - The received data, or None if unsuccessful
+        """
+
+        data = b""
+        addr = None
+
+        while len(data) < buf_size:
+            try:
+                async with asyncio.timeout(self.__connection_timeout):
+                    packet, current_addr = await self.__protocol.queue.get()
+            except asyncio.TimeoutError as e:
+                print(f"Could not receive data: {e}")
+                return False, None
+
+            if addr is None:
+                addr = current_addr
+            elif addr != current_addr:
+                print(f"Data received from multiple addresses: {addr} and {current_addr}")
+                continue
+
+            data += packet
+
+        return True, data
+
+    def get_datagrams_dropped(self) -> int:
+        """
+        Number of datagrams dropped because the receive queue was full.
+        """
+
+        return self.__protocol.datagrams_dropped
+
+    def close(self) -> bool:
+        """
+        Closes the socket. All future operations on the socket object will fail.
+
+        Returns
+        -------
+        bool: If the socket was closed successfully.
+        """
+
+        self.__transport.close()
+
+        return True
+
+    def address(self) -> "tuple[str, int]":
+        """
+        Retrieves the address that the socket is bound to.
+
+        Returns
+        -------
+        tuple[str, int]
+            The address in the format (ip address, port).
+        """
+
+        return self.__transport.get_extra_info("sockname")
+
+    def get_transport(self) -> asyncio.DatagramTransport:
+        """
+        Getter for the underlying transport object.
+        """
+
+        return self.__transport
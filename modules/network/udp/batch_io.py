@@ -0,0 +1,379 @@
+"""
+Batched datagram I/O, sending and receiving many datagrams per system call.
+
+Uses sendmmsg() and recvmmsg() through ctypes on Linux.
+On other platforms, falls back to one sendto() or recvfrom_into() per datagram.
+"""
+
+import ctypes
+import errno
+import math
+import os
+import select
+import socket
+import struct
+import sys
+
+import numpy as np
+
+
+BATCH_SIZE = 64  # Datagrams per system call
+SLOT_COUNT = 256  # Datagrams in the receive ring, views stay valid until their slot is reused
+# Fits a datagram on a 1500 byte Ethernet MTU, so the ring is 512 KB instead of 16 MB
+SLOT_SIZE = 2048  # bytes
+MAX_SLOT_SIZE = 65507  # Largest UDP payload over IPv4
+SOCKADDR_STORAGE_SIZE = 128
+SOCKADDR_IN6_SIZE = 28  # Large enough for IPv4 and IPv6 addresses
+ADDRESS_CACHE_SIZE = 1024  # Sender addresses remembered, to avoid unpacking them every datagram
+
+
+class IoVec(ctypes.Structure):
+    """
+    struct iovec
+    """
+
+    _fields_ = [
+        ("iov_base", ctypes.c_void_p),
+        ("iov_len", ctypes.c_size_t),
+    ]
+
+
+class MsgHdr(ctypes.Structure):
+    """
+    struct msghdr (glibc)
+    """
+
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class MMsgHdr(ctypes.Structure):
+    """
+    struct mmsghdr
+    """
+
+    _fields_ = [
+        ("msg_hdr", MsgHdr),
+        ("msg_len", ctypes.c_uint),
+    ]
+
+
+# sendmmsg() and recvmmsg() only exist on Linux
+LIBC_SENDMMSG = None
+LIBC_RECVMMSG = None
+if sys.platform == "linux":
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        LIBC_SENDMMSG = libc.sendmmsg
+        LIBC_SENDMMSG.argtypes = [
+            ctypes.c_int,
+            ctypes.c_void_p,
+            ctypes.c_uint,
+            ctypes.c_int,
+        ]
+        LIBC_SENDMMSG.restype = ctypes.c_int
+        LIBC_RECVMMSG = libc.recvmmsg
+        LIBC_RECVMMSG.argtypes = [
+            ctypes.c_int,
+            ctypes.c_void_p,
+            ctypes.c_uint,
+            ctypes.c_int,
+            ctypes.c_void_p,
+        ]
+        LIBC_RECVMMSG.restype = ctypes.c_int
+    except (AttributeError, OSError):
+        LIBC_SENDMMSG = None
+        LIBC_RECVMMSG = None
+
+BATCH_IO_AVAILABLE = LIBC_SENDMMSG is not None and LIBC_RECVMMSG is not None
+
+
+def sockaddr_from_address(family: int, address: tuple) -> bytes:
+    """
+    Packs a Python socket address into a struct sockaddr_in or sockaddr_in6.
+    """
+    if family == socket.AF_INET:
+        host, port = address
+        return (
+            struct.pack("=H", family)
+            + struct.pack("!H", port)
+            + socket.inet_pton(family, host)
+            + bytes(8)
+        )
+
+    host, port, flow_info, scope_id = address
+    return (
+        struct.pack("=H", family)
+        + struct.pack("!HI", port, flow_info)
+        + socket.inet_pton(family, host)
+        + struct.pack("=I", scope_id)
+    )
+
+
+def address_from_sockaddr(sockaddr: memoryview) -> tuple:
+    """
+    Unpacks a struct sockaddr_in or sockaddr_in6 into a Python socket address.
+    """
+    (family,) = struct.unpack_from("=H", sockaddr)
+    if family == socket.AF_INET:
+        (port,) = struct.unpack_from("!H", sockaddr, 2)
+        return socket.inet_ntop(family, sockaddr[4:8]), port
+
+    port, flow_info = struct.unpack_from("!HI", sockaddr, 2)
+    (scope_id,) = struct.unpack_from("=I", sockaddr, 24)
+    return socket.inet_ntop(family, sockaddr[8:24]), port, flow_info, scope_id
+
+
+# Buffers are kept as attributes so they stay alive while the kernel uses them
+# pylint: disable-next=too-many-instance-attributes
+class DatagramBatcher:
+    """
+    Preallocated message headers for sending, and a ring of buffers for receiving.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, batch_size: int = BATCH_SIZE, slot_count: int = SLOT_COUNT, slot_size: int = SLOT_SIZE
+    ) -> "tuple[True, DatagramBatcher] | tuple[False, None]":
+        """
+        batch_size: Maximum datagrams per system call.
+        slot_count: Number of receive buffers, at least batch_size. Received views stay valid for
+            at least slot_count - batch_size further datagrams.
+        slot_size: Bytes in each receive buffer, longer datagrams are truncated.
+            Use MAX_SLOT_SIZE to receive datagrams of any size.
+
+        Return: Success, object.
+        """
+        if batch_size <= 0:
+            print("Batch size must be a positive non-zero value.")
+            return False, None
+
+        if slot_count < batch_size:
+            print("Slot count must be at least the batch size.")
+            return False, None
+
+        if slot_size <= 0:
+            print("Slot size must be a positive non-zero value.")
+            return False, None
+
+        return True, DatagramBatcher(cls.__create_key, batch_size, slot_count, slot_size)
+
+    def __init__(
+        self, class_private_create_key: object, batch_size: int, slot_count: int, slot_size: int
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is DatagramBatcher.__create_key, "Use create() method."
+
+        self.__batch_size = batch_size
+        self.__slot_count = slot_count
+        self.__slot_size = slot_size
+        self.__next_slot = 0
+        self.__address_cache: "dict[bytes, tuple]" = {}
+
+        # Sending, iov_base and iov_len are filled in for every batch
+        self.__send_iovecs = (IoVec * batch_size)()
+        self.__send_headers = (MMsgHdr * batch_size)()
+        self.__send_sockaddr = ctypes.create_string_buffer(SOCKADDR_STORAGE_SIZE)
+        for i in range(batch_size):
+            header = self.__send_headers[i].msg_hdr
+            header.msg_name = ctypes.addressof(self.__send_sockaddr)
+            header.msg_iov = ctypes.pointer(self.__send_iovecs[i])
+            header.msg_iovlen = 1
+
+        # Receiving, each header points at its own slot in the ring
+        self.__ring = bytearray(slot_count * slot_size)
+        self.__ring_view = memoryview(self.__ring)
+        self.__recv_sockaddrs = ctypes.create_string_buffer(slot_count * SOCKADDR_STORAGE_SIZE)
+        self.__recv_sockaddrs_view = memoryview(self.__recv_sockaddrs).cast("B")
+        self.__recv_iovecs = (IoVec * slot_count)()
+        self.__recv_headers = (MMsgHdr * slot_count)()
+        ring_address = ctypes.addressof(ctypes.c_char.from_buffer(self.__ring))
+        sockaddrs_address = ctypes.addressof(self.__recv_sockaddrs)
+        for i in range(slot_count):
+            self.__recv_iovecs[i].iov_base = ring_address + i * slot_size
+            self.__recv_iovecs[i].iov_len = slot_size
+            header = self.__recv_headers[i].msg_hdr
+            header.msg_name = sockaddrs_address + i * SOCKADDR_STORAGE_SIZE
+            header.msg_iov = ctypes.pointer(self.__recv_iovecs[i])
+            header.msg_iovlen = 1
+
+    def get_batch_size(self) -> int:
+        """
+        Maximum datagrams per system call.
+        """
+        return self.__batch_size
+
+    def get_slot_size(self) -> int:
+        """
+        Bytes in each receive buffer.
+        """
+        return self.__slot_size
+
+    def send(
+        self, socket_instance: socket.socket, data: memoryview, chunk_size: int, address: tuple
+    ) -> None:
+        """
+        Sends the data split into chunks, each chunk as a datagram, all in one system call.
+        Blocks while the send buffer is full, up to the timeout of the socket.
+
+        socket_instance: Socket to send with.
+        data: Payload of at most batch_size chunks.
+        chunk_size: Maximum bytes in each datagram.
+        address: Resolved address (e.g. from socket.getaddrinfo()).
+
+        Raises OSError if sending fails.
+        """
+        chunk_count = math.ceil(data.nbytes / chunk_size)
+        assert chunk_count <= self.__batch_size
+
+        if not BATCH_IO_AVAILABLE:
+            for offset in range(0, data.nbytes, chunk_size):
+                socket_instance.sendto(data[offset : offset + chunk_size], address)
+
+            return
+
+        sockaddr = sockaddr_from_address(socket_instance.family, address)
+        ctypes.memmove(self.__send_sockaddr, sockaddr, len(sockaddr))
+
+        # Keep the array alive while the kernel reads from it
+        array = np.frombuffer(data, np.uint8)
+        base_address = array.ctypes.data
+        for i in range(chunk_count):
+            offset = i * chunk_size
+            self.__send_iovecs[i].iov_base = base_address + offset
+            self.__send_iovecs[i].iov_len = min(chunk_size, data.nbytes - offset)
+            self.__send_headers[i].msg_hdr.msg_namelen = len(sockaddr)
+
+        sent = 0
+        while sent < chunk_count:
+            count = LIBC_SENDMMSG(
+                socket_instance.fileno(),
+                ctypes.addressof(self.__send_headers) + sent * ctypes.sizeof(MMsgHdr),
+                chunk_count - sent,
+                0,
+            )
+            if count >= 0:
+                sent += count
+                continue
+
+            error = ctypes.get_errno()
+            if error == errno.EINTR:
+                continue
+
+            # Sockets with a timeout are non-blocking underneath, so wait for space
+            if error in (errno.EAGAIN, errno.EWOULDBLOCK, errno.ENOBUFS):
+                _, writable, _ = select.select(
+                    [], [socket_instance], [], socket_instance.gettimeout()
+                )
+                if len(writable) > 0:
+                    continue
+
+                raise TimeoutError("Timed out waiting for space in the send buffer")
+
+            raise OSError(error, os.strerror(error))
+
+    def recv(
+        self, socket_instance: socket.socket, max_count: int
+    ) -> "list[tuple[memoryview, tuple]]":
+        """
+        Receives the datagrams which have already arrived, without blocking.
+        Datagrams are received into the next slots of the ring.
+
+        socket_instance: Socket to receive with.
+        max_count: Maximum datagrams to receive, at most batch_size.
+
+        Return: Views of the datagrams and their sender addresses.
+            Each view is valid until its slot is reused. The ring wraps early when max_count
+            slots do not fit at its end, so that is after at least slot_count - batch_size
+            further datagrams, not slot_count.
+            Raises OSError if receiving fails.
+        """
+        assert max_count <= self.__batch_size
+
+        # Receive into contiguous slots, wrapping around when the end of the ring is reached
+        if self.__next_slot + max_count > self.__slot_count:
+            self.__next_slot = 0
+
+        first_slot = self.__next_slot
+
+        if not BATCH_IO_AVAILABLE:
+            return self.__recv_each(socket_instance, first_slot, max_count)
+
+        for i in range(first_slot, first_slot + max_count):
+            self.__recv_headers[i].msg_hdr.msg_namelen = SOCKADDR_STORAGE_SIZE
+
+        while True:
+            count = LIBC_RECVMMSG(
+                socket_instance.fileno(),
+                ctypes.addressof(self.__recv_headers) + first_slot * ctypes.sizeof(MMsgHdr),
+                max_count,
+                socket.MSG_DONTWAIT,
+                None,
+            )
+            if count >= 0:
+                break
+
+            error = ctypes.get_errno()
+            if error == errno.EINTR:
+                continue
+
+            if error in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return []
+
+            raise OSError(error, os.strerror(error))
+
+        datagrams = []
+        for i in range(first_slot, first_slot + count):
+            start = i * self.__slot_size
+            size = min(self.__recv_headers[i].msg_len, self.__slot_size)
+            sockaddr_start = i * SOCKADDR_STORAGE_SIZE
+            sockaddr = bytes(
+                self.__recv_sockaddrs_view[sockaddr_start : sockaddr_start + SOCKADDR_IN6_SIZE]
+            )
+
+            # Datagrams usually come from the same few senders
+            address = self.__address_cache.get(sockaddr)
+            if address is None:
+                if len(self.__address_cache) >= ADDRESS_CACHE_SIZE:
+                    self.__address_cache.clear()
+
+                address = address_from_sockaddr(memoryview(sockaddr))
+                self.__address_cache[sockaddr] = address
+
+            datagrams.append((self.__ring_view[start : start + size], address))
+
+        self.__next_slot = first_slot + count
+
+        return datagrams
+
+    def __recv_each(
+        self, socket_instance: socket.socket, first_slot: int, max_count: int
+    ) -> "list[tuple[memoryview, tuple]]":
+        """
+        Fallback for platforms without recvmmsg().
+        """
+        datagrams = []
+        for i in range(first_slot, first_slot + max_count):
+            readable, _, _ = select.select([socket_instance], [], [], 0.0)
+            if len(readable) == 0:
+                break
+
+            start = i * self.__slot_size
+            view = self.__ring_view[start : start + self.__slot_size]
+            size, address = socket_instance.recvfrom_into(view)
+            datagrams.append((view[:size], address))
+
+        self.__next_slot = first_slot + len(datagrams)
+
+        return datagrams
@@ -0,0 +1,477 @@
+"""
+Chunked message transport over UDP.
+
+Messages are split into chunks, each with a header containing the message ID and chunk index,
+so the receiver can reassemble chunks arriving out of order and detect lost chunks.
+Lost chunks can optionally be requested again with a negative acknowledgement (NACK).
+"""
+
+import collections
+import enum
+import math
+import random
+import select
+import socket
+import struct
+import time
+
+from .socket_wrapper import UdpSocket
+
+
+# Packet type, message ID, chunk index, chunk count, chunk offset, message size
+DATA_HEADER = struct.Struct("!BIHHII")
+# Packet type, message ID, number of missing chunk indices (followed by the indices)
+NACK_HEADER = struct.Struct("!BIH")
+
+MAX_DATAGRAM_SIZE = 65507  # Largest UDP payload over IPv4
+MAX_CHUNK_COUNT = 2**16 - 1
+MAX_NACK_INDICES = 1024  # Keeps NACK datagrams small
+
+CHUNK_SIZE = 1400  # Bytes of message per datagram, fits in a 1500 byte Ethernet MTU with headers
+MESSAGE_TIMEOUT = 1.0  # Seconds without new chunks before an incomplete message is dropped
+MAX_MESSAGE_SIZE = 2**26  # 64 MB, protects against allocating huge buffers for bad headers
+FINISHED_HISTORY_SIZE = 256  # Number of finished message IDs remembered to ignore late chunks
+
+
+class PacketType(enum.Enum):
+    """
+    Type of datagram, first byte of the header.
+    """
+
+    DATA = 0
+    NACK = 1
+
+
+# Statistics are exposed as attributes
+# pylint: disable-next=too-many-instance-attributes
+class ChunkedSender:
+    """
+    Splits messages into chunks and sends them over a UDP socket.
+
+    Datagrams are paced by the rate limiter of the socket if it has one,
+    and NACKs are reported to it as congestion.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, udp_socket: UdpSocket, chunk_size: int = CHUNK_SIZE, history_size: int = 0
+    ) -> "tuple[True, ChunkedSender] | tuple[False, None]":
+        """
+        udp_socket: Socket to send with.
+        chunk_size: Bytes of message in each datagram.
+        history_size: Number of recent messages kept for retransmission when the receiver
+            sends NACKs. 0 disables retransmission.
+
+        Return: Success, object.
+        """
+        if chunk_size <= 0 or chunk_size + DATA_HEADER.size > MAX_DATAGRAM_SIZE:
+            print(f"Chunk size must be between 1 and {MAX_DATAGRAM_SIZE - DATA_HEADER.size}.")
+            return False, None
+
+        if history_size < 0:
+            print("History size must not be negative.")
+            return False, None
+
+        return True, ChunkedSender(cls.__create_key, udp_socket, chunk_size, history_size)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        udp_socket: UdpSocket,
+        chunk_size: int,
+        history_size: int,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ChunkedSender.__create_key, "Use create() method."
+
+        self.__udp_socket = udp_socket
+        self.__socket = udp_socket.get_socket()
+        self.__chunk_size = chunk_size
+        self.__history_size = history_size
+
+        # Message ID to (message, address, chunk count)
+        self.__history: "collections.OrderedDict[int, tuple[memoryview, tuple, int]]" = (
+            collections.OrderedDict()
+        )
+
+        # Random start so a restarted sender is unlikely to reuse recently finished IDs
+        self.__next_message_id = random.getrandbits(32)
+
+        self.chunks_sent = 0
+        self.chunks_retransmitted = 0
+
+    def send_to(self, data: bytes, host: str, port: int) -> "tuple[True, int] | tuple[False, None]":
+        """
+        Sends a message to the address, without waiting for acknowledgement.
+        If retransmission is enabled, the data must not be modified until it leaves the history.
+
+        data: Any object supporting the buffer protocol (e.g. bytes, bytearray, np.ndarray).
+        host: Hostname or IP address of the receiver.
+        port: Port of the receiver.
+
+        Return: Success, message ID.
+        """
+        payload = memoryview(data).cast("B")
+        chunk_count = max(math.ceil(payload.nbytes / self.__chunk_size), 1)
+        if chunk_count > MAX_CHUNK_COUNT or payload.nbytes > MAX_MESSAGE_SIZE:
+            print(f"Message too large: {payload.nbytes} bytes.")
+            return False, None
+
+        # Resolve once instead of for every datagram
+        try:
+            address = socket.getaddrinfo(
+                host, port, self.__socket.family, socket.SOCK_DGRAM, socket.IPPROTO_UDP
+            )[0][4]
+        except socket.gaierror as e:
+            print(f"Could not resolve address, address related error: {e}.")
+            return False, None
+
+        message_id = self.__next_message_id
+        self.__next_message_id = (message_id + 1) % 2**32
+
+        for chunk_index in range(chunk_count):
+            if not self.__send_chunk(message_id, chunk_index, chunk_count, payload, address):
+                return False, None
+
+        self.chunks_sent += chunk_count
+
+        if self.__history_size > 0:
+            self.__history[message_id] = (payload, address, chunk_count)
+            while len(self.__history) > self.__history_size:
+                self.__history.popitem(last=False)
+
+        return True, message_id
+
+    def handle_nacks(self, timeout: float = 0.0) -> int:
+        """
+        Retransmits chunks requested by the receiver. Call regularly when retransmission is enabled.
+
+        timeout: Seconds to wait for the first NACK, 0.0 to only handle those already received.
+
+        Return: Number of chunks retransmitted.
+        """
+        retransmitted = 0
+        wait = timeout
+        send_failed = False
+        while not send_failed:
+            readable, _, _ = select.select([self.__socket], [], [], wait)
+            if len(readable) == 0:
+                break
+
+            wait = 0.0
+
+            try:
+                packet, _ = self.__socket.recvfrom(MAX_DATAGRAM_SIZE)
+            except socket.error as e:
+                print(f"Could not receive data: {e}")
+                break
+
+            if len(packet) < NACK_HEADER.size:
+                continue
+
+            packet_type, message_id, missing_count = NACK_HEADER.unpack_from(packet)
+            if packet_type != PacketType.NACK.value or message_id not in self.__history:
+                continue
+
+            if len(packet) != NACK_HEADER.size + 2 * missing_count:
+                continue
+
+            # Lost chunks mean the link is congested
+            rate_limiter = self.__udp_socket.get_rate_limiter()
+            if rate_limiter is not None:
+                rate_limiter.report_congestion()
+
+            payload, address, chunk_count = self.__history[message_id]
+            for (chunk_index,) in struct.iter_unpack("!H", packet[NACK_HEADER.size :]):
+                if chunk_index >= chunk_count:
+                    continue
+
+                if not self.__send_chunk(message_id, chunk_index, chunk_count, payload, address):
+                    send_failed = True
+                    break
+
+                retransmitted += 1
+
+        self.chunks_retransmitted += retransmitted
+
+        return retransmitted
+
+    def __send_chunk(
+        self,
+        message_id: int,
+        chunk_index: int,
+        chunk_count: int,
+        payload: memoryview,
+        address: tuple,
+    ) -> bool:
+        """
+        Sends one chunk of the message.
+        """
+        offset = chunk_index * self.__chunk_size
+        header = DATA_HEADER.pack(
+            PacketType.DATA.value, message_id, chunk_index, chunk_count, offset, payload.nbytes
+        )
+        chunk = payload[offset : offset + self.__chunk_size]
+
+        rate_limiter = self.__udp_socket.get_rate_limiter()
+        if rate_limiter is not None:
+            rate_limiter.acquire(len(header) + chunk.nbytes)
+
+        try:
+            # Scatter-gather is not available on all platforms (e.g. Windows)
+            if hasattr(self.__socket, "sendmsg"):
+                self.__socket.sendmsg([header, chunk], [], 0, address)
+            else:
+                self.__socket.sendto(header + chunk, address)
+        except socket.error as e:
+            print(f"Could not send data: {e}")
+            return False
+
+        return True
+
+
+class PartialMessage:
+    """
+    Message being reassembled from chunks.
+    """
+
+    def __init__(self, chunk_count: int, message_size: int, arrival_time: float) -> None:
+        """
+        chunk_count: Number of chunks in the message.
+        message_size: Bytes.
+        arrival_time: Time the first chunk arrived, in seconds.
+        """
+        self.data = bytearray(message_size)
+        self.received = bytearray(chunk_count)  # Non-zero if the chunk has arrived
+        self.received_count = 0
+        self.last_arrival_time = arrival_time
+        self.last_nack_time = -math.inf
+
+    def missing_chunks(self) -> "list[int]":
+        """
+        Indices of chunks which have not arrived.
+        """
+        return [i for i, received in enumerate(self.received) if received == 0]
+
+
+# Statistics are exposed as attributes
+# pylint: disable-next=too-many-instance-attributes
+class ChunkedReceiver:
+    """
+    Receives chunks from a UDP socket and reassembles them into messages.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        udp_socket: UdpSocket,
+        message_timeout: float = MESSAGE_TIMEOUT,
+        nack_delay: float | None = None,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+    ) -> "tuple[True, ChunkedReceiver] | tuple[False, None]":
+        """
+        udp_socket: Socket bound to the address the sender sends to.
+        message_timeout: Seconds without new chunks before an incomplete message is dropped,
+            so large messages still arriving (e.g. retransmissions after NACKs) are kept.
+        nack_delay: Seconds without new chunks of an incomplete message before requesting the
+            missing chunks again. None disables NACKs.
+        max_message_size: Bytes, larger messages are ignored.
+
+        Return: Success, object.
+        """
+        if message_timeout <= 0.0:
+            print("Message timeout must be a positive non-zero value.")
+            return False, None
+
+        if nack_delay is not None and nack_delay <= 0.0:
+            print("NACK delay must be a positive non-zero value.")
+            return False, None
+
+        if max_message_size <= 0:
+            print("Maximum message size must be a positive non-zero value.")
+            return False, None
+
+        return True, ChunkedReceiver(
+            cls.__create_key, udp_socket, message_timeout, nack_delay, max_message_size
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        udp_socket: UdpSocket,
+        message_timeout: float,
+        nack_delay: float | None,
+        max_message_size: int,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ChunkedReceiver.__create_key, "Use create() method."
+
+        self.__socket = udp_socket.get_socket()
+        self.__message_timeout = message_timeout
+        self.__nack_delay = nack_delay
+        self.__max_message_size = max_message_size
+
+        self.__datagram_buffer = bytearray(MAX_DATAGRAM_SIZE)
+        self.__datagram_view = memoryview(self.__datagram_buffer)
+
+        # Keyed by (sender address, message ID)
+        self.__partial_messages: "dict[tuple[tuple, int], PartialMessage]" = {}
+        self.__finished_messages: "collections.OrderedDict[tuple[tuple, int], None]" = (
+            collections.OrderedDict()
+        )
+
+        self.messages_received = 0
+        self.messages_dropped = 0
+        self.nacks_sent = 0
+
+    def recv(self, timeout: float | None = None) -> "tuple[True, bytearray] | tuple[False, None]":
+        """
+        Receives the next complete message.
+
+        timeout: Seconds to wait. None uses the timeout of the socket.
+
+        Return: Success, message.
+        """
+        if timeout is None:
+            timeout = self.__socket.gettimeout()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            self.__drop_expired(now)
+            self.__send_nacks(now)
+
+            wait = None
+            if deadline is not None:
+                wait = deadline - now
+                if wait <= 0.0:
+                    return False, None
+
+            if self.__nack_delay is not None and len(self.__partial_messages) > 0:
+                wait = self.__nack_delay if wait is None else min(wait, self.__nack_delay)
+
+            readable, _, _ = select.select([self.__socket], [], [], wait)
+            if len(readable) == 0:
+                continue
+
+            try:
+                size, address = self.__socket.recvfrom_into(self.__datagram_buffer)
+            except socket.error as e:
+                print(f"Could not receive data: {e}")
+                return False, None
+
+            message = self.__handle_chunk(self.__datagram_view[:size], address, time.monotonic())
+            if message is not None:
+                return True, message
+
+    def __handle_chunk(self, packet: memoryview, address: tuple, now: float) -> "bytearray | None":
+        """
+        Copies the chunk into its message.
+
+        Return: The message if it is now complete, None otherwise.
+        """
+        if packet.nbytes < DATA_HEADER.size:
+            return None
+
+        packet_type, message_id, chunk_index, chunk_count, offset, message_size = (
+            DATA_HEADER.unpack_from(packet)
+        )
+        chunk = packet[DATA_HEADER.size :]
+
+        if packet_type != PacketType.DATA.value:
+            return None
+
+        if message_size > self.__max_message_size:
+            return None
+
+        if chunk_index >= chunk_count or offset + chunk.nbytes > message_size:
+            return None
+
+        key = (address, message_id)
+        if key in self.__finished_messages:
+            return None
+
+        partial_message = self.__partial_messages.get(key)
+        if partial_message is None:
+            partial_message = PartialMessage(chunk_count, message_size, now)
+            self.__partial_messages[key] = partial_message
+        elif (
+            len(partial_message.received) != chunk_count
+            or len(partial_message.data) != message_size
+        ):
+            return None
+
+        if partial_message.received[chunk_index] != 0:
+            return None
+
+        partial_message.data[offset : offset + chunk.nbytes] = chunk
+        partial_message.received[chunk_index] = 1
+        partial_message.received_count += 1
+        partial_message.last_arrival_time = now
+
+        if partial_message.received_count < chunk_count:
+            return None
+
+        self.__finish(key)
+        self.messages_received += 1
+
+        return partial_message.data
+
+    def __drop_expired(self, now: float) -> None:
+        """
+        Drops incomplete messages which have stopped receiving chunks.
+        """
+        expired = [
+            key
+            for key, partial_message in self.__partial_messages.items()
+            if now - partial_message.last_arrival_time > self.__message_timeout
+        ]
+
+        for key in expired:
+            self.__finish(key)
+            self.messages_dropped += 1
+
+    def __send_nacks(self, now: float) -> None:
+        """
+        Requests missing chunks of incomplete messages which have stopped receiving chunks.
+        """
+        if self.__nack_delay is None:
+            return
+
+        for (address, message_id), partial_message in self.__partial_messages.items():
+            if now - partial_message.last_arrival_time < self.__nack_delay:
+                continue
+
+            if now - partial_message.last_nack_time < self.__nack_delay:
+                continue
+
+            missing = partial_message.missing_chunks()[:MAX_NACK_INDICES]
+            packet = NACK_HEADER.pack(PacketType.NACK.value, message_id, len(missing))
+            packet += struct.pack(f"!{len(missing)}H", *missing)
+
+            try:
+                self.__socket.sendto(packet, address)
+            except socket.error as e:
+                print(f"Could not send NACK: {e}")
+                continue
+
+            partial_message.last_nack_time = now
+            self.nacks_sent += 1
+
+    def __finish(self, key: "tuple[tuple, int]") -> None:
+        """
+        Stops tracking the message and ignores any of its chunks arriving later.
+        """
+        self.__partial_messages.pop(key, None)
+
+        self.__finished_messages[key] = None
+        while len(self.__finished_messages) > FINISHED_HISTORY_SIZE:
+            self.__finished_messages.popitem(last=False)
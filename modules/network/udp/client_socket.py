@@ -98,6 +98,24 @@ class UdpClientSocket(UdpSocket):
 
         return True
 
+    def send_batched(self, data: bytes) -> bool:
+        """
+        Sends data to the specified server address during this socket's creation,
+        submitting many datagrams per system call.
+
+        Parameters
+        ----------
+        data: bytes
+            Takes in raw data that we wish to send
+
+        Returns
+        -------
+        bool: True if data is sent successfully, and false if it fails to send
+        """
+
+        host, port = self.__server_address
+        return super().send_to_batched(data, host, port)
+
     def recv(self, buf_size: int) -> None:
         """
         Receive data method override to prevent client sockets from receiving data.
@@ -116,3 +134,22 @@ class UdpClientSocket(UdpSocket):
         raise NotImplementedError(
             "Client sockets cannot receive data as they are not bound by a port."
         )
+
+    def recv_batch(self, max_count: int = 0) -> None:
+        """
+        Receive data method override to prevent client sockets from receiving data.
+
+        Parameters
+        ----------
+        max_count: int
+            The number of datagrams to be received.
+
+        Raises
+        ------
+        NotImplementedError
+            Always raised because client sockets should not receive data.
+        """
+
+        raise NotImplementedError(
+            "Client sockets cannot receive data as they are not bound by a port."
+        )
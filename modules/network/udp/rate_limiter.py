@@ -0,0 +1,229 @@
+"""
+Token bucket rate limiter for pacing datagrams.
+
+Optionally adapts the rate with additive increase, multiplicative decrease (AIMD):
+the rate grows linearly over time and is cut when congestion is reported,
+either by the receiver (e.g. NACKs) or by the send queue of the socket filling up.
+"""
+
+import math
+import time
+
+
+BURST_SIZE = 2**16  # Bytes that can be sent at once after being idle
+MIN_BITRATE = 64e3  # Bits per second, adaptive mode never goes below this
+ADDITIVE_INCREASE = 1e6  # Bits per second gained every second without congestion
+MULTIPLICATIVE_DECREASE = 0.5  # Bitrate is multiplied by this on congestion
+DECREASE_INTERVAL = 0.1  # Seconds, congestion reported more often is treated as one event
+SEND_QUEUE_CONGESTION_THRESHOLD = 0.5  # Fraction of the send buffer in use considered congested
+STATISTICS_WINDOW = 1.0  # Seconds over which the achieved bitrate is measured
+
+
+# Statistics are exposed as attributes
+# pylint: disable-next=too-many-instance-attributes
+class RateLimiter:
+    """
+    Token bucket where tokens are bytes, refilled at the target bitrate.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        bitrate: float,
+        burst_size: int = BURST_SIZE,
+        adaptive: bool = False,
+        min_bitrate: float = MIN_BITRATE,
+        max_bitrate: float | None = None,
+        additive_increase: float = ADDITIVE_INCREASE,
+        multiplicative_decrease: float = MULTIPLICATIVE_DECREASE,
+    ) -> "tuple[True, RateLimiter] | tuple[False, None]":
+        """
+        bitrate: Target in bits per second. Starting rate in adaptive mode.
+        burst_size: Bytes which can be sent without waiting after being idle.
+        adaptive: Adjust the bitrate with AIMD between min_bitrate and max_bitrate.
+        min_bitrate: Bits per second.
+        max_bitrate: Bits per second. None is no limit.
+        additive_increase: Bits per second added for every second without congestion.
+        multiplicative_decrease: Between 0.0 and 1.0, bitrate is multiplied by this on congestion.
+
+        Return: Success, object.
+        """
+        if bitrate <= 0.0:
+            print("Bitrate must be a positive non-zero value.")
+            return False, None
+
+        if burst_size <= 0:
+            print("Burst size must be a positive non-zero value.")
+            return False, None
+
+        if adaptive:
+            if min_bitrate <= 0.0 or min_bitrate > bitrate:
+                print("Minimum bitrate must be positive and at most the bitrate.")
+                return False, None
+
+            if max_bitrate is not None and max_bitrate < bitrate:
+                print("Maximum bitrate must be at least the bitrate.")
+                return False, None
+
+            if additive_increase < 0.0:
+                print("Additive increase must not be negative.")
+                return False, None
+
+            if multiplicative_decrease <= 0.0 or multiplicative_decrease >= 1.0:
+                print("Multiplicative decrease must be between 0.0 and 1.0 exclusive.")
+                return False, None
+
+        return True, RateLimiter(
+            cls.__create_key,
+            bitrate,
+            burst_size,
+            adaptive,
+            min_bitrate,
+            max_bitrate,
+            additive_increase,
+            multiplicative_decrease,
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        bitrate: float,
+        burst_size: int,
+        adaptive: bool,
+        min_bitrate: float,
+        max_bitrate: float | None,
+        additive_increase: float,
+        multiplicative_decrease: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is RateLimiter.__create_key, "Use create() method."
+
+        self.__bitrate = bitrate
+        self.__burst_size = burst_size
+        self.__adaptive = adaptive
+        self.__min_bitrate = min_bitrate
+        self.__max_bitrate = max_bitrate
+        self.__additive_increase = additive_increase
+        self.__multiplicative_decrease = multiplicative_decrease
+
+        now = time.monotonic()
+        self.__tokens = float(burst_size)
+        self.__last_refill_time = now
+        self.__last_decrease_time = -math.inf
+
+        self.__window_start_time = now
+        self.__window_bytes = 0
+        self.__achieved_bitrate = 0.0
+
+        self.bytes_sent = 0
+        self.packets_sent = 0
+        self.wait_time = 0.0
+        self.congestion_events = 0
+        self.send_queue_size = 0
+        self.send_queue_peak = 0
+
+    def acquire(self, size: int) -> None:
+        """
+        Blocks until size bytes can be sent at the target bitrate, then consumes them.
+
+        size: Bytes about to be sent.
+        """
+        self.__refill(time.monotonic())
+
+        # Datagrams larger than the burst size are allowed by going into debt
+        required = min(size, self.__burst_size)
+        if self.__tokens < required:
+            delay = (required - self.__tokens) * 8 / self.__bitrate
+            time.sleep(delay)
+            self.wait_time += delay
+            self.__refill(time.monotonic())
+
+        self.__tokens -= size
+
+        self.bytes_sent += size
+        self.packets_sent += 1
+        self.__window_bytes += size
+
+    def report_congestion(self) -> None:
+        """
+        Receiver feedback that data was lost. Decreases the bitrate in adaptive mode.
+        """
+        self.congestion_events += 1
+
+        if not self.__adaptive:
+            return
+
+        now = time.monotonic()
+        if now - self.__last_decrease_time < DECREASE_INTERVAL:
+            return
+
+        self.__refill(now)
+        self.__bitrate = max(self.__bitrate * self.__multiplicative_decrease, self.__min_bitrate)
+        self.__last_decrease_time = now
+
+    def report_send_queue(self, queued_size: int, buffer_size: int) -> None:
+        """
+        Records the socket send queue occupancy.
+        In adaptive mode, a mostly full send queue is treated as congestion.
+
+        queued_size: Bytes waiting in the socket send buffer.
+        buffer_size: Bytes, size of the socket send buffer.
+        """
+        self.send_queue_size = queued_size
+        self.send_queue_peak = max(self.send_queue_peak, queued_size)
+
+        if buffer_size > 0 and queued_size > buffer_size * SEND_QUEUE_CONGESTION_THRESHOLD:
+            self.report_congestion()
+
+    def is_adaptive(self) -> bool:
+        """
+        Whether the bitrate adapts to congestion.
+        """
+        return self.__adaptive
+
+    def get_bitrate(self) -> float:
+        """
+        Current target in bits per second.
+        """
+        return self.__bitrate
+
+    def get_achieved_bitrate(self) -> float:
+        """
+        Bits per second actually sent, measured over the last statistics window.
+        """
+        self.__update_window(time.monotonic())
+        return self.__achieved_bitrate
+
+    def __refill(self, now: float) -> None:
+        """
+        Adds the tokens earned since the last refill, and increases the bitrate in adaptive mode.
+        """
+        elapsed = now - self.__last_refill_time
+        self.__last_refill_time = now
+
+        # Only probe for more bandwidth while sending is limited by the bitrate, not when idle
+        if self.__adaptive and self.__tokens < self.__burst_size:
+            limited_time = min(elapsed, (self.__burst_size - self.__tokens) * 8 / self.__bitrate)
+            self.__bitrate += limited_time * self.__additive_increase
+            if self.__max_bitrate is not None:
+                self.__bitrate = min(self.__bitrate, self.__max_bitrate)
+
+        self.__tokens = min(self.__tokens + elapsed * self.__bitrate / 8, self.__burst_size)
+
+        self.__update_window(now)
+
+    def __update_window(self, now: float) -> None:
+        """
+        Starts a new statistics window when the current one has ended.
+        """
+        elapsed = now - self.__window_start_time
+        if elapsed < STATISTICS_WINDOW:
+            return
+
+        self.__achieved_bitrate = self.__window_bytes * 8 / elapsed
+        self.__window_start_time = now
+        self.__window_bytes = 0
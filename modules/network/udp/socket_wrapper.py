@@ -2,9 +2,21 @@
 Wrapper for a UDP socket.
 """
 
+import select
 import socket
+import struct
 import time
 
+# Send queue size is only available on Linux
+try:
+    import fcntl
+    import termios
+except ImportError:
+    fcntl = None
+
+from . import batch_io
+from .rate_limiter import RateLimiter
+
 
 CHUNK_SIZE = 2**15  # 32 kb, may need to be shrunk on pi becasue its buffer may not be as large
 SEND_DELAY = 1e-4  # Delay in seconds in between sends to avoid filling socket buffer
@@ -24,6 +36,9 @@ class UdpSocket:
         """
 
         self.__socket = socket_instance
+        self.__rate_limiter = None
+        self.__send_buffer_size = 0
+        self.__batcher = None
 
     def send_to(
         self,
@@ -43,6 +58,10 @@ class UdpSocket:
             Empty string is interpreted as '0.0.0.0' (IPv4) or '::' (IPv6), which is an open address
         port: int (default 5000)
             The host, combined with the port, will form the address as a tuple
+        chunk_size: int (default CHUNK_SIZE)
+            Maximum bytes in each datagram.
+        send_delay: float (default SEND_DELAY)
+            Seconds to wait after each datagram. Ignored if a rate limiter is set.
 
         Returns
         -------
@@ -59,6 +78,9 @@ class UdpSocket:
             else:
                 chunk = data[data_sent : data_sent + chunk_size]
 
+            if self.__rate_limiter is not None:
+                self.__rate_limiter.acquire(len(chunk))
+
             try:
                 self.__socket.sendto(chunk, address)
                 data_sent += len(chunk)
@@ -66,7 +88,12 @@ class UdpSocket:
                 print(f"Could not send data: {e}")
                 return False
 
-            time.sleep(send_delay)
+            if self.__rate_limiter is None:
+                time.sleep(send_delay)
+            elif self.__rate_limiter.is_adaptive():
+                result, queued_size = self.get_send_queue_size()
+                if result:
+                    self.__rate_limiter.report_send_queue(queued_size, self.__send_buffer_size)
 
         return True
 
@@ -107,6 +134,181 @@ class UdpSocket:
 
         return True, data
 
+    def send_to_batched(
+        self,
+        data: bytes,
+        host: str = "",
+        port: int = 5000,
+        chunk_size: int = CHUNK_SIZE,
+        batch_size: int = batch_io.BATCH_SIZE,
+    ) -> bool:
+        """
+        Sends data to specified address, submitting many datagrams per system call.
+        There is no delay between datagrams, but the rate limiter is used if one is set.
+
+        Parameters
+        ----------
+        data: bytes
+            Any object supporting the buffer protocol (e.g. bytes, bytearray, np.ndarray).
+        host: str (default "")
+            Empty string is interpreted as '0.0.0.0' (IPv4) or '::' (IPv6), which is an open address
+        port: int (default 5000)
+            The host, combined with the port, will form the address as a tuple
+        chunk_size: int (default CHUNK_SIZE)
+            Maximum bytes in each datagram.
+        batch_size: int (default batch_io.BATCH_SIZE)
+            Maximum datagrams per system call.
+
+        Returns
+        -------
+        bool: if data was transferred successfully
+        """
+
+        result = self.__create_batcher(batch_size)
+        if not result:
+            return False
+
+        payload = memoryview(data).cast("B")
+
+        # Resolve once instead of for every datagram
+        try:
+            address = socket.getaddrinfo(
+                host, port, self.__socket.family, socket.SOCK_DGRAM, socket.IPPROTO_UDP
+            )[0][4]
+        except socket.gaierror as e:
+            print(f"Could not resolve address, address related error: {e}.")
+            return False
+
+        batch_data_size = chunk_size * batch_size
+        for start in range(0, payload.nbytes, batch_data_size):
+            batch = payload[start : start + batch_data_size]
+
+            if self.__rate_limiter is not None:
+                for offset in range(0, batch.nbytes, chunk_size):
+                    self.__rate_limiter.acquire(min(chunk_size, batch.nbytes - offset))
+
+            try:
+                self.__batcher.send(self.__socket, batch, chunk_size, address)
+            except socket.error as e:
+                print(f"Could not send data: {e}")
+                return False
+
+        return True
+
+    def recv_batch(
+        self, max_count: int = batch_io.BATCH_SIZE, slot_size: int = batch_io.SLOT_SIZE
+    ) -> "tuple[bool, list[tuple[memoryview, tuple]] | None]":
+        """
+        Receives up to max_count datagrams in one system call, waiting for at least one.
+        Datagrams are received into a ring of preallocated buffers.
+
+        Parameters
+        ----------
+        max_count: int (default batch_io.BATCH_SIZE)
+            Maximum number of datagrams to receive.
+        slot_size: int (default batch_io.SLOT_SIZE)
+            Bytes in each buffer of the ring, longer datagrams are truncated. Must cover the
+            sender's chunk_size, use batch_io.MAX_SLOT_SIZE for the default CHUNK_SIZE or any size.
+
+        Returns
+        -------
+        tuple:
+            bool - True if data was received successfully, False otherwise
+            list[tuple[memoryview, tuple]] | None - The datagrams and their sender addresses,
+                or None if unsuccessful. Each view is overwritten after batch_io.SLOT_COUNT
+                more datagrams are received, so copy it (e.g. bytes(view)) if it must be kept.
+        """
+
+        result = self.__create_batcher(max_count, slot_size)
+        if not result:
+            return False, None
+
+        try:
+            # Only wait if nothing has arrived yet, saving a system call under load
+            datagrams = self.__batcher.recv(self.__socket, max_count)
+            while len(datagrams) == 0:
+                readable, _, _ = select.select([self.__socket], [], [], self.__socket.gettimeout())
+                if len(readable) == 0:
+                    raise TimeoutError("timed out")
+
+                datagrams = self.__batcher.recv(self.__socket, max_count)
+        except socket.error as e:
+            print(f"Could not receive data: {e}")
+            return False, None
+
+        return True, datagrams
+
+    def set_rate_limiter(self, rate_limiter: RateLimiter | None) -> None:
+        """
+        Paces send_to() with a rate limiter instead of a fixed delay between datagrams.
+        An adaptive rate limiter is also told the send queue occupancy after every datagram.
+
+        Parameters
+        ----------
+        rate_limiter: RateLimiter | None
+            None restores the fixed delay.
+        """
+
+        self.__rate_limiter = rate_limiter
+        self.__send_buffer_size = self.__socket.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+
+    def get_rate_limiter(self) -> RateLimiter | None:
+        """
+        Getter for the rate limiter, for its statistics.
+        """
+
+        return self.__rate_limiter
+
+    def get_send_queue_size(self) -> "tuple[bool, int | None]":
+        """
+        Retrieves the number of bytes in the socket send buffer which have not been sent yet.
+
+        Returns
+        -------
+        tuple[bool, int | None]
+            The first parameter represents if the size is available (only on Linux).
+            - If it is not available, the second parameter will be None.
+            - If it is available, the second parameter will be the size in bytes.
+        """
+
+        if fcntl is None:
+            return False, None
+
+        try:
+            result = fcntl.ioctl(self.__socket.fileno(), termios.TIOCOUTQ, bytes(4))
+        except (AttributeError, OSError):
+            return False, None
+
+        return True, struct.unpack("i", result)[0]
+
+    def __create_batcher(self, batch_size: int, slot_size: int | None = None) -> bool:
+        """
+        Allocates the buffers for batched I/O on first use, and again for larger batches or a
+        different receive buffer size. None keeps the current receive buffer size.
+        """
+
+        if self.__batcher is None:
+            if slot_size is None:
+                slot_size = batch_io.SLOT_SIZE
+        else:
+            if slot_size is None:
+                slot_size = self.__batcher.get_slot_size()
+
+            if (
+                self.__batcher.get_batch_size() >= batch_size
+                and self.__batcher.get_slot_size() == slot_size
+            ):
+                return True
+
+        result, batcher = batch_io.DatagramBatcher.create(
+            batch_size, max(batch_size, batch_io.SLOT_COUNT), slot_size
+        )
+        if not result:
+            return False
+
+        self.__batcher = batcher
+        return True
+
     def get_socket(self) -> socket.socket:
         """
         Getter for the underlying socket objet.
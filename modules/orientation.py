@@ -13,6 +13,8 @@ class Orientation:
     Orientation is identical in local and global space.
     """
 
+    __slots__ = ("yaw", "pitch", "roll")
+
     __create_key = object()
 
     @classmethod
@@ -1,15 +1,21 @@
 """
 3D position in WGS 84.
 
-Class with name also available.
+Class with name and columnar array also available.
 """
 
+import numpy as np
+
+from . import columnar_array
+
 
 class PositionGlobal:
     """
     WGS 84 following ISO 6709 (latitude before longitude).
     """
 
+    __slots__ = ("latitude", "longitude", "altitude")
+
     __create_key = object()
 
     @classmethod
@@ -55,6 +61,8 @@ class NamedPositionGlobal(PositionGlobal):
     Named PositionGlobal.
     """
 
+    __slots__ = ("name",)
+
     __create_key = object()
 
     @classmethod
@@ -99,3 +107,33 @@ class NamedPositionGlobal(PositionGlobal):
         To string.
         """
         return f"{self.__class__}: name: {self.name}, latitude: {self.latitude}, longitude: {self.longitude}, altitude: {self.altitude}"
+
+
+class PositionGlobalArray(columnar_array.ColumnarArray):
+    """
+    Many PositionGlobal as columns, see ColumnarArray.
+    """
+
+    FIELDS = ("latitude", "longitude", "altitude")
+    ELEMENT_CLASS = PositionGlobal
+
+    @property
+    def latitude(self) -> np.ndarray:
+        """
+        Decimal degrees.
+        """
+        return self.data["latitude"]
+
+    @property
+    def longitude(self) -> np.ndarray:
+        """
+        Decimal degrees.
+        """
+        return self.data["longitude"]
+
+    @property
+    def altitude(self) -> np.ndarray:
+        """
+        Metres above mean sea level (MSL).
+        """
+        return self.data["altitude"]
@@ -12,6 +12,8 @@ class PositionGlobalRelativeAltitude:
     Relative altitude to home position.
     """
 
+    __slots__ = ("latitude", "longitude", "relative_altitude")
+
     __create_key = object()
 
     @classmethod
@@ -65,6 +67,8 @@ class NamedPositionGlobalRelativeAltitude(PositionGlobalRelativeAltitude):
     Named PositionGlobalRelativeAltitude.
     """
 
+    __slots__ = ("name",)
+
     __create_key = object()
 
     @classmethod
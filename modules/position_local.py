@@ -1,13 +1,21 @@
 """
 Position in local Euclidean space (origin at home position global).
+
+Class with name and columnar array also available.
 """
 
+import numpy as np
+
+from . import columnar_array
+
 
 class PositionLocal:
     """
     Position in NED system relative to home position.
     """
 
+    __slots__ = ("north", "east", "down")
+
     __create_key = object()
 
     @classmethod
@@ -53,6 +61,8 @@ class NamedPositionLocal(PositionLocal):
     Named PositionLocal.
     """
 
+    __slots__ = ("name",)
+
     __create_key = object()
 
     @classmethod
@@ -92,3 +102,33 @@ class NamedPositionLocal(PositionLocal):
         To string.
         """
         return f"{self.__class__}: name: {self.name}, north: {self.north}, east: {self.east}, down: {self.down}"
+
+
+class PositionLocalArray(columnar_array.ColumnarArray):
+    """
+    Many PositionLocal as columns, see ColumnarArray.
+    """
+
+    FIELDS = ("north", "east", "down")
+    ELEMENT_CLASS = PositionLocal
+
+    @property
+    def north(self) -> np.ndarray:
+        """
+        Metres.
+        """
+        return self.data["north"]
+
+    @property
+    def east(self) -> np.ndarray:
+        """
+        Metres.
+        """
+        return self.data["east"]
+
+    @property
+    def down(self) -> np.ndarray:
+        """
+        Metres.
+        """
+        return self.data["down"]
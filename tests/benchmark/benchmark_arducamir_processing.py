@@ -0,0 +1,127 @@
+"""
+Benchmark ArducamIR frame processing on synthetic raw frames, without the Arducam SDK.
+"""
+
+import timeit
+
+import cv2
+import numpy as np
+
+from modules.camera import arducamir_processing
+
+
+FRAME_COUNT = 50
+RESOLUTIONS = [(640, 480), (1920, 1080)]
+BIT_DEPTHS = [10, 12]
+
+
+def remosaic(data: np.ndarray) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Stands in for arducam_rgbir_remosaic.rgbir_remosaic() , which returns new Bayer and quarter
+    size IR arrays. Same cost before and after.
+    """
+    return data.copy(), data[1::2, ::2].copy()
+
+
+def format_before(data: bytes, width: int, height: int, bit_depth: int) -> np.ndarray:
+    """
+    CameraArducamIR.format() before buffers, for comparison.
+    """
+    raw = np.frombuffer(data, np.uint16).reshape(height, width)
+    return (raw >> (bit_depth - 8)).astype(np.uint8)
+
+
+def demosaic_before(data: bytes, width: int, height: int, bit_depth: int, use_rgb: bool) -> None:
+    """
+    CameraArducamIR.demosaic() before buffers, for comparison.
+    """
+    bayer, ir = remosaic(format_before(data, width, height, bit_depth))
+    if use_rgb:
+        cv2.cvtColor(bayer, cv2.COLOR_BayerRG2BGRA)
+        return
+
+    ir_color = cv2.cvtColor(ir, cv2.COLOR_GRAY2BGRA)
+    cv2.resize(ir_color, (bayer.shape[1], bayer.shape[0]))
+
+
+def demosaic_after(
+    processor: arducamir_processing.ArducamIRProcessor,
+    data: bytes,
+    width: int,
+    height: int,
+    bit_depth: int,
+) -> None:
+    """
+    CameraArducamIR.demosaic_both() with a processor, reusing its buffers.
+    """
+    bayer, ir = remosaic(processor.format(data, width, height, bit_depth))
+    processor.bayer_to_bgra(bayer)
+    processor.ir_to_bgra(ir, bayer.shape[1], bayer.shape[0])
+
+
+def time_frame(
+    processor: arducamir_processing.ArducamIRProcessor,
+    data: bytes,
+    width: int,
+    height: int,
+    bit_depth: int,
+) -> "list[float]":
+    """
+    Return: Milliseconds per frame to format before and after, and to get RGB and IR before and
+    after.
+    """
+    times = [
+        timeit.timeit(lambda: format_before(data, width, height, bit_depth), number=FRAME_COUNT),
+        timeit.timeit(lambda: processor.format(data, width, height, bit_depth), number=FRAME_COUNT),
+        # Two calls, one for each output
+        timeit.timeit(
+            lambda: (
+                demosaic_before(data, width, height, bit_depth, True),
+                demosaic_before(data, width, height, bit_depth, False),
+            ),
+            number=FRAME_COUNT,
+        ),
+        timeit.timeit(
+            lambda: demosaic_after(processor, data, width, height, bit_depth),
+            number=FRAME_COUNT,
+        ),
+    ]
+
+    return [elapsed_time / FRAME_COUNT * 1000 for elapsed_time in times]
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    _, processor = arducamir_processing.ArducamIRProcessor.create()
+
+    print(f"{'Resolution':>10} {'Bits':>4} {'Format ms':>20} {'RGB and IR ms':>20}")
+    print(f"{'':>10} {'':>4} {'Before':>10}{'After':>10} {'Before':>10}{'After':>10}")
+    for width, height in RESOLUTIONS:
+        for bit_depth in BIT_DEPTHS:
+            raw = np.random.default_rng(0).integers(0, 2**bit_depth, (height, width), np.uint16)
+            data = raw.tobytes()
+
+            if not np.array_equal(
+                format_before(data, width, height, bit_depth),
+                processor.format(data, width, height, bit_depth),
+            ):
+                print("ERROR: Formatted data differs")
+                return -1
+
+            times = time_frame(processor, data, width, height, bit_depth)
+            print(
+                f"{height:>9}p {bit_depth:>4} {times[0]:>10.2f}{times[1]:>10.2f}"
+                f" {times[2]:>10.2f}{times[3]:>10.2f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,181 @@
+"""
+Benchmark concurrent TCP connections over loopback on one asyncio event loop
+against one thread per connection.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+
+from modules.network.tcp.async_client_socket import AsyncTcpClientSocket
+from modules.network.tcp.async_server_socket import AsyncTcpServer
+from modules.network.tcp.async_socket_wrapper import AsyncTcpSocket
+from modules.network.tcp.client_socket import TcpClientSocket
+from modules.network.tcp.server_socket import TcpServerSocket
+
+
+HOST = "localhost"
+CONNECTION_COUNTS = [10, 100, 500]
+MESSAGE_COUNT = 100  # Round trips per connection
+MESSAGE_SIZE = 1000
+TIMEOUT = 30.0
+
+
+async def async_echo(connection: AsyncTcpSocket) -> None:
+    """
+    Sends back every message until the peer disconnects.
+    """
+    while True:
+        result, message = await connection.recv_message()
+        if not result:
+            return
+
+        await connection.send_message(message)
+
+
+async def async_client(port: int) -> None:
+    """
+    Round trips on one connection.
+    """
+    result, client = await AsyncTcpClientSocket.create(
+        host=HOST, port=port, connection_timeout=TIMEOUT
+    )
+    assert result
+    assert client is not None
+
+    data = bytes(MESSAGE_SIZE)
+    for _ in range(MESSAGE_COUNT):
+        assert await client.send_message(data)
+        result, _ = await client.recv_message()
+        assert result
+
+    await client.close()
+
+
+async def benchmark_async(connection_count: int) -> float:
+    """
+    Server and clients on one event loop.
+
+    Return: Seconds.
+    """
+    result, server = await AsyncTcpServer.create(
+        async_echo, HOST, port=0, connection_timeout=TIMEOUT
+    )
+    assert result
+    assert server is not None
+
+    _, port = server.address()
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(async_client(port) for _ in range(connection_count)))
+    elapsed = time.perf_counter() - start_time
+
+    await server.close()
+
+    return elapsed
+
+
+def threaded_echo(instance: socket.socket) -> None:
+    """
+    Sends back every message until the peer disconnects.
+    """
+    instance.settimeout(TIMEOUT)
+    result, connection = TcpServerSocket.create(instance=instance)
+    assert result
+    assert connection is not None
+
+    while True:
+        result, message = connection.recv_message()
+        if not result:
+            break
+
+        connection.send_message(message)
+
+    connection.close()
+
+
+def threaded_accept(server: socket.socket, connection_count: int) -> None:
+    """
+    Starts a thread for each connection.
+    """
+    for _ in range(connection_count):
+        instance, _ = server.accept()
+        threading.Thread(target=threaded_echo, args=(instance,), daemon=True).start()
+
+
+def threaded_client(port: int) -> None:
+    """
+    Round trips on one connection.
+    """
+    result, client = TcpClientSocket.create(host=HOST, port=port, connection_timeout=TIMEOUT)
+    assert result
+    assert client is not None
+
+    data = bytes(MESSAGE_SIZE)
+    for _ in range(MESSAGE_COUNT):
+        assert client.send_message(data)
+        result, _ = client.recv_message()
+        assert result
+
+    client.close()
+
+
+def benchmark_threaded(connection_count: int) -> float:
+    """
+    A thread for each server connection and each client.
+
+    Return: Seconds.
+    """
+    server = socket.create_server((HOST, 0), backlog=connection_count)
+    server.settimeout(TIMEOUT)
+    _, port = server.getsockname()
+
+    accept_thread = threading.Thread(target=threaded_accept, args=(server, connection_count))
+    accept_thread.start()
+
+    start_time = time.perf_counter()
+    clients = [
+        threading.Thread(target=threaded_client, args=(port,)) for _ in range(connection_count)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start_time
+
+    accept_thread.join()
+    server.close()
+
+    return elapsed
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    results = []
+    for connection_count in CONNECTION_COUNTS:
+        async_time = asyncio.run(benchmark_async(connection_count))
+        threaded_time = benchmark_threaded(connection_count)
+        results.append((connection_count, async_time, threaded_time))
+
+    # Printed afterwards, as the connection threads print when their peer disconnects
+    print(f"{MESSAGE_COUNT} round trips of {MESSAGE_SIZE} bytes per connection")
+    print(f"{'Connections':>12} {'asyncio msg/s':>14} {'threaded msg/s':>15} {'Threads':>8}")
+    for connection_count, async_time, threaded_time in results:
+        message_count = connection_count * MESSAGE_COUNT
+        print(
+            f"{connection_count:>12} {message_count / async_time:>14.0f} "
+            f"{message_count / threaded_time:>15.0f} {1:>4} vs {connection_count * 2 + 1}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
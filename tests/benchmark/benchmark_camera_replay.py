@@ -0,0 +1,96 @@
+"""
+Benchmark frame rate of the replay camera at max speed, with and without prefetching and caching.
+"""
+
+import pathlib
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from modules.camera import camera_replay
+
+
+WIDTH = 1920
+HEIGHT = 1080
+IMAGE_COUNT = 30
+# Passes through the images, so the cache is used
+PASS_COUNT = 3
+# Consumer waiting on something else per frame, e.g. a network or accelerator
+CONSUMER_WAIT = 0.01  # s
+
+
+def write_images(directory: pathlib.Path) -> None:
+    """
+    JPEG images with gradients and noise, compress like camera images.
+    """
+    generator = np.random.default_rng(0)
+    rows = np.linspace(0, 200, HEIGHT)[:, np.newaxis, np.newaxis]
+    columns = np.linspace(0, 55, WIDTH)[np.newaxis, :, np.newaxis]
+    for index in range(IMAGE_COUNT):
+        noise = generator.normal(0.0, 4.0, (HEIGHT, WIDTH, 3))
+        image = np.clip(rows + columns + noise, 0, 255).astype(np.uint8)
+        cv2.imwrite(str(pathlib.Path(directory, f"frame_{index:03}.jpg")), image)
+
+
+def measure(config: camera_replay.ConfigReplay, consumer_wait: float) -> float:
+    """
+    Return: Frames per second.
+    """
+    result, camera = camera_replay.CameraReplay.create(WIDTH, HEIGHT, config)
+    if not result:
+        return 0.0
+
+    start_time = time.monotonic()
+    for _ in range(IMAGE_COUNT * PASS_COUNT):
+        result, _ = camera.run()
+        if not result:
+            return 0.0
+
+        time.sleep(consumer_wait)
+
+    return IMAGE_COUNT * PASS_COUNT / (time.monotonic() - start_time)
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        directory = pathlib.Path(directory)
+        write_images(directory)
+
+        cases = [
+            ("no prefetch", 0, 0, 1),
+            ("prefetch 4, 2 threads", 4, 0, 2),
+            ("prefetch 4, cache all", 4, IMAGE_COUNT, 2),
+        ]
+
+        print(f"{IMAGE_COUNT} JPEG images at {HEIGHT}p, {PASS_COUNT} passes, max speed")
+        print(f"{'Replay':>22} {'fps':>7} {'fps with 10 ms consumer':>24}")
+        for name, prefetch_count, cache_size, thread_count in cases:
+            config = camera_replay.ConfigReplay(
+                directory,
+                camera_replay.ReplayRate.MAX_SPEED,
+                loop=True,
+                prefetch_count=prefetch_count,
+                cache_size=cache_size,
+                thread_count=thread_count,
+            )
+            fps = measure(config, 0.0)
+            fps_with_consumer = measure(config, CONSUMER_WAIT)
+            if fps == 0.0 or fps_with_consumer == 0.0:
+                return -1
+
+            print(f"{name:>22} {fps:>7.1f} {fps_with_consumer:>24.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
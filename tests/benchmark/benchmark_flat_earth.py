@@ -0,0 +1,111 @@
+"""
+Benchmark accuracy and speed of the flat earth approximation against the exact conversion.
+"""
+
+import time
+
+import numpy as np
+
+from modules import position_global
+from modules import position_local
+from modules.mavlink import local_frame
+
+
+DISTANCES = [100.0, 1000.0, 2000.0, 5000.0, 10000.0, 20000.0, 50000.0]  # Metres from home
+POINT_COUNT = 100000  # For array conversion
+SCALAR_POINT_COUNT = 10000
+
+
+def create_local_positions(distance: float, count: int) -> np.ndarray:
+    """
+    Positions at the distance from home in random directions, within 100 m of home altitude.
+    """
+    generator = np.random.default_rng(0)
+    angles = generator.uniform(0.0, 2.0 * np.pi, count)
+
+    return np.column_stack(
+        (
+            distance * np.cos(angles),
+            distance * np.sin(angles),
+            generator.uniform(-100.0, 100.0, count),
+        )
+    )
+
+
+def measure_error(
+    exact_frame: local_frame.LocalFrame, flat_frame: local_frame.LocalFrame, distance: float
+) -> "tuple[float, float]":
+    """
+    Return: Maximum horizontal and vertical error in metres.
+    """
+    local_positions = create_local_positions(distance, POINT_COUNT)
+
+    result, approximate = flat_frame.to_global(local_positions)
+    assert result
+    result, approximate_local = exact_frame.to_local(approximate)
+    assert result
+
+    error = approximate_local.to_array() - local_positions
+
+    return np.max(np.hypot(error[:, 0], error[:, 1])), np.max(np.abs(error[:, 2]))
+
+
+def measure_speed(frame: local_frame.LocalFrame) -> "tuple[float, float]":
+    """
+    Return: Positions per second for scalar and array conversion to global.
+    """
+    local_positions = create_local_positions(1000.0, POINT_COUNT)
+
+    positions = []
+    for north, east, down in local_positions[:SCALAR_POINT_COUNT].tolist():
+        _, position = position_local.PositionLocal.create(north, east, down)
+        positions.append(position)
+
+    start_time = time.perf_counter()
+    for position in positions:
+        frame.to_global(position)
+    scalar_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    result, _ = frame.to_global(local_positions)
+    array_time = time.perf_counter() - start_time
+    assert result
+
+    return SCALAR_POINT_COUNT / scalar_time, POINT_COUNT / array_time
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    result, home_position = position_global.PositionGlobal.create(43.472978, -80.540103, 336.0)
+    assert result
+
+    result, exact_frame = local_frame.LocalFrame.create(home_position)
+    assert result
+
+    result, flat_frame = local_frame.LocalFrame.create(home_position, flat_earth=True)
+    assert result
+
+    print("Flat earth error")
+    print(f"{'Distance m':>11} {'Horizontal m':>13} {'Vertical m':>11}")
+    for distance in DISTANCES:
+        horizontal_error, vertical_error = measure_error(exact_frame, flat_frame, distance)
+        print(f"{distance:>11.0f} {horizontal_error:>13.4f} {vertical_error:>11.4f}")
+
+    print()
+    print("Local to global")
+    print(f"{'Mode':>11} {'Scalar pt/s':>13} {'Array pt/s':>11}")
+    for name, frame in [("exact", exact_frame), ("flat earth", flat_frame)]:
+        scalar_rate, array_rate = measure_speed(frame)
+        print(f"{name:>11} {scalar_rate:>13.0f} {array_rate:>11.0f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,148 @@
+"""
+Benchmark frame rate and frame age of a consumer reading a 30 fps camera directly with run() and
+through the frame grabber.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+from modules.camera import base_camera
+from modules.camera import frame_grabber
+
+
+DURATION = 3.0  # s
+CAMERA_PERIOD = 1.0 / 30.0  # s
+WIDTH = 1280
+HEIGHT = 720
+# Frames a V4L2 driver typically queues
+DRIVER_BUFFER_COUNT = 4
+# Gaussian blur kernel sizes, the large one takes longer than a camera period
+KERNEL_SIZES = [15, 61]
+
+
+class SimulatedCamera(base_camera.BaseCameraDevice):
+    """
+    Exposes a frame every camera period. Like a driver, run() returns the oldest queued frame, or
+    waits for the next exposure if none are queued. When the queue is full the oldest is dropped.
+    """
+
+    @classmethod
+    def create(cls, width: int, height: int, config: object) -> "tuple[True, SimulatedCamera]":
+        return True, SimulatedCamera(width, height)
+
+    def __init__(self, width: int, height: int) -> None:
+        self.__image = np.random.default_rng(0).integers(0, 256, (height, width, 3), np.uint8)
+        self.__start_time = time.monotonic()
+        self.__next_exposure = 0
+        # End time of exposure of each frame returned by run()
+        self.exposure_times = []
+
+    def __del__(self) -> None:
+        pass
+
+    def run(self) -> tuple[True, np.ndarray] | tuple[False, None]:
+        exposed = int((time.monotonic() - self.__start_time) / CAMERA_PERIOD)
+        self.__next_exposure = max(self.__next_exposure, exposed - DRIVER_BUFFER_COUNT + 1)
+
+        exposure_time = self.__start_time + (self.__next_exposure + 1) * CAMERA_PERIOD
+        time.sleep(max(0.0, exposure_time - time.monotonic()))
+        self.__next_exposure += 1
+
+        self.exposure_times.append(exposure_time)
+        return True, self.__image.copy()
+
+
+def run_direct(kernel_size: int) -> "tuple[int, list[float], list[float]]":
+    """
+    Return: Frames processed, wait per frame, frame age when processing starts.
+    """
+    _, camera = SimulatedCamera.create(WIDTH, HEIGHT, None)
+    waits = []
+    ages = []
+    end_time = time.monotonic() + DURATION
+    while time.monotonic() < end_time:
+        start_time = time.monotonic()
+        _, image = camera.run()
+        now = time.monotonic()
+        waits.append(now - start_time)
+        ages.append(now - camera.exposure_times[-1])
+
+        cv2.GaussianBlur(image, (kernel_size, kernel_size), 0)
+
+    return len(waits), waits, ages
+
+
+def run_grabber(kernel_size: int, use_latest: bool) -> "tuple[int, list[float], list[float]]":
+    """
+    Return: New frames processed, wait per frame, frame age when processing starts.
+    """
+    _, camera = SimulatedCamera.create(WIDTH, HEIGHT, None)
+    result, grabber = frame_grabber.FrameGrabber.create(camera)
+    if not result:
+        return 0, [], []
+
+    out = np.empty(grabber.shape, np.uint8)
+    waits = []
+    ages = []
+    previous_sequence_number = -1
+    end_time = time.monotonic() + DURATION
+    while time.monotonic() < end_time:
+        start_time = time.monotonic()
+        if use_latest:
+            frame = grabber.latest(out)
+        else:
+            result, frame = grabber.next(1.0, out)
+            if not result:
+                break
+        now = time.monotonic()
+
+        if frame.sequence_number == previous_sequence_number:
+            # Already processed, poll again shortly
+            time.sleep(0.001)
+            continue
+
+        waits.append(now - start_time)
+        # Sequence number counts calls to run()
+        ages.append(now - camera.exposure_times[frame.sequence_number])
+        previous_sequence_number = frame.sequence_number
+
+        cv2.GaussianBlur(frame.image, (kernel_size, kernel_size), 0)
+
+    grabber.stop()
+    return len(waits), waits, ages
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    cases = [
+        ("run()", run_direct),
+        ("grabber next()", lambda kernel_size: run_grabber(kernel_size, False)),
+        ("grabber latest()", lambda kernel_size: run_grabber(kernel_size, True)),
+    ]
+
+    print(f"{WIDTH}x{HEIGHT} camera at {1 / CAMERA_PERIOD:.0f} fps, Gaussian blur per frame")
+    print(f"{'Kernel':>6} {'Read':>16} {'New fps':>8} {'Wait ms':>8} {'Age ms':>7}")
+    for kernel_size in KERNEL_SIZES:
+        for name, function in cases:
+            count, waits, ages = function(kernel_size)
+            if count == 0:
+                return -1
+
+            print(
+                f"{kernel_size:>6} {name:>16} {count / DURATION:>8.1f}"
+                f" {np.mean(waits) * 1000:>8.2f} {np.mean(ages) * 1000:>7.2f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
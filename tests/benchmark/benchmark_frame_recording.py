@@ -0,0 +1,144 @@
+"""
+Benchmark writing and reading 1080p frames as individual PNG files and as a recording.
+"""
+
+import pathlib
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from modules.camera import frame_recording
+from modules.logger import image_sink
+
+
+WIDTH = 1920
+HEIGHT = 1080
+FRAME_COUNT = 60
+
+
+def make_frames() -> "list[np.ndarray]":
+    """
+    Frames with gradients and noise, compress like camera images.
+    """
+    generator = np.random.default_rng(0)
+    rows = np.linspace(0, 200, HEIGHT)[:, np.newaxis, np.newaxis]
+    columns = np.linspace(0, 55, WIDTH)[np.newaxis, :, np.newaxis]
+    frames = []
+    for _ in range(FRAME_COUNT):
+        noise = generator.normal(0.0, 4.0, (HEIGHT, WIDTH, 3))
+        frames.append(np.clip(rows + columns + noise, 0, 255).astype(np.uint8))
+
+    return frames
+
+
+def write_png(directory: pathlib.Path, frames: "list[np.ndarray]") -> "list[pathlib.Path]":
+    """
+    Same as Logger.save_image() .
+    """
+    _, sink = image_sink.ImageSink.create(directory, "benchmark")
+    paths = []
+    for frame in frames:
+        _, name = sink.save(frame)
+        paths.append(pathlib.Path(directory, name))
+
+    return paths
+
+
+def write_recording(
+    path: pathlib.Path, frames: "list[np.ndarray]", encoding: frame_recording.FrameEncoding
+) -> None:
+    """
+    Recording of the frames.
+    """
+    _, recorder = frame_recording.FrameRecorder.create(path, encoding)
+    for index, frame in enumerate(frames):
+        recorder.write(frame, float(index))
+    recorder.close()
+
+
+def read_png(paths: "list[pathlib.Path]", order: "list[int]") -> None:
+    """
+    Decodes the files in the order.
+    """
+    for index in order:
+        cv2.imread(str(paths[index])).max()
+
+
+def read_recording(path: pathlib.Path, order: "list[int]") -> None:
+    """
+    Reads the frames in the order.
+    """
+    _, reader = frame_recording.FrameRecordingReader.create(path)
+    for index in order:
+        _, image, _ = reader.read(index)
+        image.max()
+        del image
+    reader.close()
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    frames = make_frames()
+    sequential = list(range(FRAME_COUNT))
+    shuffled = list(np.random.default_rng(1).permutation(FRAME_COUNT))
+
+    print(f"{FRAME_COUNT} frames at {HEIGHT}p, files in page cache")
+    print(f"{'Format':>16} {'MB':>7} {'Write ms':>9} {'Read ms':>8} {'Random ms':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = pathlib.Path(directory)
+
+        cases = []
+
+        png_directory = pathlib.Path(directory, "png")
+        png_directory.mkdir()
+        start_time = time.perf_counter()
+        paths = write_png(png_directory, frames)
+        write_time = time.perf_counter() - start_time
+        size = sum(path.stat().st_size for path in paths)
+        cases.append(("PNG files", size, write_time, lambda order: read_png(paths, order)))
+
+        for name, encoding in [
+            ("recording raw", frame_recording.FrameEncoding.RAW),
+            ("recording JPEG", frame_recording.FrameEncoding.JPEG),
+        ]:
+            path = pathlib.Path(directory, f"{encoding.name}{frame_recording.FILE_EXTENSION}")
+            start_time = time.perf_counter()
+            write_recording(path, frames, encoding)
+            write_time = time.perf_counter() - start_time
+            cases.append(
+                (
+                    name,
+                    path.stat().st_size,
+                    write_time,
+                    lambda order, path=path: read_recording(path, order),
+                )
+            )
+
+        for name, size, write_time, read in cases:
+            start_time = time.perf_counter()
+            read(sequential)
+            read_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            read(shuffled)
+            random_time = time.perf_counter() - start_time
+
+            print(
+                f"{name:>16} {size / 1e6:>7.1f} {write_time / FRAME_COUNT * 1000:>9.2f}"
+                f" {read_time / FRAME_COUNT * 1000:>8.2f} {random_time / FRAME_COUNT * 1000:>10.2f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,81 @@
+"""
+Benchmark caller latency of saving 1080p frames at 30 fps, on the calling thread and queued.
+"""
+
+import pathlib
+import tempfile
+import time
+
+import numpy as np
+
+from modules.logger import image_sink
+
+
+FRAME_COUNT = 90
+FRAME_PERIOD = 1.0 / 30.0  # s
+QUEUE_SIZE = 8
+
+
+def make_frame() -> np.ndarray:
+    """
+    1080p frame with gradients and noise, compresses like a camera image.
+    """
+    generator = np.random.default_rng(0)
+    rows = np.linspace(0, 200, 1080)[:, np.newaxis, np.newaxis]
+    columns = np.linspace(0, 55, 1920)[np.newaxis, :, np.newaxis]
+    noise = generator.normal(0.0, 4.0, (1080, 1920, 3))
+    return np.clip(rows + columns + noise, 0, 255).astype(np.uint8)
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    frame = make_frame()
+
+    cases = [
+        ("PNG", image_sink.ImageFormat.PNG, 0),
+        ("PNG", image_sink.ImageFormat.PNG, QUEUE_SIZE),
+        ("JPEG", image_sink.ImageFormat.JPEG, 0),
+        ("JPEG", image_sink.ImageFormat.JPEG, QUEUE_SIZE),
+        ("NPY", image_sink.ImageFormat.NPY, 0),
+        ("NPY", image_sink.ImageFormat.NPY, QUEUE_SIZE),
+    ]
+
+    print(f"{FRAME_COUNT} 1080p frames offered at 30 fps")
+    print(f"{'Format':>6} {'Queue':>5} {'Mean ms':>8} {'Max ms':>7} {'Saved':>6} {'Dropped':>8}")
+
+    for name, image_format, queue_size in cases:
+        with tempfile.TemporaryDirectory() as directory:
+            result, sink = image_sink.ImageSink.create(
+                pathlib.Path(directory), "benchmark", image_format, queue_size=queue_size
+            )
+            if not result:
+                return -1
+
+            latencies = []
+            next_time = time.perf_counter()
+            for _ in range(FRAME_COUNT):
+                start_time = time.perf_counter()
+                sink.save(frame)
+                latencies.append(time.perf_counter() - start_time)
+
+                next_time += FRAME_PERIOD
+                time.sleep(max(0.0, next_time - time.perf_counter()))
+
+            sink.close()
+
+            print(
+                f"{name:>6} {queue_size:>5} {np.mean(latencies) * 1000:>8.2f}"
+                f" {np.max(latencies) * 1000:>7.2f} {sink.saved_count:>6} {sink.dropped_count:>8}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
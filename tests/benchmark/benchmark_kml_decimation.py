@@ -0,0 +1,123 @@
+"""
+Benchmark KML export of a long track and many targets, with and without decimation.
+"""
+
+import pathlib
+import tempfile
+import time
+
+import numpy as np
+
+from modules import position_global_relative_altitude
+from modules.kml import kml_conversion
+
+
+TRACK_POINT_COUNT = 100000
+TARGET_COUNT = 100000
+
+# Track sampled every 0.5 m with GPS noise
+TRACK_STEP = 0.5  # m
+TRACK_NOISE = 0.1  # m
+TRACK_TOLERANCE = 1.0  # m
+
+# Targets spread over 2 km
+TARGET_AREA = 2000.0  # m
+GRID_CELL_SIZE = 10.0  # m
+
+TILE_SIZE = 0.005  # degrees, about 500 m
+
+METRE = 1.0 / 111195.0  # degrees of latitude
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    generator = np.random.default_rng(0)
+
+    # Lawnmower search pattern
+    headings = np.repeat(np.tile([0.0, np.pi / 2, np.pi, np.pi / 2], 50), TRACK_POINT_COUNT // 200)
+    steps = np.column_stack([np.cos(headings), np.sin(headings)]) * TRACK_STEP
+    track = np.cumsum(steps, axis=0) + generator.normal(0.0, TRACK_NOISE, steps.shape)
+    track_rows = (track * METRE + [43.47, -80.54]).tolist()
+
+    positions = [
+        position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+            latitude, longitude, 30.0
+        )[1]
+        for latitude, longitude in track_rows
+    ]
+
+    target_rows = (
+        generator.uniform(0.0, TARGET_AREA, (TARGET_COUNT, 2)) * METRE + [43.47, -80.54]
+    ).tolist()
+    named_positions = [
+        position_global_relative_altitude.NamedPositionGlobalRelativeAltitude.create(
+            str(i), latitude, longitude, 0.0
+        )[1]
+        for i, (latitude, longitude) in enumerate(target_rows)
+    ]
+
+    cases = [
+        ("track", lambda directory: kml_conversion.positions_to_kml(positions, "t", directory)),
+        (
+            "track simplified",
+            lambda directory: kml_conversion.positions_to_kml(
+                positions, "t", directory, track_tolerance=TRACK_TOLERANCE
+            ),
+        ),
+        (
+            "track simplified tiled",
+            lambda directory: kml_conversion.positions_to_kml(
+                positions, "t", directory, track_tolerance=TRACK_TOLERANCE, tile_size=TILE_SIZE
+            ),
+        ),
+        (
+            "targets",
+            lambda directory: kml_conversion.named_positions_to_kml(
+                named_positions, "n", directory
+            ),
+        ),
+        (
+            "targets binned",
+            lambda directory: kml_conversion.named_positions_to_kml(
+                named_positions, "n", directory, grid_cell_size=GRID_CELL_SIZE
+            ),
+        ),
+        (
+            "targets binned tiled",
+            lambda directory: kml_conversion.named_positions_to_kml(
+                named_positions, "n", directory, grid_cell_size=GRID_CELL_SIZE, tile_size=TILE_SIZE
+            ),
+        ),
+    ]
+
+    print(f"{TRACK_POINT_COUNT} track points, {TARGET_COUNT} targets")
+    # Tiled exports also write a file per tile, only loaded by viewers when in view
+    print(f"{'Export':>24} {'Time s':>8} {'Placemarks':>11} {'File MB':>8} {'Total MB':>9}")
+
+    for name, function in cases:
+        with tempfile.TemporaryDirectory() as directory:
+            start_time = time.perf_counter()
+            result, path = function(pathlib.Path(directory))
+            elapsed_time = time.perf_counter() - start_time
+            if not result:
+                print(f"ERROR: {name} failed")
+                return -1
+
+            document = path.read_text(encoding="utf-8")
+            total_size = sum(file.stat().st_size for file in pathlib.Path(directory).rglob("*.kml"))
+            print(
+                f"{name:>24} {elapsed_time:>8.3f} {document.count('<Placemark '):>11}"
+                f" {len(document) / 1e6:>8.2f} {total_size / 1e6:>9.2f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
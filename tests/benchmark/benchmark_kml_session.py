@@ -0,0 +1,99 @@
+"""
+Benchmark live track updates: appending with a session against rewriting the whole document.
+"""
+
+import io
+import pathlib
+import tempfile
+import time
+
+from modules import position_global
+from modules.kml import kml_session
+from modules.kml import kml_writer
+
+
+POINTS_PER_UPDATE = 10
+CHECKPOINTS = [1000, 10000, 100000]
+UPDATES_TIMED = 20
+
+
+def rewrite_document(path: pathlib.Path, track: "list[tuple[float, float, float]]") -> None:
+    """
+    Writes the whole track, as each update had to before sessions.
+    """
+    buffer = io.StringIO()
+    _, writer = kml_writer.KmlWriter.create(buffer)
+    writer.write_line_string("Track", track, kml_session.TRACK_ALTITUDE_MODE)
+    writer.close()
+    path.write_text(buffer.getvalue(), encoding="utf-8")
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    positions = []
+    for i in range(POINTS_PER_UPDATE):
+        _, position = position_global.PositionGlobal.create(43.0 + i * 1e-5, -80.0, 300.0)
+        positions.append(position)
+
+    print(f"Update of {POINTS_PER_UPDATE} points, mean of {UPDATES_TIMED} updates")
+    print(f"{'Points':>8} {'Rewrite ms':>11} {'KML ms':>8} {'KMZ ms':>8} {'KMZ bytes':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        save_directory = pathlib.Path(directory)
+
+        _, kml = kml_session.KmlSession.create("kml", save_directory)
+        _, kmz = kml_session.KmlSession.create("kmz", save_directory, use_kmz=True)
+
+        track = []
+        point_count = 0
+        for checkpoint in CHECKPOINTS:
+            # Grow to the checkpoint without timing
+            while point_count < checkpoint:
+                for session in [kml, kmz]:
+                    if not session.add_track_positions(positions):
+                        print("ERROR: Update failed")
+                        return -1
+
+                track.extend(
+                    (position.latitude, position.longitude, position.altitude)
+                    for position in positions
+                )
+                point_count += POINTS_PER_UPDATE
+
+            times = []
+            for session in [kml, kmz]:
+                start_time = time.perf_counter()
+                for _ in range(UPDATES_TIMED):
+                    session.add_track_positions(positions)
+                times.append((time.perf_counter() - start_time) / UPDATES_TIMED)
+
+            start_time = time.perf_counter()
+            for _ in range(UPDATES_TIMED):
+                rewrite_document(pathlib.Path(save_directory, "rewrite.kml"), track)
+            rewrite_time = (time.perf_counter() - start_time) / UPDATES_TIMED
+
+            point_count += POINTS_PER_UPDATE * UPDATES_TIMED
+            track.extend(
+                (position.latitude, position.longitude, position.altitude)
+                for position in positions * UPDATES_TIMED
+            )
+
+            print(
+                f"{checkpoint:>8} {rewrite_time * 1000:>11.3f} {times[0] * 1000:>8.3f}"
+                f" {times[1] * 1000:>8.3f} {kmz.document_path.stat().st_size:>10}"
+            )
+
+        kml.close()
+        kmz.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,138 @@
+"""
+Benchmark time and peak memory of writing KML with simplekml and with the streaming writer.
+"""
+
+import pathlib
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import simplekml
+import simplekml.base
+
+from modules import position_global_relative_altitude
+from modules.kml import kml_conversion
+
+
+POINT_COUNTS = [10000, 1000000]
+
+# simplekml pretty prints the whole document with minidom, too slow above this
+SIMPLEKML_MAX_POINT_COUNT = 100000
+
+
+def simplekml_positions_to_kml(
+    positions: "list[position_global_relative_altitude.PositionGlobalRelativeAltitude]",
+    document_name_prefix: str,
+    save_directory: pathlib.Path,
+) -> "tuple[True, pathlib.Path] | tuple[False, None]":
+    """
+    positions_to_kml before streaming, for comparison.
+    """
+    named_positions = []
+    for i, position in enumerate(positions):
+        _, named_position = (
+            position_global_relative_altitude.NamedPositionGlobalRelativeAltitude.create(
+                str(i), position.latitude, position.longitude, position.relative_altitude
+            )
+        )
+        named_positions.append(named_position)
+
+    # pylint: disable-next=protected-access
+    simplekml.base.Kmlable._globalid = 0
+
+    kml = simplekml.Kml()
+    for named_position in named_positions:
+        kml.newpoint(
+            name=named_position.name,
+            coords=[
+                (
+                    named_position.longitude,
+                    named_position.latitude,
+                    named_position.relative_altitude,
+                )
+            ],
+        )
+
+    kml_file_path = pathlib.Path(save_directory, f"{document_name_prefix}.kml")
+    kml.save(str(kml_file_path))
+
+    return True, kml_file_path
+
+
+def measure(function: "callable") -> "tuple[object, float, int]":
+    """
+    Runs the function twice: once timed, once with allocations traced (which is slower).
+
+    Return: Result, seconds, peak bytes allocated.
+    """
+    start_time = time.perf_counter()
+    function()
+    elapsed_time = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, elapsed_time, peak
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    generator = np.random.default_rng(0)
+
+    print(f"{'Points':>8} {'Writer':>10} {'Time s':>8} {'Peak MB':>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        save_directory = pathlib.Path(directory)
+
+        for point_count in POINT_COUNTS:
+            rows = np.column_stack(
+                [
+                    generator.uniform(-90.0, 90.0, point_count),
+                    generator.uniform(-180.0, 180.0, point_count),
+                    generator.uniform(0.0, 100.0, point_count),
+                ]
+            ).tolist()
+            positions = [
+                position_global_relative_altitude.PositionGlobalRelativeAltitude.create(*row)[1]
+                for row in rows
+            ]
+
+            if point_count <= SIMPLEKML_MAX_POINT_COUNT:
+                (_, expected_path), elapsed_time, peak = measure(
+                    lambda positions=positions: simplekml_positions_to_kml(
+                        positions, "simplekml", save_directory
+                    )
+                )
+                print(f"{point_count:>8} {'simplekml':>10} {elapsed_time:>8.2f} {peak / 1e6:>8.1f}")
+            else:
+                expected_path = None
+
+            (result, path), elapsed_time, peak = measure(
+                lambda positions=positions: kml_conversion.positions_to_kml(
+                    positions, "streaming", save_directory
+                )
+            )
+            if not result:
+                print("ERROR: Streaming writer failed")
+                return -1
+
+            print(f"{point_count:>8} {'streaming':>10} {elapsed_time:>8.2f} {peak / 1e6:>8.1f}")
+
+            if expected_path is not None and path.read_bytes() != expected_path.read_bytes():
+                print("ERROR: Output differs from simplekml")
+                return -1
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,141 @@
+"""
+Benchmark batch local/global conversion against converting one position at a time.
+"""
+
+import time
+
+import numpy as np
+
+from modules import position_global
+from modules import position_local
+from modules.mavlink import local_frame
+from modules.mavlink import local_global_conversion
+
+
+POINT_COUNTS = [1000, 100000, 1000000]
+
+
+def benchmark_scalar(
+    home_position: position_global.PositionGlobal, local_positions: np.ndarray
+) -> "tuple[float, float]":
+    """
+    One call per position, including object creation.
+
+    Return: Local to global seconds, global to local seconds.
+    """
+    start_time = time.perf_counter()
+    global_positions = []
+    for north, east, down in local_positions.tolist():
+        _, local_position = position_local.PositionLocal.create(north, east, down)
+        result, global_position = local_global_conversion.position_global_from_position_local(
+            home_position, local_position
+        )
+        assert result
+        global_positions.append(global_position)
+    to_global_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for global_position in global_positions:
+        result, _ = local_global_conversion.position_local_from_position_global(
+            home_position, global_position
+        )
+        assert result
+    to_local_time = time.perf_counter() - start_time
+
+    return to_global_time, to_local_time
+
+
+def benchmark_frame(
+    home_position: position_global.PositionGlobal, local_positions: np.ndarray
+) -> "tuple[float, float]":
+    """
+    One call per position with a LocalFrame created once, including object creation.
+
+    Return: Local to global seconds, global to local seconds.
+    """
+    result, frame = local_frame.LocalFrame.create(home_position)
+    assert result
+
+    start_time = time.perf_counter()
+    global_positions = []
+    for north, east, down in local_positions.tolist():
+        _, local_position = position_local.PositionLocal.create(north, east, down)
+        result, global_position = frame.to_global(local_position)
+        assert result
+        global_positions.append(global_position)
+    to_global_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for global_position in global_positions:
+        result, _ = frame.to_local(global_position)
+        assert result
+    to_local_time = time.perf_counter() - start_time
+
+    return to_global_time, to_local_time
+
+
+def benchmark_batch(
+    home_position: position_global.PositionGlobal, local_positions: np.ndarray
+) -> "tuple[float, float]":
+    """
+    One call for all positions.
+
+    Return: Local to global seconds, global to local seconds.
+    """
+    start_time = time.perf_counter()
+    result, global_positions = local_global_conversion.positions_global_from_positions_local(
+        home_position, local_positions
+    )
+    assert result
+    to_global_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    result, _ = local_global_conversion.positions_local_from_positions_global(
+        home_position, global_positions
+    )
+    assert result
+    to_local_time = time.perf_counter() - start_time
+
+    return to_global_time, to_local_time
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    result, home_position = position_global.PositionGlobal.create(43.472978, -80.540103, 336.0)
+    assert result
+
+    generator = np.random.default_rng(0)
+
+    print(
+        f"{'Points':>9} {'Method':>7} {'To global pt/s':>15} {'To local pt/s':>14} "
+        f"{'Speedup':>8}"
+    )
+    for point_count in POINT_COUNTS:
+        local_positions = generator.uniform(-5000.0, 5000.0, (point_count, 3))
+
+        scalar_times = benchmark_scalar(home_position, local_positions)
+        frame_times = benchmark_frame(home_position, local_positions)
+        batch_times = benchmark_batch(home_position, local_positions)
+
+        for name, (to_global_time, to_local_time) in [
+            ("scalar", scalar_times),
+            ("frame", frame_times),
+            ("batch", batch_times),
+        ]:
+            speedup = sum(scalar_times) / (to_global_time + to_local_time)
+            print(
+                f"{point_count:>9} {name:>7} {point_count / to_global_time:>15.0f} "
+                f"{point_count / to_local_time:>14.0f} {speedup:>7.0f}x"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,74 @@
+"""
+Benchmark the cost of debug() calls when the debug level is disabled.
+"""
+
+import logging
+import os
+import sys
+import timeit
+
+import numpy as np
+
+from modules.logger import logger
+
+
+CALL_COUNT = 200000
+
+
+def eager_debug(instance: logger.Logger, message: str) -> None:
+    """
+    Logger.debug() before the level check, for comparison.
+    """
+    # pylint: disable-next=protected-access
+    message = logger.Logger.message_and_metadata(message, sys._getframe(1))
+    instance.logger.debug(message)
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    original_stdout = sys.stdout
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        sys.stdout = devnull
+        result, instance = logger.Logger.create("benchmark_disabled_level", False)
+        sys.stdout = original_stdout
+    if not result:
+        return -1
+
+    instance.logger.setLevel(logging.INFO)
+
+    # Typical message from a worker
+    frame_index = 1234
+    position = np.array([43.4723, -80.5449, 336.0])
+
+    cases = [
+        (
+            "eager, f-string (before)",
+            lambda: eager_debug(instance, f"Frame {frame_index} at {position}"),
+        ),
+        ("f-string", lambda: instance.debug(f"Frame {frame_index} at {position}")),
+        ("%-style args", lambda: instance.debug("Frame %d at %s", args=(frame_index, position))),
+        ("function", lambda: instance.debug(lambda: f"Frame {frame_index} at {position}")),
+        (
+            "is_enabled_for guard",
+            lambda: instance.is_enabled_for(logging.DEBUG)
+            and instance.debug(f"Frame {frame_index} at {position}"),
+        ),
+    ]
+
+    print(f"Debug disabled, {CALL_COUNT} calls")
+    print(f"{'Call':>25} {'us/call':>8}")
+    for name, function in cases:
+        elapsed_time = timeit.timeit(function, number=CALL_COUNT)
+        print(f"{name:>25} {elapsed_time / CALL_COUNT * 1e6:>8.3f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,99 @@
+"""
+Benchmark per-call cost of adding frame info to log messages.
+"""
+
+import inspect
+import os
+import sys
+import timeit
+
+# Used in type annotation of frame parameters
+# pylint: disable-next=unused-import
+import types
+
+from modules.logger import logger
+
+
+CALL_COUNT = 100000
+
+
+def inspect_message_and_metadata(message: str, frame: "types.FrameType | None") -> str:
+    """
+    Logger.message_and_metadata before caching, for comparison.
+    """
+    if frame is None:
+        return message
+
+    function_name = frame.f_code.co_name
+    filename = frame.f_code.co_filename
+    line_number = inspect.getframeinfo(frame).lineno
+
+    return f"[{filename} | {function_name} | {line_number}] {message}"
+
+
+def inspect_frame_info(message: str) -> str:
+    """
+    Logger.debug() frame info before caching.
+    """
+    logger_frame = inspect.currentframe()
+    caller_frame = logger_frame.f_back
+    return inspect_message_and_metadata(message, caller_frame)
+
+
+def cached_frame_info(message: str) -> str:
+    """
+    Logger.debug() frame info now.
+    """
+    # pylint: disable-next=protected-access
+    return logger.Logger.message_and_metadata(message, sys._getframe(1))
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    # Both must give the same text
+    frame = inspect.currentframe()
+    if inspect_message_and_metadata("message", frame) != logger.Logger.message_and_metadata(
+        "message", frame
+    ):
+        print("ERROR: Frame info differs")
+        return -1
+
+    print(f"{'Per call':>23} {'Before us':>10} {'After us':>9}")
+
+    before = timeit.timeit(lambda: inspect_frame_info("message"), number=CALL_COUNT)
+    after = timeit.timeit(lambda: cached_frame_info("message"), number=CALL_COUNT)
+    print(f"{'frame info':>23} {before / CALL_COUNT * 1e6:>10.2f} {after / CALL_COUNT * 1e6:>9.2f}")
+
+    # Whole call, terminal output discarded
+    original_stdout = sys.stdout
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        sys.stdout = devnull
+        result, instance = logger.Logger.create("benchmark_frame_info", False)
+        if not result:
+            sys.stdout = original_stdout
+            return -1
+
+        without = timeit.timeit(lambda: instance.debug("message", False), number=CALL_COUNT)
+        before = timeit.timeit(
+            lambda: instance.logger.debug(inspect_frame_info("message")), number=CALL_COUNT
+        )
+        after = timeit.timeit(lambda: instance.debug("message", True), number=CALL_COUNT)
+        sys.stdout = original_stdout
+
+    print(
+        f"{'debug() with frame info':>23} {before / CALL_COUNT * 1e6:>10.2f}"
+        f" {after / CALL_COUNT * 1e6:>9.2f}"
+    )
+    print(f"{'debug() without':>23} {'':>10} {without / CALL_COUNT * 1e6:>9.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,122 @@
+"""
+Benchmark per-call latency of Logger with synchronous handlers and with the queue.
+"""
+
+import io
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from modules.logger import logger
+from modules.read_yaml import read_yaml
+
+
+CALL_COUNT = 20000
+
+# Calls between sleeps, like a worker logging a few messages per frame
+BURST_SIZE = 10
+BURST_PERIOD = 0.001  # s
+
+
+class SyncingFile(io.TextIOWrapper):
+    """
+    File where every flush waits for the disk, like a slow terminal or SD card.
+    """
+
+    def flush(self) -> None:
+        """
+        Flush and sync.
+        """
+        super().flush()
+        os.fsync(self.fileno())
+
+
+def measure(instance: logger.Logger) -> np.ndarray:
+    """
+    Return: Latency of each call in microseconds.
+    """
+    latencies = np.empty(CALL_COUNT)
+    for i in range(CALL_COUNT):
+        start_time = time.perf_counter_ns()
+        instance.info("Frame processed", False)
+        latencies[i] = (time.perf_counter_ns() - start_time) / 1000
+
+        if i % BURST_SIZE == BURST_SIZE - 1:
+            time.sleep(BURST_PERIOD)
+
+    instance.flush()
+
+    return latencies
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    result, config = read_yaml.open_config(logger.CONFIG_FILE_PATH)
+    if not result:
+        return -1
+
+    original_directory = os.getcwd()
+    original_stdout = sys.stdout
+    rows = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        log_path = pathlib.Path(
+            config["logger"]["directory_path"],
+            time.strftime(config["logger"]["file_datetime_format"]),
+        )
+        log_path.mkdir(parents=True)
+
+        try:
+            for stream_name, stream_class in [("file", io.TextIOWrapper), ("fsync", SyncingFile)]:
+                for use_queue in [False, True]:
+                    # Terminal output goes to a file, the handler takes sys.stdout on creation
+                    # Closed with the stream below
+                    # pylint: disable-next=consider-using-with
+                    raw_file = open(f"stdout_{stream_name}_{use_queue}", "wb")
+                    stream = stream_class(raw_file, encoding="utf-8")
+                    sys.stdout = stream
+
+                    name = f"benchmark_{stream_name}_{use_queue}"
+                    result, instance = logger.Logger.create(name, True, use_queue)
+                    if not result:
+                        return -1
+
+                    latencies = measure(instance)
+                    rows.append((stream_name, use_queue, latencies, instance.dropped_message_count))
+
+                    sys.stdout = original_stdout
+                    for handler in list(instance.logger.handlers):
+                        instance.logger.removeHandler(handler)
+                        handler.close()
+                    stream.close()
+        finally:
+            sys.stdout = original_stdout
+            os.chdir(original_directory)
+
+    print(f"{CALL_COUNT} info() calls in bursts of {BURST_SIZE} every {BURST_PERIOD * 1000} ms")
+    print(
+        f"{'Stdout':>6} {'Queue':>6} {'Mean us':>8} {'p50 us':>7} {'p99 us':>7} {'Max us':>8} Dropped"
+    )
+    for stream_name, use_queue, latencies, dropped_count in rows:
+        print(
+            f"{stream_name:>6} {str(use_queue):>6} {np.mean(latencies):>8.1f}"
+            f" {np.percentile(latencies, 50):>7.1f} {np.percentile(latencies, 99):>7.1f}"
+            f" {np.max(latencies):>8.1f} {dropped_count:>7}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,139 @@
+"""
+Benchmark format string struct calls against the precompiled schema registry.
+"""
+
+import base64
+import struct
+import time
+
+from modules import position_global
+from modules.data_encoding import message_encoding_decoding
+from modules.data_encoding import message_schema
+from modules.data_encoding import metadata_encoding_decoding
+from modules.data_encoding import worker_enum
+from modules.data_encoding.message_schema import MessageType
+
+
+MESSAGE_COUNT = 100000
+WORKER_ID = worker_enum.WorkerEnum.GEOLOCATION_WORKER
+
+
+def benchmark_format_string(position: position_global.PositionGlobal) -> "tuple[float, float]":
+    """
+    Original implementation: format string parsed on every call.
+
+    Return: Encode seconds, decode seconds.
+    """
+    start_time = time.perf_counter()
+    for _ in range(MESSAGE_COUNT):
+        encoded = base64.b64encode(
+            struct.pack(
+                message_encoding_decoding.DATA_STRUCT.format,
+                WORKER_ID.value,
+                position.latitude,
+                position.longitude,
+                position.altitude,
+            )
+        )
+    encode_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for _ in range(MESSAGE_COUNT):
+        data = base64.b64decode(encoded)
+        assert len(data) == struct.calcsize(message_encoding_decoding.DATA_STRUCT.format)
+        values = struct.unpack(message_encoding_decoding.DATA_STRUCT.format, data)
+        worker_enum.WorkerEnum(values[0])
+        position_global.PositionGlobal.create(values[1], values[2], values[3])
+    decode_time = time.perf_counter() - start_time
+
+    return encode_time, decode_time
+
+
+def benchmark_worker_message(position: position_global.PositionGlobal) -> "tuple[float, float]":
+    """
+    STATUSTEXT format: encoded with a precompiled struct, decoded through the schema.
+
+    Return: Encode seconds, decode seconds.
+    """
+    start_time = time.perf_counter()
+    for _ in range(MESSAGE_COUNT):
+        _, encoded = message_encoding_decoding.encode_position_global(WORKER_ID, position)
+    encode_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for _ in range(MESSAGE_COUNT):
+        message_encoding_decoding.decode_bytes_to_position_global(encoded)
+    decode_time = time.perf_counter() - start_time
+
+    return encode_time, decode_time
+
+
+def benchmark_registry(
+    position: position_global.PositionGlobal, use_encoder: bool
+) -> "tuple[float, float]":
+    """
+    All messages packed into one preallocated buffer and decoded by the dispatcher.
+
+    use_encoder: Encode with an encoder bound to the worker instead of looking up the schema.
+
+    Return: Encode seconds, decode seconds.
+    """
+    result, registry = message_schema.SchemaRegistry.create(
+        [metadata_encoding_decoding.SCHEMA, message_encoding_decoding.SCHEMA]
+    )
+    assert result
+
+    buffer = bytearray(message_encoding_decoding.SCHEMA.size * MESSAGE_COUNT)
+
+    start_time = time.perf_counter()
+    offset = 0
+    if use_encoder:
+        result, encoder = registry.create_encoder(WORKER_ID, MessageType.POSITION_GLOBAL)
+        assert result
+        for _ in range(MESSAGE_COUNT):
+            _, offset = encoder.pack_into(buffer, offset, position)
+    else:
+        for _ in range(MESSAGE_COUNT):
+            _, offset = registry.encode_into(
+                buffer, offset, WORKER_ID, MessageType.POSITION_GLOBAL, position
+            )
+    encode_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    result, messages = registry.decode_all(buffer)
+    decode_time = time.perf_counter() - start_time
+    assert result
+    assert len(messages) == MESSAGE_COUNT
+
+    return encode_time, decode_time
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    result, position = position_global.PositionGlobal.create(43.4723, -80.5449, 336.0)
+    assert result
+
+    print(f"{MESSAGE_COUNT} PositionGlobal messages")
+    print(f"{'Method':>30} {'Encode msg/s':>13} {'Decode msg/s':>13}")
+    for name, benchmark in [
+        ("Format string", benchmark_format_string),
+        ("Schema STATUSTEXT", benchmark_worker_message),
+        ("Registry encode_into", lambda position: benchmark_registry(position, False)),
+        ("Registry encoder", lambda position: benchmark_registry(position, True)),
+    ]:
+        encode_time, decode_time = benchmark(position)
+        print(
+            f"{name:>30} {MESSAGE_COUNT / encode_time:>13.0f} {MESSAGE_COUNT / decode_time:>13.0f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
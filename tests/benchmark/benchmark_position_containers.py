@@ -0,0 +1,115 @@
+"""
+Benchmark memory and construction time of position representations.
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from modules import position_global
+
+
+POSITION_COUNT = 1000000
+
+
+class DictPositionGlobal:
+    """
+    PositionGlobal before __slots__, for comparison.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, latitude: float, longitude: float, altitude: float
+    ) -> "tuple[True, DictPositionGlobal] | tuple[False, None]":
+        """
+        Same as PositionGlobal.create().
+        """
+        return True, DictPositionGlobal(cls.__create_key, latitude, longitude, altitude)
+
+    def __init__(
+        self, class_private_create_key: object, latitude: float, longitude: float, altitude: float
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is DictPositionGlobal.__create_key, "Use create() method."
+
+        self.latitude = latitude
+        self.longitude = longitude
+        self.altitude = altitude
+
+
+def measure(function: "callable") -> "tuple[object, float, int]":
+    """
+    Runs the function twice: once timed, once with allocations traced (which is slower).
+
+    Return: Result, seconds, bytes allocated and still held.
+    """
+    start_time = time.perf_counter()
+    function()
+    elapsed_time = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    result = function()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, elapsed_time, size
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    generator = np.random.default_rng(0)
+    coordinates = np.column_stack(
+        [
+            generator.uniform(-90.0, 90.0, POSITION_COUNT),
+            generator.uniform(-180.0, 180.0, POSITION_COUNT),
+            generator.uniform(-100.0, 1000.0, POSITION_COUNT),
+        ]
+    )
+    rows = coordinates.tolist()
+
+    print(f"{POSITION_COUNT} positions")
+    print(f"{'Representation':>30} {'Create s':>9} {'Bytes/position':>15}")
+
+    def create_objects(cls: type) -> list:
+        return [
+            cls.create(latitude, longitude, altitude)[1] for latitude, longitude, altitude in rows
+        ]
+
+    def print_row(name: str, elapsed_time: float, size: int) -> None:
+        print(f"{name:>30} {elapsed_time:>9.3f} {size / POSITION_COUNT:>15.1f}")
+
+    _, elapsed_time, size = measure(lambda: create_objects(DictPositionGlobal))
+    print_row("__dict__ objects", elapsed_time, size)
+
+    objects, elapsed_time, size = measure(lambda: create_objects(position_global.PositionGlobal))
+    print_row("__slots__ objects", elapsed_time, size)
+
+    _, elapsed_time, size = measure(
+        lambda: position_global.PositionGlobalArray.create(coordinates)[1]
+    )
+    print_row("PositionGlobalArray (array)", elapsed_time, size)
+
+    array, elapsed_time, size = measure(
+        lambda: position_global.PositionGlobalArray.from_objects(objects)[1]
+    )
+    print_row("PositionGlobalArray (objects)", elapsed_time, size)
+
+    _, elapsed_time, _ = measure(array.to_objects)
+    print(f"{'Array to objects s':>30} {elapsed_time:>9.3f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,157 @@
+"""
+Benchmark size and throughput of encoding positions one per message against in batches.
+"""
+
+import time
+
+import numpy as np
+
+from modules import position_global
+from modules.data_encoding import message_encoding_decoding
+from modules.data_encoding import position_global_batch_encoding
+from modules.data_encoding import worker_enum
+from modules.data_encoding.position_global_batch_encoding import PositionFormat
+
+
+POSITION_COUNT = 10000
+WORKER_ID = worker_enum.WorkerEnum.CLUSTER_ESTIMATION_WORKER
+
+
+def create_positions() -> "list[position_global.PositionGlobal]":
+    """
+    Random positions.
+    """
+    generator = np.random.default_rng(0)
+    coordinates = np.column_stack(
+        [
+            generator.uniform(-90.0, 90.0, POSITION_COUNT),
+            generator.uniform(-180.0, 180.0, POSITION_COUNT),
+            generator.uniform(-100.0, 1000.0, POSITION_COUNT),
+        ]
+    )
+
+    positions = []
+    for latitude, longitude, altitude in coordinates.tolist():
+        result, position = position_global.PositionGlobal.create(latitude, longitude, altitude)
+        assert result
+        positions.append(position)
+
+    return positions
+
+
+def benchmark_single(
+    positions: "list[position_global.PositionGlobal]",
+) -> "tuple[int, float, float]":
+    """
+    One STATUSTEXT message per position.
+
+    Return: Messages, encode seconds, decode seconds.
+    """
+    start_time = time.perf_counter()
+    texts = []
+    for position in positions:
+        result, text = message_encoding_decoding.encode_position_global(WORKER_ID, position)
+        assert result
+        texts.append(text)
+    encode_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for text in texts:
+        result, _, _ = message_encoding_decoding.decode_bytes_to_position_global(text)
+        assert result
+    decode_time = time.perf_counter() - start_time
+
+    return len(texts), encode_time, decode_time
+
+
+def benchmark_batch(
+    positions: "list[position_global.PositionGlobal] | np.ndarray",
+    position_format: PositionFormat,
+) -> "tuple[int, float, float]":
+    """
+    Positions packed into as few STATUSTEXT messages as possible.
+
+    Return: Messages, encode seconds, decode seconds.
+    """
+    start_time = time.perf_counter()
+    result, texts = position_global_batch_encoding.encode_position_global_status_texts(
+        WORKER_ID, positions, position_format
+    )
+    assert result
+    encode_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for text in texts:
+        result, _, _ = position_global_batch_encoding.decode_position_global_status_text(text)
+        assert result
+    decode_time = time.perf_counter() - start_time
+
+    return len(texts), encode_time, decode_time
+
+
+def benchmark_payload(
+    array: np.ndarray, position_format: PositionFormat
+) -> "tuple[int, float, float]":
+    """
+    All positions in one binary payload (e.g. over TCP).
+
+    Return: Bytes, encode seconds, decode seconds.
+    """
+    start_time = time.perf_counter()
+    result, data = position_global_batch_encoding.encode_position_global_batch(
+        WORKER_ID, array, position_format
+    )
+    assert result
+    encode_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    result, _, _ = position_global_batch_encoding.decode_position_global_batch(data)
+    assert result
+    decode_time = time.perf_counter() - start_time
+
+    return len(data), encode_time, decode_time
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    positions = create_positions()
+    result, array = position_global_batch_encoding.positions_to_array(positions)
+    assert result
+
+    print(f"{POSITION_COUNT} positions")
+    print(
+        f"{'Method':>30} {'Messages':>9} {'Bytes/position':>15} "
+        f"{'Encode pos/s':>13} {'Decode pos/s':>13}"
+    )
+
+    def print_row(
+        name: str, messages: int, size: float, encode_time: float, decode_time: float
+    ) -> None:
+        print(
+            f"{name:>30} {messages:>9} {size / POSITION_COUNT:>15.1f} "
+            f"{POSITION_COUNT / encode_time:>13.0f} {POSITION_COUNT / decode_time:>13.0f}"
+        )
+
+    messages, encode_time, decode_time = benchmark_single(positions)
+    print_row("STATUSTEXT per position", messages, messages * 36, encode_time, decode_time)
+
+    for position_format in PositionFormat:
+        messages, encode_time, decode_time = benchmark_batch(positions, position_format)
+        size = messages * position_global_batch_encoding.STATUS_TEXT_LENGTH
+        print_row(f"STATUSTEXT {position_format.name}", messages, size, encode_time, decode_time)
+
+    for position_format in PositionFormat:
+        size, encode_time, decode_time = benchmark_payload(array, position_format)
+        print_row(f"Payload {position_format.name}", 1, size, encode_time, decode_time)
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,137 @@
+"""
+Benchmark sending frames from a camera process to consumer processes, pickled through queues and
+as descriptors of a shared frame pool.
+"""
+
+import multiprocessing
+import multiprocessing.queues
+import time
+
+import numpy as np
+
+from modules.camera import shared_frame_pool
+
+
+DURATION = 2.0  # s
+QUEUE_SIZE = 4
+# Frames queued plus one held by each consumer plus one being written
+SLOT_COUNT = QUEUE_SIZE + 3 + 1
+RESOLUTIONS = [(1280, 720), (1920, 1080)]
+CONSUMER_COUNTS = [1, 2]
+
+
+def consume(
+    handle: "shared_frame_pool.FramePoolHandle | None",
+    frames: multiprocessing.queues.Queue,
+    results: multiprocessing.queues.Queue,
+) -> None:
+    """
+    Reads frames until None, then sends the frame count and CPU time.
+    """
+    pool = None
+    if handle is not None:
+        _, pool = shared_frame_pool.SharedFramePool.attach(handle)
+
+    count = 0
+    start_cpu_time = time.process_time()
+    while True:
+        item = frames.get()
+        if item is None:
+            break
+
+        image = item if pool is None else pool.view(item)
+        # Light work, so transport dominates
+        image[::8, ::8].mean()
+        del image
+        if pool is not None:
+            pool.release(item)
+
+        count += 1
+
+    results.put((count, time.process_time() - start_cpu_time))
+    if pool is not None:
+        pool.close()
+
+
+def run(width: int, height: int, consumer_count: int, use_pool: bool) -> "tuple[float, float]":
+    """
+    Return: Frames per second per consumer, CPU milliseconds per delivered frame.
+    """
+    image = np.random.default_rng(0).integers(0, 256, (height, width, 3), np.uint8)
+
+    pool = None
+    handle = None
+    if use_pool:
+        _, pool = shared_frame_pool.SharedFramePool.create(SLOT_COUNT, image.shape)
+        handle = pool.handle
+
+    queues = [multiprocessing.Queue(QUEUE_SIZE) for _ in range(consumer_count)]
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=consume, args=(handle, frames, results)) for frames in queues
+    ]
+    for process in processes:
+        process.start()
+
+    start_cpu_time = time.process_time()
+    start_time = time.monotonic()
+    while time.monotonic() - start_time < DURATION:
+        # Camera returns a new array each frame
+        frame = image.copy()
+        if pool is None:
+            for frames in queues:
+                frames.put(frame)
+            continue
+
+        result, descriptor = pool.write(frame, time.monotonic(), consumer_count)
+        if not result:
+            time.sleep(0.001)
+            continue
+
+        for frames in queues:
+            frames.put(descriptor)
+
+    for frames in queues:
+        frames.put(None)
+
+    counts = []
+    cpu_time = time.process_time() - start_cpu_time
+    for _ in processes:
+        count, consumer_cpu_time = results.get()
+        counts.append(count)
+        cpu_time += consumer_cpu_time
+    elapsed_time = time.monotonic() - start_time
+
+    for process in processes:
+        process.join()
+
+    if pool is not None:
+        pool.close()
+        pool.unlink()
+
+    return np.mean(counts) / elapsed_time, cpu_time / sum(counts) * 1000
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    print(f"{'Resolution':>10} {'Consumers':>9} {'Transport':>9} {'fps':>7} {'CPU ms/frame':>12}")
+    for width, height in RESOLUTIONS:
+        for consumer_count in CONSUMER_COUNTS:
+            for name, use_pool in [("pickle", False), ("shared", True)]:
+                fps, cpu_per_frame = run(width, height, consumer_count, use_pool)
+                print(
+                    f"{height:>9}p {consumer_count:>9} {name:>9} {fps:>7.1f}"
+                    f" {cpu_per_frame:>12.2f}"
+                )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,106 @@
+"""
+Benchmark TCP receive throughput of recv() against recv_message().
+"""
+
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+from modules.network.tcp.client_socket import TcpClientSocket
+
+
+PAYLOAD_SIZES = [100_000, 1_000_000, 10_000_000]  # Bytes
+REPEATS = 10
+
+
+def benchmark_recv(data: bytes) -> float:
+    """
+    Send data with length prefix and receive it with recv().
+
+    Return: Seconds per message.
+    """
+    sender_instance, receiver_instance = socket.socketpair()
+    _, sender = TcpClientSocket.create(instance=sender_instance)
+    _, receiver = TcpClientSocket.create(instance=receiver_instance)
+
+    def send_all() -> None:
+        for _ in range(REPEATS):
+            sender.send(struct.pack("!I", len(data)))
+            sender.send(data)
+
+    thread = threading.Thread(target=send_all)
+
+    start_time = time.perf_counter()
+    thread.start()
+    for _ in range(REPEATS):
+        result, data_len = receiver.recv(4)
+        assert result
+        result, _ = receiver.recv(struct.unpack("!I", data_len)[0])
+        assert result
+    end_time = time.perf_counter()
+
+    thread.join()
+    sender.close()
+    receiver.close()
+
+    return (end_time - start_time) / REPEATS
+
+
+def benchmark_recv_message(data: bytes) -> float:
+    """
+    Send data with send_message() and receive it with recv_message().
+
+    Return: Seconds per message.
+    """
+    sender_instance, receiver_instance = socket.socketpair()
+    _, sender = TcpClientSocket.create(instance=sender_instance)
+    _, receiver = TcpClientSocket.create(instance=receiver_instance)
+
+    def send_all() -> None:
+        for _ in range(REPEATS):
+            sender.send_message(data)
+
+    thread = threading.Thread(target=send_all)
+
+    start_time = time.perf_counter()
+    thread.start()
+    for _ in range(REPEATS):
+        result, _ = receiver.recv_message()
+        assert result
+    end_time = time.perf_counter()
+
+    thread.join()
+    sender.close()
+    receiver.close()
+
+    return (end_time - start_time) / REPEATS
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    print(f"{'Payload (bytes)':>16} {'recv (MB/s)':>12} {'recv_message (MB/s)':>20}")
+
+    for payload_size in PAYLOAD_SIZES:
+        data = np.random.bytes(payload_size)
+
+        recv_time = benchmark_recv(data)
+        recv_message_time = benchmark_recv_message(data)
+
+        recv_rate = payload_size / recv_time / 1e6
+        recv_message_rate = payload_size / recv_message_time / 1e6
+        print(f"{payload_size:>16} {recv_rate:>12.1f} {recv_message_rate:>20.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
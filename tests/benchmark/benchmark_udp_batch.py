@@ -0,0 +1,135 @@
+"""
+Benchmark UDP datagrams per second and CPU usage of batched I/O against one datagram per call.
+"""
+
+import multiprocessing
+import multiprocessing.synchronize
+import time
+
+import numpy as np
+
+from modules.network.udp import batch_io
+from modules.network.udp.server_socket import UdpServerSocket
+
+
+HOST = "localhost"
+DATAGRAM_SIZE = 256  # Small datagrams so the system call overhead dominates
+DATAGRAM_COUNT = 100_000
+RECEIVE_DURATION = 2.0  # Seconds
+
+
+def create_socket() -> UdpServerSocket:
+    """
+    Socket bound to a free port.
+    """
+    result, instance = UdpServerSocket.create(host=HOST, port=0, connection_timeout=1.0)
+    assert result
+    assert instance is not None
+
+    return instance
+
+
+def benchmark_send(batched: bool) -> "tuple[float, float]":
+    """
+    Send datagrams to a socket which is not read from, the kernel drops them when full.
+
+    Return: Datagrams per second, CPU usage as a fraction of one core.
+    """
+    sender = create_socket()
+    receiver = create_socket()
+    _, port = receiver.get_socket().getsockname()
+    data = np.random.bytes(DATAGRAM_SIZE * DATAGRAM_COUNT)
+
+    start_time = time.perf_counter()
+    start_cpu_time = time.process_time()
+    if batched:
+        result = sender.send_to_batched(data, HOST, port, chunk_size=DATAGRAM_SIZE)
+    else:
+        result = sender.send_to(data, HOST, port, chunk_size=DATAGRAM_SIZE, send_delay=0.0)
+    cpu_time = time.process_time() - start_cpu_time
+    elapsed = time.perf_counter() - start_time
+    assert result
+
+    sender.get_socket().close()
+    receiver.get_socket().close()
+
+    return DATAGRAM_COUNT / elapsed, cpu_time / elapsed
+
+
+def send_until_stopped(port: int, stop: "multiprocessing.synchronize.Event") -> None:
+    """
+    Sends datagrams as fast as possible until stopped.
+    """
+    sender = create_socket()
+    data = np.random.bytes(DATAGRAM_SIZE * 1000)
+    while not stop.is_set():
+        sender.send_to_batched(data, HOST, port, chunk_size=DATAGRAM_SIZE)
+
+    sender.get_socket().close()
+
+
+def benchmark_recv(batched: bool) -> "tuple[float, float]":
+    """
+    Receive datagrams while another process sends as fast as possible.
+
+    Return: Datagrams received per second, CPU usage as a fraction of one core.
+    """
+    receiver = create_socket()
+    _, port = receiver.get_socket().getsockname()
+    stop = multiprocessing.Event()
+
+    process = multiprocessing.Process(target=send_until_stopped, args=(port, stop))
+    process.start()
+
+    # Wait for the sender to start
+    result, _ = receiver.recv_batch()
+    assert result
+
+    received = 0
+    buffer = bytearray(batch_io.SLOT_SIZE)
+    receiver_socket = receiver.get_socket()
+    start_time = time.perf_counter()
+    start_cpu_time = time.process_time()
+    while time.perf_counter() - start_time < RECEIVE_DURATION:
+        if batched:
+            result, datagrams = receiver.recv_batch()
+            assert result
+            received += len(datagrams)
+        else:
+            receiver_socket.recvfrom_into(buffer)
+            received += 1
+    cpu_time = time.process_time() - start_cpu_time
+    elapsed = time.perf_counter() - start_time
+
+    stop.set()
+    process.join()
+    receiver.get_socket().close()
+
+    return received / elapsed, cpu_time / elapsed
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    print(f"Batched I/O available: {batch_io.BATCH_IO_AVAILABLE}")
+    print(f"{'Path':>24} {'Datagrams/s':>12} {'CPU %':>6}")
+
+    for name, benchmark, batched in [
+        ("send_to", benchmark_send, False),
+        ("send_to_batched", benchmark_send, True),
+        ("recvfrom_into", benchmark_recv, False),
+        ("recv_batch", benchmark_recv, True),
+    ]:
+        rate, cpu_usage = benchmark(batched)
+        print(f"{name:>24} {rate:>12.0f} {cpu_usage * 100:>6.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,55 @@
+"""
+Test frame grabber with OpenCV camera physically.
+"""
+
+import cv2
+
+from modules.camera import camera_factory
+from modules.camera import camera_opencv
+from modules.camera import frame_grabber
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    config = camera_opencv.ConfigOpenCV(0)
+    assert config is not None
+
+    result, device = camera_factory.create_camera(
+        camera_factory.CameraOption.OPENCV, 640, 480, config
+    )
+    if not result:
+        print("OpenCV camera creation error.")
+        return -1
+
+    result, grabber = frame_grabber.FrameGrabber.create(device)
+    if not result:
+        print("Frame grabber creation error.")
+        return -1
+
+    while True:
+        frame = grabber.latest()
+
+        print(
+            f"Frame {frame.sequence_number}, captured: {grabber.captured_count},"
+            f" failed: {grabber.failed_count}"
+        )
+
+        cv2.imshow("Frame grabber", frame.image)
+
+        # Delay for 1 ms
+        if cv2.waitKey(1) & 0xFF == ord("q"):
+            break
+
+    grabber.stop()
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main != 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
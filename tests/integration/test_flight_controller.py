@@ -46,6 +46,16 @@ def main() -> int:
         else:
             print("Failed to get home position")
 
+        result, frame = controller.get_local_frame(TIMEOUT)
+        if result and odometry is not None:
+            result, odometry_local = frame.drone_odometry_local_from_global(odometry)
+            if result:
+                controller.send_statustext_msg("north: " + str(odometry_local.position.north))
+                controller.send_statustext_msg("east: " + str(odometry_local.position.east))
+                controller.send_statustext_msg("down: " + str(odometry_local.position.down))
+        else:
+            print("Failed to get local frame")
+
         time.sleep(DELAY_TIME)
 
     # Download and print commands
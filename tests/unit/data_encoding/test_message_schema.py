@@ -0,0 +1,216 @@
+"""
+Test the schema registry.
+"""
+
+import base64
+
+import pytest
+
+from modules import position_global
+from modules.data_encoding import message_encoding_decoding
+from modules.data_encoding import message_schema
+from modules.data_encoding import metadata_encoding_decoding
+from modules.data_encoding import worker_enum
+from modules.data_encoding.message_schema import MessageType
+
+
+WORKER_ID = worker_enum.WorkerEnum.GEOLOCATION_WORKER
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def registry() -> message_schema.SchemaRegistry:
+    """
+    Registry with the metadata and position schemas.
+    """
+    result, instance = message_schema.SchemaRegistry.create(
+        [metadata_encoding_decoding.SCHEMA, message_encoding_decoding.SCHEMA]
+    )
+    assert result
+    assert instance is not None
+
+    yield instance
+
+
+@pytest.fixture
+def position() -> position_global.PositionGlobal:
+    """
+    Waterloo.
+    """
+    result, instance = position_global.PositionGlobal.create(43.4723, -80.5449, 336.0)
+    assert result
+    assert instance is not None
+
+    yield instance
+
+
+def test_dispatch(
+    registry: message_schema.SchemaRegistry, position: position_global.PositionGlobal
+) -> None:
+    """
+    Decoder identifies the message type from the header.
+    """
+    result, data = registry.encode(WORKER_ID, MessageType.POSITION_GLOBAL, position)
+    assert result
+    assert len(data) == message_schema.HEADER.size + 24
+
+    result, worker_id, message_type, decoded, offset = registry.decode(data)
+    assert result
+    assert worker_id == WORKER_ID
+    assert message_type == MessageType.POSITION_GLOBAL
+    assert offset == len(data)
+    assert (decoded.latitude, decoded.longitude, decoded.altitude) == (
+        position.latitude,
+        position.longitude,
+        position.altitude,
+    )
+
+    result, data = registry.encode(WORKER_ID, MessageType.METADATA, 7)
+    assert result
+
+    result, worker_id, message_type, decoded, _ = registry.decode(data)
+    assert result
+    assert worker_id == WORKER_ID
+    assert message_type == MessageType.METADATA
+    assert decoded == 7
+
+
+def test_encode_into(
+    registry: message_schema.SchemaRegistry, position: position_global.PositionGlobal
+) -> None:
+    """
+    Messages packed back to back into a preallocated buffer.
+    """
+    buffer = bytearray(100)
+    offset = 0
+    for message_type, value in [
+        (MessageType.METADATA, 2),
+        (MessageType.POSITION_GLOBAL, position),
+        (MessageType.POSITION_GLOBAL, position),
+    ]:
+        result, offset = registry.encode_into(buffer, offset, WORKER_ID, message_type, value)
+        assert result
+
+    result, messages = registry.decode_all(bytes(buffer[:offset]))
+    assert result
+    assert [message_type for _, message_type, _ in messages] == [
+        MessageType.METADATA,
+        MessageType.POSITION_GLOBAL,
+        MessageType.POSITION_GLOBAL,
+    ]
+    assert messages[0][2] == 2
+    assert messages[2][2].altitude == position.altitude
+
+    # Buffer too small
+    result, offset = registry.encode_into(
+        bytearray(10), 0, WORKER_ID, MessageType.POSITION_GLOBAL, position
+    )
+    assert not result
+    assert offset is None
+
+
+def test_encoder(
+    registry: message_schema.SchemaRegistry, position: position_global.PositionGlobal
+) -> None:
+    """
+    Encoder bound to a worker gives the same messages as the registry.
+    """
+    result, encoder = registry.create_encoder(WORKER_ID, MessageType.POSITION_GLOBAL)
+    assert result
+    assert encoder is not None
+
+    result, expected = registry.encode(WORKER_ID, MessageType.POSITION_GLOBAL, position)
+    assert result
+
+    result, data = encoder.encode(position)
+    assert result
+    assert data == expected
+
+    buffer = bytearray(encoder.size * 2)
+    result, offset = encoder.pack_into(buffer, encoder.size, position)
+    assert result
+    assert offset == len(buffer)
+    assert buffer[encoder.size :] == expected
+
+    result, offset = encoder.pack_into(buffer, offset, position)
+    assert not result
+    assert offset is None
+
+
+def test_worker_registration(position: position_global.PositionGlobal) -> None:
+    """
+    Schemas registered for one worker are not available to others.
+    """
+    result, registry = message_schema.SchemaRegistry.create()
+    assert result
+
+    assert registry.register(message_encoding_decoding.SCHEMA, WORKER_ID)
+
+    result, _ = registry.encode(WORKER_ID, MessageType.POSITION_GLOBAL, position)
+    assert result
+
+    other_worker = worker_enum.WorkerEnum.DATA_MERGE_WORKER
+    result, data = registry.encode(other_worker, MessageType.POSITION_GLOBAL, position)
+    assert not result
+    assert data is None
+
+    # Same message from an unregistered worker is rejected by the decoder
+    buffer = bytearray(message_encoding_decoding.SCHEMA.size)
+    assert message_encoding_decoding.SCHEMA.pack_into(buffer, 0, other_worker, position)
+    result, worker_id, message_type, decoded, offset = registry.decode(bytes(buffer))
+    assert not result
+    assert worker_id is None
+    assert message_type is None
+    assert decoded is None
+    assert offset is None
+
+
+def test_invalid(registry: message_schema.SchemaRegistry) -> None:
+    """
+    Truncated, unknown, and malformed messages are rejected.
+    """
+    result, data = registry.encode(WORKER_ID, MessageType.METADATA, 3)
+    assert result
+
+    result, _, _, _, _ = registry.decode(data[:-1])
+    assert not result
+
+    result, _, _, _, _ = registry.decode(bytes([WORKER_ID.value, 200]) + data[2:])
+    assert not result
+
+    result, _, _, _, _ = registry.decode(bytes([0]) + data[1:])
+    assert not result
+
+    result, messages = registry.decode_all(data + data[:3])
+    assert not result
+    assert messages is None
+
+    result, data = registry.encode(WORKER_ID, MessageType.METADATA, "not a number")
+    assert not result
+    assert data is None
+
+
+def test_worker_message_format(position: position_global.PositionGlobal) -> None:
+    """
+    STATUSTEXT format is unchanged: worker ID and body, base64 encoded.
+    """
+    result, encoded = message_encoding_decoding.encode_position_global(WORKER_ID, position)
+    assert result
+    assert len(base64.b64decode(encoded)) == 25
+
+    result, encoded = metadata_encoding_decoding.encode_metadata(WORKER_ID, 5)
+    assert result
+    assert len(base64.b64decode(encoded)) == 5
+
+    # Wrong length and invalid base64
+    result, worker_id, decoded = message_encoding_decoding.decode_bytes_to_position_global(encoded)
+    assert not result
+    assert worker_id is None
+    assert decoded is None
+
+    result, _, _ = metadata_encoding_decoding.decode_metadata(b"!")
+    assert not result
@@ -0,0 +1,250 @@
+"""
+Test encoding and decoding many positions at once.
+"""
+
+import base64
+
+import numpy as np
+import pytest
+
+from modules import position_global
+from modules.data_encoding import message_encoding_decoding
+from modules.data_encoding import position_global_batch_encoding
+from modules.data_encoding import worker_enum
+from modules.data_encoding.position_global_batch_encoding import PositionFormat
+
+
+WORKER_ID = worker_enum.WorkerEnum.CLUSTER_ESTIMATION_WORKER
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def positions() -> "list[position_global.PositionGlobal]":
+    """
+    Positions around the world.
+    """
+    coordinates = [
+        (43.4723, -80.5449, 336.0),
+        (-33.8688, 151.2093, 58.25),
+        (89.9999999, -179.9999999, -10.5),
+        (0.0, 0.0, 0.0),
+        (51.5072, -0.1276, 11.0),
+    ]
+
+    instances = []
+    for latitude, longitude, altitude in coordinates:
+        result, position = position_global.PositionGlobal.create(latitude, longitude, altitude)
+        assert result
+        instances.append(position)
+
+    return instances
+
+
+def to_array(positions: "list[position_global.PositionGlobal]") -> np.ndarray:
+    """
+    Expected values.
+    """
+    return np.array(
+        [(position.latitude, position.longitude, position.altitude) for position in positions]
+    )
+
+
+class TestBatch:
+    """
+    Test encode_position_global_batch and decode_position_global_batch.
+    """
+
+    def test_float64(self, positions: "list[position_global.PositionGlobal]") -> None:
+        """
+        Exact round trip.
+        """
+        result, data = position_global_batch_encoding.encode_position_global_batch(
+            WORKER_ID, positions, PositionFormat.FLOAT64
+        )
+        assert result
+        assert len(data) == position_global_batch_encoding.HEADER.size + 24 * len(positions)
+
+        result, worker_id, array = position_global_batch_encoding.decode_position_global_batch(data)
+        assert result
+        assert worker_id == WORKER_ID
+        np.testing.assert_array_equal(array, to_array(positions))
+
+    def test_scaled_int32(self, positions: "list[position_global.PositionGlobal]") -> None:
+        """
+        Round trip to 1e-7 degrees and 1 mm.
+        """
+        result, data = position_global_batch_encoding.encode_position_global_batch(
+            WORKER_ID, positions, PositionFormat.SCALED_INT32
+        )
+        assert result
+        assert len(data) == position_global_batch_encoding.HEADER.size + 12 * len(positions)
+
+        result, worker_id, array = position_global_batch_encoding.decode_position_global_batch(data)
+        assert result
+        assert worker_id == WORKER_ID
+        expected = to_array(positions)
+        np.testing.assert_allclose(array[:, :2], expected[:, :2], rtol=0.0, atol=0.5e-7)
+        np.testing.assert_allclose(array[:, 2], expected[:, 2], rtol=0.0, atol=0.5e-3)
+
+    def test_float32(self, positions: "list[position_global.PositionGlobal]") -> None:
+        """
+        Round trip to float32 precision.
+        """
+        result, data = position_global_batch_encoding.encode_position_global_batch(
+            WORKER_ID, to_array(positions), PositionFormat.FLOAT32
+        )
+        assert result
+
+        result, _, array = position_global_batch_encoding.decode_position_global_batch(data)
+        assert result
+        np.testing.assert_allclose(array, to_array(positions), rtol=1e-7, atol=1e-6)
+
+    def test_objects(self, positions: "list[position_global.PositionGlobal]") -> None:
+        """
+        Decoded array converts back to PositionGlobal objects.
+        """
+        result, data = position_global_batch_encoding.encode_position_global_batch(
+            WORKER_ID, positions, PositionFormat.FLOAT64
+        )
+        assert result
+        result, _, array = position_global_batch_encoding.decode_position_global_batch(data)
+        assert result
+
+        result, decoded = position_global_batch_encoding.array_to_positions(array)
+        assert result
+        for expected, actual in zip(positions, decoded):
+            assert actual.latitude == expected.latitude
+            assert actual.longitude == expected.longitude
+            assert actual.altitude == expected.altitude
+
+    def test_empty(self) -> None:
+        """
+        No positions.
+        """
+        result, data = position_global_batch_encoding.encode_position_global_batch(WORKER_ID, [])
+        assert result
+
+        result, worker_id, array = position_global_batch_encoding.decode_position_global_batch(data)
+        assert result
+        assert worker_id == WORKER_ID
+        assert array.shape == (0, 3)
+
+    def test_invalid(self, positions: "list[position_global.PositionGlobal]") -> None:
+        """
+        Invalid input is rejected.
+        """
+        result, data = position_global_batch_encoding.encode_position_global_batch(1, positions)
+        assert not result
+        assert data is None
+
+        result, data = position_global_batch_encoding.encode_position_global_batch(
+            WORKER_ID, np.array([[0.0, np.nan, 0.0]])
+        )
+        assert not result
+        assert data is None
+
+        result, data = position_global_batch_encoding.encode_position_global_batch(
+            WORKER_ID, np.zeros((2, 2))
+        )
+        assert not result
+        assert data is None
+
+        # Truncated record
+        result, data = position_global_batch_encoding.encode_position_global_batch(
+            WORKER_ID, positions
+        )
+        assert result
+        result, worker_id, array = position_global_batch_encoding.decode_position_global_batch(
+            data[:-1]
+        )
+        assert not result
+        assert worker_id is None
+        assert array is None
+
+
+class TestStatusText:
+    """
+    Test splitting positions into STATUSTEXT strings.
+    """
+
+    @pytest.mark.parametrize(
+        "position_format, positions_per_text",
+        [
+            (PositionFormat.FLOAT64, 1),
+            (PositionFormat.FLOAT32, 3),
+            (PositionFormat.SCALED_INT32, 3),
+        ],
+    )
+    def test_round_trip(
+        self,
+        positions: "list[position_global.PositionGlobal]",
+        position_format: PositionFormat,
+        positions_per_text: int,
+    ) -> None:
+        """
+        Every string fits in a STATUSTEXT and decodes on its own.
+        """
+        result, texts = position_global_batch_encoding.encode_position_global_status_texts(
+            WORKER_ID, positions, position_format
+        )
+        assert result
+        assert len(texts) == -(-len(positions) // positions_per_text)
+
+        decoded = []
+        for text in texts:
+            assert len(text.encode("utf-8")) <= position_global_batch_encoding.STATUS_TEXT_LENGTH
+
+            result, worker_id, array = (
+                position_global_batch_encoding.decode_position_global_status_text(text)
+            )
+            assert result
+            assert worker_id == WORKER_ID
+            decoded.append(array)
+
+        np.testing.assert_allclose(np.concatenate(decoded), to_array(positions), atol=1e-5)
+
+    def test_fewer_messages(self, positions: "list[position_global.PositionGlobal]") -> None:
+        """
+        Fewer STATUSTEXT messages than one per position with encode_position_global().
+        """
+        result, texts = position_global_batch_encoding.encode_position_global_status_texts(
+            WORKER_ID, positions * 20
+        )
+        assert result
+
+        for position in positions:
+            result, single = message_encoding_decoding.encode_position_global(WORKER_ID, position)
+            assert result
+            assert len(single) <= position_global_batch_encoding.STATUS_TEXT_LENGTH
+
+        assert len(texts) == 34  # 100 positions, 3 per message
+
+    def test_chunk_index(self, positions: "list[position_global.PositionGlobal]") -> None:
+        """
+        Each string carries its index, so lost or reordered messages can be detected.
+        """
+        result, texts = position_global_batch_encoding.encode_position_global_status_texts(
+            WORKER_ID, positions, PositionFormat.FLOAT64
+        )
+        assert result
+
+        for index, text in enumerate(texts):
+            _, _, chunk_index = position_global_batch_encoding.HEADER.unpack_from(
+                base64.b85decode(text)
+            )
+            assert chunk_index == index
+
+    def test_invalid_text(self) -> None:
+        """
+        Not base85.
+        """
+        result, worker_id, array = (
+            position_global_batch_encoding.decode_position_global_status_text("\x00 ~")
+        )
+        assert not result
+        assert worker_id is None
+        assert array is None
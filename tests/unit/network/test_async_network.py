@@ -0,0 +1,263 @@
+"""
+Test asyncio TCP and UDP sockets over loopback.
+"""
+
+import asyncio
+import socket
+
+import numpy as np
+import pytest
+
+from modules.network.tcp.async_client_socket import AsyncTcpClientSocket
+from modules.network.tcp.async_server_socket import AsyncTcpServer, AsyncTcpServerSocket
+from modules.network.tcp.async_socket_wrapper import AsyncTcpSocket
+from modules.network.tcp.client_socket import TcpClientSocket
+from modules.network.udp.async_client_socket import AsyncUdpClientSocket
+from modules.network.udp.async_server_socket import AsyncUdpServerSocket
+
+
+HOST = "localhost"
+TIMEOUT = 5.0
+
+
+async def echo(connection: AsyncTcpSocket) -> None:
+    """
+    Sends back every message until the peer disconnects.
+    """
+    while True:
+        result, message = await connection.recv_message()
+        if not result:
+            return
+
+        result = await connection.send_message(message)
+        if not result:
+            return
+
+
+class TestAsyncTcp:
+    """
+    Test asyncio TCP sockets.
+    """
+
+    def test_single_connection(self) -> None:
+        """
+        Server socket accepts one connection and data flows both ways.
+        """
+
+        async def run() -> None:
+            # Find a free port
+            with socket.create_server((HOST, 0)) as probe:
+                _, port = probe.getsockname()
+
+            server_task = asyncio.create_task(
+                AsyncTcpServerSocket.create(HOST, port, connection_timeout=TIMEOUT)
+            )
+            await asyncio.sleep(0.1)
+
+            result, client = await AsyncTcpClientSocket.create(
+                host=HOST, port=port, connection_timeout=TIMEOUT
+            )
+            assert result
+            assert client is not None
+
+            result, server = await server_task
+            assert result
+            assert server is not None
+
+            assert await client.send(b"Hello world!")
+            result, data = await server.recv(12)
+            assert result
+            assert data == b"Hello world!"
+
+            assert await server.send_message(b"Reply")
+            result, data = await client.recv_message()
+            assert result
+            assert data == b"Reply"
+
+            assert await client.close()
+            result, data = await server.recv(1)
+            assert not result
+            assert data is None
+
+            assert await server.close()
+
+        asyncio.run(run())
+
+    def test_many_connections(self) -> None:
+        """
+        One server handles concurrent clients.
+        """
+        client_count = 20
+
+        async def run() -> None:
+            result, server = await AsyncTcpServer.create(
+                echo, HOST, port=0, connection_timeout=TIMEOUT
+            )
+            assert result
+            assert server is not None
+
+            _, port = server.address()
+
+            async def client_session(index: int) -> None:
+                result, client = await AsyncTcpClientSocket.create(
+                    host=HOST, port=port, connection_timeout=TIMEOUT
+                )
+                assert result
+                assert client is not None
+
+                for i in range(10):
+                    data = f"{index} {i}".encode()
+                    assert await client.send_message(data)
+                    result, actual = await client.recv_message()
+                    assert result
+                    assert actual == data
+
+                assert await client.close()
+
+            await asyncio.gather(*(client_session(i) for i in range(client_count)))
+
+            await server.close()
+            assert server.connection_count == client_count
+
+        asyncio.run(run())
+
+    def test_blocking_peer(self) -> None:
+        """
+        Framed messages are compatible with the blocking TcpSocket.
+        """
+        data = np.random.bytes(100000)
+
+        async def run(async_instance: socket.socket, blocking: TcpClientSocket) -> None:
+            result, client = await AsyncTcpClientSocket.create(
+                instance=async_instance, connection_timeout=TIMEOUT
+            )
+            assert result
+            assert client is not None
+
+            assert await client.send_message(data)
+            result, message = await asyncio.to_thread(blocking.recv_message)
+            assert result
+            assert message == data
+
+            assert await asyncio.to_thread(blocking.send_message, data)
+            result, message = await client.recv_message()
+            assert result
+            assert message == data
+
+            assert await client.close()
+
+        async_instance, blocking_instance = socket.socketpair()
+        blocking_instance.settimeout(TIMEOUT)
+        result, blocking = TcpClientSocket.create(instance=blocking_instance)
+        assert result
+        assert blocking is not None
+
+        asyncio.run(run(async_instance, blocking))
+
+        blocking.close()
+
+    def test_message_too_large(self) -> None:
+        """
+        Message over the limit is discarded and the next one is still received.
+        """
+
+        async def run(async_instance: socket.socket, blocking: TcpClientSocket) -> None:
+            result, client = await AsyncTcpClientSocket.create(
+                instance=async_instance, connection_timeout=TIMEOUT
+            )
+            assert result
+            assert client is not None
+
+            assert await asyncio.to_thread(blocking.send_message, b"abcdef")
+            assert await asyncio.to_thread(blocking.send_message, b"gh")
+
+            result, message = await client.recv_message(max_message_size=2)
+            assert not result
+            assert message is None
+
+            result, message = await client.recv_message(max_message_size=2)
+            assert result
+            assert message == b"gh"
+
+            assert await client.close()
+
+        async_instance, blocking_instance = socket.socketpair()
+        blocking_instance.settimeout(TIMEOUT)
+        result, blocking = TcpClientSocket.create(instance=blocking_instance)
+        assert result
+        assert blocking is not None
+
+        asyncio.run(run(async_instance, blocking))
+
+        blocking.close()
+
+    def test_connection_refused(self) -> None:
+        """
+        Nothing is listening.
+        """
+        with socket.create_server((HOST, 0)) as probe:
+            _, port = probe.getsockname()
+
+        result, client = asyncio.run(
+            AsyncTcpClientSocket.create(host=HOST, port=port, connection_timeout=TIMEOUT)
+        )
+        assert not result
+        assert client is None
+
+
+class TestAsyncUdp:
+    """
+    Test asyncio UDP sockets.
+    """
+
+    def test_send_and_receive(self) -> None:
+        """
+        Data sent by the client is received in order by the server.
+        """
+        data = np.random.bytes(100000)
+
+        async def run() -> None:
+            result, server = await AsyncUdpServerSocket.create(
+                HOST, port=0, connection_timeout=TIMEOUT
+            )
+            assert result
+            assert server is not None
+
+            _, port = server.address()
+            result, client = await AsyncUdpClientSocket.create(
+                HOST, port, connection_timeout=TIMEOUT
+            )
+            assert result
+            assert client is not None
+
+            assert await client.send(data)
+            result, actual = await server.recv(len(data))
+            assert result
+            assert actual == data
+            assert server.get_datagrams_dropped() == 0
+
+            with pytest.raises(NotImplementedError):
+                await client.recv(1)
+
+            client.close()
+            server.close()
+
+        asyncio.run(run())
+
+    def test_timeout(self) -> None:
+        """
+        Nothing to receive.
+        """
+
+        async def run() -> None:
+            result, server = await AsyncUdpServerSocket.create(HOST, port=0, connection_timeout=0.1)
+            assert result
+            assert server is not None
+
+            result, data = await server.recv(1)
+            assert not result
+            assert data is None
+
+            server.close()
+
+        asyncio.run(run())
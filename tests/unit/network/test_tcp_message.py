@@ -0,0 +1,174 @@
+"""
+Test framed messages over a connected pair of TCP sockets.
+"""
+
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from modules.network.tcp.client_socket import TcpClientSocket
+from modules.network.tcp.socket_wrapper import TcpSocket
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def socket_pair() -> "tuple[TcpSocket, TcpSocket]":  # type: ignore
+    """
+    Connected sender and receiver.
+    """
+    sender_instance, receiver_instance = socket.socketpair()
+    sender_instance.settimeout(10.0)
+    receiver_instance.settimeout(10.0)
+
+    result, sender = TcpClientSocket.create(instance=sender_instance)
+    assert result
+    assert sender is not None
+
+    result, receiver = TcpClientSocket.create(instance=receiver_instance)
+    assert result
+    assert receiver is not None
+
+    yield sender, receiver
+
+    sender.close()
+    receiver.close()
+
+
+class TestMessage:
+    """
+    Test send_message and recv_message.
+    """
+
+    def test_small_messages(self, socket_pair: "tuple[TcpSocket, TcpSocket]") -> None:
+        """
+        Messages arrive in order and intact, including an empty one.
+        """
+        sender, receiver = socket_pair
+        messages = [b"Hello world!", b"", np.random.bytes(4096)]
+
+        for data in messages:
+            assert sender.send_message(data)
+
+        for data in messages:
+            result, actual = receiver.recv_message()
+            assert result
+            assert actual is not None
+            assert actual == data
+
+    def test_large_message(self, socket_pair: "tuple[TcpSocket, TcpSocket]") -> None:
+        """
+        Message larger than the socket buffers, sent from another thread.
+        """
+        sender, receiver = socket_pair
+        data = np.random.bytes(5_000_000)
+
+        thread = threading.Thread(target=sender.send_message, args=(data,))
+        thread.start()
+
+        result, actual = receiver.recv_message()
+        thread.join()
+
+        assert result
+        assert actual is not None
+        assert actual == data
+
+    def test_numpy_array(self, socket_pair: "tuple[TcpSocket, TcpSocket]") -> None:
+        """
+        Any buffer can be sent without converting to bytes first.
+        """
+        sender, receiver = socket_pair
+        image = np.random.randint(0, 255, (48, 64, 3), dtype=np.uint8)
+
+        assert sender.send_message(image)
+
+        result, actual = receiver.recv_message()
+        assert result
+        assert actual is not None
+        assert np.array_equal(np.frombuffer(actual, np.uint8).reshape(image.shape), image)
+
+    def test_provided_buffer(self, socket_pair: "tuple[TcpSocket, TcpSocket]") -> None:
+        """
+        Message is received into the caller's buffer.
+        """
+        sender, receiver = socket_pair
+        buffer = bytearray(16)
+
+        assert sender.send_message(b"abc")
+
+        result, actual = receiver.recv_message(buffer)
+        assert result
+        assert actual is not None
+        assert actual.obj is buffer
+        assert buffer[:3] == b"abc"
+
+    def test_buffer_too_small(self, socket_pair: "tuple[TcpSocket, TcpSocket]") -> None:
+        """
+        Provided buffer cannot hold the message, which is discarded.
+        """
+        sender, receiver = socket_pair
+
+        assert sender.send_message(b"abcdef")
+        assert sender.send_message(b"gh")
+
+        result, actual = receiver.recv_message(bytearray(2))
+        assert not result
+        assert actual is None
+
+        result, actual = receiver.recv_message(bytearray(2))
+        assert result
+        assert actual == b"gh"
+
+    def test_message_too_large(self, socket_pair: "tuple[TcpSocket, TcpSocket]") -> None:
+        """
+        Message over the limit is discarded without allocating a buffer for it.
+        """
+        sender, receiver = socket_pair
+
+        assert sender.send_message(b"abcdef")
+        assert sender.send_message(b"gh")
+
+        result, actual = receiver.recv_message(max_message_size=2)
+        assert not result
+        assert actual is None
+
+        result, actual = receiver.recv_message(max_message_size=2)
+        assert result
+        assert actual == b"gh"
+
+    def test_previous_view_kept(self, socket_pair: "tuple[TcpSocket, TcpSocket]") -> None:
+        """
+        Internal buffer can grow while a view of a previous message is still held.
+        """
+        sender, receiver = socket_pair
+
+        assert sender.send_message(b"a")
+        assert sender.send_message(b"bcdefgh")
+
+        result, first = receiver.recv_message()
+        assert result
+        assert first is not None
+
+        result, second = receiver.recv_message()
+        assert result
+        assert second is not None
+        assert first == b"a"
+        assert second == b"bcdefgh"
+
+    def test_connection_closed(self, socket_pair: "tuple[TcpSocket, TcpSocket]") -> None:
+        """
+        Peer closes the connection in the middle of a message.
+        """
+        sender, receiver = socket_pair
+
+        sender.get_socket().sendall(b"\x00\x00\x00\x10abc")
+        sender.close()
+
+        result, actual = receiver.recv_message()
+        assert not result
+        assert actual is None
@@ -0,0 +1,303 @@
+"""
+Test the selector based TCP server with many clients.
+"""
+
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from modules.network.tcp.client_socket import TcpClientSocket
+from modules.network.tcp.multi_client_server import (
+    READ_BUFFER_SIZE,
+    TcpMultiClientServer,
+    TcpServerConnection,
+)
+
+
+HOST = "localhost"
+TIMEOUT = 5.0
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+def echo(connection: TcpServerConnection, message: memoryview) -> None:
+    """
+    Sends the message back.
+    """
+    connection.send_message(message)
+
+
+@pytest.fixture
+def server() -> TcpMultiClientServer:  # type: ignore
+    """
+    Echo server on a free port.
+    """
+    result, instance = TcpMultiClientServer.create(echo, HOST, port=0)
+    assert result
+    assert instance is not None
+
+    yield instance
+
+    instance.close()
+
+
+def connect(server: TcpMultiClientServer) -> TcpClientSocket:
+    """
+    Connects a client and lets the server accept it.
+    """
+    _, port = server.address()
+    result, client = TcpClientSocket.create(host=HOST, port=port, connection_timeout=TIMEOUT)
+    assert result
+    assert client is not None
+
+    connection_count = server.connection_count
+    run_until(server, lambda: server.connection_count > connection_count)
+
+    return client
+
+
+def run_until(server: TcpMultiClientServer, condition: Callable[[], bool]) -> None:
+    """
+    Runs the server until the condition is met.
+    """
+    end_time = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < end_time
+        server.run_once(0.01)
+
+
+def run_in_background(server: TcpMultiClientServer, stop: threading.Event) -> threading.Thread:
+    """
+    Runs the server on another thread until stopped.
+    """
+
+    def run() -> None:
+        while not stop.is_set():
+            server.run_once(0.01)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+
+    return thread
+
+
+class TestMultiClientServer:
+    """
+    Test TcpMultiClientServer and TcpServerConnection.
+    """
+
+    def test_many_clients(self, server: TcpMultiClientServer) -> None:
+        """
+        Messages from several clients are handled independently.
+        """
+        clients = [connect(server) for _ in range(5)]
+        assert len(server.get_connections()) == 5
+
+        for i, client in enumerate(clients):
+            assert client.send_message(f"Client {i}".encode())
+            assert client.send_message(b"")
+
+        stop = threading.Event()
+        thread = run_in_background(server, stop)
+        try:
+            for i, client in enumerate(clients):
+                result, message = client.recv_message()
+                assert result
+                assert bytes(message) == f"Client {i}".encode()
+
+                result, message = client.recv_message()
+                assert result
+                assert bytes(message) == b""
+        finally:
+            stop.set()
+            thread.join()
+
+        for client in clients:
+            client.close()
+
+        run_until(server, lambda: len(server.get_connections()) == 0)
+
+    def test_large_message(self, server: TcpMultiClientServer) -> None:
+        """
+        Messages larger than the read buffer are reassembled.
+        """
+        client = connect(server)
+        data = np.random.bytes(READ_BUFFER_SIZE * 10)
+
+        stop = threading.Event()
+        thread = run_in_background(server, stop)
+        try:
+            assert client.send_message(data)
+            result, message = client.recv_message()
+            assert result
+            assert bytes(message) == data
+        finally:
+            stop.set()
+            thread.join()
+
+        client.close()
+
+    def test_split_messages(self) -> None:
+        """
+        Messages arriving a byte at a time, or many in one read, are all handled.
+        """
+        received = []
+        result, instance = TcpMultiClientServer.create(
+            lambda connection, message: received.append(bytes(message)), HOST, port=0
+        )
+        assert result
+        assert instance is not None
+
+        client = connect(instance)
+        stream = b"".join(len(data).to_bytes(4, "big") + data for data in [b"abc", b"", b"de"])
+        for i in range(len(stream)):
+            assert client.send(stream[i : i + 1])
+            instance.run_once(0.01)
+
+        assert client.send(stream * 100)
+        run_until(instance, lambda: len(received) == 303)
+
+        assert received[:3] == [b"abc", b"", b"de"]
+        assert received[3:] == [b"abc", b"", b"de"] * 100
+
+        client.close()
+        instance.close()
+
+    def test_backpressure(self) -> None:
+        """
+        Reading stops while too much is waiting to be sent to a client which does not read.
+        """
+        reply = bytes(100000)
+        result, server = TcpMultiClientServer.create(
+            lambda connection, message: connection.send_message(reply),
+            HOST,
+            port=0,
+            max_send_buffer_size=len(reply) * 4,
+        )
+        assert result
+        assert server is not None
+
+        client = connect(server)
+        connection = server.get_connections()[0]
+
+        request_count = 200
+        for _ in range(request_count):
+            assert client.send_message(b"request")
+
+        run_until(server, connection.is_reading_paused)
+        assert connection.messages_received < request_count
+        assert connection.messages_dropped == 0
+
+        # Replies resume once the client reads
+        stop = threading.Event()
+        thread = run_in_background(server, stop)
+        try:
+            for _ in range(request_count):
+                result, message = client.recv_message()
+                assert result
+                assert message.nbytes == len(reply)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert connection.messages_received == request_count
+        assert connection.messages_dropped == 0
+
+        client.close()
+        server.close()
+
+    def test_send_queue_full(self, server: TcpMultiClientServer) -> None:
+        """
+        Messages beyond the send queue limit are dropped.
+        """
+        client = connect(server)
+        connection = server.get_connections()[0]
+
+        data = bytes(2**20)
+        while connection.send_message(data):
+            pass
+
+        assert connection.messages_dropped == 1
+        assert connection.get_send_queue_size() > 0
+
+        client.close()
+
+    def test_message_too_large_while_congested(self) -> None:
+        """
+        An oversized header is rejected before the read buffer grows, even when the send queue
+        is congested and messages are not being handled.
+        """
+        reply = bytes(2**24)
+        max_message_size = 1000
+        result, server = TcpMultiClientServer.create(
+            lambda connection, message: connection.send_message(reply),
+            HOST,
+            port=0,
+            max_send_buffer_size=len(reply) + 2**20,
+            max_message_size=max_message_size,
+        )
+        assert result
+        assert server is not None
+
+        client = connect(server)
+        connection = server.get_connections()[0]
+
+        # Reply to the request congests the send queue, the oversized header is in the same read
+        request = len(b"request").to_bytes(4, "big") + b"request"
+        oversized_header = (READ_BUFFER_SIZE * 16).to_bytes(4, "big")
+        assert client.send(request + oversized_header)
+
+        run_until(server, connection.is_closed)
+        assert connection.messages_received == 1
+
+        client.close()
+        server.close()
+
+    def test_write_after_close(self, server: TcpMultiClientServer) -> None:
+        """
+        A connection closed earlier in the same batch of events ignores its write event.
+        """
+        client = connect(server)
+        connection = server.get_connections()[0]
+
+        # Queued data registers for writability
+        while connection.get_send_queue_size() == 0:
+            assert connection.send_message(bytes(2**20))
+
+        connection.close()
+        connection.handle_write()
+        assert connection.is_closed()
+
+        client.close()
+
+    def test_disconnect_handler(self) -> None:
+        """
+        Handlers are called when clients connect and disconnect.
+        """
+        connected = []
+        disconnected = []
+        result, server = TcpMultiClientServer.create(
+            echo,
+            HOST,
+            port=0,
+            connect_handler=connected.append,
+            disconnect_handler=disconnected.append,
+        )
+        assert result
+        assert server is not None
+
+        client = connect(server)
+        assert len(connected) == 1
+
+        client.close()
+        run_until(server, lambda: len(disconnected) == 1)
+        assert disconnected[0] is connected[0]
+        assert disconnected[0].is_closed()
+
+        server.close()
@@ -0,0 +1,234 @@
+"""
+Test the persistent TCP client: queueing, reconnecting, and socket options.
+"""
+
+import socket
+
+import pytest
+
+from modules.network.tcp.client_socket import TcpClientSocket
+from modules.network.tcp.connection_profile import ConnectionProfile
+from modules.network.tcp.persistent_client_socket import (
+    PersistentTcpClientSocket,
+    TcpClientPool,
+)
+from modules.network.tcp.server_socket import TcpServerSocket
+
+
+HOST = "localhost"
+TIMEOUT = 5.0
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def port() -> int:
+    """
+    Port which is free, nothing is listening on it.
+    """
+    with socket.create_server((HOST, 0)) as probe:
+        _, free_port = probe.getsockname()
+
+    return free_port
+
+
+@pytest.fixture
+def client(port: int) -> PersistentTcpClientSocket:  # type: ignore
+    """
+    Client reconnecting quickly.
+    """
+    result, instance = PersistentTcpClientSocket.create(
+        HOST,
+        port,
+        ConnectionProfile(connection_timeout=TIMEOUT),
+        queue_size=3,
+        initial_backoff=0.01,
+        max_backoff=0.05,
+    )
+    assert result
+    assert instance is not None
+
+    yield instance
+
+    instance.close()
+
+
+def accept(port: int) -> TcpServerSocket:
+    """
+    Accepts one connection on the port.
+    """
+    with socket.create_server((HOST, port)) as listener:
+        listener.settimeout(TIMEOUT)
+        instance, _ = listener.accept()
+
+    instance.settimeout(TIMEOUT)
+    result, server = TcpServerSocket.create(instance=instance)
+    assert result
+    assert server is not None
+
+    return server
+
+
+class TestPersistentClient:
+    """
+    Test PersistentTcpClientSocket.
+    """
+
+    def test_queue_while_disconnected(self, client: PersistentTcpClientSocket, port: int) -> None:
+        """
+        Messages sent before the server is up are delivered once connected, dropping the oldest.
+        """
+        for i in range(5):
+            assert client.send_message(f"Message {i}".encode())
+
+        assert not client.is_connected()
+        assert client.messages_dropped == 2
+        assert client.get_queue_size() == 3
+
+        server = accept(port)
+        for i in range(2, 5):
+            result, message = server.recv_message()
+            assert result
+            assert bytes(message) == f"Message {i}".encode()
+
+        assert client.wait_connected(TIMEOUT)
+        assert client.connect_count == 1
+        assert client.reconnect_count == 0
+
+        server.close()
+
+    def test_reconnect(self, client: PersistentTcpClientSocket, port: int) -> None:
+        """
+        Reconnects after the server closes the connection, and records the latency.
+        """
+        server = accept(port)
+        assert client.wait_connected(TIMEOUT)
+
+        assert server.send_message(b"Hello")
+        result, message = client.recv_message()
+        assert result
+        assert bytes(message) == b"Hello"
+
+        server.close()
+        result, message = client.recv_message()
+        assert not result
+        assert message is None
+
+        server = accept(port)
+        assert client.wait_connected(TIMEOUT)
+        assert client.reconnect_count == 1
+        assert len(client.reconnect_latencies) == 1
+        assert 0.0 <= client.reconnect_latencies[0] < TIMEOUT
+
+        assert client.send_message(b"Again")
+        result, message = server.recv_message()
+        assert result
+        assert bytes(message) == b"Again"
+
+        server.close()
+
+    def test_recv_timeout(self, port: int) -> None:
+        """
+        An idle link is kept open when nothing arrives within the connection timeout.
+        """
+        result, client = PersistentTcpClientSocket.create(
+            HOST, port, ConnectionProfile(connection_timeout=0.1), initial_backoff=0.01
+        )
+        assert result
+        assert client is not None
+
+        server = accept(port)
+        assert client.wait_connected(TIMEOUT)
+
+        result, message = client.recv_message()
+        assert not result
+        assert message is None
+        assert client.is_connected()
+
+        assert server.send_message(b"Late")
+        result, message = client.recv_message()
+        assert result
+        assert bytes(message) == b"Late"
+        assert client.connect_count == 1
+
+        client.close()
+        server.close()
+
+    def test_closed(self, client: PersistentTcpClientSocket) -> None:
+        """
+        Nothing is queued after closing.
+        """
+        client.close()
+
+        assert not client.send_message(b"Hello")
+        assert not client.wait_connected(0.0)
+
+    def test_invalid(self) -> None:
+        """
+        Invalid parameters.
+        """
+        result, instance = PersistentTcpClientSocket.create(queue_size=0)
+        assert not result
+        assert instance is None
+
+        result, instance = PersistentTcpClientSocket.create(initial_backoff=1.0, max_backoff=0.5)
+        assert not result
+        assert instance is None
+
+
+class TestPool:
+    """
+    Test TcpClientPool.
+    """
+
+    def test_shared(self, port: int) -> None:
+        """
+        The same address gives the same client.
+        """
+        result, pool = TcpClientPool.create()
+        assert result
+        assert pool is not None
+
+        result, first = pool.get(HOST, port)
+        assert result
+        result, second = pool.get(HOST, port)
+        assert result
+        assert first is second
+
+        result, other = pool.get(HOST, port + 1)
+        assert result
+        assert other is not first
+
+        pool.close()
+        assert not first.send_message(b"Hello")
+
+
+class TestProfile:
+    """
+    Test ConnectionProfile.
+    """
+
+    def test_options(self, port: int) -> None:
+        """
+        Options are set on the socket.
+        """
+        profile = ConnectionProfile(
+            connection_timeout=2.0, no_delay=True, keepalive=True, send_buffer_size=65536
+        )
+
+        with socket.create_server((HOST, port)):
+            result, instance = TcpClientSocket.create(host=HOST, port=port, profile=profile)
+            assert result
+            assert instance is not None
+
+            socket_instance = instance.get_socket()
+            assert socket_instance.gettimeout() == 2.0
+            assert socket_instance.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+            assert socket_instance.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE) != 0
+            # Linux doubles the requested size for bookkeeping
+            assert socket_instance.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) >= 65536
+
+            instance.close()
@@ -0,0 +1,196 @@
+"""
+Test batched sending and receiving of datagrams.
+"""
+
+import socket
+
+import numpy as np
+import pytest
+
+from modules.network.udp import batch_io
+from modules.network.udp.client_socket import UdpClientSocket
+from modules.network.udp.server_socket import UdpServerSocket
+from modules.network.udp.socket_wrapper import CHUNK_SIZE
+
+
+HOST = "localhost"
+TIMEOUT = 5.0
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def server() -> UdpServerSocket:  # type: ignore
+    """
+    Server bound to a free port.
+    """
+    result, instance = UdpServerSocket.create(host=HOST, port=0, connection_timeout=TIMEOUT)
+    assert result
+    assert instance is not None
+
+    yield instance
+
+    instance.get_socket().close()
+
+
+@pytest.fixture
+def client(server: UdpServerSocket) -> UdpClientSocket:  # type: ignore
+    """
+    Client sending to the server.
+    """
+    _, port = server.get_socket().getsockname()
+    result, instance = UdpClientSocket.create(host=HOST, port=port, connection_timeout=TIMEOUT)
+    assert result
+    assert instance is not None
+
+    yield instance
+
+    instance.get_socket().close()
+
+
+def recv_all(
+    server: UdpServerSocket, count: int, slot_size: int = batch_io.SLOT_SIZE
+) -> "list[tuple[bytes, tuple]]":
+    """
+    Receives count datagrams with recv_batch.
+    """
+    datagrams = []
+    while len(datagrams) < count:
+        result, batch = server.recv_batch(slot_size=slot_size)
+        assert result
+        assert batch is not None
+
+        datagrams += [(bytes(view), address) for view, address in batch]
+
+    return datagrams
+
+
+class TestBatchIO:
+    """
+    Test send_to_batched and recv_batch.
+    """
+
+    def test_send_and_receive(self, server: UdpServerSocket, client: UdpClientSocket) -> None:
+        """
+        All datagrams arrive in order from the client address.
+        """
+        data = np.random.bytes(CHUNK_SIZE * 2 + 10)
+
+        assert client.send_batched(data)
+
+        # Default chunks are larger than the default receive buffers
+        datagrams = recv_all(server, 3, batch_io.MAX_SLOT_SIZE)
+        assert b"".join(chunk for chunk, _ in datagrams) == data
+        assert [len(chunk) for chunk, _ in datagrams] == [CHUNK_SIZE, CHUNK_SIZE, 10]
+
+        _, client_port = client.get_socket().getsockname()
+        for _, address in datagrams:
+            assert address == ("127.0.0.1", client_port)
+
+    def test_chunk_size(self, server: UdpServerSocket) -> None:
+        """
+        Data is split by chunk size.
+        """
+        _, port = server.get_socket().getsockname()
+        data = np.random.bytes(10000)
+
+        assert server.send_to_batched(data, HOST, port, chunk_size=3000, batch_size=2)
+
+        datagrams = recv_all(server, 4, batch_io.MAX_SLOT_SIZE)
+        assert [len(chunk) for chunk, _ in datagrams] == [3000, 3000, 3000, 1000]
+        assert b"".join(chunk for chunk, _ in datagrams) == data
+
+    def test_slot_size(self, server: UdpServerSocket) -> None:
+        """
+        Datagrams longer than the receive buffers are truncated.
+        """
+        _, port = server.get_socket().getsockname()
+        data = np.random.bytes(6000)
+
+        assert server.send_to_batched(data, HOST, port, chunk_size=3000)
+
+        datagrams = recv_all(server, 2, 1000)
+        assert [chunk for chunk, _ in datagrams] == [data[:1000], data[3000:4000]]
+
+    def test_ring_wraps(self, server: UdpServerSocket) -> None:
+        """
+        Receiving more datagrams than the ring holds reuses the slots.
+        """
+        _, port = server.get_socket().getsockname()
+        for _ in range(3):
+            data = np.random.bytes(100 * 100)
+            assert server.send_to_batched(data, HOST, port, chunk_size=100)
+
+            datagrams = recv_all(server, 100)
+            assert b"".join(chunk for chunk, _ in datagrams) == data
+
+    def test_view_lifetime(self, server: UdpServerSocket) -> None:
+        """
+        Views stay valid for at least slot_count - batch_size further datagrams.
+        """
+        result, batcher = batch_io.DatagramBatcher.create(batch_size=4, slot_count=10)
+        assert result
+        assert batcher is not None
+
+        server_socket = server.get_socket()
+        _, port = server_socket.getsockname()
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            received = []
+            for i in range(0, 40, 4):
+                for j in range(i, i + 4):
+                    sender.sendto(j.to_bytes(4, "big"), (HOST, port))
+
+                # Already arrived on localhost
+                datagrams = []
+                while len(datagrams) < 4:
+                    datagrams += batcher.recv(server_socket, 4 - len(datagrams))
+
+                received += [view for view, _ in datagrams]
+                for index in range(max(len(received) - (10 - 4), 0), len(received)):
+                    assert int.from_bytes(received[index], "big") == index
+
+    def test_timeout(self, server: UdpServerSocket) -> None:
+        """
+        Nothing to receive.
+        """
+        server.get_socket().settimeout(0.1)
+
+        result, datagrams = server.recv_batch()
+        assert not result
+        assert datagrams is None
+
+    def test_client_cannot_receive(self, client: UdpClientSocket) -> None:
+        """
+        Client sockets are not bound.
+        """
+        with pytest.raises(NotImplementedError):
+            client.recv_batch()
+
+
+class TestSockaddr:
+    """
+    Test conversion between Python addresses and sockaddr structures.
+    """
+
+    def test_ipv4(self) -> None:
+        """
+        Round trip.
+        """
+        address = ("192.168.1.20", 5000)
+        sockaddr = batch_io.sockaddr_from_address(socket.AF_INET, address)
+
+        assert len(sockaddr) == 16
+        assert batch_io.address_from_sockaddr(memoryview(sockaddr)) == address
+
+    def test_ipv6(self) -> None:
+        """
+        Round trip.
+        """
+        address = ("fe80::1", 5000, 0, 2)
+        sockaddr = batch_io.sockaddr_from_address(socket.AF_INET6, address)
+
+        assert len(sockaddr) == 28
+        assert batch_io.address_from_sockaddr(memoryview(sockaddr)) == address
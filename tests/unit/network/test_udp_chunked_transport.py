@@ -0,0 +1,245 @@
+"""
+Test chunked transport over UDP sockets on localhost.
+"""
+
+import random
+import struct
+
+import numpy as np
+import pytest
+
+from modules.network.udp import chunked_transport
+from modules.network.udp.client_socket import UdpClientSocket
+from modules.network.udp.server_socket import UdpServerSocket
+
+
+HOST = "localhost"
+TIMEOUT = 5.0
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def server() -> UdpServerSocket:  # type: ignore
+    """
+    Server bound to a free port.
+    """
+    result, instance = UdpServerSocket.create(host=HOST, port=0, connection_timeout=TIMEOUT)
+    assert result
+    assert instance is not None
+
+    yield instance
+
+    instance.get_socket().close()
+
+
+@pytest.fixture
+def client(server: UdpServerSocket) -> UdpClientSocket:  # type: ignore
+    """
+    Client sending to the server.
+    """
+    _, port = server.get_socket().getsockname()
+    result, instance = UdpClientSocket.create(host=HOST, port=port, connection_timeout=TIMEOUT)
+    assert result
+    assert instance is not None
+
+    yield instance
+
+    instance.get_socket().close()
+
+
+def make_chunks(data: bytes, chunk_size: int, message_id: int) -> "list[bytes]":
+    """
+    Datagrams as created by ChunkedSender.
+    """
+    chunk_count = (len(data) + chunk_size - 1) // chunk_size
+    chunks = []
+    for i in range(chunk_count):
+        offset = i * chunk_size
+        header = chunked_transport.DATA_HEADER.pack(
+            chunked_transport.PacketType.DATA.value, message_id, i, chunk_count, offset, len(data)
+        )
+        chunks.append(header + data[offset : offset + chunk_size])
+
+    return chunks
+
+
+class TestChunkedTransport:
+    """
+    Test ChunkedSender and ChunkedReceiver.
+    """
+
+    def test_send_and_receive(self, server: UdpServerSocket, client: UdpClientSocket) -> None:
+        """
+        Messages of different sizes arrive intact.
+        """
+        _, port = server.get_socket().getsockname()
+        result, sender = chunked_transport.ChunkedSender.create(client)
+        assert result
+        assert sender is not None
+
+        result, receiver = chunked_transport.ChunkedReceiver.create(server)
+        assert result
+        assert receiver is not None
+
+        for data in [b"", b"Hello world!", np.random.bytes(50000)]:
+            result, _ = sender.send_to(data, HOST, port)
+            assert result
+
+            result, actual = receiver.recv(TIMEOUT)
+            assert result
+            assert actual == data
+
+        assert receiver.messages_received == 3
+
+    def test_out_of_order(self, server: UdpServerSocket, client: UdpClientSocket) -> None:
+        """
+        Chunks arriving in any order and duplicated are reassembled.
+        """
+        _, port = server.get_socket().getsockname()
+        result, receiver = chunked_transport.ChunkedReceiver.create(server)
+        assert result
+        assert receiver is not None
+
+        data = np.random.bytes(10000)
+        chunks = make_chunks(data, 1000, 7)
+        chunks.append(chunks[3])
+        random.shuffle(chunks)
+
+        for chunk in chunks:
+            client.get_socket().sendto(chunk, (HOST, port))
+
+        result, actual = receiver.recv(TIMEOUT)
+        assert result
+        assert actual == data
+
+    def test_incomplete_dropped(self, server: UdpServerSocket, client: UdpClientSocket) -> None:
+        """
+        Incomplete message is dropped after timeout, and the next message still arrives.
+        """
+        _, port = server.get_socket().getsockname()
+        result, receiver = chunked_transport.ChunkedReceiver.create(server, message_timeout=0.1)
+        assert result
+        assert receiver is not None
+
+        for chunk in make_chunks(np.random.bytes(3000), 1000, 1)[1:]:
+            client.get_socket().sendto(chunk, (HOST, port))
+
+        result, actual = receiver.recv(0.3)
+        assert not result
+        assert actual is None
+        assert receiver.messages_dropped == 1
+
+        data = np.random.bytes(3000)
+        for chunk in make_chunks(data, 1000, 2):
+            client.get_socket().sendto(chunk, (HOST, port))
+
+        result, actual = receiver.recv(TIMEOUT)
+        assert result
+        assert actual == data
+
+    def test_slow_message_kept(self, server: UdpServerSocket, client: UdpClientSocket) -> None:
+        """
+        Message taking longer than the timeout to arrive is kept while chunks keep arriving.
+        """
+        _, port = server.get_socket().getsockname()
+        result, receiver = chunked_transport.ChunkedReceiver.create(server, message_timeout=0.2)
+        assert result
+        assert receiver is not None
+
+        data = np.random.bytes(6000)
+        chunks = make_chunks(data, 1000, 4)
+        for chunk in chunks[:-1]:
+            client.get_socket().sendto(chunk, (HOST, port))
+            result, _ = receiver.recv(0.1)
+            assert not result
+
+        client.get_socket().sendto(chunks[-1], (HOST, port))
+        result, actual = receiver.recv(TIMEOUT)
+        assert result
+        assert actual == data
+        assert receiver.messages_dropped == 0
+
+    def test_nack(self, server: UdpServerSocket, client: UdpClientSocket) -> None:
+        """
+        Receiver requests the missing chunks.
+        """
+        _, port = server.get_socket().getsockname()
+        result, receiver = chunked_transport.ChunkedReceiver.create(server, nack_delay=0.05)
+        assert result
+        assert receiver is not None
+
+        data = np.random.bytes(5000)
+        chunks = make_chunks(data, 1000, 3)
+        for i in [0, 2, 4]:
+            client.get_socket().sendto(chunks[i], (HOST, port))
+
+        result, _ = receiver.recv(0.2)
+        assert not result
+        assert receiver.nacks_sent >= 1
+
+        packet, _ = client.get_socket().recvfrom(chunked_transport.MAX_DATAGRAM_SIZE)
+        packet_type, message_id, missing_count = chunked_transport.NACK_HEADER.unpack_from(packet)
+        missing = struct.unpack_from(
+            f"!{missing_count}H", packet, chunked_transport.NACK_HEADER.size
+        )
+        assert packet_type == chunked_transport.PacketType.NACK.value
+        assert message_id == 3
+        assert list(missing) == [1, 3]
+
+    def test_retransmission(self, server: UdpServerSocket, client: UdpClientSocket) -> None:
+        """
+        Sender retransmits the chunks requested by the receiver.
+        """
+        _, port = server.get_socket().getsockname()
+        result, sender = chunked_transport.ChunkedSender.create(
+            client, chunk_size=1000, history_size=4
+        )
+        assert result
+        assert sender is not None
+
+        result, receiver = chunked_transport.ChunkedReceiver.create(server, nack_delay=0.05)
+        assert result
+        assert receiver is not None
+
+        data = np.random.bytes(5000)
+        result, message_id = sender.send_to(data, HOST, port)
+        assert result
+
+        # Lose a chunk by receiving it outside of the receiver, then let the receiver NACK it
+        server.get_socket().recvfrom(chunked_transport.MAX_DATAGRAM_SIZE)
+        result, _ = receiver.recv(0.2)
+        assert not result
+
+        # Receiver may have sent the NACK more than once
+        retransmitted = sender.handle_nacks(TIMEOUT)
+        assert retransmitted >= 1
+
+        result, actual = receiver.recv(TIMEOUT)
+        assert result
+        assert actual == data
+        assert sender.chunks_retransmitted == retransmitted
+        assert message_id is not None
+
+    def test_invalid_chunk_size(self, client: UdpClientSocket) -> None:
+        """
+        Chunk cannot fit in a datagram.
+        """
+        result, sender = chunked_transport.ChunkedSender.create(client, chunk_size=2**16)
+        assert not result
+        assert sender is None
+
+    def test_message_too_large(self, client: UdpClientSocket) -> None:
+        """
+        Message needs more chunks than the header can hold.
+        """
+        result, sender = chunked_transport.ChunkedSender.create(client, chunk_size=1)
+        assert result
+        assert sender is not None
+
+        result, message_id = sender.send_to(bytes(2**16), HOST, 1)
+        assert not result
+        assert message_id is None
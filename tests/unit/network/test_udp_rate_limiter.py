@@ -0,0 +1,173 @@
+"""
+Test rate limiter and its use in UDP sockets.
+"""
+
+import sys
+import time
+
+import pytest
+
+from modules.network.udp import rate_limiter
+from modules.network.udp.server_socket import UdpServerSocket
+
+
+HOST = "localhost"
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def server() -> UdpServerSocket:  # type: ignore
+    """
+    Server bound to a free port.
+    """
+    result, instance = UdpServerSocket.create(host=HOST, port=0, connection_timeout=5.0)
+    assert result
+    assert instance is not None
+
+    yield instance
+
+    instance.get_socket().close()
+
+
+class TestRateLimiter:
+    """
+    Test token bucket and AIMD.
+    """
+
+    def test_pacing(self) -> None:
+        """
+        Sending beyond the burst size waits for the bitrate.
+        """
+        result, limiter = rate_limiter.RateLimiter.create(8e6, burst_size=10000)
+        assert result
+        assert limiter is not None
+
+        start_time = time.monotonic()
+        for _ in range(60):
+            limiter.acquire(1000)
+        elapsed = time.monotonic() - start_time
+
+        # 50 kB after the burst at 1 MB/s
+        assert elapsed >= 0.045
+        assert limiter.bytes_sent == 60000
+        assert limiter.packets_sent == 60
+        assert limiter.wait_time > 0.0
+
+    def test_burst(self) -> None:
+        """
+        Sending within the burst size does not wait.
+        """
+        result, limiter = rate_limiter.RateLimiter.create(8e3, burst_size=10000)
+        assert result
+        assert limiter is not None
+
+        for _ in range(10):
+            limiter.acquire(1000)
+
+        assert limiter.wait_time == 0.0
+
+    def test_decrease(self) -> None:
+        """
+        Congestion multiplies the bitrate once per interval, down to the minimum.
+        """
+        result, limiter = rate_limiter.RateLimiter.create(
+            1e6, adaptive=True, min_bitrate=300e3, multiplicative_decrease=0.5
+        )
+        assert result
+        assert limiter is not None
+
+        limiter.report_congestion()
+        limiter.report_congestion()
+        assert limiter.get_bitrate() == pytest.approx(500e3, rel=0.01)
+        assert limiter.congestion_events == 2
+
+        time.sleep(rate_limiter.DECREASE_INTERVAL)
+        limiter.report_congestion()
+        assert limiter.get_bitrate() == 300e3
+
+    def test_increase(self) -> None:
+        """
+        Bitrate grows while sending is limited, up to the maximum.
+        """
+        result, limiter = rate_limiter.RateLimiter.create(
+            8e6, burst_size=1000, adaptive=True, max_bitrate=9e6, additive_increase=1e9
+        )
+        assert result
+        assert limiter is not None
+
+        for _ in range(20):
+            limiter.acquire(1000)
+
+        assert limiter.get_bitrate() == 9e6
+
+    def test_not_adaptive(self) -> None:
+        """
+        Congestion is counted but does not change the bitrate.
+        """
+        result, limiter = rate_limiter.RateLimiter.create(1e6)
+        assert result
+        assert limiter is not None
+
+        limiter.report_congestion()
+        limiter.report_send_queue(1000, 1000)
+
+        assert limiter.get_bitrate() == 1e6
+        assert limiter.congestion_events == 2
+        assert limiter.send_queue_peak == 1000
+
+    def test_invalid(self) -> None:
+        """
+        Invalid parameters.
+        """
+        result, limiter = rate_limiter.RateLimiter.create(0.0)
+        assert not result
+        assert limiter is None
+
+        result, limiter = rate_limiter.RateLimiter.create(1e6, adaptive=True, max_bitrate=1e5)
+        assert not result
+        assert limiter is None
+
+        result, limiter = rate_limiter.RateLimiter.create(
+            1e6, adaptive=True, multiplicative_decrease=1.0
+        )
+        assert not result
+        assert limiter is None
+
+
+class TestSocket:
+    """
+    Test rate limiter set on a socket.
+    """
+
+    def test_send_to(self, server: UdpServerSocket) -> None:
+        """
+        Datagrams sent with send_to are counted by the rate limiter.
+        """
+        _, port = server.get_socket().getsockname()
+        result, limiter = rate_limiter.RateLimiter.create(1e9, adaptive=True)
+        assert result
+        assert limiter is not None
+
+        server.set_rate_limiter(limiter)
+        assert server.get_rate_limiter() is limiter
+
+        assert server.send_to(bytes(10000), HOST, port, chunk_size=1000)
+        assert limiter.packets_sent == 10
+        assert limiter.bytes_sent == 10000
+
+        result, data = server.recv(10000)
+        assert result
+        assert data == bytes(10000)
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="Send queue size is only on Linux")
+    def test_send_queue_size(self, server: UdpServerSocket) -> None:
+        """
+        Send queue size is available on Linux.
+        """
+        result, size = server.get_send_queue_size()
+        assert result
+        assert size == 0
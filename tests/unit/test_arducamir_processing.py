@@ -0,0 +1,81 @@
+"""
+Test ArducamIR processing.
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from modules.camera import arducamir_processing
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+WIDTH = 64
+HEIGHT = 48
+
+
+@pytest.fixture
+def processor() -> arducamir_processing.ArducamIRProcessor:
+    """
+    Processor.
+    """
+    result, processor = arducamir_processing.ArducamIRProcessor.create()
+    assert result
+    assert processor is not None
+
+    yield processor
+
+
+@pytest.mark.parametrize("bit_depth", [8, 10, 12])
+def test_format(processor: arducamir_processing.ArducamIRProcessor, bit_depth: int) -> None:
+    """
+    Same as shifting and converting with temporaries.
+    """
+    generator = np.random.default_rng(0)
+    dtype = np.uint8 if bit_depth <= 8 else np.uint16
+    raw = generator.integers(0, 2**bit_depth, (HEIGHT, WIDTH), dtype=dtype)
+
+    expected = (raw >> (bit_depth - 8)).astype(np.uint8)
+
+    data = processor.format(raw.tobytes(), WIDTH, HEIGHT, bit_depth)
+    np.testing.assert_array_equal(data, expected)
+
+
+def test_demosaic(processor: arducamir_processing.ArducamIRProcessor) -> None:
+    """
+    Same as converting with new arrays.
+    """
+    generator = np.random.default_rng(0)
+    bayer = generator.integers(0, 256, (HEIGHT, WIDTH), dtype=np.uint8)
+    ir = generator.integers(0, 256, (HEIGHT // 2, WIDTH // 2), dtype=np.uint8)
+
+    expected_rgb = cv2.cvtColor(bayer, cv2.COLOR_BayerRG2BGRA)
+    expected_ir = cv2.resize(cv2.cvtColor(ir, cv2.COLOR_GRAY2BGRA), (WIDTH, HEIGHT))
+
+    np.testing.assert_array_equal(processor.bayer_to_bgra(bayer), expected_rgb)
+    np.testing.assert_array_equal(processor.ir_to_bgra(ir, WIDTH, HEIGHT), expected_ir)
+
+
+def test_buffers_reused(processor: arducamir_processing.ArducamIRProcessor) -> None:
+    """
+    Same arrays are returned until the resolution changes.
+    """
+    raw = np.zeros((HEIGHT, WIDTH), dtype=np.uint16).tobytes()
+    bayer = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+    ir = np.zeros((HEIGHT // 2, WIDTH // 2), dtype=np.uint8)
+
+    data = processor.format(raw, WIDTH, HEIGHT, 10)
+    rgb = processor.bayer_to_bgra(bayer)
+    ir_bgra = processor.ir_to_bgra(ir, WIDTH, HEIGHT)
+
+    assert processor.format(raw, WIDTH, HEIGHT, 10) is data
+    assert processor.bayer_to_bgra(bayer) is rgb
+    assert processor.ir_to_bgra(ir, WIDTH, HEIGHT) is ir_bgra
+
+    larger_rgb = processor.bayer_to_bgra(np.zeros((HEIGHT * 2, WIDTH * 2), dtype=np.uint8))
+    assert larger_rgb is not rgb
+    assert larger_rgb.shape == (HEIGHT * 2, WIDTH * 2, 4)
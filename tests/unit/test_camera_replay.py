@@ -0,0 +1,215 @@
+"""
+Test replay camera.
+"""
+
+import os
+import pathlib
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from modules.camera import camera_replay
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+WIDTH = 64
+HEIGHT = 48
+FRAME_COUNT = 6
+
+
+def frame_value(image: np.ndarray) -> int:
+    """
+    Value the frame was filled with, robust to compression.
+    """
+    return int(round(float(np.mean(image)) / 10))
+
+
+@pytest.fixture
+def image_directory(tmp_path: pathlib.Path) -> pathlib.Path:
+    """
+    PNG images filled with 0, 10, 20, ... , modified 0.1 s apart, and a file to ignore.
+    """
+    for index in range(FRAME_COUNT):
+        path = pathlib.Path(tmp_path, f"frame_{index:02}.png")
+        cv2.imwrite(str(path), np.full((HEIGHT, WIDTH, 3), index * 10, dtype=np.uint8))
+        modified_time = 1000.0 + index * 0.1
+        os.utime(path, (modified_time, modified_time))
+
+    pathlib.Path(tmp_path, "notes.txt").write_text("Not an image", encoding="utf-8")
+
+    yield tmp_path
+
+
+@pytest.fixture
+def video_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    """
+    Video with the same frames as the image directory.
+    """
+    path = pathlib.Path(tmp_path, "video.avi")
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (WIDTH, HEIGHT))
+    assert writer.isOpened()
+    for index in range(FRAME_COUNT):
+        writer.write(np.full((HEIGHT, WIDTH, 3), index * 10, dtype=np.uint8))
+    writer.release()
+
+    yield path
+
+
+def read_all(camera: camera_replay.CameraReplay, count: int) -> "list[int]":
+    """
+    Values of frames until the end or the count.
+    """
+    values = []
+    for _ in range(count):
+        result, image = camera.run()
+        if not result:
+            break
+
+        assert image.shape == (HEIGHT, WIDTH, 3)
+        values.append(frame_value(image))
+
+    return values
+
+
+def test_image_directory(image_directory: pathlib.Path) -> None:
+    """
+    Images in name order, then the end.
+    """
+    config = camera_replay.ConfigReplay(image_directory, camera_replay.ReplayRate.MAX_SPEED)
+    result, camera = camera_replay.CameraReplay.create(WIDTH, HEIGHT, config)
+    assert result
+    assert camera is not None
+    assert camera.frame_count == FRAME_COUNT
+
+    assert read_all(camera, 10) == list(range(FRAME_COUNT))
+
+    result, image = camera.run()
+    assert not result
+    assert image is None
+
+
+def test_unpadded_names(tmp_path: pathlib.Path) -> None:
+    """
+    Numbers in names (e.g. from the logger's image sink) are in numeric order.
+    """
+    for index in [2, 10, 95, 100]:
+        path = pathlib.Path(tmp_path, f"image_1700000000_{index}.png")
+        cv2.imwrite(str(path), np.full((HEIGHT, WIDTH, 3), index, dtype=np.uint8))
+
+    result, source = camera_replay.ImageDirectorySource.create(tmp_path)
+    assert result
+    assert source is not None
+
+    values = []
+    for index in range(source.frame_count):
+        result, image, _ = source.read(index)
+        assert result
+        values.append(int(image[0, 0, 0]))
+
+    assert values == [2, 10, 95, 100]
+
+
+def test_video(video_path: pathlib.Path) -> None:
+    """
+    Video frames in order, resized to the camera size.
+    """
+    config = camera_replay.ConfigReplay(video_path, camera_replay.ReplayRate.MAX_SPEED)
+    result, camera = camera_replay.CameraReplay.create(WIDTH * 2, HEIGHT * 2, config)
+    assert result
+
+    for expected in range(FRAME_COUNT):
+        result, image = camera.run()
+        assert result
+        assert image.shape == (HEIGHT * 2, WIDTH * 2, 3)
+        assert frame_value(image) == expected
+
+    result, _ = camera.run()
+    assert not result
+
+
+def test_loop_cache(image_directory: pathlib.Path) -> None:
+    """
+    Looping restarts from the first frame, and cached frames are not decoded again.
+    """
+    config = camera_replay.ConfigReplay(
+        image_directory, camera_replay.ReplayRate.MAX_SPEED, loop=True, cache_size=FRAME_COUNT
+    )
+    result, camera = camera_replay.CameraReplay.create(WIDTH, HEIGHT, config)
+    assert result
+
+    assert read_all(camera, FRAME_COUNT * 3) == list(range(FRAME_COUNT)) * 3
+    assert camera.cache_hit_count >= FRAME_COUNT * 2
+
+    # Returned frames do not change the cache
+    _, image = camera.run()
+    image[:] = 255
+    assert read_all(camera, FRAME_COUNT) == list(range(1, FRAME_COUNT)) + [0]
+
+
+def test_rates(image_directory: pathlib.Path) -> None:
+    """
+    Real time follows the frame rate, timestamp follows modification times.
+    """
+    config = camera_replay.ConfigReplay(
+        image_directory, camera_replay.ReplayRate.REAL_TIME, frame_rate=50.0
+    )
+    result, camera = camera_replay.CameraReplay.create(WIDTH, HEIGHT, config)
+    assert result
+
+    start_time = time.monotonic()
+    assert len(read_all(camera, FRAME_COUNT)) == FRAME_COUNT
+    # 5 intervals of 0.02 s
+    assert 0.09 < time.monotonic() - start_time < 0.5
+
+    config = camera_replay.ConfigReplay(image_directory, camera_replay.ReplayRate.TIMESTAMP)
+    result, camera = camera_replay.CameraReplay.create(WIDTH, HEIGHT, config)
+    assert result
+
+    start_time = time.monotonic()
+    assert len(read_all(camera, FRAME_COUNT)) == FRAME_COUNT
+    # 5 intervals of 0.1 s
+    assert 0.45 < time.monotonic() - start_time < 1.0
+
+
+def test_undecodable(image_directory: pathlib.Path) -> None:
+    """
+    Frames that cannot be decoded are skipped.
+    """
+    pathlib.Path(image_directory, "frame_02.png").write_bytes(b"Not a PNG")
+
+    config = camera_replay.ConfigReplay(image_directory, camera_replay.ReplayRate.MAX_SPEED)
+    result, camera = camera_replay.CameraReplay.create(WIDTH, HEIGHT, config)
+    assert result
+
+    assert read_all(camera, 10) == [0, 1, 3, 4, 5]
+    assert camera.skipped_count == 1
+
+
+def test_invalid(image_directory: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    """
+    Bad sizes, settings and paths.
+    """
+    config = camera_replay.ConfigReplay(image_directory)
+    result, camera = camera_replay.CameraReplay.create(0, HEIGHT, config)
+    assert not result
+    assert camera is None
+
+    config = camera_replay.ConfigReplay(image_directory, frame_rate=0.0)
+    result, camera = camera_replay.CameraReplay.create(WIDTH, HEIGHT, config)
+    assert not result
+
+    config = camera_replay.ConfigReplay(pathlib.Path(tmp_path, "missing.mp4"))
+    result, camera = camera_replay.CameraReplay.create(WIDTH, HEIGHT, config)
+    assert not result
+
+    empty_directory = pathlib.Path(tmp_path, "empty")
+    empty_directory.mkdir()
+    config = camera_replay.ConfigReplay(empty_directory)
+    result, camera = camera_replay.CameraReplay.create(WIDTH, HEIGHT, config)
+    assert not result
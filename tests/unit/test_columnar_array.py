@@ -0,0 +1,153 @@
+"""
+Test columnar containers of positions and locations.
+"""
+
+import numpy as np
+import pytest
+
+from modules import location_global
+from modules import location_local
+from modules import orientation
+from modules import position_global
+from modules import position_local
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def positions() -> "list[position_global.PositionGlobal]":
+    """
+    Positions in a line.
+    """
+    instances = []
+    for i in range(5):
+        result, position = position_global.PositionGlobal.create(43.0 + i, -80.0 - i, 300.0 + i)
+        assert result
+        instances.append(position)
+
+    yield instances
+
+
+def test_slots() -> None:
+    """
+    No per-instance dictionary.
+    """
+    result, position = position_global.PositionGlobal.create(1.0, 2.0, 3.0)
+    assert result
+    assert not hasattr(position, "__dict__")
+
+    result, named = position_global.NamedPositionGlobal.create("home", 1.0, 2.0, 3.0)
+    assert result
+    assert not hasattr(named, "__dict__")
+    assert named.name == "home"
+
+    result, angles = orientation.Orientation.create(0.0, 0.1, 0.2)
+    assert result
+    assert not hasattr(angles, "__dict__")
+
+
+def test_from_objects(positions: "list[position_global.PositionGlobal]") -> None:
+    """
+    Round trip through objects.
+    """
+    result, array = position_global.PositionGlobalArray.from_objects(positions)
+    assert result
+    assert array is not None
+    assert len(array) == len(positions)
+
+    np.testing.assert_array_equal(array.latitude, [position.latitude for position in positions])
+    np.testing.assert_array_equal(array.altitude, [position.altitude for position in positions])
+
+    result, objects = array.to_objects()
+    assert result
+    for expected, actual in zip(positions, objects):
+        assert isinstance(actual, position_global.PositionGlobal)
+        assert (actual.latitude, actual.longitude, actual.altitude) == (
+            expected.latitude,
+            expected.longitude,
+            expected.altitude,
+        )
+
+
+def test_slicing(positions: "list[position_global.PositionGlobal]") -> None:
+    """
+    Slices are views of the same type, indexing and iterating give rows.
+    """
+    result, array = position_global.PositionGlobalArray.from_objects(positions)
+    assert result
+
+    subset = array[1:4]
+    assert isinstance(subset, position_global.PositionGlobalArray)
+    assert len(subset) == 3
+    assert np.shares_memory(subset.data, array.data)
+
+    subset.altitude[:] = 0.0
+    assert array.altitude[1] == 0.0
+
+    row = array[-1]
+    assert row.latitude == positions[-1].latitude
+    row.altitude = 1.0
+    assert array.altitude[-1] == 1.0
+
+    result, element = array.get(-1)
+    assert result
+    assert isinstance(element, position_global.PositionGlobal)
+    assert element.latitude == positions[-1].latitude
+
+    result, element = array.get(len(array))
+    assert not result
+    assert element is None
+
+    masked = array[array.latitude > 45.0]
+    assert len(masked) == 2
+
+    # Strided slice is not contiguous
+    np.testing.assert_array_equal(array[::2].to_array()[:, 0], array.latitude[::2])
+
+    latitudes = [position.latitude for position in array]
+    assert latitudes == array.latitude.tolist()
+
+
+def test_create_from_array() -> None:
+    """
+    Plain arrays are viewed as the structured dtype.
+    """
+    values = np.arange(6, dtype=np.float64).reshape(3, 2)
+
+    result, array = location_local.LocationLocalArray.create(values)
+    assert result
+    np.testing.assert_array_equal(array.north, [0.0, 2.0, 4.0])
+    np.testing.assert_array_equal(array.east, [1.0, 3.0, 5.0])
+    np.testing.assert_array_equal(array.to_array(), values)
+
+    result, array = location_global.LocationGlobalArray.create(values)
+    assert result
+    assert array[0].longitude == 1.0
+
+    result, array = position_local.PositionLocalArray.create(values)
+    assert not result
+    assert array is None
+
+    result, array = position_local.PositionLocalArray.create_empty(4)
+    assert result
+    assert len(array) == 4
+    assert array.down.tolist() == [0.0] * 4
+
+
+def test_create_invalid() -> None:
+    """
+    Objects without the attributes are rejected.
+    """
+    result, location = location_global.LocationGlobal.create(1.0, 2.0)
+    assert result
+
+    result, array = position_global.PositionGlobalArray.from_objects([location])
+    assert not result
+    assert array is None
+
+    result, array = position_global.PositionGlobalArray.create_empty(-1)
+    assert not result
+    assert array is None
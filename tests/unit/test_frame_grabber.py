@@ -0,0 +1,159 @@
+"""
+Test frame grabber.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from modules.camera import base_camera
+from modules.camera import frame_grabber
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeCamera(base_camera.BaseCameraDevice):
+    """
+    Image filled with the count of previous calls to run().
+    """
+
+    @classmethod
+    def create(cls, width: int, height: int, config: object) -> "tuple[True, FakeCamera]":
+        return True, FakeCamera(width, height, config)
+
+    def __init__(self, width: int, height: int, exposure_time: float) -> None:
+        """
+        exposure_time: Seconds each run() takes.
+        """
+        self.__shape = (height, width, 3)
+        self.__exposure_time = exposure_time
+        self.run_count = 0
+        # Set to block run() until released
+        self.pause = threading.Event()
+        self.pause.set()
+
+    def __del__(self) -> None:
+        pass
+
+    def run(self) -> tuple[True, np.ndarray] | tuple[False, None]:
+        self.pause.wait()
+        time.sleep(self.__exposure_time)
+        image = np.full(self.__shape, self.run_count % 256, dtype=np.uint8)
+        self.run_count += 1
+        return True, image
+
+
+@pytest.fixture
+def camera() -> FakeCamera:
+    """
+    Camera at about 200 fps.
+    """
+    _, camera = FakeCamera.create(64, 48, 0.005)
+    yield camera
+
+
+def test_next_in_order(camera: FakeCamera) -> None:
+    """
+    next() returns every frame in order when read quickly enough.
+    """
+    result, grabber = frame_grabber.FrameGrabber.create(camera, 8)
+    assert result
+    assert grabber is not None
+    assert grabber.shape == (48, 64, 3)
+
+    previous_timestamp = 0.0
+    for expected in range(20):
+        result, frame = grabber.next(1.0)
+        assert result
+        assert frame.sequence_number == expected
+        assert frame.image[0, 0, 0] == expected
+        assert frame.timestamp > previous_timestamp
+        previous_timestamp = frame.timestamp
+
+    grabber.stop()
+    assert grabber.dropped_count == 0
+
+
+def test_next_drops_overwritten(camera: FakeCamera) -> None:
+    """
+    Frames overwritten while the consumer is slow are counted, and next() resumes at the oldest.
+    """
+    result, grabber = frame_grabber.FrameGrabber.create(camera, 2)
+    assert result
+
+    time.sleep(0.2)
+    result, frame = grabber.next(1.0)
+    assert result
+    assert frame.sequence_number > 1
+    assert grabber.dropped_count == frame.sequence_number
+
+    result, following = grabber.next(1.0)
+    assert result
+    assert following.sequence_number == frame.sequence_number + 1
+
+    grabber.stop()
+
+
+def test_latest(camera: FakeCamera) -> None:
+    """
+    latest() does not wait, and copies into the given array.
+    """
+    result, grabber = frame_grabber.FrameGrabber.create(camera)
+    assert result
+
+    camera.pause.clear()
+    time.sleep(0.05)
+
+    out = np.empty(grabber.shape, dtype=np.uint8)
+    start_time = time.monotonic()
+    first = grabber.latest(out)
+    second = grabber.latest()
+    assert time.monotonic() - start_time < 0.005
+
+    assert first.image is out
+    assert first.sequence_number == second.sequence_number
+    np.testing.assert_array_equal(first.image, second.image)
+    assert first.image[0, 0, 0] == first.sequence_number % 256
+
+    # Waiting next() returns when stopped
+    while grabber.next(0.0)[0]:
+        pass
+    thread = threading.Thread(target=grabber.next)
+    thread.start()
+    camera.pause.set()
+    grabber.stop()
+    thread.join(1.0)
+    assert not thread.is_alive()
+
+
+def test_next_timeout(camera: FakeCamera) -> None:
+    """
+    next() fails after the timeout when no frame arrives.
+    """
+    result, grabber = frame_grabber.FrameGrabber.create(camera)
+    assert result
+
+    camera.pause.clear()
+    while grabber.next(0.05)[0]:
+        pass
+
+    result, frame = grabber.next(0.05)
+    assert not result
+    assert frame is None
+
+    camera.pause.set()
+    grabber.stop()
+
+
+def test_invalid(camera: FakeCamera) -> None:
+    """
+    Ring buffer too small.
+    """
+    result, grabber = frame_grabber.FrameGrabber.create(camera, 1)
+    assert not result
+    assert grabber is None
@@ -0,0 +1,235 @@
+"""
+Test frame recording.
+"""
+
+import pathlib
+
+import numpy as np
+import pytest
+
+from modules.camera import base_camera
+from modules.camera import camera_replay
+from modules.camera import frame_recording
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+WIDTH = 64
+HEIGHT = 48
+FRAME_COUNT = 5
+
+
+class FakeCamera(base_camera.BaseCameraDevice):
+    """
+    Image filled with 0, 40, 80, ... , then fails.
+    """
+
+    @classmethod
+    def create(cls, width: int, height: int, config: object) -> "tuple[True, FakeCamera]":
+        return True, FakeCamera(width, height)
+
+    def __init__(self, width: int, height: int) -> None:
+        self.__shape = (height, width, 3)
+        self.__count = 0
+
+    def __del__(self) -> None:
+        pass
+
+    def run(self) -> tuple[True, np.ndarray] | tuple[False, None]:
+        if self.__count >= FRAME_COUNT:
+            return False, None
+
+        image = np.full(self.__shape, self.__count * 40, dtype=np.uint8)
+        self.__count += 1
+        return True, image
+
+
+@pytest.fixture
+def images() -> "list[np.ndarray]":
+    """
+    Colour and 16 bit grey frames.
+    """
+    generator = np.random.default_rng(0)
+    yield [
+        generator.integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8),
+        generator.integers(0, 4096, (HEIGHT, WIDTH), dtype=np.uint16),
+        generator.integers(0, 256, (HEIGHT + 1, WIDTH - 3, 3), dtype=np.uint8),
+    ]
+
+
+def write_recording(
+    path: pathlib.Path, images: "list[np.ndarray]", encoding: frame_recording.FrameEncoding
+) -> frame_recording.FrameRecorder:
+    """
+    Recording of the images with timestamps 10, 11, 12, ... , not closed.
+    """
+    result, recorder = frame_recording.FrameRecorder.create(path, encoding)
+    assert result
+    assert recorder is not None
+
+    for index, image in enumerate(images):
+        result, frame_number = recorder.write(image, 10.0 + index)
+        assert result
+        assert frame_number == index
+
+    return recorder
+
+
+def test_raw(images: "list[np.ndarray]", tmp_path: pathlib.Path) -> None:
+    """
+    Raw frames are exact aligned views, in any order.
+    """
+    path = pathlib.Path(tmp_path, "flight.frames")
+    recorder = write_recording(path, images, frame_recording.FrameEncoding.RAW)
+    assert recorder.close()
+
+    result, reader = frame_recording.FrameRecordingReader.create(path)
+    assert result
+    assert reader is not None
+    assert reader.frame_count == len(images)
+    np.testing.assert_array_equal(reader.timestamps, [10.0, 11.0, 12.0])
+
+    for index in [2, 0, 1]:
+        result, image, timestamp = reader.read(index)
+        assert result
+        assert timestamp == 10.0 + index
+        assert image.dtype == images[index].dtype
+        np.testing.assert_array_equal(image, images[index])
+        assert not image.flags.writeable
+        assert image.ctypes.data % frame_recording.ALIGNMENT == 0
+        del image
+
+    result, image, timestamp = reader.read(len(images))
+    assert not result
+    assert image is None
+    assert timestamp is None
+
+    reader.close()
+
+
+def test_jpeg(images: "list[np.ndarray]", tmp_path: pathlib.Path) -> None:
+    """
+    JPEG frames are decoded to the recorded shape, and are smaller for smooth images.
+    """
+    smooth = np.tile(np.arange(WIDTH, dtype=np.uint8)[np.newaxis, :, np.newaxis], (HEIGHT, 1, 3))
+    frames = [smooth, images[0], smooth[:, :, 0], smooth[:, :, :1]]
+
+    raw_path = pathlib.Path(tmp_path, "raw.frames")
+    assert write_recording(raw_path, frames, frame_recording.FrameEncoding.RAW).close()
+    jpeg_path = pathlib.Path(tmp_path, "jpeg.frames")
+    assert write_recording(jpeg_path, frames, frame_recording.FrameEncoding.JPEG).close()
+    assert jpeg_path.stat().st_size < raw_path.stat().st_size
+
+    result, reader = frame_recording.FrameRecordingReader.create(jpeg_path)
+    assert result
+
+    result, image, _ = reader.read(0)
+    assert result
+    assert image.shape == smooth.shape
+    assert np.abs(image.astype(int) - smooth).max() <= 4
+
+    # Grayscale, with and without the channel axis
+    for index in [2, 3]:
+        result, image, _ = reader.read(index)
+        assert result
+        assert image.shape == frames[index].shape
+        assert np.abs(image.astype(int) - frames[index]).max() <= 4
+
+    reader.close()
+
+
+def test_not_closed(images: "list[np.ndarray]", tmp_path: pathlib.Path) -> None:
+    """
+    Index is rebuilt from the records, an incomplete last record is ignored.
+    """
+    path = pathlib.Path(tmp_path, "flight.frames")
+    recorder = write_recording(path, images, frame_recording.FrameEncoding.RAW)
+    recorder.flush()
+
+    with open(path, "r+b") as file:
+        # Past the padding, into the data of the last frame
+        file.truncate(path.stat().st_size - 100)
+
+    result, reader = frame_recording.FrameRecordingReader.create(path)
+    assert result
+    assert reader.frame_count == len(images) - 1
+
+    result, image, timestamp = reader.read(1)
+    assert result
+    assert timestamp == 11.0
+    np.testing.assert_array_equal(image, images[1])
+    del image
+
+    reader.close()
+    recorder.close()
+
+
+def test_record_and_replay(tmp_path: pathlib.Path) -> None:
+    """
+    Recording from a camera plays back through the replay camera.
+    """
+    path = pathlib.Path(tmp_path, "flight.frames")
+    result, recorder = frame_recording.FrameRecorder.create(path)
+    assert result
+
+    _, camera = FakeCamera.create(WIDTH, HEIGHT, None)
+    result, written_count = recorder.record(camera, FRAME_COUNT + 2)
+    assert result
+    assert written_count == FRAME_COUNT
+    assert recorder.close()
+
+    config = camera_replay.ConfigReplay(path, camera_replay.ReplayRate.MAX_SPEED)
+    result, replay = camera_replay.CameraReplay.create(WIDTH, HEIGHT, config)
+    assert result
+    assert replay.frame_count == FRAME_COUNT
+
+    for index in range(FRAME_COUNT):
+        result, image = replay.run()
+        assert result
+        assert image.flags.writeable
+        np.testing.assert_array_equal(image, np.full((HEIGHT, WIDTH, 3), index * 40))
+
+    result, _ = replay.run()
+    assert not result
+
+
+def test_invalid(tmp_path: pathlib.Path) -> None:
+    """
+    Existing recording, other files, and images that cannot be stored.
+    """
+    path = pathlib.Path(tmp_path, "flight.frames")
+    result, recorder = frame_recording.FrameRecorder.create(
+        path, frame_recording.FrameEncoding.JPEG
+    )
+    assert result
+
+    result, frame_number = recorder.write(np.zeros(10, dtype=np.uint8), 0.0)
+    assert not result
+    assert frame_number is None
+
+    result, frame_number = recorder.write(np.zeros((HEIGHT, WIDTH, 2), dtype=np.uint8), 0.0)
+    assert not result
+
+    # BGRA and 16 bit images would be read back as 3 channel or 8 bit
+    result, frame_number = recorder.write(np.zeros((HEIGHT, WIDTH, 4), dtype=np.uint8), 0.0)
+    assert not result
+    result, frame_number = recorder.write(np.zeros((HEIGHT, WIDTH), dtype=np.uint16), 0.0)
+    assert not result
+    assert recorder.frame_count == 0
+    assert recorder.close()
+
+    result, other = frame_recording.FrameRecorder.create(path)
+    assert not result
+    assert other is None
+
+    text_path = pathlib.Path(tmp_path, "notes.txt")
+    text_path.write_text("Not a recording", encoding="utf-8")
+    result, reader = frame_recording.FrameRecordingReader.create(text_path)
+    assert not result
+    assert reader is None
+
+    result, reader = frame_recording.FrameRecordingReader.create(pathlib.Path(tmp_path, "missing"))
+    assert not result
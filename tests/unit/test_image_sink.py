@@ -0,0 +1,222 @@
+"""
+Test image sink.
+"""
+
+import pathlib
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from modules.logger import image_sink
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def image() -> np.ndarray:
+    """
+    Random colour image.
+    """
+    generator = np.random.default_rng(0)
+    yield generator.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+
+
+def test_unique_names(image: np.ndarray, tmp_path: pathlib.Path) -> None:
+    """
+    Names are unique within the same second, and PNG and NPY are lossless.
+    """
+    for image_format in [image_sink.ImageFormat.PNG, image_sink.ImageFormat.NPY]:
+        result, sink = image_sink.ImageSink.create(tmp_path, "worker", image_format)
+        assert result
+        assert sink is not None
+
+        names = []
+        for _ in range(5):
+            result, name = sink.save(image, "frame")
+            assert result
+            names.append(name)
+
+        assert len(set(names)) == 5
+        assert sink.saved_count == 5
+
+        for name in names:
+            assert name.endswith(f"_frame.{image_format.value}")
+            path = pathlib.Path(tmp_path, name)
+            if image_format == image_sink.ImageFormat.NPY:
+                np.testing.assert_array_equal(np.load(path), image)
+            else:
+                np.testing.assert_array_equal(cv2.imread(str(path)), image)
+
+
+def test_name_order(tmp_path: pathlib.Path) -> None:
+    """
+    Names sort in the order the images were saved.
+    """
+    result, sink = image_sink.ImageSink.create(tmp_path, "worker", image_sink.ImageFormat.NPY)
+    assert result
+
+    names = []
+    for _ in range(12):
+        result, name = sink.save(np.zeros((2, 2), dtype=np.uint8))
+        assert result
+        names.append(name)
+
+    assert sorted(names) == names
+
+
+def test_queue(image: np.ndarray, tmp_path: pathlib.Path) -> None:
+    """
+    Queued images are copies and are saved by the thread.
+    """
+    result, sink = image_sink.ImageSink.create(
+        tmp_path, "worker", image_sink.ImageFormat.JPEG, queue_size=100
+    )
+    assert result
+
+    expected = image.copy()
+    result, name = sink.save(image)
+    assert result
+    # Caller reuses the array
+    image[:] = 0
+
+    sink.flush()
+    assert sink.saved_count == 1
+    # JPEG of noise is not close per pixel, but is not the zeroed array
+    saved = cv2.imread(str(pathlib.Path(tmp_path, name)))
+    assert abs(np.mean(saved) - np.mean(expected)) < 5.0
+
+    sink.close()
+
+
+def test_threads(image: np.ndarray, tmp_path: pathlib.Path) -> None:
+    """
+    Names are unique when saving from several threads.
+    """
+    result, sink = image_sink.ImageSink.create(
+        tmp_path, "worker", image_sink.ImageFormat.NPY, queue_size=100
+    )
+    assert result
+
+    names = []
+
+    def save_images() -> None:
+        for _ in range(10):
+            _, name = sink.save(image)
+            names.append(name)
+
+    threads = [threading.Thread(target=save_images) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    sink.close()
+
+    assert len(set(names)) == 40
+    assert sink.saved_count == 40
+    assert len(list(tmp_path.glob("*.npy"))) == 40
+
+
+def test_closed(image: np.ndarray, tmp_path: pathlib.Path) -> None:
+    """
+    Images are not accepted after closing, and flush does not wait for them.
+    """
+    result, sink = image_sink.ImageSink.create(tmp_path, "worker", queue_size=10)
+    assert result
+    assert sink.is_queued
+
+    sink.close()
+
+    result, name = sink.save(image)
+    assert not result
+    assert name is None
+
+    sink.flush()
+    assert sink.saved_count == 0
+
+
+def test_dropped(tmp_path: pathlib.Path) -> None:
+    """
+    Images are dropped and counted when the queue is full, without blocking.
+    """
+    large_image = np.random.default_rng(0).integers(0, 256, (1080, 1920, 3), dtype=np.uint8)
+
+    result, sink = image_sink.ImageSink.create(tmp_path, "worker", png_compression=9, queue_size=1)
+    assert result
+
+    for _ in range(20):
+        sink.save(large_image)
+
+    sink.close()
+
+    assert sink.dropped_count > 0
+    assert sink.saved_count + sink.dropped_count == 20
+    assert len(list(tmp_path.glob("*.png"))) == sink.saved_count
+
+
+def test_sampling(image: np.ndarray, tmp_path: pathlib.Path) -> None:
+    """
+    Every nth image, and at most one per interval.
+    """
+    result, sink = image_sink.ImageSink.create(tmp_path, "every", sample_interval=3)
+    assert result
+
+    saved = [sink.save(image)[0] for _ in range(9)]
+    assert saved == [True, False, False] * 3
+    assert sink.skipped_count == 6
+
+    result, sink = image_sink.ImageSink.create(tmp_path, "rate", min_interval=3600.0)
+    assert result
+
+    saved = [sink.save(image)[0] for _ in range(3)]
+    assert saved == [True, False, False]
+    assert sink.saved_count == 1
+
+
+def test_invalid(tmp_path: pathlib.Path) -> None:
+    """
+    Out of range settings, and a directory that does not exist.
+    """
+    result, sink = image_sink.ImageSink.create(tmp_path, "worker", jpeg_quality=101)
+    assert not result
+    assert sink is None
+
+    result, sink = image_sink.ImageSink.create(tmp_path, "worker", sample_interval=0)
+    assert not result
+    assert sink is None
+
+    result, sink = image_sink.ImageSink.create(pathlib.Path(tmp_path, "nonexistent"), "worker")
+    assert result
+
+    result, name = sink.save(np.zeros((10, 10), dtype=np.uint8))
+    assert not result
+    assert name is None
+    assert sink.failed_count == 1
+
+
+def test_failed_write_not_rate_limited(tmp_path: pathlib.Path) -> None:
+    """
+    A failed write does not start the minimum interval.
+    """
+    directory = pathlib.Path(tmp_path, "later")
+    result, sink = image_sink.ImageSink.create(directory, "worker", min_interval=100.0)
+    assert result
+
+    result, _ = sink.save(np.zeros((10, 10), dtype=np.uint8))
+    assert not result
+    assert sink.failed_count == 1
+    assert sink.skipped_count == 0
+
+    directory.mkdir()
+    result, _ = sink.save(np.zeros((10, 10), dtype=np.uint8))
+    assert result
+    assert sink.saved_count == 1
+
+    result, _ = sink.save(np.zeros((10, 10), dtype=np.uint8))
+    assert not result
+    assert sink.skipped_count == 1
@@ -3,6 +3,7 @@ Test Process.
 """
 
 import pathlib
+import xml.etree.ElementTree
 
 import pytest
 import pytest_mock
@@ -229,7 +230,7 @@ class TestNamedPositions:
 
 class TestWrapper:
     """
-    Functions are wrappers to named_positions_to_kml.
+    Functions are wrappers to placemarks_to_kml.
     """
 
     def test_positions(
@@ -247,7 +248,7 @@ class TestWrapper:
 
         tmp_path.mkdir(parents=True, exist_ok=True)
 
-        spy = mocker.spy(kml_conversion, "named_positions_to_kml")
+        spy = mocker.spy(kml_conversion, "placemarks_to_kml")
 
         # Run
         result, actual_kml_file_path = kml_conversion.positions_to_kml(
@@ -286,7 +287,7 @@ class TestWrapper:
 
         tmp_path.mkdir(parents=True, exist_ok=True)
 
-        spy = mocker.spy(kml_conversion, "named_positions_to_kml")
+        spy = mocker.spy(kml_conversion, "placemarks_to_kml")
 
         # Run
         result, actual_kml_file_path = kml_conversion.named_positions_to_kml(
@@ -322,7 +323,7 @@ class TestWrapper:
 
         tmp_path.mkdir(parents=True, exist_ok=True)
 
-        spy = mocker.spy(kml_conversion, "named_positions_to_kml")
+        spy = mocker.spy(kml_conversion, "placemarks_to_kml")
 
         # Run
         result, actual_kml_file_path = kml_conversion.locations_to_kml(
@@ -343,3 +344,146 @@ class TestWrapper:
         assert actual_kml_file_path.read_text(
             encoding="utf-8"
         ) == expected_kml_document_path.read_text(encoding="utf-8")
+
+
+class TestDecimation:
+    """
+    Decimation and tiling options.
+    """
+
+    def test_grid_cell_size(
+        self,
+        named_positions: list[
+            position_global_relative_altitude.NamedPositionGlobalRelativeAltitude
+        ],
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """
+        Cities are far apart, a duplicate next to one is removed.
+        """
+        result, duplicate = (
+            position_global_relative_altitude.NamedPositionGlobalRelativeAltitude.create(
+                "San Francisco again", 37.77491, -122.41941, 0.0
+            )
+        )
+        assert result
+
+        result, actual_kml_file_path = kml_conversion.named_positions_to_kml(
+            named_positions + [duplicate], "actual", tmp_path, grid_cell_size=100.0
+        )
+        assert result
+        assert actual_kml_file_path is not None
+
+        # Same as without the duplicate
+        expected_kml_document_path = pathlib.Path(PARENT_DIRECTORY, EXPECTED_NAMED_FILENAME)
+        assert actual_kml_file_path.read_text(
+            encoding="utf-8"
+        ) == expected_kml_document_path.read_text(encoding="utf-8")
+
+        result, actual_kml_file_path = kml_conversion.named_positions_to_kml(
+            named_positions, "actual", tmp_path, grid_cell_size=-1.0
+        )
+        assert not result
+        assert actual_kml_file_path is None
+
+    def test_track_tolerance(self, tmp_path: pathlib.Path) -> None:
+        """
+        Straight track keeps the ends, named by original index.
+        """
+        positions = []
+        for i in range(100):
+            result, position = (
+                position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+                    43.0 + i * 1e-5, -80.0, 50.0
+                )
+            )
+            assert result
+            positions.append(position)
+
+        result, actual_kml_file_path = kml_conversion.positions_to_kml(
+            positions, "actual", tmp_path, track_tolerance=1.0
+        )
+        assert result
+        assert actual_kml_file_path is not None
+
+        document = actual_kml_file_path.read_text(encoding="utf-8")
+        assert document.count("<Placemark ") == 2
+        assert "<name>0</name>" in document
+        assert "<name>99</name>" in document
+
+    def test_tile_size(
+        self,
+        positions: list[position_global_relative_altitude.PositionGlobalRelativeAltitude],
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """
+        Each city is in its own tile file, linked with a region around it and in the overview.
+        """
+        result, actual_kml_file_path = kml_conversion.positions_to_kml(
+            positions, "actual", tmp_path, tile_size=1.0
+        )
+        assert result
+        assert actual_kml_file_path is not None
+
+        namespace = "{http://www.opengis.net/kml/2.2}"
+        root = xml.etree.ElementTree.parse(actual_kml_file_path).getroot()
+        links = list(root.iter(f"{namespace}NetworkLink"))
+        folders = list(root.iter(f"{namespace}Folder"))
+        assert len(links) == 3
+        assert len(folders) == 3
+
+        for link, folder in zip(links, folders):
+            box = link.find(f"{namespace}Region/{namespace}LatLonAltBox")
+            north = float(box.find(f"{namespace}north").text)
+            west = float(box.find(f"{namespace}west").text)
+            assert north - float(box.find(f"{namespace}south").text) == 1.0
+
+            # Overview is shown until the tile file is loaded
+            lod = folder.find(f"{namespace}Region/{namespace}Lod")
+            assert lod.find(f"{namespace}maxLodPixels").text == str(
+                kml_conversion.TILE_MIN_LOD_PIXELS
+            )
+            assert len(folder.findall(f"{namespace}Placemark")) == 1
+
+            href = link.find(f"{namespace}Link/{namespace}href").text
+            tile = xml.etree.ElementTree.parse(
+                pathlib.Path(actual_kml_file_path.parent, href)
+            ).getroot()
+            placemarks = list(tile.iter(f"{namespace}Placemark"))
+            assert len(placemarks) == 1
+            coordinates = placemarks[0].find(f".//{namespace}coordinates").text
+            longitude, latitude, _ = map(float, coordinates.split(","))
+            assert north - 1.0 <= latitude < north
+            assert west <= longitude < west + 1.0
+
+        # Sorted by tile, south first
+        assert [link.find(f"{namespace}name").text for link in links] == [
+            "Tile 124 61",
+            "Tile 127 57",
+            "Tile 130 105",
+        ]
+
+    def test_same_second(
+        self,
+        positions: list[position_global_relative_altitude.PositionGlobalRelativeAltitude],
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """
+        Calls within the same second do not overwrite or delete earlier files.
+        """
+        paths = []
+        for tile_size in [1.0, 1.0, None]:
+            result, path = kml_conversion.positions_to_kml(
+                positions, "actual", tmp_path, tile_size=tile_size
+            )
+            assert result
+            assert path is not None
+            paths.append(path)
+
+        assert len(set(paths)) == 3
+        for path in paths:
+            assert path.read_text(encoding="utf-8").count("<Placemark ") > 0
+
+        tile_directories = [pathlib.Path(tmp_path, f"{path.stem}_tiles") for path in paths[:2]]
+        for tile_directory in tile_directories:
+            assert len(list(tile_directory.glob("*.kml"))) == 3
@@ -0,0 +1,93 @@
+"""
+Test KML decimation.
+"""
+
+import numpy as np
+
+from modules.kml import kml_decimation
+
+
+# About 1 m in latitude
+METRE = 1.0 / 111195.0
+
+
+def test_douglas_peucker_corner() -> None:
+    """
+    Straight runs are removed, the corner is kept.
+    """
+    # East 100 m then north 100 m, with 1 m spacing
+    latitudes = np.concatenate([np.zeros(100), np.arange(101) * METRE]) + 43.0
+    longitudes = np.concatenate([np.arange(100) * METRE, np.full(101, 100 * METRE)]) - 80.0
+    altitudes = np.zeros_like(latitudes)
+
+    result, indices = kml_decimation.douglas_peucker(latitudes, longitudes, altitudes, 0.5)
+    assert result
+    assert indices.tolist() == [0, 100, 200]
+
+    # Altitude counts
+    altitudes[50] = 10.0
+    result, indices = kml_decimation.douglas_peucker(latitudes, longitudes, altitudes, 0.5)
+    assert result
+    assert 50 in indices.tolist()
+
+
+def test_douglas_peucker_tolerance() -> None:
+    """
+    No removed vertex is farther than the tolerance from the simplified track.
+    """
+    generator = np.random.default_rng(0)
+    steps = generator.normal(0.0, 5.0 * METRE, (2000, 2))
+    latitudes, longitudes = (np.cumsum(steps, axis=0) + [43.0, -80.0]).T
+    altitudes = np.zeros(len(latitudes))
+    tolerance = 3.0
+
+    result, indices = kml_decimation.douglas_peucker(latitudes, longitudes, altitudes, tolerance)
+    assert result
+    assert 2 < len(indices) < len(latitudes)
+    assert indices[0] == 0
+    assert indices[-1] == len(latitudes) - 1
+
+    # Check against the kept vertex pairs around each removed vertex
+    scale = np.array([1.0, np.cos(np.radians(43.0))]) / METRE
+    points = np.column_stack([latitudes, longitudes]) * scale
+    for start, end in zip(indices[:-1], indices[1:]):
+        segment = points[end] - points[start]
+        offsets = points[start + 1 : end] - points[start]
+        fractions = np.clip(offsets @ segment / (segment @ segment), 0.0, 1.0)
+        distances = np.linalg.norm(offsets - fractions[:, np.newaxis] * segment, axis=1)
+        assert np.all(distances <= tolerance * 1.01)
+
+
+def test_grid_bin() -> None:
+    """
+    First point of each cell is kept, in the original order.
+    """
+    latitudes = 43.0 + np.array([0.0, 1.0, 25.0, 2.0, 30.0, 200.0]) * METRE
+    longitudes = np.full(6, -80.0)
+
+    result, indices = kml_decimation.grid_bin(latitudes, longitudes, 20.0)
+    assert result
+    assert indices.tolist() == [0, 2, 5]
+
+    result, indices = kml_decimation.grid_bin(np.array([]), np.array([]), 20.0)
+    assert result
+    assert len(indices) == 0
+
+
+def test_invalid() -> None:
+    """
+    Negative sizes and mismatched arrays.
+    """
+    values = np.zeros(3)
+
+    result, indices = kml_decimation.douglas_peucker(values, values, values, -1.0)
+    assert not result
+    assert indices is None
+
+    result, indices = kml_decimation.douglas_peucker(values, values, np.zeros(2), 1.0)
+    assert not result
+    assert indices is None
+
+    result, indices = kml_decimation.grid_bin(values, values, 0.0)
+    assert not result
+    assert indices is None
@@ -0,0 +1,175 @@
+"""
+Test live KML session.
+"""
+
+import pathlib
+import xml.etree.ElementTree
+import zipfile
+
+from modules import orientation
+from modules import position_global
+from modules.kml import kml_session
+from modules.mavlink import drone_odometry_global
+
+
+KML_NAMESPACE = "{http://www.opengis.net/kml/2.2}"
+
+
+def make_positions(start: int, count: int) -> "list[position_global.PositionGlobal]":
+    """
+    Positions along a line.
+    """
+    positions = []
+    for i in range(start, start + count):
+        result, position = position_global.PositionGlobal.create(43.0 + i * 1e-4, -80.0, 300.0)
+        assert result
+        positions.append(position)
+
+    return positions
+
+
+def read_track(document: str) -> "list[list[str]]":
+    """
+    Parses the document and returns the coordinates of each placemark in order.
+    """
+    root = xml.etree.ElementTree.fromstring(document)
+    vertices = []
+    for coordinates in root.iter(f"{KML_NAMESPACE}coordinates"):
+        vertices.append(coordinates.text.split(" "))
+
+    return vertices
+
+
+def test_kml_append(tmp_path: pathlib.Path) -> None:
+    """
+    Document is complete after every update and the track is continuous.
+    """
+    result, session = kml_session.KmlSession.create("live", tmp_path)
+    assert result
+    assert session is not None
+    assert session.network_link_path is None
+
+    # Empty document already valid
+    assert not read_track(session.document_path.read_text(encoding="utf-8"))
+
+    # First point held until there is a line
+    assert session.add_track_positions(make_positions(0, 1))
+    assert not read_track(session.document_path.read_text(encoding="utf-8"))
+
+    assert session.add_track_positions(make_positions(1, 2))
+    assert session.add_placemarks([("target", 43.0, -80.0, 0.0)])
+
+    result, odometry = drone_odometry_global.DroneOdometryGlobal.create(
+        make_positions(3, 1)[0],
+        orientation.Orientation.create(0.0, 0.0, 0.0)[1],
+        drone_odometry_global.FlightMode.MOVING,
+    )
+    assert result
+    assert session.add_odometry(odometry)
+
+    segments = read_track(session.document_path.read_text(encoding="utf-8"))
+    assert len(segments) == 3
+    assert len(segments[0]) == 3
+    # Point placemark
+    assert segments[1] == ["-80.0,43.0,0.0"]
+    # Continues from the end of the previous segment
+    assert segments[2][0] == segments[0][-1]
+
+    assert session.close()
+    assert not session.add_placemarks([("late", 0.0, 0.0, 0.0)])
+
+
+def test_one_track(tmp_path: pathlib.Path) -> None:
+    """
+    Updates extend the same line string until placemarks are added.
+    """
+    result, session = kml_session.KmlSession.create("live", tmp_path)
+    assert result
+
+    for position in make_positions(0, 50):
+        assert session.add_track_positions([position])
+
+    segments = read_track(session.document_path.read_text(encoding="utf-8"))
+    assert len(segments) == 1
+    assert len(segments[0]) == 50
+
+    assert session.add_placemarks([("target", 43.0, -80.0, 0.0)])
+    for position in make_positions(50, 10):
+        assert session.add_track_positions([position])
+
+    assert session.close()
+
+    segments = read_track(session.document_path.read_text(encoding="utf-8"))
+    assert [len(segment) for segment in segments] == [50, 1, 11]
+    assert segments[2][0] == segments[0][-1]
+
+
+def test_kmz_same_as_kml(tmp_path: pathlib.Path) -> None:
+    """
+    KMZ contains the same document, readable after every update.
+    """
+    result, kml = kml_session.KmlSession.create("kml", tmp_path)
+    assert result
+
+    result, kmz = kml_session.KmlSession.create("kmz", tmp_path, use_kmz=True, refresh_interval=1.0)
+    assert result
+    assert kmz.document_path.suffix == ".kmz"
+
+    for start in range(0, 100, 10):
+        for session in [kml, kmz]:
+            assert session.add_track_positions(make_positions(start, 10))
+            assert session.add_placemarks([(str(start), 43.0, -80.0, 0.0)])
+
+        with zipfile.ZipFile(kmz.document_path) as archive:
+            assert archive.testzip() is None
+            assert archive.read("doc.kml") == kml.document_path.read_bytes()
+
+    assert kml.close()
+    assert kmz.close()
+
+    network_link = xml.etree.ElementTree.parse(kmz.network_link_path).getroot()
+    assert network_link.find(f".//{KML_NAMESPACE}href").text == kmz.document_path.name
+
+
+def test_network_link_escaped(tmp_path: pathlib.Path) -> None:
+    """
+    NetworkLink file is valid XML for names with special characters.
+    """
+    result, session = kml_session.KmlSession.create("a&b<c", tmp_path, refresh_interval=2.0)
+    assert result
+    assert session.close()
+
+    network_link = xml.etree.ElementTree.parse(session.network_link_path).getroot()
+    assert network_link.find(f".//{KML_NAMESPACE}NetworkLink/{KML_NAMESPACE}name").text == (
+        session.document_path.stem
+    )
+    assert network_link.find(f".//{KML_NAMESPACE}href").text == session.document_path.name
+    assert network_link.find(f".//{KML_NAMESPACE}refreshInterval").text == "2.0"
+    assert network_link.find(f".//{KML_NAMESPACE}Region") is None
+
+
+def test_update_interval(tmp_path: pathlib.Path) -> None:
+    """
+    Items are held until the interval has passed or update is called.
+    """
+    result, session = kml_session.KmlSession.create("held", tmp_path, update_interval=3600.0)
+    assert result
+
+    assert session.add_track_positions(make_positions(0, 5))
+    assert not read_track(session.document_path.read_text(encoding="utf-8"))
+
+    assert session.close()
+    assert len(read_track(session.document_path.read_text(encoding="utf-8"))[0]) == 5
+
+
+def test_invalid(tmp_path: pathlib.Path) -> None:
+    """
+    Invalid settings and paths.
+    """
+    result, session = kml_session.KmlSession.create("live", tmp_path, refresh_interval=0.0)
+    assert not result
+    assert session is None
+
+    result, session = kml_session.KmlSession.create("live", pathlib.Path(tmp_path, "nonexistent"))
+    assert not result
+    assert session is None
@@ -0,0 +1,125 @@
+"""
+Test streaming KML writer.
+"""
+
+import io
+import pathlib
+
+import numpy as np
+import simplekml
+import simplekml.base
+
+from modules.kml import kml_conversion
+from modules.kml import kml_writer
+
+
+# Test functions access class privates
+# No enable
+# pylint: disable=protected-access
+
+
+def simplekml_document(placemarks: "list[tuple[str, float, float, float]]") -> str:
+    """
+    Document as generated by simplekml, for comparison.
+    """
+    simplekml.base.Kmlable._globalid = 0
+
+    kml = simplekml.Kml()
+    for name, latitude, longitude, altitude in placemarks:
+        kml.newpoint(name=name, coords=[(longitude, latitude, altitude)])
+
+    return kml.kml()
+
+
+def test_same_as_simplekml() -> None:
+    """
+    Names needing escaping and various float representations.
+    """
+    generator = np.random.default_rng(0)
+    placemarks = [
+        ("San Francisco", 37.7749, -122.4194, 0.0),
+        ("Tom & Jerry's <home>", 1e-7, -180.0, 123456789.125),
+        ('"quoted"', -0.0, 0.1 + 0.2, -5.0),
+        ("", 10.0, 20.0, 30.0),
+        ("Überlingen", 47.7667, 9.1667, 1.5),
+    ]
+    placemarks += [
+        (str(i), latitude, longitude, altitude)
+        for i, (latitude, longitude, altitude) in enumerate(
+            generator.uniform(-90.0, 90.0, (20, 3)).tolist()
+        )
+    ]
+
+    file = io.StringIO()
+    result, writer = kml_writer.KmlWriter.create(file)
+    assert result
+    assert writer is not None
+
+    result, count = writer.write_placemarks(iter(placemarks[:3]))
+    assert result
+    assert count == 3
+
+    for placemark in placemarks[3:]:
+        assert writer.write_placemark(*placemark)
+
+    assert writer.close()
+    assert writer.placemark_count == len(placemarks)
+
+    assert file.getvalue() == simplekml_document(placemarks)
+
+    # Closed
+    assert not writer.write_placemark("late", 0.0, 0.0, 0.0)
+
+
+def test_invalid_placemarks() -> None:
+    """
+    Items that are not placemarks are rejected.
+    """
+    result, writer = kml_writer.KmlWriter.create(io.StringIO())
+    assert result
+
+    result, count = writer.write_placemarks([("name", 1.0, 2.0)])
+    assert not result
+    assert count is None
+
+
+def test_generator_input(tmp_path: pathlib.Path) -> None:
+    """
+    Generators are consumed without building a list, empty input makes no file.
+    """
+    placemarks = ((str(i), float(i), float(-i), 0.0) for i in range(5000))
+
+    result, path = kml_conversion.placemarks_to_kml(placemarks, "generated", tmp_path)
+    assert result
+    assert path is not None
+    assert path.read_text(encoding="utf-8").count("<Placemark ") == 5000
+
+    result, path = kml_conversion.placemarks_to_kml(iter([]), "empty", tmp_path)
+    assert not result
+    assert path is None
+    assert not list(tmp_path.glob("empty*"))
+
+
+def test_line_string_same_as_simplekml() -> None:
+    """
+    IDs continue across points and line strings.
+    """
+    simplekml.base.Kmlable._globalid = 0
+
+    kml = simplekml.Kml()
+    kml.newpoint(name="start", coords=[(2.0, 1.0, 0.0)])
+    line_string = kml.newlinestring(name="track", coords=[(2.0, 1.0, 3.5), (2.25, 1.5, 4.0)])
+    line_string.altitudemode = simplekml.AltitudeMode.absolute
+    kml.newlinestring(name="ground", coords=[(0.0, 0.0, 0.0), (1.0, 1.0, 0.0)])
+
+    file = io.StringIO()
+    result, writer = kml_writer.KmlWriter.create(file)
+    assert result
+
+    assert writer.write_placemark("start", 1.0, 2.0, 0.0)
+    assert writer.write_line_string("track", [(1.0, 2.0, 3.5), (1.5, 2.25, 4.0)], "absolute")
+    assert writer.write_line_string("ground", iter([(0.0, 0.0, 0.0), (1.0, 1.0, 0.0)]))
+    assert writer.close()
+    assert writer.placemark_count == 3
+
+    assert file.getvalue() == kml.kml()
@@ -0,0 +1,271 @@
+"""
+Test conversion with a cached local frame against the library.
+"""
+
+import math
+
+import numpy as np
+import pymap3d as pm
+import pytest
+
+from modules import orientation
+from modules import position_global
+from modules import position_local
+from modules.mavlink import drone_odometry_global
+from modules.mavlink import drone_odometry_local
+from modules.mavlink import local_frame
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def home_position() -> position_global.PositionGlobal:  # type: ignore
+    """
+    Home position.
+    """
+    result, position = position_global.PositionGlobal.create(43.472978, -80.540103, 336.0)
+    assert result
+    assert position is not None
+
+    yield position
+
+
+@pytest.fixture
+def frame(home_position: position_global.PositionGlobal) -> local_frame.LocalFrame:  # type: ignore
+    """
+    Frame at home.
+    """
+    result, instance = local_frame.LocalFrame.create(home_position)
+    assert result
+    assert instance is not None
+
+    yield instance
+
+
+@pytest.fixture
+def local_positions() -> np.ndarray:  # type: ignore
+    """
+    North, east, down up to 50 km from home.
+    """
+    generator = np.random.default_rng(0)
+
+    yield generator.uniform(-50000.0, 50000.0, (100, 3))
+
+
+def test_to_global(
+    home_position: position_global.PositionGlobal,
+    frame: local_frame.LocalFrame,
+    local_positions: np.ndarray,
+) -> None:
+    """
+    Scalar and array conversion match pymap3d.
+    """
+    expected = np.column_stack(
+        pm.ned2geodetic(
+            local_positions[:, 0],
+            local_positions[:, 1],
+            local_positions[:, 2],
+            home_position.latitude,
+            home_position.longitude,
+            home_position.altitude,
+        )
+    )
+
+    result, actual_array = frame.to_global(local_positions)
+    assert result
+    assert isinstance(actual_array, position_global.PositionGlobalArray)
+    np.testing.assert_allclose(actual_array.to_array(), expected, rtol=0.0, atol=1e-6)
+
+    for (north, east, down), (latitude, longitude, altitude) in zip(
+        local_positions.tolist(), expected.tolist()
+    ):
+        result, position = position_local.PositionLocal.create(north, east, down)
+        assert result
+
+        result, actual = frame.to_global(position)
+        assert result
+        assert isinstance(actual, position_global.PositionGlobal)
+        assert actual.latitude == pytest.approx(latitude, abs=1e-9)
+        assert actual.longitude == pytest.approx(longitude, abs=1e-9)
+        assert actual.altitude == pytest.approx(altitude, abs=1e-6)
+
+
+def test_to_local(
+    home_position: position_global.PositionGlobal,
+    frame: local_frame.LocalFrame,
+    local_positions: np.ndarray,
+) -> None:
+    """
+    Scalar and array conversion are the inverse of to_global() and match pymap3d.
+    """
+    result, global_positions = frame.to_global(local_positions)
+    assert result
+
+    result, actual_array = frame.to_local(global_positions)
+    assert result
+    assert isinstance(actual_array, position_local.PositionLocalArray)
+    np.testing.assert_allclose(actual_array.to_array(), local_positions, rtol=0.0, atol=1e-6)
+
+    result, global_objects = global_positions.to_objects()
+    assert result
+
+    for global_position in global_objects:
+        result, actual = frame.to_local(global_position)
+        assert result
+        assert isinstance(actual, position_local.PositionLocal)
+
+        expected = pm.geodetic2ned(
+            global_position.latitude,
+            global_position.longitude,
+            global_position.altitude,
+            home_position.latitude,
+            home_position.longitude,
+            home_position.altitude,
+        )
+        assert (actual.north, actual.east, actual.down) == pytest.approx(expected, abs=1e-6)
+
+
+def test_drone_odometry_local_from_global(
+    home_position: position_global.PositionGlobal, frame: local_frame.LocalFrame
+) -> None:
+    """
+    Home is the origin.
+    """
+    result, drone_orientation = orientation.Orientation.create(0.0, 0.0, 0.0)
+    assert result
+
+    result, odometry = drone_odometry_global.DroneOdometryGlobal.create(
+        home_position, drone_orientation, drone_odometry_global.FlightMode.MANUAL
+    )
+    assert result
+
+    result, actual = frame.drone_odometry_local_from_global(odometry)
+    assert result
+    assert isinstance(actual, drone_odometry_local.DroneOdometryLocal)
+    assert actual.orientation is drone_orientation
+    assert (actual.position.north, actual.position.east, actual.position.down) == pytest.approx(
+        (0.0, 0.0, 0.0), abs=1e-6
+    )
+
+
+def test_is_home(
+    home_position: position_global.PositionGlobal, frame: local_frame.LocalFrame
+) -> None:
+    """
+    Frame only needs to be recreated when the home position changes.
+    """
+    result, same = position_global.PositionGlobal.create(
+        home_position.latitude, home_position.longitude, home_position.altitude
+    )
+    assert result
+    assert frame.is_home(same)
+
+    result, moved = position_global.PositionGlobal.create(
+        home_position.latitude, home_position.longitude, home_position.altitude + 1.0
+    )
+    assert result
+    assert not frame.is_home(moved)
+
+
+def test_invalid() -> None:
+    """
+    Non-finite home position.
+    """
+    result, home_position = position_global.PositionGlobal.create(math.nan, 0.0, 0.0)
+    assert result
+
+    result, frame = local_frame.LocalFrame.create(home_position)
+    assert not result
+    assert frame is None
+
+
+def test_pole() -> None:
+    """
+    Conversion at the north pole.
+    """
+    result, home_position = position_global.PositionGlobal.create(90.0, 0.0, 10.0)
+    assert result
+
+    result, frame = local_frame.LocalFrame.create(home_position)
+    assert result
+
+    result, position = position_local.PositionLocal.create(0.0, 0.0, -5.0)
+    assert result
+
+    result, actual = frame.to_global(position)
+    assert result
+    assert actual.latitude == pytest.approx(90.0, abs=1e-9)
+    assert actual.altitude == pytest.approx(15.0, abs=1e-6)
+
+
+@pytest.mark.parametrize(
+    "distance, horizontal_error, vertical_error",
+    [(1000.0, 0.02, 0.001), (5000.0, 0.15, 0.001), (20000.0, 1.0, 0.01)],
+)
+def test_flat_earth_error(
+    home_position: position_global.PositionGlobal,
+    frame: local_frame.LocalFrame,
+    distance: float,
+    horizontal_error: float,
+    vertical_error: float,
+) -> None:
+    """
+    Flat earth approximation is within the documented error of the exact conversion.
+    """
+    result, flat_frame = local_frame.LocalFrame.create(home_position, flat_earth=True)
+    assert result
+    assert flat_frame is not None
+
+    generator = np.random.default_rng(0)
+    angles = generator.uniform(0.0, 2.0 * np.pi, 500)
+    local_positions = np.column_stack(
+        (
+            distance * np.cos(angles),
+            distance * np.sin(angles),
+            generator.uniform(-100.0, 100.0, 500),
+        )
+    )
+
+    # To global, compared in local space of the exact frame
+    result, approximate = flat_frame.to_global(local_positions)
+    assert result
+    result, approximate_local = frame.to_local(approximate)
+    assert result
+
+    error = approximate_local.to_array() - local_positions
+    assert np.max(np.hypot(error[:, 0], error[:, 1])) < horizontal_error
+    assert np.max(np.abs(error[:, 2])) < vertical_error
+
+    # To local
+    result, exact_global = frame.to_global(local_positions)
+    assert result
+    result, approximate_local = flat_frame.to_local(exact_global)
+    assert result
+
+    error = approximate_local.to_array() - local_positions
+    assert np.max(np.hypot(error[:, 0], error[:, 1])) < horizontal_error
+    assert np.max(np.abs(error[:, 2])) < vertical_error
+
+    # Scalar path uses the same formula
+    result, position = position_local.PositionLocal.create(*local_positions[0].tolist())
+    assert result
+    result, scalar = flat_frame.to_global(position)
+    assert result
+    assert (scalar.latitude, scalar.longitude, scalar.altitude) == pytest.approx(
+        tuple(approximate.to_array()[0]), abs=1e-9
+    )
+
+
+def test_flat_earth_pole() -> None:
+    """
+    Not available near the poles.
+    """
+    result, home_position = position_global.PositionGlobal.create(89.5, 0.0, 0.0)
+    assert result
+
+    result, frame = local_frame.LocalFrame.create(home_position, flat_earth=True)
+    assert not result
+    assert frame is None
@@ -2,6 +2,7 @@
 Test calls only, not conversion correctness as that is handled by the library.
 """
 
+import numpy as np
 import pytest
 
 from modules import location_global
@@ -139,3 +140,128 @@ def test_drone_odometry_local_from_global(home_position: position_global.Positio
     assert result
     assert actual is not None
     assert isinstance(actual, drone_odometry_local.DroneOdometryLocal)
+
+
+@pytest.fixture
+def local_positions() -> np.ndarray:  # type: ignore
+    """
+    North, east, down within 5 km of home.
+    """
+    generator = np.random.default_rng(0)
+
+    yield generator.uniform(-5000.0, 5000.0, (50, 3))
+
+
+def test_positions_global_from_positions_local(
+    home_position: position_global.PositionGlobal, local_positions: np.ndarray
+) -> None:
+    """
+    Same result as converting each position.
+    """
+    # Run
+    result, actual = local_global_conversion.positions_global_from_positions_local(
+        home_position, local_positions
+    )
+
+    # Check
+    assert result
+    assert actual is not None
+    assert isinstance(actual, position_global.PositionGlobalArray)
+    assert len(actual) == len(local_positions)
+
+    for (north, east, down), batch_position in zip(local_positions.tolist(), actual):
+        result, position = position_local.PositionLocal.create(north, east, down)
+        assert result
+        result, expected = local_global_conversion.position_global_from_position_local(
+            home_position, position
+        )
+        assert result
+        assert batch_position.latitude == pytest.approx(expected.latitude, abs=1e-9)
+        assert batch_position.longitude == pytest.approx(expected.longitude, abs=1e-9)
+        assert batch_position.altitude == pytest.approx(expected.altitude, abs=1e-6)
+
+
+def test_positions_local_from_positions_global(
+    home_position: position_global.PositionGlobal, local_positions: np.ndarray
+) -> None:
+    """
+    Same result as converting each position, and inverse of the global conversion.
+    """
+    # Setup
+    result, global_positions = local_global_conversion.positions_global_from_positions_local(
+        home_position, local_positions
+    )
+    assert result
+
+    # Run
+    result, actual = local_global_conversion.positions_local_from_positions_global(
+        home_position, global_positions
+    )
+
+    # Check
+    assert result
+    assert actual is not None
+    assert isinstance(actual, position_local.PositionLocalArray)
+    np.testing.assert_allclose(actual.to_array(), local_positions, rtol=0.0, atol=1e-6)
+
+    result, objects = global_positions.to_objects()
+    assert result
+    for global_position, batch_position in zip(objects, actual):
+        result, expected = local_global_conversion.position_local_from_position_global(
+            home_position, global_position
+        )
+        assert result
+        assert batch_position.north == pytest.approx(expected.north, abs=1e-6)
+        assert batch_position.east == pytest.approx(expected.east, abs=1e-6)
+        assert batch_position.down == pytest.approx(expected.down, abs=1e-6)
+
+
+def test_locations_batch(home_position: position_global.PositionGlobal) -> None:
+    """
+    Locations are on the ground at home altitude.
+    """
+    # Setup
+    result, locations = location_local.LocationLocalArray.create(
+        np.array([[0.0, 0.0], [100.0, -50.0]])
+    )
+    assert result
+
+    # Run
+    result, global_positions = local_global_conversion.positions_global_from_locations_local(
+        home_position, locations
+    )
+    assert result
+
+    result, global_locations = location_global.LocationGlobalArray.create(
+        global_positions.to_array()[:, :2]
+    )
+    assert result
+
+    result, actual = local_global_conversion.positions_local_from_locations_global(
+        home_position, global_locations
+    )
+
+    # Check
+    assert result
+    assert actual is not None
+    np.testing.assert_allclose(actual.north, locations.north, atol=1e-6)
+    np.testing.assert_allclose(actual.east, locations.east, atol=1e-6)
+    # Locations follow the curvature of the Earth, so only home is exactly at down 0
+    assert actual.down[0] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_batch_invalid(home_position: position_global.PositionGlobal) -> None:
+    """
+    Wrong shape or non-finite values.
+    """
+    result, actual = local_global_conversion.positions_global_from_positions_local(
+        home_position, np.zeros((3, 2))
+    )
+    assert not result
+    assert actual is None
+
+    result, actual = local_global_conversion.positions_local_from_positions_global(
+        home_position, np.array([[np.nan, 0.0, 0.0]])
+    )
+    assert not result
+    assert actual is None
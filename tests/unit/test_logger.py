@@ -2,14 +2,21 @@
 Logger unit tests.
 """
 
+import datetime
 import inspect
+import io
+import logging
 import pathlib
+import queue
 import re
+import threading
 
 import cv2
 import numpy as np
 import pytest
+import pytest_mock
 
+from modules.logger import log_queue
 from modules.logger import logger
 from modules.logger import logger_main_setup
 from modules.read_yaml import read_yaml
@@ -67,7 +74,7 @@ class TestMessageAndMetadata:
         frame = inspect.currentframe()
         message = "Test message"
         expected = (
-            f"[{__file__} | {self.test_message_and_metadata_with_frame.__name__} | 74] Test message"
+            f"[{__file__} | {self.test_message_and_metadata_with_frame.__name__} | 81] Test message"
         )
 
         # Get line number of this function call
@@ -88,6 +95,31 @@ class TestMessageAndMetadata:
         assert actual == expected
 
 
+@pytest.fixture
+def logger_instance_queue_and_logging_path(
+    mocker: pytest_mock.MockerFixture, tmp_path: pathlib.Path
+) -> tuple[logger.Logger, pathlib.Path]:  # type: ignore
+    """
+    Returns a logger writing from a separate thread to a file in its own logging directory.
+    """
+    result, config = read_yaml.open_config(logger.CONFIG_FILE_PATH)
+    assert result
+    assert config is not None
+
+    config["logger"]["directory_path"] = str(tmp_path)
+    logging_path = pathlib.Path(
+        tmp_path, datetime.datetime.now().strftime(config["logger"]["file_datetime_format"])
+    )
+    logging_path.mkdir()
+    mocker.patch.object(logger.read_yaml, "open_config", return_value=(True, config))
+
+    result, instance = logger.Logger.create("test_logger_queue_to_file_enabled", True, True)
+    assert result
+    assert instance is not None
+
+    yield instance, logging_path
+
+
 # Fixtures are used to setup and teardown resources for tests
 # pylint: disable=redefined-outer-name
 class TestLogger:
@@ -109,12 +141,35 @@ class TestLogger:
         expected_pattern = re.compile(
             r"DEBUG.*\["
             + re.escape(__file__)
-            + r" | test_log_with_frame_info | 93\]"
+            + r" | test_log_with_frame_info | 138\]"
             + re.escape(test_message)
         )
 
         assert re.search(expected_pattern, actual) is not None
 
+    def test_log_with_frame_info_format(
+        self, caplog: pytest.LogCaptureFixture, logger_instance_to_file_disabled: logger.Logger
+    ) -> None:
+        """
+        Test if frame information is exact for each level, and for repeated calls
+        """
+        for method in [
+            logger_instance_to_file_disabled.debug,
+            logger_instance_to_file_disabled.info,
+            logger_instance_to_file_disabled.warning,
+            logger_instance_to_file_disabled.error,
+            logger_instance_to_file_disabled.critical,
+        ]:
+            for _ in range(2):
+                line_number = inspect.currentframe().f_lineno + 1
+                method("test message", True)
+
+                expected = (
+                    f"[{__file__} | {self.test_log_with_frame_info_format.__name__} | "
+                    f"{line_number}] test message"
+                )
+                assert caplog.records[-1].getMessage() == expected
+
     def test_log_to_file(
         self,
         main_logger_instance_and_logging_path: tuple[logger.Logger, pathlib.Path],
@@ -258,3 +313,174 @@ class TestLogger:
             actual_image = cv2.imread(image_path)
 
             assert np.array_equal(actual_image, expected_image)
+
+    def test_queue_log_to_file(
+        self,
+        logger_instance_queue_and_logging_path: tuple[logger.Logger, pathlib.Path],
+    ) -> None:
+        """
+        Test if messages logged through the queue are written to file in order
+        """
+        logger_instance, logging_path = logger_instance_queue_and_logging_path
+
+        for i in range(500):
+            logger_instance.info(f"queued message {i}", False)
+
+        logger_instance.flush()
+
+        test_logging_path = pathlib.Path(logging_path, "test_logger_queue_to_file_enabled.log")
+        with open(test_logging_path, "r", encoding="utf8") as log_file:
+            lines = log_file.read().splitlines()
+
+        assert len(lines) == 500
+        for i, line in enumerate(lines):
+            assert line.endswith(f"[INFO] queued message {i}")
+
+        assert logger_instance.dropped_message_count == 0
+
+
+class TestLogQueue:
+    """
+    Test the queue handler and writer thread.
+    """
+
+    def test_dropped_count(self) -> None:
+        """
+        Records beyond the queue size are dropped and counted without blocking
+        """
+        record_queue = queue.Queue(2)
+        handler = log_queue.DroppingQueueHandler(record_queue)
+        test_logger = logging.getLogger("test_log_queue_dropped_count")
+        test_logger.propagate = False
+        test_logger.addHandler(handler)
+
+        for i in range(5):
+            test_logger.warning("message %d", i)
+
+        assert handler.dropped_count == 3
+        assert record_queue.get_nowait().getMessage() == "message 0"
+
+    def test_batch_listener(self) -> None:
+        """
+        Records are formatted and written in order, filtered by handler level
+        """
+        record_queue = queue.Queue()
+        stream = io.StringIO()
+        stream_handler = logging.StreamHandler(stream)
+        stream_handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        stream_handler.setLevel(logging.INFO)
+
+        result, listener = log_queue.BatchQueueListener.create(record_queue, [stream_handler], 3)
+        assert result
+        assert listener is not None
+
+        test_logger = logging.getLogger("test_log_queue_batch_listener")
+        test_logger.propagate = False
+        test_logger.setLevel(logging.DEBUG)
+        test_logger.addHandler(log_queue.DroppingQueueHandler(record_queue))
+
+        listener.start()
+        for i in range(10):
+            test_logger.debug("hidden %d", i)
+            test_logger.info("shown %d", i)
+        listener.stop()
+
+        assert stream.getvalue() == "".join(f"INFO shown {i}\n" for i in range(10))
+
+        result, listener = log_queue.BatchQueueListener.create(record_queue, [stream_handler], 0)
+        assert not result
+        assert listener is None
+
+    def test_flush(self) -> None:
+        """
+        Flush waits for queued records, and is safe concurrently with other flushes and stop
+        """
+        record_queue = queue.Queue(4)
+        stream = io.StringIO()
+        stream_handler = logging.StreamHandler(stream)
+
+        result, listener = log_queue.BatchQueueListener.create(record_queue, [stream_handler], 2)
+        assert result
+        assert listener is not None
+
+        test_logger = logging.getLogger("test_log_queue_flush")
+        test_logger.propagate = False
+        test_logger.addHandler(log_queue.DroppingQueueHandler(record_queue))
+
+        listener.start()
+        test_logger.warning("first")
+        listener.flush()
+        assert stream.getvalue() == "first\n"
+
+        threads = [threading.Thread(target=listener.flush) for _ in range(4)]
+        threads.append(threading.Thread(target=listener.stop))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Not running
+        listener.flush()
+
+
+class TestLazyLogging:
+    """
+    Test lazy messages and the configured level.
+    """
+
+    def test_args_and_callable(
+        self, caplog: pytest.LogCaptureFixture, logger_instance_to_file_disabled: logger.Logger
+    ) -> None:
+        """
+        Test if %-style args and functions give the message
+        """
+        logger_instance_to_file_disabled.info("frame %d of %s", False, args=(3, "video"))
+        assert caplog.records[-1].getMessage() == "frame 3 of video"
+
+        logger_instance_to_file_disabled.warning(lambda: "from function", False)
+        assert caplog.records[-1].getMessage() == "from function"
+
+        line_number = inspect.currentframe().f_lineno + 1
+        logger_instance_to_file_disabled.debug("%d%%", args=(50,))
+        assert caplog.records[-1].getMessage() == (
+            f"[{__file__} | {self.test_args_and_callable.__name__} | {line_number}] 50%"
+        )
+
+    def test_disabled_level(
+        self, caplog: pytest.LogCaptureFixture, logger_instance_to_file_disabled: logger.Logger
+    ) -> None:
+        """
+        Test if disabled levels skip the function and formatting
+        """
+        logger_instance_to_file_disabled.logger.setLevel(logging.INFO)
+        assert not logger_instance_to_file_disabled.is_enabled_for(logging.DEBUG)
+        assert logger_instance_to_file_disabled.is_enabled_for(logging.INFO)
+
+        calls = []
+        logger_instance_to_file_disabled.debug(lambda: calls.append(1) or "not logged")
+        # Formatting would raise
+        logger_instance_to_file_disabled.debug("%d", args=("not a number",))
+        assert not calls
+        assert not caplog.records
+
+        logger_instance_to_file_disabled.logger.setLevel(logging.DEBUG)
+
+    def test_level_from_config(self, mocker: pytest_mock.MockerFixture) -> None:
+        """
+        Test if the level is read from the configuration file
+        """
+        result, config = read_yaml.open_config(logger.CONFIG_FILE_PATH)
+        assert result
+
+        config["logger"]["level"] = "WARNING"
+        mocker.patch.object(logger.read_yaml, "open_config", return_value=(True, config))
+
+        result, instance = logger.Logger.create("test_logger_level_from_config", False)
+        assert result
+        assert not instance.is_enabled_for(logging.INFO)
+        assert instance.is_enabled_for(logging.WARNING)
+
+        config["logger"]["level"] = "VERBOSE"
+        result, instance = logger.Logger.create("test_logger_level_from_config", False)
+        assert not result
+        assert instance is None
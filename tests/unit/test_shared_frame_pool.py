@@ -0,0 +1,193 @@
+"""
+Test shared frame pool.
+"""
+
+import multiprocessing
+import multiprocessing.queues
+
+import numpy as np
+import pytest
+
+from modules.camera import shared_frame_pool
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+SHAPE = (48, 64, 3)
+
+
+@pytest.fixture
+def pool() -> shared_frame_pool.SharedFramePool:
+    """
+    Pool of 3 slots.
+    """
+    result, pool = shared_frame_pool.SharedFramePool.create(3, SHAPE)
+    assert result
+    assert pool is not None
+
+    yield pool
+
+    pool.close()
+    pool.unlink()
+
+
+def consumer(
+    handle: shared_frame_pool.FramePoolHandle,
+    descriptors: multiprocessing.queues.Queue,
+    sums: multiprocessing.queues.Queue,
+) -> None:
+    """
+    Sums each frame and releases it, until None.
+    """
+    result, pool = shared_frame_pool.SharedFramePool.attach(handle)
+    assert result
+
+    while True:
+        descriptor = descriptors.get()
+        if descriptor is None:
+            break
+
+        image = pool.view(descriptor)
+        sums.put((descriptor.timestamp, int(image.sum())))
+        del image
+        pool.release(descriptor)
+
+    pool.close()
+
+
+def test_write_view_release(pool: shared_frame_pool.SharedFramePool) -> None:
+    """
+    Views share memory with the slot, and released slots are reused.
+    """
+    image = np.full(SHAPE, 7, dtype=np.uint8)
+    result, descriptor = pool.write(image, 12.5, 2)
+    assert result
+    assert descriptor.shape == SHAPE
+    assert descriptor.dtype == "|u1"
+    assert descriptor.timestamp == 12.5
+
+    view = pool.view(descriptor)
+    np.testing.assert_array_equal(view, image)
+    assert not view.flags.writeable
+    assert not view.flags.owndata
+    assert pool.free_slot_count() == 2
+
+    assert pool.release(descriptor)
+    assert pool.free_slot_count() == 2
+    assert pool.release(descriptor)
+    assert pool.free_slot_count() == 3
+
+    del view
+
+
+def test_over_release(pool: shared_frame_pool.SharedFramePool) -> None:
+    """
+    Releasing or referencing a free slot fails and leaves it free.
+    """
+    image = np.zeros(SHAPE, dtype=np.uint8)
+    result, descriptor = pool.write(image, 0.0)
+    assert result
+
+    assert pool.add_reference(descriptor)
+    assert pool.release(descriptor)
+    assert pool.release(descriptor)
+    assert not pool.release(descriptor)
+    assert not pool.add_reference(descriptor)
+    assert pool.free_slot_count() == 3
+
+    for _ in range(3):
+        result, _ = pool.write(image, 0.0)
+        assert result
+
+
+def test_full(pool: shared_frame_pool.SharedFramePool) -> None:
+    """
+    Writes fail and are counted when every slot is in use.
+    """
+    image = np.zeros(SHAPE, dtype=np.uint8)
+    descriptors = []
+    for _ in range(3):
+        result, descriptor = pool.write(image, 0.0)
+        assert result
+        descriptors.append(descriptor)
+
+    assert sorted(descriptor.slot_id for descriptor in descriptors) == [0, 1, 2]
+
+    result, descriptor = pool.write(image, 0.0)
+    assert not result
+    assert descriptor is None
+    assert pool.dropped_count == 1
+
+    pool.release(descriptors[1])
+    result, descriptor = pool.write(image, 0.0)
+    assert result
+    assert descriptor.slot_id == 1
+
+
+def test_other_process(pool: shared_frame_pool.SharedFramePool) -> None:
+    """
+    A consumer process reads frames through descriptors and releases them.
+    """
+    descriptors = multiprocessing.Queue()
+    sums = multiprocessing.Queue()
+    process = multiprocessing.Process(target=consumer, args=(pool.handle, descriptors, sums))
+    process.start()
+
+    for value in range(10):
+        result, descriptor = pool.write(np.full(SHAPE, value, dtype=np.uint8), float(value))
+        assert result
+        descriptors.put(descriptor)
+        # Waits for the consumer, so slots are reused
+        assert sums.get(timeout=10.0) == (float(value), value * int(np.prod(SHAPE)))
+
+    descriptors.put(None)
+    process.join(10.0)
+    assert process.exitcode == 0
+    assert pool.free_slot_count() == 3
+
+
+def test_close_with_view() -> None:
+    """
+    Closing fails while a view or an array derived from it is referenced.
+    """
+    result, pool = shared_frame_pool.SharedFramePool.create(1, SHAPE)
+    assert result
+
+    result, descriptor = pool.write(np.full(SHAPE, 3, dtype=np.uint8), 0.0)
+    assert result
+
+    view = pool.view(descriptor)
+    row = view[1]
+    del view
+    assert not pool.close()
+    assert int(row.sum()) == 3 * row.size
+
+    del row
+    assert pool.close()
+    pool.unlink()
+
+
+def test_invalid() -> None:
+    """
+    No slots, empty shape, and a mismatched image.
+    """
+    result, pool = shared_frame_pool.SharedFramePool.create(0, SHAPE)
+    assert not result
+    assert pool is None
+
+    result, pool = shared_frame_pool.SharedFramePool.create(1, (0, 64))
+    assert not result
+    assert pool is None
+
+    result, pool = shared_frame_pool.SharedFramePool.create(1, SHAPE, np.uint16)
+    assert result
+
+    result, descriptor = pool.write(np.zeros((64, 48, 3)), 0.0)
+    assert not result
+    assert descriptor is None
+
+    pool.close()
+    pool.unlink()